@@ -35,12 +35,6 @@ try:
 except ImportError:
     AUDIO_PROCESSING_AVAILABLE = False
 
-from .edge_model_manager import EdgeModelManager
-from .edge_feature_extractor import EdgeFeatureExtractor
-from .edge_wake_word_detector import EdgeWakeWordDetector
-from .edge_emotion_analyzer import EdgeEmotionAnalyzer
-from .edge_safety_checker import EdgeSafetyChecker
-
 logger = logging.getLogger(__name__)
 
 
@@ -139,6 +133,14 @@ class EdgeModelConfig:
     model_optimization: bool = True
 
 
+# The components import the dataclasses above
+from .edge_model_manager import EdgeModelManager
+from .edge_feature_extractor import EdgeFeatureExtractor
+from .edge_wake_word_detector import EdgeWakeWordDetector
+from .edge_emotion_analyzer import EdgeEmotionAnalyzer
+from .edge_safety_checker import EdgeSafetyChecker
+
+
 class EdgeAIManager:
     """Main Edge AI Manager for ESP32-S3 real-time processing."""
 
@@ -8,9 +8,13 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import logging
-import tflite_runtime.interpreter as tflite
 
-from .edge_ai_manager import TF_AVAILABLE
+try:
+    import tflite_runtime.interpreter as tflite
+    TF_AVAILABLE = True
+except ImportError:
+    tflite = None
+    TF_AVAILABLE = False
 
 
 class EdgeModelManager:
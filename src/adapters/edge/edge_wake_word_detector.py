@@ -1,7 +1,9 @@
-from typing import Tuple
+from typing import Optional, Tuple
+import asyncio
 import numpy as np
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import tflite_runtime.interpreter
@@ -10,6 +12,12 @@ except ImportError:
     TF_AVAILABLE = False
 
 from .edge_model_manager import EdgeModelManager
+from .streaming_wake_word import (
+    EnergyWakeWordScorer,
+    StreamingWakeWordConfig,
+    StreamingWakeWordDetector,
+    TFLiteWakeWordScorer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +25,13 @@ logger = logging.getLogger(__name__)
 class EdgeWakeWordDetector:
     """Optimized wake word detection for edge devices."""
 
-    def __init__(self, model_manager: "EdgeModelManager"):
+    def __init__(self, model_manager: "EdgeModelManager", threshold: float = 0.7):
         self.model_manager = model_manager
         self.model = None
+        self.threshold = threshold
+        # Interpreters are not thread-safe: one inference thread per model
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wake-word")
         self.wake_word_patterns = [
             "hey teddy",
             "hello teddy",
@@ -45,24 +57,17 @@ class EdgeWakeWordDetector:
             if self.model is None:
                 return False, 0.0
 
-            if self.model.get("type") == "mock":
+            if isinstance(self.model, dict) and self.model.get("type") == "mock":
                 return self._mock_wake_word_detection(audio_data, start_time)
 
             # Preprocess audio for model
             processed_audio = self._preprocess_audio(audio_data)
 
-            # Run inference
-            input_details = self.model.get_input_details()
-            output_details = self.model.get_output_details()
+            # Run inference off the event loop
+            confidence = await asyncio.get_running_loop().run_in_executor(
+                self._inference_executor, self._invoke_model, processed_audio)
 
-            self.model.set_tensor(input_details[0]["index"], processed_audio)
-            self.model.invoke()
-
-            output_data = self.model.get_tensor(output_details[0]["index"])
-            # Assuming binary classification
-            confidence = float(output_data[0][1])
-
-            detected = confidence > 0.7  # Threshold for wake word
+            detected = confidence > self.threshold
 
             processing_time = (time.time() - start_time) * 1000
             self.logger.debug(
@@ -75,6 +80,41 @@ class EdgeWakeWordDetector:
             self.logger.error(f"Wake word detection failed: {e}")
             return False, 0.0
 
+    def _invoke_model(self, processed_audio: np.ndarray) -> float:
+        input_details = self.model.get_input_details()
+        output_details = self.model.get_output_details()
+
+        # The streaming scorer resizes this interpreter's batch dimension
+        shape = list(input_details[0]["shape"])
+        if shape[0] != 1:
+            self.model.resize_tensor_input(input_details[0]["index"], [1, *shape[1:]])
+            self.model.allocate_tensors()
+
+        self.model.set_tensor(input_details[0]["index"], processed_audio)
+        self.model.invoke()
+
+        output_data = self.model.get_tensor(output_details[0]["index"])
+        # Assuming binary classification
+        return float(output_data[0][1])
+
+    def create_streaming_detector(
+        self, config: Optional[StreamingWakeWordConfig] = None
+    ) -> StreamingWakeWordDetector:
+        """Streaming detector for always-on listening over many devices.
+
+        Shares this detector's model and inference thread (each path resizes
+        the interpreter's batch dimension before invoking it); feed it
+        hop-sized audio per device instead of calling ``detect_wake_word``
+        per chunk.
+        """
+        config = config or StreamingWakeWordConfig(threshold_on=self.threshold)
+        if self.model is None or (
+                isinstance(self.model, dict) and self.model.get("type") == "mock"):
+            scorer = EnergyWakeWordScorer()
+        else:
+            scorer = TFLiteWakeWordScorer(self.model)
+        return StreamingWakeWordDetector(scorer, config, self._inference_executor)
+
     def _preprocess_audio(self, audio_data: np.ndarray) -> np.ndarray:
         """Preprocess audio for wake word model."""
         # Ensure correct input size (typically 16000 samples for 1 second)
@@ -0,0 +1,467 @@
+"""
+Streaming wake word detection for always-on listening.
+
+Each device stream is fed hop-sized audio (100 ms by default) instead of
+re-sending the last second on every call:
+
+- log-mel feature frames are computed once, as their samples arrive, and
+  kept in a ring; every 1 s window is a view over the ring, so frames
+  shared by overlapping windows are never recomputed (models taking raw
+  audio get a waveform ring instead)
+- windows from all streams go through one ``InferenceBatcher``, which
+  scores them in batches on a dedicated thread, off the event loop
+- posteriors are smoothed with a moving average, and a debounce state
+  machine (consecutive hops above the threshold, hysteresis, refractory
+  period) turns them into discrete ``WakeWordEvent`` objects
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FEATURES = "features"
+WAVEFORM = "waveform"
+
+
+@dataclass
+class StreamingWakeWordConfig:
+    """Framing, smoothing and debounce settings for streaming detection."""
+
+    sample_rate: int = 16000
+    window_seconds: float = 1.0
+    hop_ms: int = 100
+    frame_length_ms: int = 25
+    frame_step_ms: int = 10
+    n_fft: int = 512
+    n_mels: int = 40
+    # Moving average over this many hop posteriors
+    smoothing_hops: int = 3
+    threshold_on: float = 0.7
+    threshold_off: float = 0.4
+    # Consecutive smoothed hops above threshold_on before firing
+    min_active_hops: int = 2
+    refractory_seconds: float = 1.0
+    max_batch: int = 64
+    max_batch_delay_ms: float = 5.0
+
+    @property
+    def window_samples(self) -> int:
+        return int(self.sample_rate * self.window_seconds)
+
+    @property
+    def hop_samples(self) -> int:
+        return self.sample_rate * self.hop_ms // 1000
+
+    @property
+    def frame_length(self) -> int:
+        return self.sample_rate * self.frame_length_ms // 1000
+
+    @property
+    def frame_step(self) -> int:
+        return self.sample_rate * self.frame_step_ms // 1000
+
+    @property
+    def frames_per_window(self) -> int:
+        return 1 + (self.window_samples - self.frame_length) // self.frame_step
+
+    @property
+    def refractory_hops(self) -> int:
+        return int(round(self.refractory_seconds * 1000 / self.hop_ms))
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Triangular HTK-mel filters, shape (n_mels, n_fft // 2 + 1)."""
+
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(to_mel(0.0), to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+class LogMelFrontend:
+    """Incremental log-mel frames: every frame is computed exactly once."""
+
+    def __init__(self, config: StreamingWakeWordConfig, filterbank: Optional[np.ndarray] = None):
+        self.config = config
+        self.filterbank = (filterbank if filterbank is not None else mel_filterbank(
+            config.sample_rate, config.n_fft, config.n_mels))
+        self.window = np.hanning(config.frame_length).astype(np.float32)
+        # Samples of frames that are not complete yet
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def frames_for(self, audio: np.ndarray) -> np.ndarray:
+        """Log-mel frames for all frames completed by ``audio``"""
+        config = self.config
+        buffer = np.concatenate([self._tail, audio]) if self._tail.size else audio
+        if buffer.size < config.frame_length:
+            self._tail = buffer
+            return np.zeros((0, config.n_mels), dtype=np.float32)
+
+        count = 1 + (buffer.size - config.frame_length) // config.frame_step
+        frames = np.lib.stride_tricks.sliding_window_view(
+            buffer, config.frame_length)[::config.frame_step][:count]
+        self._tail = buffer[count * config.frame_step:].copy()
+
+        power = np.abs(np.fft.rfft(frames * self.window, n=config.n_fft)) ** 2
+        return np.log(power.astype(np.float32) @ self.filterbank.T + 1e-6)
+
+
+class RingWindow:
+    """Fixed-length ring whose window is always one contiguous slice.
+
+    Rows are written twice (at ``i`` and ``i + length``), so the current
+    window is ``buffer[head:head + length]``, with no copy or roll.
+    """
+
+    def __init__(self, length: int, row_shape: Tuple[int, ...] = (), fill: float = 0.0):
+        self.length = length
+        self._buffer = np.full((2 * length,) + row_shape, fill, dtype=np.float32)
+        self._head = 0
+
+    def extend(self, rows: np.ndarray) -> None:
+        if len(rows) >= self.length:
+            rows = rows[-self.length:]
+        first = min(len(rows), self.length - self._head)
+        for start, chunk in ((self._head, rows[:first]), (0, rows[first:])):
+            if len(chunk):
+                self._buffer[start:start + len(chunk)] = chunk
+                self._buffer[start + self.length:start + self.length + len(chunk)] = chunk
+        self._head = (self._head + len(rows)) % self.length
+
+    def window(self) -> np.ndarray:
+        """Oldest to newest; a view, copy it before the next ``extend``"""
+        return self._buffer[self._head:self._head + self.length]
+
+
+class EnergyWakeWordScorer:
+    """Scores raw windows by mean amplitude (stand-in for the mock model)."""
+
+    input_kind = WAVEFORM
+
+    def score_batch(self, windows: np.ndarray) -> np.ndarray:
+        return np.minimum(np.mean(np.abs(windows), axis=1) * 10, 1.0)
+
+
+class TFLiteWakeWordScorer:
+    """Batched inference on a TFLite wake word interpreter.
+
+    A 2-D model input (batch, samples) takes peak-normalized raw windows,
+    anything else takes log-mel windows. The batch dimension is resized to
+    the batch at hand; models that refuse are invoked once per window. The
+    interpreter may be shared with callers that resize it back to batch 1,
+    so its current batch size is read from the interpreter on every call.
+    """
+
+    def __init__(self, interpreter: Any):
+        self.interpreter = interpreter
+        self._input = interpreter.get_input_details()[0]
+        self._output = interpreter.get_output_details()[0]
+        self.input_shape = tuple(int(d) for d in self._input["shape"][1:])
+        self.input_kind = WAVEFORM if len(self.input_shape) == 1 else FEATURES
+        self._batchable = True
+
+    def _resize(self, batch_size: int) -> bool:
+        current = int(self.interpreter.get_input_details()[0]["shape"][0])
+        if batch_size == current:
+            return True
+        if not self._batchable:
+            return False
+        try:
+            self.interpreter.resize_tensor_input(
+                self._input["index"], [batch_size, *self.input_shape])
+            self.interpreter.allocate_tensors()
+        except Exception as e:
+            logger.warning(f"Wake word model does not batch, invoking per window: {e}")
+            self._batchable = False
+            return False
+        return True
+
+    def _invoke(self, inputs: np.ndarray) -> np.ndarray:
+        self.interpreter.set_tensor(self._input["index"], inputs)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output["index"])
+        # Binary classification: column 1 is the wake word posterior
+        return output[:, 1] if output.shape[-1] > 1 else output[:, 0]
+
+    def score_batch(self, windows: np.ndarray) -> np.ndarray:
+        if self.input_kind == WAVEFORM:
+            peaks = np.max(np.abs(windows), axis=1, keepdims=True)
+            windows = windows / np.where(peaks > 0, peaks, 1.0)
+        inputs = windows.reshape((len(windows),) + self.input_shape).astype(
+            self._input["dtype"])
+        if self._resize(len(inputs)):
+            return self._invoke(inputs)
+        self._resize(1)
+        return np.concatenate([self._invoke(row[None]) for row in inputs])
+
+
+class InferenceBatcher:
+    """Collects windows from many streams and scores them in batches.
+
+    When idle, windows submitted in the same event loop iteration are
+    flushed together at the end of it; while a batch is being scored, new
+    windows wait up to ``max_delay`` (or until ``max_batch``) and form the
+    next, larger batch. Scoring runs on a single thread (interpreters are
+    not thread-safe).
+    """
+
+    def __init__(
+        self,
+        scorer: Any,
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="wake-word")
+        self._owns_executor = executor is None
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._running: set = set()
+        self.stats = {"batches": 0, "windows": 0, "inference_seconds": 0.0, "max_batch": 0}
+
+    async def score(self, window: np.ndarray) -> float:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((window, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self._running:
+                self._flush_handle = loop.call_later(self.max_delay, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch, self._pending = (
+                self._pending[:self.max_batch], self._pending[self.max_batch:])
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._running.add(task)
+
+    def _score(self, windows: np.ndarray) -> np.ndarray:
+        started = time.perf_counter()
+        scores = np.asarray(self.scorer.score_batch(windows), dtype=np.float32)
+        self.stats["inference_seconds"] += time.perf_counter() - started
+        return scores
+
+    async def _run(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        windows = np.stack([window for window, _ in batch])
+        try:
+            scores = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._score, windows)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._running.discard(asyncio.current_task())
+            if self._pending and not self._running:
+                self._flush()
+        self.stats["batches"] += 1
+        self.stats["windows"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        for (_, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(float(score))
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+class DetectorState(Enum):
+    """Debounce states of one stream."""
+
+    LISTENING = "listening"
+    REFRACTORY = "refractory"
+
+
+@dataclass
+class WakeWordEvent:
+    """One detected wake word on a device stream."""
+
+    device_id: str
+    confidence: float
+    stream_time_seconds: float
+    detected_at: float
+
+
+class _StreamState:
+    """Framing, smoothing and debounce state of one device stream."""
+
+    def __init__(self, config: StreamingWakeWordConfig, input_kind: str, filterbank: np.ndarray):
+        self.frontend: Optional[LogMelFrontend] = None
+        if input_kind == FEATURES:
+            self.frontend = LogMelFrontend(config, filterbank)
+            # Silence in log-mel terms, like zero padding the first second
+            self.ring = RingWindow(
+                config.frames_per_window, (config.n_mels,), fill=float(np.log(1e-6)))
+        else:
+            self.ring = RingWindow(config.window_samples)
+        self.hop_fill = 0
+        self.samples_seen = 0
+        self.posteriors: Deque[float] = deque(maxlen=config.smoothing_hops)
+        self.posterior_sum = 0.0
+        self.state = DetectorState.LISTENING
+        self.active_hops = 0
+        self.refractory_left = 0
+
+    def push(self, audio: np.ndarray) -> None:
+        if self.frontend is not None:
+            frames = self.frontend.frames_for(audio)
+            if len(frames):
+                self.ring.extend(frames)
+        else:
+            self.ring.extend(audio)
+        self.samples_seen += len(audio)
+
+    def smooth(self, posterior: float) -> float:
+        if len(self.posteriors) == self.posteriors.maxlen:
+            self.posterior_sum -= self.posteriors[0]
+        self.posteriors.append(posterior)
+        self.posterior_sum += posterior
+        return self.posterior_sum / len(self.posteriors)
+
+
+class StreamingWakeWordDetector:
+    """Always-on wake word detection over many concurrent device streams."""
+
+    def __init__(
+        self,
+        scorer: Any,
+        config: Optional[StreamingWakeWordConfig] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.config = config or StreamingWakeWordConfig()
+        self.scorer = scorer
+        self.input_kind = getattr(scorer, "input_kind", WAVEFORM)
+        self.batcher = InferenceBatcher(
+            scorer,
+            max_batch=self.config.max_batch,
+            max_delay=self.config.max_batch_delay_ms / 1000,
+            executor=executor,
+        )
+        self._filterbank = mel_filterbank(
+            self.config.sample_rate, self.config.n_fft, self.config.n_mels)
+        self.streams: Dict[str, _StreamState] = {}
+        self.stats = {"hops": 0, "detections": 0}
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def _stream(self, device_id: str) -> _StreamState:
+        stream = self.streams.get(device_id)
+        if stream is None:
+            stream = self.streams[device_id] = _StreamState(
+                self.config, self.input_kind, self._filterbank)
+        return stream
+
+    def close_stream(self, device_id: str) -> None:
+        self.streams.pop(device_id, None)
+
+    async def feed(self, device_id: str, audio: np.ndarray) -> List[WakeWordEvent]:
+        """Push any amount of audio; returns the wake words it completed"""
+        audio = np.asarray(audio)
+        if np.issubdtype(audio.dtype, np.integer):
+            audio = audio.astype(np.float32) / 32768.0
+        else:
+            audio = audio.astype(np.float32, copy=False)
+
+        stream = self._stream(device_id)
+        hop = self.config.hop_samples
+        windows = []
+        offset = 0
+        while offset < len(audio):
+            take = min(hop - stream.hop_fill, len(audio) - offset)
+            stream.push(audio[offset:offset + take])
+            stream.hop_fill += take
+            offset += take
+            if stream.hop_fill == hop:
+                stream.hop_fill = 0
+                windows.append((stream.samples_seen, stream.ring.window().copy()))
+
+        events = []
+        if windows:
+            posteriors = await asyncio.gather(
+                *[self.batcher.score(window) for _, window in windows])
+            for (samples_seen, _), posterior in zip(windows, posteriors):
+                event = self._advance(device_id, stream, posterior, samples_seen)
+                if event is not None:
+                    events.append(event)
+            self.stats["hops"] += len(windows)
+        return events
+
+    def _advance(
+        self, device_id: str, stream: _StreamState, posterior: float, samples_seen: int
+    ) -> Optional[WakeWordEvent]:
+        """Smoothing + debounce for one hop"""
+        config = self.config
+        smoothed = stream.smooth(posterior)
+
+        if stream.state == DetectorState.REFRACTORY:
+            stream.refractory_left -= 1
+            if stream.refractory_left <= 0 and smoothed < config.threshold_off:
+                stream.state = DetectorState.LISTENING
+            return None
+
+        if smoothed < config.threshold_on:
+            stream.active_hops = 0
+            return None
+        stream.active_hops += 1
+        if stream.active_hops < config.min_active_hops:
+            return None
+
+        stream.state = DetectorState.REFRACTORY
+        stream.refractory_left = config.refractory_hops
+        stream.active_hops = 0
+        self.stats["detections"] += 1
+        event = WakeWordEvent(
+            device_id=device_id,
+            confidence=smoothed,
+            stream_time_seconds=samples_seen / config.sample_rate,
+            detected_at=time.time(),
+        )
+        self.logger.debug(
+            f"Wake word on {device_id} at {event.stream_time_seconds:.2f}s "
+            f"(confidence: {smoothed:.3f})")
+        return event
+
+    def get_stats(self) -> Dict[str, Any]:
+        audio_seconds = self.stats["hops"] * self.config.hop_ms / 1000
+        batches = self.batcher.stats["batches"]
+        return {
+            "streams": len(self.streams),
+            "hops": self.stats["hops"],
+            "detections": self.stats["detections"],
+            "audio_seconds": audio_seconds,
+            "batches": batches,
+            "average_batch_size": self.batcher.stats["windows"] / batches if batches else 0.0,
+            "max_batch_size": self.batcher.stats["max_batch"],
+            "inference_seconds": self.batcher.stats["inference_seconds"],
+        }
+
+    def close(self) -> None:
+        self.batcher.close()
@@ -0,0 +1,236 @@
+"""Time-indexed emotion history storage.
+
+Each child's history is a bounded ring buffer of parallel NumPy arrays
+(wall-clock epoch seconds, emotion code, confidence) next to the original
+``EmotionResult`` objects. The arrays start small and double up to the
+capacity, so children with little history cost little memory. Entries
+arrive in time order, so the two contiguous segments of the ring are each
+sorted and a window is found with two binary searches instead of parsing
+and sorting every entry.
+
+Cold children can be spilled to SQLite so memory stays bounded.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ....domain.emotion.models import EmotionResult, EmotionType
+
+_EPOCH = datetime(1970, 1, 1)
+_INITIAL_ALLOCATION = 8
+
+
+def wall_clock_seconds(value: datetime) -> float:
+    """Seconds since 1970-01-01 of the wall-clock time (offset ignored).
+
+    Grouping by hour/day then matches ``strftime`` on the original value.
+    """
+    return (value.replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
+class EmotionCodes:
+    """Dense integer codes for emotion names (known emotions first)."""
+
+    def __init__(self):
+        self.names: List[str] = [emotion.value for emotion in EmotionType]
+        self._codes: Dict[str, int] = {
+            name: code for code, name in enumerate(self.names)}
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def codes_for(self, names: List[str]) -> List[int]:
+        return [self._codes[name] for name in names if name in self._codes]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class EmotionRingBuffer:
+    """Bounded, time-ordered ring of one child's emotion results.
+
+    Storage grows by doubling until ``capacity``; it only wraps around once
+    it is full, so ``start`` stays 0 while it is still growing.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        allocated = min(capacity, _INITIAL_ALLOCATION)
+        self.timestamps = np.zeros(allocated, dtype=np.float64)
+        self.codes = np.zeros(allocated, dtype=np.int32)
+        self.confidences = np.zeros(allocated, dtype=np.float32)
+        self.results: List[Optional[EmotionResult]] = [None] * allocated
+        self.start = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def allocated(self) -> int:
+        return len(self.results)
+
+    @property
+    def last_timestamp(self) -> float:
+        return float(self.timestamps[(self.start + self.size - 1) % self.allocated])
+
+    def _reserve(self, size: int) -> None:
+        """Grow storage (up to capacity) to hold ``size`` entries."""
+        if size <= self.allocated:
+            return
+        allocated = self.allocated
+        while allocated < size:
+            allocated *= 2
+        allocated = min(allocated, self.capacity)
+        # Not wrapped yet while growing: entries are [0, size)
+        for name in ("timestamps", "codes", "confidences"):
+            old = getattr(self, name)
+            new = np.zeros(allocated, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.results.extend([None] * (allocated - len(self.results)))
+
+    def append(
+        self, timestamp: float, code: int, confidence: float, result: EmotionResult
+    ) -> None:
+        if self.size and timestamp < self.last_timestamp:
+            self._insert_out_of_order(timestamp, code, confidence, result)
+            return
+
+        if self.size < self.capacity:
+            self._reserve(self.size + 1)
+            position = (self.start + self.size) % self.allocated
+            self.size += 1
+        else:
+            # Full: overwrite the oldest entry
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        self.timestamps[position] = timestamp
+        self.codes[position] = code
+        self.confidences[position] = confidence
+        self.results[position] = result
+
+    def _insert_out_of_order(
+        self, timestamp: float, code: int, confidence: float, result: EmotionResult
+    ) -> None:
+        """Rare late arrival: linearize and insert at its sorted position."""
+        order = self.physical(0)
+        timestamps = self.timestamps[order]
+        at = int(np.searchsorted(timestamps, timestamp, side="right"))
+        if self.size == self.capacity and at == 0:
+            return  # Older than everything kept
+
+        timestamps = np.insert(timestamps, at, timestamp)
+        codes = np.insert(self.codes[order], at, code)
+        confidences = np.insert(self.confidences[order], at, confidence)
+        results = [self.results[i] for i in order]
+        results.insert(at, result)
+
+        keep = min(len(results), self.capacity)
+        self._reserve(keep)
+        self.size = keep
+        self.start = 0
+        self.timestamps[:keep] = timestamps[-keep:]
+        self.codes[:keep] = codes[-keep:]
+        self.confidences[:keep] = confidences[-keep:]
+        self.results[:keep] = results[-keep:]
+
+    def first_after(self, timestamp: float) -> int:
+        """Logical index of the first entry strictly newer than ``timestamp``."""
+        head = min(self.size, self.allocated - self.start)
+        first = self.timestamps[self.start:self.start + head]
+        index = int(np.searchsorted(first, timestamp, side="right"))
+        if index < head:
+            return index
+        second = self.timestamps[:self.size - head]
+        return head + int(np.searchsorted(second, timestamp, side="right"))
+
+    def physical(self, logical_start: int, logical_end: Optional[int] = None) -> np.ndarray:
+        """Physical positions of a logical (oldest-first) range."""
+        end = self.size if logical_end is None else logical_end
+        return (self.start + np.arange(logical_start, end)) % self.allocated
+
+    def window(self, since: float, limit: Optional[int] = None) -> np.ndarray:
+        """Physical positions newer than ``since``, oldest first.
+
+        With ``limit`` only the newest ``limit`` entries are returned.
+        """
+        low = self.first_after(since)
+        if limit is not None:
+            low = max(low, self.size - limit)
+        return self.physical(low)
+
+    def iter_results(self) -> List[EmotionResult]:
+        return [self.results[i] for i in self.physical(0)]
+
+
+class EmotionHistorySpillStore:
+    """SQLite store for histories of children that are not in memory."""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS emotion_history ("
+            "child_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "entries INTEGER NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def put(self, child_id: str, results: List[EmotionResult]) -> None:
+        payload = zlib.compress(json.dumps(
+            [asdict(result) for result in results], ensure_ascii=False
+        ).encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO emotion_history "
+                "(child_id, data, entries, updated_at) VALUES (?, ?, ?, ?)",
+                (child_id, payload, len(results), datetime.now().timestamp()),
+            )
+            self._db.commit()
+
+    def get(self, child_id: str) -> Optional[List[EmotionResult]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM emotion_history WHERE child_id = ?", (child_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return [
+            EmotionResult(**data)
+            for data in json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        ]
+
+    def contains(self, child_id: str) -> bool:
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM emotion_history WHERE child_id = ?", (child_id,)
+            ).fetchone() is not None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM emotion_history").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"spilled_children": self.count(), "db_path": str(self.db_path)}
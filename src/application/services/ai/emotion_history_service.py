@@ -1,30 +1,145 @@
 """History service for emotion tracking and trends."""
 
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import structlog
 
 from ....domain.emotion.models import ChildEmotionProfile, EmotionResult, EmotionTrend
+from .emotion_history_buffer import (
+    EmotionCodes,
+    EmotionHistorySpillStore,
+    EmotionRingBuffer,
+    wall_clock_seconds,
+)
 
 logger = structlog.get_logger(__name__)
 
 
+TREND_EMOTIONS = ["happy", "sad", "angry", "scared", "calm", "curious"]
+POSITIVE_EMOTIONS = ["happy", "calm"]
+NEGATIVE_EMOTIONS = ["sad", "angry", "scared"]
+
+_SECONDS_PER_HOUR = 3600
+_SECONDS_PER_DAY = 86400
+
+
 class EmotionHistoryService:
-    """Service for managing emotion history and trends."""
+    """Service for managing emotion history and trends.
 
-    def __init__(self, max_history_size: int = 1000):
+    History is kept per child in a time-ordered ring buffer; at most
+    ``max_hot_children`` buffers stay in memory. The least recently used
+    ones are spilled to ``spill_path`` (SQLite) when it is configured and
+    dropped otherwise. Spill reads and writes run in the default executor.
+    """
+
+    def __init__(
+        self,
+        max_history_size: int = 1000,
+        max_hot_children: int = 10000,
+        spill_path: Optional[str] = None,
+    ):
         self.max_history_size = max_history_size
-        self.emotion_cache = defaultdict(
-            lambda: deque(maxlen=max_history_size))
+        self.max_hot_children = max_hot_children
+        self.emotion_codes = EmotionCodes()
+        self.emotion_cache: "OrderedDict[str, EmotionRingBuffer]" = OrderedDict()
+        self.spill_store = (
+            EmotionHistorySpillStore(spill_path) if spill_path else None)
+        # Evicted histories whose spill write has not finished yet
+        self._spilling: Dict[str, List[EmotionResult]] = {}
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _new_buffer(self) -> EmotionRingBuffer:
+        return EmotionRingBuffer(self.max_history_size)
+
+    def _append(self, buffer: EmotionRingBuffer, emotion_result: EmotionResult) -> None:
+        timestamp = wall_clock_seconds(
+            datetime.fromisoformat(emotion_result.timestamp))
+        buffer.append(
+            timestamp,
+            self.emotion_codes.code(emotion_result.primary_emotion),
+            emotion_result.confidence,
+            emotion_result,
+        )
+
+    @staticmethod
+    async def _run_io(function, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(function, *args))
+
+    def _hot_buffer(self, child_id: str) -> Optional[EmotionRingBuffer]:
+        buffer = self.emotion_cache.get(child_id)
+        if buffer is not None:
+            self.emotion_cache.move_to_end(child_id)
+        return buffer
+
+    async def _get_buffer(
+        self, child_id: str, create: bool = False
+    ) -> Optional[EmotionRingBuffer]:
+        buffer = self._hot_buffer(child_id)
+        if buffer is not None:
+            return buffer
+
+        spilled = self._spilling.get(child_id)
+        if spilled is None and self.spill_store is not None:
+            spilled = await self._run_io(self.spill_store.get, child_id)
+            buffer = self._hot_buffer(child_id)  # Loaded meanwhile
+            if buffer is not None:
+                return buffer
+        if spilled is None and not create:
+            return None
+
+        buffer = self._new_buffer()
+        for emotion_result in spilled or []:
+            self._append(buffer, emotion_result)
+        self.emotion_cache[child_id] = buffer
+        await self._evict_cold_children()
+        return buffer
+
+    async def _evict_cold_children(self) -> None:
+        while len(self.emotion_cache) > self.max_hot_children:
+            child_id, buffer = self.emotion_cache.popitem(last=False)
+            if self.spill_store is None:
+                logger.debug(f"Dropped emotion history of cold child {child_id}")
+                continue
+            results = buffer.iter_results()
+            self._spilling[child_id] = results
+            try:
+                await self._run_io(self.spill_store.put, child_id, results)
+            finally:
+                if self._spilling.get(child_id) is results:
+                    del self._spilling[child_id]
+
+    def flush(self) -> None:
+        """Persist all in-memory histories to the spill store."""
+        if self.spill_store is None:
+            return
+        for child_id, buffer in self.emotion_cache.items():
+            self.spill_store.put(child_id, buffer.iter_results())
+
+    async def _window(
+        self, child_id: str, hours: int, limit: Optional[int] = None
+    ) -> Tuple[Optional[EmotionRingBuffer], np.ndarray]:
+        """Buffer and physical positions of entries in the last ``hours``."""
+        buffer = await self._get_buffer(child_id)
+        if buffer is None:
+            return None, np.empty(0, dtype=np.int64)
+        cutoff = wall_clock_seconds(datetime.now() - timedelta(hours=hours))
+        return buffer, buffer.window(cutoff, limit)
 
     async def add_emotion_to_history(
         self, child_id: str, emotion_result: EmotionResult
     ) -> None:
         """Add emotion result to child's history."""
         try:
-            self.emotion_cache[child_id].append(emotion_result)
+            self._append(await self._get_buffer(child_id, create=True), emotion_result)
             logger.debug(f"Added emotion to history for child {child_id}")
         except Exception as e:
             logger.error(f" Failed to add emotion to history: {e}")
@@ -32,25 +147,12 @@ class EmotionHistoryService:
     async def get_emotion_history(
         self, child_id: str, hours: int = 24, limit: int = 100
     ) -> List[EmotionResult]:
-        """Get emotion history for a child."""
+        """Get emotion history for a child (most recent first)."""
         try:
-            if child_id not in self.emotion_cache:
+            buffer, positions = await self._window(child_id, hours, limit)
+            if buffer is None:
                 return []
-
-            cutoff_time = datetime.now() - timedelta(hours=hours)
-            emotions = list(self.emotion_cache[child_id])
-
-            # Filter by time
-            recent_emotions = [
-                e for e in emotions if datetime.fromisoformat(
-                    e.timestamp) > cutoff_time]
-
-            # Sort by timestamp (most recent first)
-            recent_emotions.sort(
-                key=lambda x: datetime.fromisoformat(x.timestamp), reverse=True
-            )
-
-            return recent_emotions[:limit]
+            return [buffer.results[i] for i in positions[::-1]]
 
         except Exception as e:
             logger.error(f" Failed to get emotion history: {e}")
@@ -61,29 +163,34 @@ class EmotionHistoryService:
     ) -> List[EmotionTrend]:
         """Get emotion trends over time."""
         try:
-            emotions = await self.get_emotion_history(
-                child_id, hours=days * 24, limit=1000
-            )
+            buffer, positions = await self._window(child_id, days * 24, limit=1000)
+            if buffer is None or not len(positions):
+                return []
 
-            if not emotions:
+            # Ratio of each emotion per time period, all emotions at once
+            buckets = self._bucket_keys(buffer.timestamps[positions], granularity)
+            periods, period_index = np.unique(buckets, return_inverse=True)
+            if len(periods) < 2:
                 return []
 
-            # Group emotions by time period
-            time_groups = self._group_emotions_by_time(emotions, granularity)
-
-            # Calculate trends for each emotion type
-            emotion_types = [
-                "happy",
-                "sad",
-                "angry",
-                "scared",
-                "calm",
-                "curious"]
-            trends = []
+            n_codes = len(self.emotion_codes)
+            counts = np.bincount(
+                period_index * n_codes + buffer.codes[positions],
+                minlength=len(periods) * n_codes,
+            ).reshape(len(periods), n_codes)
+            ratios = counts / counts.sum(axis=1, keepdims=True)
+
+            dates = [
+                date.fromordinal(int(hour_or_day) + 719163)
+                for hour_or_day in self._bucket_days(periods, granularity)
+            ]
 
-            for emotion_type in emotion_types:
+            trends = []
+            for emotion_type in TREND_EMOTIONS:
                 trend = self._calculate_emotion_trend(
-                    emotion_type, time_groups, granularity
+                    emotion_type,
+                    dates,
+                    ratios[:, self.emotion_codes.code(emotion_type)].tolist(),
                 )
                 if trend:
                     trends.append(trend)
@@ -149,38 +256,30 @@ class EmotionHistoryService:
     ) -> float:
         """Calculate emotional stability score for child."""
         try:
-            emotions = await self.get_emotion_history(
-                child_id, hours=days * 24, limit=1000
-            )
-
-            if not emotions:
+            buffer, positions = await self._window(child_id, days * 24, limit=1000)
+            if buffer is None or not len(positions):
                 return 0.5  # Neutral stability
 
             # Calculate emotion distribution
-            emotion_counts = defaultdict(int)
-            for emotion in emotions:
-                emotion_counts[emotion.primary_emotion] += 1
-
-            total = len(emotions)
+            counts = np.bincount(
+                buffer.codes[positions], minlength=len(self.emotion_codes))
+            total = len(positions)
 
             # Calculate stability metrics
-            positive_ratio = (
-                emotion_counts["happy"] + emotion_counts["calm"]) / total
-
-            negative_ratio = (
-                emotion_counts["sad"]
-                + emotion_counts["angry"]
-                + emotion_counts["scared"]
-            ) / total
+            positive_ratio = counts[
+                self.emotion_codes.codes_for(POSITIVE_EMOTIONS)].sum() / total
+            negative_ratio = counts[
+                self.emotion_codes.codes_for(NEGATIVE_EMOTIONS)].sum() / total
 
             # Stability score based on positive vs negative balance
             stability = positive_ratio - (negative_ratio * 0.5)
 
             # Factor in consistency (lower variance = higher stability)
-            variance_penalty = self._calculate_emotion_variance(emotions)
+            variance_penalty = self._calculate_emotion_variance(
+                buffer.confidences[positions])
             stability -= variance_penalty * 0.2
 
-            return max(0, min(1, stability))
+            return float(max(0, min(1, stability)))
 
         except Exception as e:
             logger.error(f" Failed to calculate stability: {e}")
@@ -238,29 +337,22 @@ class EmotionHistoryService:
             logger.error(f" Failed to identify patterns: {e}")
             return []
 
-    def _group_emotions_by_time(
-        self, emotions: List[EmotionResult], granularity: str
-    ) -> Dict[str, List[EmotionResult]]:
-        """Group emotions by time periods."""
-        groups = defaultdict(list)
-
-        for emotion in emotions:
-            timestamp = datetime.fromisoformat(emotion.timestamp)
-
-            if granularity == "hourly":
-                key = timestamp.strftime("%Y-%m-%d %H:00")
-            elif granularity == "daily":
-                key = timestamp.strftime("%Y-%m-%d")
-            elif granularity == "weekly":
-                # Get start of week
-                start_of_week = timestamp - timedelta(days=timestamp.weekday())
-                key = start_of_week.strftime("%Y-%m-%d")
-            else:
-                key = timestamp.strftime("%Y-%m-%d")
-
-            groups[key].append(emotion)
-
-        return groups
+    @staticmethod
+    def _bucket_keys(timestamps: np.ndarray, granularity: str) -> np.ndarray:
+        """Period key per entry: hour index for hourly, else day index."""
+        days = np.floor_divide(timestamps, _SECONDS_PER_DAY).astype(np.int64)
+        if granularity == "hourly":
+            return np.floor_divide(timestamps, _SECONDS_PER_HOUR).astype(np.int64)
+        if granularity == "weekly":
+            # Start of week (Monday); 1970-01-01 was a Thursday
+            return days - (days + 3) % 7
+        return days
+
+    @staticmethod
+    def _bucket_days(periods: np.ndarray, granularity: str) -> np.ndarray:
+        if granularity == "hourly":
+            return periods // 24
+        return periods
 
     def _get_trend_direction_and_significance(self, change: float) -> Dict[str, str]:
         """Determines trend direction and significance from a change value."""
@@ -280,27 +372,10 @@ class EmotionHistoryService:
     def _calculate_emotion_trend(
         self,
         emotion_type: str,
-        time_groups: Dict[str, List[EmotionResult]],
-        granularity: str,
+        dates: List[date],
+        values: List[float],
     ) -> Optional[EmotionTrend]:
-        """Calculate trend for specific emotion type."""
-        if len(time_groups) < 2:
-            return None
-
-        dates = []
-        values = []
-
-        for time_key in sorted(time_groups.keys()):
-            emotions_in_period = time_groups[time_key]
-            emotion_count = sum(
-                1 for e in emotions_in_period if e.primary_emotion == emotion_type
-            )
-            total_count = len(emotions_in_period)
-            ratio = emotion_count / total_count if total_count > 0 else 0
-            dates.append(datetime.strptime(
-                time_key.split()[0], "%Y-%m-%d").date())
-            values.append(ratio)
-
+        """Calculate trend for specific emotion type from per-period ratios."""
         if len(values) < 2:
             return None
 
@@ -325,19 +400,12 @@ class EmotionHistoryService:
             significance=trend_info["significance"],
         )
 
-    def _calculate_emotion_variance(
-            self, emotions: List[EmotionResult]) -> float:
+    @staticmethod
+    def _calculate_emotion_variance(confidences: np.ndarray) -> float:
         """Calculate variance in emotion confidence scores."""
-        if len(emotions) < 2:
+        if len(confidences) < 2:
             return 0
-
-        confidences = [e.confidence for e in emotions]
-        mean_confidence = sum(confidences) / len(confidences)
-        variance = sum((c - mean_confidence) ** 2 for c in confidences) / len(
-            confidences
-        )
-
-        return variance
+        return float(np.var(confidences.astype(np.float64)))
 
     def _identify_behavioral_patterns(
             self, emotions: List[EmotionResult]) -> List[str]:
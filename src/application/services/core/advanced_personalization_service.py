@@ -6,7 +6,7 @@
 
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from ..personalization import (
     ChildPersonality,
@@ -43,57 +43,73 @@ class AdvancedPersonalizationService:
         self.data_manager = PersonalizationDataManager(data_dir)
         self.insights_analyzer = PersonalizationInsightsAnalyzer()
 
-        # البيانات المحلية
+        # البيانات المحلية - تُحمّل لكل طفل عند أول طلب
         self.personalities: Dict[str, ChildPersonality] = {}
         self.interaction_patterns: Dict[str, InteractionPattern] = {}
         self.content_performance: Dict[str, List[AdaptiveContent]] = {}
-
-        # تحميل البيانات عند التهيئة
-        self._load_data()
+        self._loaded_children: Set[str] = set()
 
     def _load_data(self) -> None:
-        """تحميل جميع البيانات - يفوض إلى DataManager"""
+        """إفراغ الذاكرة المحلية - تُعاد قراءة بيانات كل طفل عند الطلب"""
+        self.personalities.clear()
+        self.interaction_patterns.clear()
+        self.content_performance.clear()
+        self._loaded_children.clear()
+
+    def _ensure_child_loaded(self, child_id: str) -> None:
+        """تحميل بيانات طفل واحد من DataManager عند أول استخدام"""
+        if child_id in self._loaded_children:
+            return
+        self._loaded_children.add(child_id)
+
         try:
-            data = self.data_manager.load_all_data()
+            data = self.data_manager.load_child(child_id)
 
-            # تحويل البيانات إلى الكائنات المناسبة
-            for child_id, personality_data in data["personalities"].items():
+            if "personality" in data:
                 self.personalities[child_id] = ChildPersonality(
-                    **personality_data)
-
-            for child_id, pattern_data in data["interaction_patterns"].items():
+                    **data["personality"])
+            if "interaction_patterns" in data:
                 self.interaction_patterns[child_id] = InteractionPattern(
-                    **pattern_data)
-
-            for child_id, contents in data["content_performance"].items():
+                    **data["interaction_patterns"])
+            if "content_performance" in data:
                 self.content_performance[child_id] = [
-                    AdaptiveContent(**content) for content in contents
+                    AdaptiveContent(**content)
+                    for content in data["content_performance"]
                 ]
 
-            logger.info("تم تحميل بيانات التخصيص بنجاح")
-
         except Exception as e:
             logger.error(f"خطأ في تحميل بيانات التخصيص: {e}")
 
-    def _save_data(self) -> None:
-        """حفظ البيانات - يفوض إلى DataManager"""
+    def _save_data(self, child_id: str) -> None:
+        """حفظ بيانات طفل واحد - يفوض إلى DataManager (دفعات مجمعة)"""
         try:
-            self.data_manager.save_all_data(
-                self.personalities,
-                self.interaction_patterns,
-                self.content_performance)
+            self.data_manager.mark_dirty(
+                child_id,
+                self.personalities.get(child_id),
+                self.interaction_patterns.get(child_id),
+                self.content_performance.get(child_id),
+            )
         except Exception as e:
             logger.error(f"خطأ في حفظ بيانات التخصيص: {e}")
 
+    def flush(self) -> int:
+        """كتابة التغييرات المعلقة فوراً"""
+        return self.data_manager.flush()
+
+    def close(self) -> None:
+        """كتابة التغييرات المعلقة وإغلاق قاعدة البيانات عند الإيقاف"""
+        self.data_manager.close()
+
     # === Personality Management Methods ===
 
     def get_child_personality(self, child_id: str) -> ChildPersonality:
         """الحصول على شخصية الطفل"""
+        self._ensure_child_loaded(child_id)
         if child_id not in self.personalities:
             self.personalities[child_id] = ChildPersonality(
                 child_id=child_id, last_updated=datetime.now().isoformat()
             )
-            self._save_data()
+            self._save_data(child_id)
         return self.personalities[child_id]
 
     def analyze_personality_from_interactions(
@@ -109,17 +125,18 @@ class AdvancedPersonalizationService:
         )
 
         self.personalities[child_id] = updated_personality
-        self._save_data()
+        self._save_data(child_id)
         return updated_personality
 
     # === Interaction Pattern Methods ===
 
     def get_interaction_patterns(self, child_id: str) -> InteractionPattern:
         """الحصول على أنماط تفاعل الطفل"""
+        self._ensure_child_loaded(child_id)
         if child_id not in self.interaction_patterns:
             self.interaction_patterns[child_id] = InteractionPattern(
                 child_id=child_id)
-            self._save_data()
+            self._save_data(child_id)
         return self.interaction_patterns[child_id]
 
     def update_interaction_patterns(
@@ -129,7 +146,7 @@ class AdvancedPersonalizationService:
         patterns = self.get_interaction_patterns(child_id)
         self.pattern_manager.update_interaction_patterns(
             patterns, interaction_data)
-        self._save_data()
+        self._save_data(child_id)
 
     # === Content Recommendation Methods ===
 
@@ -151,6 +168,7 @@ class AdvancedPersonalizationService:
         self, child_id: str, content: Dict, performance_data: Dict
     ) -> None:
         """تتبع أداء المحتوى"""
+        self._ensure_child_loaded(child_id)
         if child_id not in self.content_performance:
             self.content_performance[child_id] = []
 
@@ -177,7 +195,7 @@ class AdvancedPersonalizationService:
 
         # الاحتفاظ بآخر 100 عنصر
         self.content_performance[child_id] = self.content_performance[child_id][-100:]
-        self._save_data()
+        self._save_data(child_id)
 
     def _find_matching_content(
         self, child_id: str, new_content: AdaptiveContent
@@ -278,6 +296,7 @@ class AdvancedPersonalizationService:
                     "insights_analyzer": "operational",
                 },
                 "data_stats": self.get_data_statistics(),
+                "loaded_children": len(self._loaded_children),
                 "loaded_personalities": len(self.personalities),
                 "loaded_patterns": len(self.interaction_patterns),
                 "loaded_content_performance": len(self.content_performance),
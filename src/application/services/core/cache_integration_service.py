@@ -30,6 +30,16 @@ except ImportError:
     MULTI_LAYER_CACHE_AVAILABLE = False
     MultiLayerCache = None
 
+try:
+    from src.infrastructure.caching.semantic_response_cache import (
+        SemanticResponseCache,
+    )
+
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+    SemanticResponseCache = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,9 +58,15 @@ class CacheStrategy:
 class CacheIntegrationService:
     """Service for integrating caching with AI components."""
 
-    def __init__(self, cache_config: Optional[CacheConfig] = None):
+    def __init__(
+        self,
+        cache_config: Optional[CacheConfig] = None,
+        semantic_cache: Optional[SemanticResponseCache] = None,
+    ):
         self.cache_config = cache_config or CacheConfig()
         self.cache_system: Optional[MultiLayerCache] = None
+        # Opt-in: answers paraphrases of questions already answered
+        self.semantic_cache = semantic_cache
 
         # Cache strategies for different operations
         self.strategies = self._setup_cache_strategies()
@@ -129,11 +145,24 @@ class CacheIntegrationService:
         **kwargs,
     ) -> Optional[str]:
         """Cache AI response results."""
-        if not self.cache_system:
-            return await ai_response_fn(*args, **kwargs)
-
         strategy = self.strategies["ai_response"]
 
+        # Local semantic lookup first: no network and no LLM call on a hit
+        semantic_args = self._semantic_lookup_args(conversation_context)
+        if self.semantic_cache and semantic_args:
+            question, child_age, language, variant = semantic_args
+            semantic_result = self.semantic_cache.lookup(
+                question, child_age, language, strategy.content_type, variant
+            )
+            if semantic_result is not None:
+                self.performance_stats["cache_hits"] += 1
+                return semantic_result
+
+        if not self.cache_system:
+            result = await ai_response_fn(*args, **kwargs)
+            self._store_semantic(semantic_args, result, strategy.content_type)
+            return result
+
         # Generate context-based cache key
         context_hash = self._hash_conversation_context(conversation_context)
         cache_key = f"ai_response:{context_hash}"
@@ -153,6 +182,7 @@ class CacheIntegrationService:
         # Generate AI response
         self.performance_stats["cache_misses"] += 1
         result = await ai_response_fn(*args, **kwargs)
+        self._store_semantic(semantic_args, result, strategy.content_type)
 
         # Cache result
         if result and strategy.cache_on_miss:
@@ -445,6 +475,33 @@ class CacheIntegrationService:
         context_str = json.dumps(key_elements, sort_keys=True)
         return hashlib.sha256(context_str.encode()).hexdigest()
 
+    def _semantic_lookup_args(self, context: Dict[str, Any]) -> Optional[tuple]:
+        """(question, child_age, language, variant) for the semantic cache."""
+        if not self.semantic_cache or not self.semantic_cache.enabled:
+            return None
+
+        question = context.get("user_message")
+        if not question:
+            return None
+
+        # Emotion and conversation type shape the answer, so keep them apart
+        variant = f"{context.get('emotion', '')}:{context.get('conversation_type', '')}"
+        return (
+            question,
+            context.get("child_age"),
+            context.get("language"),
+            variant,
+        )
+
+    def _store_semantic(
+        self, semantic_args: Optional[tuple], result: Any, content_type: ContentType
+    ) -> None:
+        if self.semantic_cache and semantic_args and result:
+            question, child_age, language, variant = semantic_args
+            self.semantic_cache.store(
+                question, result, child_age, language, content_type, variant
+            )
+
     def _hash_audio_features(self, features: Dict[str, Any]) -> str:
         """Generate hash for audio features."""
         # Use key audio features for caching
@@ -506,6 +563,9 @@ class CacheIntegrationService:
                 "total_time_saved_ms": self.performance_stats["compute_time_saved_ms"],
             },
             "cache_system_metrics": cache_metrics,
+            "semantic_cache": (
+                self.semantic_cache.get_stats() if self.semantic_cache else None
+            ),
             "strategy_summary": {
                 strategy_name: {
                     "content_type": strategy.content_type.value,
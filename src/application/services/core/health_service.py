@@ -7,6 +7,7 @@ import asyncio
 import gc
 import os
 import sys
+import time
 import tracemalloc
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -38,6 +39,12 @@ memory_leak_counter = Counter(
 health_check_duration = Histogram(
     "health_check_duration_seconds", "Health check duration", ["service"]
 )
+memory_profiler_overhead = Histogram(
+    "memory_profiler_overhead_seconds",
+    "Time spent collecting memory data per profiling tier",
+    ["tier"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
 
 
 @dataclass
@@ -47,11 +54,15 @@ class MemorySnapshot:
     timestamp: datetime
     rss: int  # Resident Set Size
     vms: int  # Virtual Memory Size
-    heap_size: int
-    heap_used: int
-    objects_count: int
+    # tracemalloc-traced Python heap; None when tracemalloc is off
+    heap_size: Optional[int]
+    heap_used: Optional[int]
+    # Live objects, only counted by the heavy tier's heap walk
+    objects_count: Optional[int]
     gc_stats: Dict[str, int]
     top_types: List[Tuple[str, int, int]]  # (type, count, size)
+    allocated_blocks: int = 0
+    tier: str = "cheap"  # cheap | sampled | heavy
 
 
 @dataclass
@@ -97,6 +108,23 @@ class HealthService(ServiceBase):
         self._monitor_task: Optional[asyncio.Task] = None
         self._tracemalloc_started = False
 
+        # Tiered memory profiling: cheap stats every tick, tracemalloc
+        # sampling every N ticks, full heap walk only on suspected leaks and
+        # at most once per memory_heavy_min_interval_seconds
+        self.memory_sample_every = max(
+            1, config.get("memory_sample_every_ticks", 10))
+        self.memory_heavy_min_interval = config.get(
+            "memory_heavy_min_interval_seconds", 600)
+        self._last_heavy_at: Optional[float] = None
+        # (time, live objects) from the last heavy-tier heap walk
+        self._last_object_count: Optional[Tuple[datetime, int]] = None
+        self.tracemalloc_frames = config.get("tracemalloc_frames", 1)
+        self.tracemalloc_top_n = config.get("tracemalloc_top_n", 10)
+        self._tick_count = 0
+        self._previous_trace: Optional[tracemalloc.Snapshot] = None
+        self._last_sampled: Optional[MemorySnapshot] = None
+        self.tier_overhead: Dict[str, float] = {}
+
         # WebSocket connection tracking
         self._websocket_connections: Set[str] = set()
         self._connection_memory: Dict[str, int] = {}
@@ -105,9 +133,10 @@ class HealthService(ServiceBase):
         """Initialize health monitoring"""
         self.logger.info("Initializing health service")
 
-        # Start memory tracking
-        if not self._tracemalloc_started:
-            tracemalloc.start(10)  # Keep top 10 frames
+        # Start memory tracking with a capped frame depth to keep the
+        # tracing overhead low between samples
+        if not self._tracemalloc_started and not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
             self._tracemalloc_started = True
 
         # Start monitoring task
@@ -183,8 +212,11 @@ class HealthService(ServiceBase):
             try:
                 await asyncio.sleep(self.check_interval)
 
-                # Take memory snapshot
-                snapshot = await self._take_memory_snapshot()
+                # Take memory snapshot (cheap or sampled tier)
+                self._tick_count += 1
+                snapshot = await self._take_memory_snapshot(
+                    sampled=self._tick_count % self.memory_sample_every == 0
+                )
                 self._add_snapshot(snapshot)
 
                 # Update metrics
@@ -193,7 +225,8 @@ class HealthService(ServiceBase):
                 # Check for memory leaks
                 if self._detect_memory_leak():
                     memory_leak_counter.inc()
-                    await self._handle_memory_leak()
+                    if self._heavy_tier_due():
+                        await self._handle_memory_leak()
 
                 # Perform health checks
                 health_status = await self.check_all()
@@ -300,37 +333,83 @@ class HealthService(ServiceBase):
 
         return results
 
-    async def _take_memory_snapshot(self) -> MemorySnapshot:
-        """Take a snapshot of current memory usage"""
+    async def _take_memory_snapshot(
+            self, sampled: bool = False) -> MemorySnapshot:
+        """Take a snapshot of current memory usage.
+
+        The cheap tier only reads counters (RSS, GC generation counts,
+        allocator stats) and never walks the heap. The sampled tier adds
+        a tracemalloc snapshot diffed against the previous sample; neither
+        counts live objects, which only the heavy tier does.
+        """
+        started = time.perf_counter()
+
         # Process memory
-        process = psutil.Process(os.getpid())
-        memory_info = process.memory_info()
+        memory_info = psutil.Process(os.getpid()).memory_info()
 
-        # Python heap
+        # GC generation counts and collection totals - O(1)
         gc_stats = {
-            f"generation_{i}": len(gc.get_objects(i))
-            for i in range(gc.get_count().__len__())
+            f"generation_{i}": count for i, count in enumerate(gc.get_count())
         }
-
-        # Top memory consumers
-        snapshot = tracemalloc.take_snapshot()
-        top_stats = snapshot.statistics("lineno")[:10]
-
-        top_types = []
-        for stat in top_stats:
-            top_types.append(
-                (stat.traceback.format()[0], stat.count, stat.size))
-
-        return MemorySnapshot(
+        for i, stats in enumerate(gc.get_stats()):
+            gc_stats[f"collections_{i}"] = stats.get("collections", 0)
+
+        # Python heap as traced by tracemalloc; never substituted with RSS,
+        # which the heap threshold in _check_memory_health is not sized for
+        traced_current = None
+        if tracemalloc.is_tracing():
+            traced_current, _ = tracemalloc.get_traced_memory()
+
+        # Object counts and top consumers are left empty here rather than
+        # copied from the last sample; see _check_memory_health
+        snapshot = MemorySnapshot(
             timestamp=datetime.utcnow(),
             rss=memory_info.rss,
             vms=memory_info.vms,
-            heap_size=sys.getsizeof(gc.get_objects()),
-            heap_used=sum(sys.getsizeof(obj) for obj in gc.get_objects()),
-            objects_count=len(gc.get_objects()),
+            heap_size=traced_current,
+            heap_used=traced_current,
+            objects_count=None,
             gc_stats=gc_stats,
-            top_types=top_types,
+            top_types=[],
+            allocated_blocks=sys.getallocatedblocks(),
         )
+        self._record_tier_overhead("cheap", time.perf_counter() - started)
+
+        if sampled:
+            self._apply_sampled_tier(snapshot)
+
+        return snapshot
+
+    def _apply_sampled_tier(self, snapshot: MemorySnapshot) -> None:
+        """Low-frequency tier: diff tracemalloc against the previous sample"""
+        if not tracemalloc.is_tracing():
+            return
+
+        started = time.perf_counter()
+        trace = tracemalloc.take_snapshot()
+
+        if self._previous_trace is not None:
+            stats = trace.compare_to(self._previous_trace, "lineno")
+            top_types = [
+                (stat.traceback.format()[0], stat.count_diff, stat.size_diff)
+                for stat in stats[: self.tracemalloc_top_n]
+            ]
+        else:
+            top_types = [
+                (stat.traceback.format()[0], stat.count, stat.size)
+                for stat in trace.statistics("lineno")[: self.tracemalloc_top_n]
+            ]
+
+        self._previous_trace = trace
+        snapshot.top_types = top_types
+        snapshot.tier = "sampled"
+        self._last_sampled = snapshot
+        self._record_tier_overhead("sampled", time.perf_counter() - started)
+
+    def _record_tier_overhead(self, tier: str, duration: float) -> None:
+        """Track and export per-tier profiling overhead"""
+        self.tier_overhead[tier] = duration
+        memory_profiler_overhead.labels(tier=tier).observe(duration)
 
     def _add_snapshot(self, snapshot: MemorySnapshot) -> None:
         """Add snapshot to history"""
@@ -371,24 +450,57 @@ class HealthService(ServiceBase):
 
         return False
 
+    def _heavy_tier_due(self) -> bool:
+        """Rate-limit the heavy tier while a leak keeps being detected"""
+        now = time.monotonic()
+        if (self._last_heavy_at is not None
+                and now - self._last_heavy_at < self.memory_heavy_min_interval):
+            self.logger.debug("Heavy memory profiling skipped (cooldown)")
+            return False
+        self._last_heavy_at = now
+        return True
+
     async def _handle_memory_leak(self) -> None:
-        """Handle detected memory leak"""
+        """Handle detected memory leak (heavy, on-demand tier)"""
+        started = time.perf_counter()
+
         # Force garbage collection
         gc.collect()
 
         # Log memory profile
-        snapshot = tracemalloc.take_snapshot()
-        top_stats = snapshot.statistics("lineno")[:20]
-
-        self.logger.error(
-            "Memory leak details",
-            top_consumers=[
+        top_consumers = []
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            top_consumers = [
                 {
                     "file": stat.traceback.format()[0],
                     "size": stat.size,
                     "count": stat.count,
                 }
-                for stat in top_stats
+                for stat in snapshot.statistics("lineno")[:20]
+            ]
+
+        # Single pass over live objects to find the dominant types
+        type_counts: Dict[str, List[int]] = {}
+        objects_count = 0
+        for obj in gc.get_objects():
+            entry = type_counts.setdefault(type(obj).__name__, [0, 0])
+            entry[0] += 1
+            entry[1] += sys.getsizeof(obj, 0)
+            objects_count += 1
+        self._last_object_count = (datetime.utcnow(), objects_count)
+        top_types = sorted(
+            type_counts.items(), key=lambda item: item[1][1], reverse=True
+        )[:20]
+
+        self._record_tier_overhead("heavy", time.perf_counter() - started)
+
+        self.logger.error(
+            "Memory leak details",
+            top_consumers=top_consumers,
+            top_types=[
+                {"type": name, "count": count, "size": size}
+                for name, (count, size) in top_types
             ],
         )
 
@@ -449,24 +561,38 @@ class HealthService(ServiceBase):
             return {"healthy": True, "message": "No snapshots yet"}
 
         latest = self.memory_snapshots[-1]
+        # Top consumers come from the last sampled tier and the object count
+        # from the last heavy tier; both are reported with their age
+        sampled = self._last_sampled
+        counted_at, objects_count = self._last_object_count or (None, None)
 
         # Check thresholds
         memory_percent = psutil.virtual_memory().percent
-        heap_size_mb = latest.heap_size / (1024 * 1024)
-        objects_count = latest.objects_count
+        heap_size_mb = (
+            latest.heap_size / (1024 * 1024) if latest.heap_size is not None else None
+        )
 
-        healthy = (memory_percent < 85 and heap_size_mb <
-                   1000 and objects_count < 1000000)  # 1GB heap  # 1M objects
+        healthy = (
+            memory_percent < 85
+            and (heap_size_mb is None or heap_size_mb < 1000)  # 1GB heap
+            and (objects_count is None or objects_count < 1000000)  # 1M objects
+        )
 
         return {
             "healthy": healthy,
             "memory_percent": memory_percent,
             "heap_size_mb": heap_size_mb,
             "objects_count": objects_count,
+            "objects_counted_at": counted_at.isoformat() if counted_at else None,
+            "top_consumers_sampled_at": (
+                sampled.timestamp.isoformat() if sampled else None),
+            "top_consumers_stale": sampled is not latest,
             "gc_stats": latest.gc_stats,
+            "allocated_blocks": latest.allocated_blocks,
+            "profiler_overhead_seconds": dict(self.tier_overhead),
             "top_consumers": [
                 {"location": t[0], "count": t[1], "size": t[2]}
-                for t in latest.top_types[:5]
+                for t in (sampled.top_types if sampled else [])[:5]
             ],
         }
 
@@ -475,7 +601,8 @@ class HealthService(ServiceBase):
         # Memory metrics
         memory_usage_gauge.labels(type="rss").set(snapshot.rss)
         memory_usage_gauge.labels(type="vms").set(snapshot.vms)
-        memory_usage_gauge.labels(type="heap").set(snapshot.heap_size)
+        if snapshot.heap_size is not None:
+            memory_usage_gauge.labels(type="heap").set(snapshot.heap_size)
 
         # CPU metrics
         cpu_usage_gauge.set(psutil.cpu_percent())
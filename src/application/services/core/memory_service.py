@@ -17,7 +17,9 @@ from ..domain.memory.models import (
     MemoryImportance,
     MemoryType,
 )
+from ..infrastructure.memory.memory_graph import build_memory_graph
 from ..infrastructure.memory.memory_repository import MemoryRepository
+from ..infrastructure.memory.memory_vector_index import MemoryVectorIndex
 from ..infrastructure.memory.vector_memory_store import VectorMemoryStore
 
 
@@ -39,8 +41,9 @@ class MemoryService:
         # Initialize components
         self.repository = MemoryRepository(self.data_path / "memories.db")
         self.vector_store = VectorMemoryStore()
+        self.vector_index = MemoryVectorIndex(self.data_path / "memory_index")
         self.storage_service = MemoryStorageService(
-            self.repository, self.vector_store, redis_client
+            self.repository, self.vector_store, redis_client, self.vector_index
         )
 
         self.logger.info("Memory service coordinator initialized")
@@ -62,6 +65,7 @@ class MemoryService:
             for memory in recent_memories:
                 if memory.embedding is not None:
                     self.vector_store.add_memory(memory)
+                self.vector_index.add_memory(memory)
 
             self.logger.info(f"Loaded {len(recent_memories)} recent memories")
         except Exception as e:
@@ -120,11 +124,13 @@ class MemoryService:
             relevant_memories = self._filter_memories_by_query(
                 working_memories, query)
 
-            # If we need more memories, search vector store
+            # If we need more memories, search the local vector index
             if len(relevant_memories) < limit:
-                # In a full implementation, we'd use sentence transformer here
-                # For now, return what we have
-                pass
+                relevant_memories.extend(
+                    self._search_vector_index(
+                        child_id, query, memory_types, relevant_memories, limit
+                    )
+                )
 
             # Apply limit and return
             return self._apply_memory_limit(relevant_memories, limit)
@@ -133,6 +139,35 @@ class MemoryService:
             self.logger.error(f"Failed to recall memories: {e}")
             return []
 
+    def _search_vector_index(
+        self,
+        child_id: str,
+        query: str,
+        memory_types: Optional[List[MemoryType]],
+        already_found: List[Memory],
+        limit: int,
+    ) -> List[Memory]:
+        """Top-k cosine search over the child's vector index"""
+        seen_ids = {memory.id for memory in already_found}
+        needed = limit - len(already_found)
+
+        # Over-fetch so type filtering and de-duplication still fill the limit
+        fetch_k = limit + len(seen_ids) + (limit if memory_types else 0)
+        candidates = self.vector_index.search(child_id, query, k=fetch_k)
+
+        results = []
+        for memory, _score in candidates:
+            if memory.id in seen_ids:
+                continue
+            if memory_types and memory.memory_type not in memory_types:
+                continue
+            memory.access()
+            results.append(memory)
+            if len(results) >= needed:
+                break
+
+        return results
+
     def _extract_topics_from_memories(
             self, memories: List[Memory]) -> List[str]:
         """Extract unique topics from a list of memories"""
@@ -163,9 +198,17 @@ class MemoryService:
         return None
 
     async def get_conversation_context(
-        self, child_id: str, include_summary: bool = True
+        self,
+        child_id: str,
+        include_summary: bool = True,
+        query: Optional[str] = None,
+        relevant_limit: int = 3,
     ) -> Dict[str, Any]:
-        """Get conversation context from memory"""
+        """Get conversation context from memory.
+
+        When a query is given, the most similar long-term memories are
+        included as ``relevant_memories``.
+        """
         try:
             # Get recent memories from storage service
             short_term = self.storage_service.get_short_term_buffer(child_id)
@@ -191,6 +234,14 @@ class MemoryService:
                 "summary": None,
             }
 
+            if query:
+                context["relevant_memories"] = [
+                    memory.content
+                    for memory, _score in self.vector_index.search(
+                        child_id, query, k=relevant_limit
+                    )
+                ]
+
             # Add summary if requested and available
             if include_summary:
                 context["summary"] = self._create_conversation_summary(
@@ -301,6 +352,7 @@ class MemoryService:
     async def close(self):
         """Close the memory service and cleanup"""
         await self.storage_service.close()
+        self.vector_index.persist()
         await self.repository.close()
         self.logger.info("Memory service coordinator closed")
 
@@ -321,35 +373,14 @@ def calculate_memory_similarity(memory1: Memory, memory2: Memory) -> float:
     return (topic_sim + emotion_sim) / 2
 
 
-def _is_memory_pair_similar(
-        memory1: Memory,
-        memory2: Memory,
-        threshold: float) -> bool:
-    """Check if two memories are similar enough to be related"""
-    similarity = calculate_memory_similarity(memory1, memory2)
-    return similarity >= threshold
-
-
-def _find_related_memories(
-    target_memory: Memory, all_memories: List[Memory], threshold: float
-) -> List[str]:
-    """Find all memories related to a target memory"""
-    related_ids = []
-
-    for candidate_memory in all_memories:
-        if target_memory.id == candidate_memory.id:
-            continue
-
-        if _is_memory_pair_similar(target_memory, candidate_memory, threshold):
-            related_ids.append(candidate_memory.id)
-
-    return related_ids
-
-
 def generate_memory_graph(
     memories: List[Memory], threshold: float = 0.5
 ) -> Dict[str, List[str]]:
-    """Generate a graph of related memories"""
+    """Generate a graph of related memories.
+
+    Candidate pairs come from topic/emotion inverted indexes, so only
+    memories sharing a term are ever compared.
+    """
     # Early return for empty input
     if not memories:
         return {}
@@ -358,10 +389,4 @@ def generate_memory_graph(
     if len(memories) == 1:
         return {memories[0].id: []}
 
-    graph = {}
-
-    for memory in memories:
-        related_ids = _find_related_memories(memory, memories, threshold)
-        graph[memory.id] = related_ids
-
-    return graph
+    return build_memory_graph(memories, threshold)
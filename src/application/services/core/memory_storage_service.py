@@ -4,12 +4,17 @@ Memory Storage Service - Handles memory persistence and organization
 
 import asyncio
 import logging
-from collections import defaultdict, deque
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from ....domain.memory.models import Memory, MemoryImportance, MemoryType
+from ....infrastructure.memory.memory_graph import MemoryGraph
 from ....infrastructure.memory.memory_repository import MemoryRepository
+from ....infrastructure.memory.memory_vector_index import (
+    DEFAULT_MAX_LOADED_CHILDREN,
+    MemoryVectorIndex,
+)
 from ....infrastructure.memory.vector_memory_store import VectorMemoryStore
 
 
@@ -21,10 +26,12 @@ class MemoryStorageService:
         repository: MemoryRepository,
         vector_store: VectorMemoryStore,
         redis_client=None,
+        vector_index: Optional[MemoryVectorIndex] = None,
     ):
         self.repository = repository
         self.vector_store = vector_store
         self.redis_client = redis_client
+        self.vector_index = vector_index
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Memory buffers
@@ -32,6 +39,17 @@ class MemoryStorageService:
             lambda: deque(maxlen=50))
         self.working_memory: Dict[str, List[Memory]] = defaultdict(list)
 
+        # Related-memory graph per child, seeded from the repository on first
+        # access and maintained as memories come and go. Least recently used
+        # graphs are dropped past the same child limit as the vector index
+        # and rebuilt from the repository when next needed.
+        self.memory_graphs: "OrderedDict[str, MemoryGraph]" = OrderedDict()
+        self.max_graph_children = (
+            vector_index.max_loaded_children
+            if vector_index
+            else DEFAULT_MAX_LOADED_CHILDREN
+        )
+
         # Background consolidation
         self.consolidation_task = None
 
@@ -78,7 +96,12 @@ class MemoryStorageService:
                 topics=topics,
             )
 
+            graph = await self._get_graph(child_id)
+            memory.related_memories = graph.add(memory)
+
             # Store in different memory layers
+            if self.vector_index:
+                self.vector_index.add_memory(memory)
             await self._store_short_term(memory)
             await self._update_working_memory(child_id, memory)
 
@@ -133,12 +156,32 @@ class MemoryStorageService:
         except Exception as e:
             self.logger.error(f"Failed to store long-term memory: {e}")
 
+    async def _get_graph(self, child_id: str) -> MemoryGraph:
+        """Get a child's memory graph, building it from stored memories"""
+        graph = self.memory_graphs.get(child_id)
+        if graph is None:
+            stored = await self.repository.get_memories_by_child(child_id)
+            # Another task may have built the graph while we were loading
+            graph = self.memory_graphs.get(child_id)
+            if graph is None:
+                graph = MemoryGraph()
+                for memory in stored:
+                    graph.add(memory)
+                self.memory_graphs[child_id] = graph
+
+        self.memory_graphs.move_to_end(child_id)
+        while len(self.memory_graphs) > self.max_graph_children:
+            self.memory_graphs.popitem(last=False)
+        return graph
+
     async def _consolidation_loop(self) -> None:
         """Background task for memory consolidation"""
         while True:
             try:
                 await asyncio.sleep(300)  # Run every 5 minutes
                 await self._consolidate_memories()
+                if self.vector_index:
+                    self.vector_index.persist()
             except Exception as e:
                 self.logger.error(f"Memory consolidation error: {e}")
 
@@ -151,20 +194,50 @@ class MemoryStorageService:
             if len(recent_memories) < 10:
                 return
 
-            # Group by topics and find patterns
-            topic_groups = defaultdict(list)
+            by_child: Dict[str, List[Memory]] = defaultdict(list)
             for memory in recent_memories:
-                for topic in memory.topics:
-                    topic_groups[topic].append(memory)
-
-            # Consolidate memories within topics
-            for topic, memories in topic_groups.items():
-                if len(memories) >= 3:
-                    await self._consolidate_topic_memories(topic, memories)
+                by_child[memory.child_id].append(memory)
+
+            # Consolidate each cluster of related memories around the topic
+            # its members share most
+            for child_id, memories in by_child.items():
+                graph = await self._get_graph(child_id)
+                for cluster in self._related_clusters(graph, memories):
+                    if len(cluster) < 3:
+                        continue
+                    topics = Counter(
+                        topic for memory in cluster for topic in memory.topics)
+                    if topics:
+                        topic = topics.most_common(1)[0][0]
+                        await self._consolidate_topic_memories(topic, cluster)
 
         except Exception as e:
             self.logger.error(f"Memory consolidation failed: {e}")
 
+    @staticmethod
+    def _related_clusters(
+        graph: MemoryGraph, memories: List[Memory]
+    ) -> List[List[Memory]]:
+        """Connected components of the graph restricted to the given memories"""
+        by_id = {memory.id: memory for memory in memories}
+        seen = set()
+        clusters = []
+        for memory in memories:
+            if memory.id in seen:
+                continue
+            seen.add(memory.id)
+            cluster = []
+            stack = [memory.id]
+            while stack:
+                memory_id = stack.pop()
+                cluster.append(by_id[memory_id])
+                for related_id in graph.related(memory_id):
+                    if related_id in by_id and related_id not in seen:
+                        seen.add(related_id)
+                        stack.append(related_id)
+            clusters.append(cluster)
+        return clusters
+
     async def _consolidate_topic_memories(
         self, topic: str, memories: List[Memory]
     ) -> None:
@@ -240,6 +313,12 @@ class MemoryStorageService:
 
         return topics
 
+    async def get_related_memory_ids(
+            self, child_id: str, memory_id: str) -> List[str]:
+        """Get IDs of memories related to a stored memory"""
+        graph = await self._get_graph(child_id)
+        return graph.related(memory_id)
+
     def get_working_memory(self, child_id: str) -> List[Memory]:
         """Get working memory for a child"""
         return self.working_memory.get(child_id, [])
@@ -281,6 +360,11 @@ class MemoryStorageService:
 
                 if should_forget:
                     await self.repository.delete_memory(memory.id)
+                    graph = self.memory_graphs.get(child_id)
+                    if graph is not None:
+                        graph.remove(memory.id)
+                    if self.vector_index:
+                        self.vector_index.forget(child_id, memory.id)
                     forgotten_count += 1
 
             self.logger.info(
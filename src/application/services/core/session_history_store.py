@@ -0,0 +1,235 @@
+"""Cold tier and rolling aggregates for session history.
+
+``SessionManagementService`` keeps only a small hot window of each
+session's messages in memory. Messages pushed out of that window, ended
+sessions and per-child aggregates are written here, so the in-memory state
+stays bounded however long the process runs.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class ChildSessionAggregates:
+    """Running session totals for one child, updated once per ended session.
+
+    Daily buckets are kept for the last ``max_days`` distinct days only.
+    """
+
+    __slots__ = ("session_count", "total_duration_seconds", "message_count",
+                 "first_session_at", "last_session_at", "daily", "max_days")
+
+    def __init__(self, max_days: int = 30):
+        self.session_count = 0
+        self.total_duration_seconds = 0.0
+        self.message_count = 0
+        self.first_session_at: Optional[datetime] = None
+        self.last_session_at: Optional[datetime] = None
+        # ISO day -> [sessions, seconds, messages], oldest day first
+        self.daily: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.max_days = max_days
+
+    def record(self, started_at: datetime, ended_at: datetime, messages: int) -> None:
+        duration = max(0.0, (ended_at - started_at).total_seconds())
+        self.session_count += 1
+        self.total_duration_seconds += duration
+        self.message_count += messages
+        if self.first_session_at is None or started_at < self.first_session_at:
+            self.first_session_at = started_at
+        if self.last_session_at is None or ended_at > self.last_session_at:
+            self.last_session_at = ended_at
+
+        day = started_at.date().isoformat()
+        bucket = self.daily.get(day)
+        if bucket is None:
+            newest = next(reversed(self.daily), None)
+            bucket = self.daily[day] = [0, 0.0, 0]
+            if newest is not None and day < newest:
+                # Late session for an earlier day: keep the buckets in day order
+                self.daily = OrderedDict(sorted(self.daily.items()))
+            while len(self.daily) > self.max_days:
+                self.daily.popitem(last=False)
+        bucket[0] += 1
+        bucket[1] += duration
+        bucket[2] += messages
+
+    @property
+    def average_duration_seconds(self) -> float:
+        if not self.session_count:
+            return 0.0
+        return self.total_duration_seconds / self.session_count
+
+    def day(self, day: date) -> Dict[str, Any]:
+        sessions, seconds, messages = self.daily.get(day.isoformat(), (0, 0.0, 0))
+        return {"sessions": sessions, "duration_seconds": seconds, "messages": messages}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_count": self.session_count,
+            "total_duration_seconds": self.total_duration_seconds,
+            "average_duration_seconds": self.average_duration_seconds,
+            "message_count": self.message_count,
+            "first_session_at": _iso(self.first_session_at),
+            "last_session_at": _iso(self.last_session_at),
+            "daily": {
+                day: {"sessions": s, "duration_seconds": d, "messages": m}
+                for day, (s, d, m) in self.daily.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_days: int = 30) -> "ChildSessionAggregates":
+        aggregates = cls(max_days)
+        aggregates.session_count = data.get("session_count", 0)
+        aggregates.total_duration_seconds = data.get("total_duration_seconds", 0.0)
+        aggregates.message_count = data.get("message_count", 0)
+        aggregates.first_session_at = _parse(data.get("first_session_at"))
+        aggregates.last_session_at = _parse(data.get("last_session_at"))
+        for day in sorted(data.get("daily", {}))[-max_days:]:
+            bucket = data["daily"][day]
+            aggregates.daily[day] = [
+                bucket["sessions"], bucket["duration_seconds"], bucket["messages"]]
+        return aggregates
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _encode_message(message: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    return (
+        message["type"],
+        message["content"],
+        message["timestamp"].isoformat(),
+        json.dumps(message.get("metadata") or {}, ensure_ascii=False, default=str),
+    )
+
+
+class SessionHistoryColdStore:
+    """SQLite store for evicted messages, ended sessions and child aggregates."""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS session_messages ("
+            "session_id TEXT NOT NULL, seq INTEGER NOT NULL, type TEXT NOT NULL, "
+            "content TEXT NOT NULL, timestamp TEXT NOT NULL, metadata TEXT, "
+            "PRIMARY KEY (session_id, seq)) WITHOUT ROWID;"
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, user_id TEXT, created_at TEXT, "
+            "ended_at TEXT, status TEXT, message_count INTEGER);"
+            "CREATE TABLE IF NOT EXISTS child_session_aggregates ("
+            "child_id TEXT PRIMARY KEY, data TEXT NOT NULL);"
+        )
+        self._db.commit()
+
+    def append_messages(
+        self, rows: Iterable[Tuple[str, int, Dict[str, Any]]]
+    ) -> int:
+        """Persist ``(session_id, seq, message)`` rows in one transaction."""
+        params = [(session_id, seq, *_encode_message(message))
+                  for session_id, seq, message in rows]
+        if not params:
+            return 0
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO session_messages "
+                "(session_id, seq, type, content, timestamp, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)", params)
+            self._db.commit()
+        return len(params)
+
+    def next_seq(self, session_id: str) -> int:
+        """Sequence number after the highest stored one for a session."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MAX(seq) FROM session_messages WHERE session_id = ?",
+                (session_id,)).fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    def recent_messages(
+        self, session_id: str, limit: int, before_seq: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` messages of a session, oldest first."""
+        sql = ("SELECT type, content, timestamp, metadata FROM session_messages "
+               "WHERE session_id = ?")
+        params: List[Any] = [session_id]
+        if before_seq is not None:
+            sql += " AND seq < ?"
+            params.append(before_seq)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {"type": kind, "content": content,
+             "timestamp": datetime.fromisoformat(timestamp),
+             "metadata": json.loads(metadata) if metadata else {}}
+            for kind, content, timestamp, metadata in reversed(rows)
+        ]
+
+    def save_session(self, session: Dict[str, Any], message_count: int) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions "
+                "(session_id, user_id, created_at, ended_at, status, message_count) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (session["id"], session.get("user_id"), _iso(session.get("created_at")),
+                 _iso(session.get("ended_at")), session.get("status"), message_count),
+            )
+            self._db.commit()
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT session_id, user_id, created_at, ended_at, status, message_count "
+                "FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0], "user_id": row[1], "created_at": _parse(row[2]),
+            "ended_at": _parse(row[3]), "status": row[4], "message_count": row[5],
+        }
+
+    def save_aggregates(self, child_id: str, aggregates: ChildSessionAggregates) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO child_session_aggregates (child_id, data) "
+                "VALUES (?, ?)", (child_id, json.dumps(aggregates.to_dict())))
+            self._db.commit()
+
+    def load_aggregates(
+        self, child_id: str, max_days: int = 30
+    ) -> Optional[ChildSessionAggregates]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM child_session_aggregates WHERE child_id = ?",
+                (child_id,)).fetchone()
+        if row is None:
+            return None
+        return ChildSessionAggregates.from_dict(json.loads(row[0]), max_days)
+
+    def count_messages(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM session_messages").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"cold_messages": self.count_messages(), "db_path": str(self.db_path)}
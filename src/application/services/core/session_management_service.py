@@ -1,16 +1,85 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import sys
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .session_history_store import ChildSessionAggregates, SessionHistoryColdStore
+
+logger = logging.getLogger(__name__)
+
+# Rough per-message overhead (dict, datetime, metadata dict) on top of the text
+_MESSAGE_OVERHEAD_BYTES = 400
+# Rough size of one child's aggregates, plus each daily bucket
+_AGGREGATES_BYTES = 600
+_AGGREGATES_DAY_BYTES = 250
+
+
+def _message_size(message: Dict[str, Any]) -> int:
+    return _MESSAGE_OVERHEAD_BYTES + sys.getsizeof(message["content"]) + sum(
+        sys.getsizeof(v) for v in message["metadata"].values())
+
+
+def _aggregates_size(aggregates: ChildSessionAggregates) -> int:
+    return _AGGREGATES_BYTES + len(aggregates.daily) * _AGGREGATES_DAY_BYTES
 
 
 class SessionManagementService:
     """
     Dedicated service for session management operations.
     EXTRACTED CLASS to resolve Low Cohesion - Single Responsibility: Session Management
+
+    Only the last ``hot_window`` messages of a session stay in memory; older
+    messages, ended sessions and per-child aggregates go to the optional
+    cold store. Per-child totals are updated once per ended session, so
+    ``get_child_stats`` never walks the history, and eviction keeps the hot
+    tier under ``memory_budget_bytes``.
+
+    With a cold store a child's aggregates are only cached while the child
+    has sessions in memory. Without one they are the only copy, so they stay
+    and count towards the memory budget.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        hot_window: int = 50,
+        memory_budget_bytes: int = 8 * 1024 * 1024,
+        cold_store: Optional[SessionHistoryColdStore] = None,
+        cold_store_path: Optional[str] = None,
+        min_hot_messages: int = 5,
+        daily_buckets: int = 30,
+        cold_flush_size: int = 256,
+    ):
+        if cold_store is None and cold_store_path:
+            cold_store = SessionHistoryColdStore(cold_store_path)
+        self.cold_store = cold_store
+        self.hot_window = hot_window
+        self.memory_budget_bytes = memory_budget_bytes
+        self.min_hot_messages = min(min_hot_messages, hot_window)
+        self.daily_buckets = daily_buckets
+        self.cold_flush_size = cold_flush_size
+
         self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.session_history: Dict[str, List[Dict]] = {}
+        # session_id -> (sequence number, message) for the newest messages
+        self.session_history: Dict[str, Deque[Tuple[int, Dict]]] = {}
+        self.child_aggregates: Dict[str, ChildSessionAggregates] = {}
+
+        self._next_seq: Dict[str, int] = {}
+        self._session_bytes: Dict[str, int] = {}
+        self._aggregate_bytes: Dict[str, int] = {}
+        self._sessions_per_child: Dict[str, int] = {}
+        self._hot_bytes = 0
+        self._pending_cold: List[Tuple[str, int, Dict]] = []
+        self._eviction_task: Optional[asyncio.Task] = None
+        self._counters = {
+            "total_messages": 0,
+            "ended_sessions": 0,
+            "spilled_messages": 0,
+            "dropped_messages": 0,
+            "evicted_sessions": 0,
+            "evictions": 0,
+        }
 
     def create_session(
         self, session_id: str, user_id: Optional[str] = None
@@ -19,22 +88,36 @@ class SessionManagementService:
         if not session_id or not session_id.strip():
             raise ValueError("session_id cannot be empty")
 
+        if session_id in self.sessions:
+            # Reused id: keep numbering so cold rows are not overwritten
+            next_seq = self._next_seq.get(session_id, 0)
+            self._remove_session(session_id)
+            self._next_seq[session_id] = next_seq
+
         session = {
             "id": session_id,
             "user_id": user_id,
             "created_at": datetime.now(),
             "last_activity": datetime.now(),
             "status": "active",
+            "message_count": 0,
         }
         self.sessions[session_id] = session
-        self.session_history[session_id] = []
+        self.session_history[session_id] = deque()
+        if user_id:
+            self._sessions_per_child[user_id] = (
+                self._sessions_per_child.get(user_id, 0) + 1)
         return session
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session by ID with validation"""
         if not session_id:
             return None
-        return self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is None and self.cold_store is not None:
+            self._flush_cold()
+            return self.cold_store.get_session(session_id)
+        return session
 
     def add_message(
         self,
@@ -47,8 +130,9 @@ class SessionManagementService:
         if not session_id or not message_type or not content:
             return
 
-        if session_id not in self.session_history:
-            self.session_history[session_id] = []
+        history = self.session_history.get(session_id)
+        if history is None:
+            history = self.session_history[session_id] = deque()
 
         message = {
             "type": message_type,
@@ -56,25 +140,72 @@ class SessionManagementService:
             "timestamp": datetime.now(),
             "metadata": metadata or {},
         }
+        seq = self._next_seq.get(session_id)
+        if seq is None:
+            seq = self._stored_next_seq(session_id)
+        self._next_seq[session_id] = seq + 1
+        history.append((seq, message))
+        self._account(session_id, _message_size(message))
+        self._counters["total_messages"] += 1
+        if session_id in self.sessions:
+            self.sessions[session_id]["message_count"] += 1
 
-        self.session_history[session_id].append(message)
+        while len(history) > self.hot_window:
+            self._spill(session_id, history.popleft())
         self._update_session_activity(session_id)
 
+        # Without a running eviction task the budget is still a hard cap
+        if self._hot_bytes > self.memory_budget_bytes * 1.25:
+            self.evict_to_budget()
+
     def get_recent_messages(
             self,
             session_id: str,
             limit: int = 5) -> List[Dict]:
         """Get recent messages for a session"""
-        if not session_id or session_id not in self.session_history:
+        if not session_id or limit <= 0:
             return []
 
-        return self.session_history[session_id][-limit:]
+        history = self.session_history.get(session_id, ())
+        hot = [message for _, message in list(history)[-limit:]]
+        missing = limit - len(hot)
+        if missing <= 0 or self.cold_store is None:
+            return hot
+
+        self._flush_cold()
+        before_seq = history[0][0] if history else None
+        return self.cold_store.recent_messages(session_id, missing, before_seq) + hot
 
     def end_session(self, session_id: str) -> None:
         """End session with cleanup"""
-        if session_id in self.sessions:
-            self.sessions[session_id]["ended_at"] = datetime.now()
-            self.sessions[session_id]["status"] = "ended"
+        session = self.sessions.get(session_id)
+        if session is None or session.get("status") == "ended":
+            return
+
+        session["ended_at"] = datetime.now()
+        session["status"] = "ended"
+        self._counters["ended_sessions"] += 1
+
+        child_id = session.get("user_id")
+        if child_id:
+            aggregates = self._aggregates_for(child_id)
+            aggregates.record(
+                session["created_at"], session["ended_at"], session["message_count"])
+            self._account_aggregates(child_id)
+            if self.cold_store is not None:
+                self.cold_store.save_aggregates(child_id, aggregates)
+
+        if self.cold_store is not None:
+            self.cold_store.save_session(session, session["message_count"])
+
+    def get_child_stats(self, child_id: str) -> Dict[str, Any]:
+        """Rolling session totals for one child (no history scan)"""
+        aggregates = self._aggregates_for(child_id)
+        stats = aggregates.to_dict()
+        stats["child_id"] = child_id
+        stats["today"] = aggregates.day(date.today())
+        self._release_aggregates(child_id)
+        return stats
 
     def cleanup_old_sessions(self, max_age_hours: int = 24) -> int:
         """Clean up old inactive sessions"""
@@ -90,25 +221,158 @@ class SessionManagementService:
                 sessions_to_remove.append(session_id)
 
         for session_id in sessions_to_remove:
+            # Abandoned sessions still count towards the child's totals
+            self.end_session(session_id)
             self._remove_session(session_id)
 
+        self._flush_cold()
         return len(sessions_to_remove)
 
+    def evict_to_budget(self) -> int:
+        """Move hot history to the cold tier until under the memory budget.
+
+        Ended sessions go first (oldest first), then the least recently
+        active sessions are trimmed down to ``min_hot_messages``. Returns
+        the number of messages moved out of memory.
+        """
+        if self._hot_bytes <= self.memory_budget_bytes:
+            return 0
+
+        target = self.memory_budget_bytes * 0.9
+        moved = 0
+        self._counters["evictions"] += 1
+
+        ended = sorted(
+            (s for s in self.sessions.values() if s.get("status") == "ended"),
+            key=lambda s: s.get("ended_at") or s["created_at"])
+        for session in ended:
+            if self._hot_bytes <= target:
+                break
+            moved += len(self.session_history.get(session["id"], ()))
+            self._remove_session(session["id"])
+            self._counters["evicted_sessions"] += 1
+
+        if self._hot_bytes > target:
+            idle_first = sorted(
+                self.session_history,
+                key=lambda sid: self.sessions.get(sid, {}).get(
+                    "last_activity", datetime.min))
+            for session_id in idle_first:
+                if self._hot_bytes <= target:
+                    break
+                history = self.session_history[session_id]
+                while len(history) > self.min_hot_messages and self._hot_bytes > target:
+                    self._spill(session_id, history.popleft())
+                    moved += 1
+
+        self._flush_cold()
+        logger.debug(f"Session history eviction moved {moved} messages, "
+                     f"hot tier now {self._hot_bytes} bytes")
+        return moved
+
+    def start_background_eviction(self, interval_seconds: float = 30.0) -> asyncio.Task:
+        """Run ``evict_to_budget`` periodically on the running event loop"""
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(
+                self._eviction_loop(interval_seconds))
+        return self._eviction_task
+
+    async def stop_background_eviction(self) -> None:
+        task, self._eviction_task = self._eviction_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flush_cold()
+
+    async def _eviction_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.evict_to_budget()
+                self._flush_cold()
+            except Exception as e:
+                logger.error(f"Session history eviction failed: {e}")
+
     def get_session_stats(self) -> Dict[str, Any]:
         """Get comprehensive session statistics"""
         active_sessions = sum(
             1 for s in self.sessions.values() if s.get("status") == "active"
         )
-        total_messages = sum(len(history)
-                             for history in self.session_history.values())
 
         return {
             "total_sessions": len(self.sessions),
             "active_sessions": active_sessions,
-            "total_messages": total_messages,
+            "total_messages": self._counters["total_messages"],
             "sessions_with_history": len(self.session_history),
+            "hot_messages": sum(len(h) for h in self.session_history.values()),
+            "hot_bytes": self._hot_bytes,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "children_tracked": len(self.child_aggregates),
+            "aggregate_bytes": sum(self._aggregate_bytes.values()),
+            "cold_store": self.cold_store is not None,
+            **{k: v for k, v in self._counters.items() if k != "total_messages"},
         }
 
+    def _aggregates_for(self, child_id: str) -> ChildSessionAggregates:
+        aggregates = self.child_aggregates.get(child_id)
+        if aggregates is None:
+            if self.cold_store is not None:
+                aggregates = self.cold_store.load_aggregates(child_id, self.daily_buckets)
+            if aggregates is None:
+                aggregates = ChildSessionAggregates(self.daily_buckets)
+            self.child_aggregates[child_id] = aggregates
+            self._account_aggregates(child_id)
+        return aggregates
+
+    def _account_aggregates(self, child_id: str) -> None:
+        """Keep a child's aggregates counted in the hot tier"""
+        size = _aggregates_size(self.child_aggregates[child_id])
+        self._hot_bytes += size - self._aggregate_bytes.get(child_id, 0)
+        self._aggregate_bytes[child_id] = size
+
+    def _release_aggregates(self, child_id: str) -> None:
+        """Drop cached aggregates once the child has no sessions in memory.
+
+        They were saved to the cold store when each session ended and are
+        reloaded from there on next use. Without a cold store they are kept.
+        """
+        if self.cold_store is None or self._sessions_per_child.get(child_id):
+            return
+        if self.child_aggregates.pop(child_id, None) is not None:
+            self._hot_bytes -= self._aggregate_bytes.pop(child_id, 0)
+
+    def _account(self, session_id: str, size: int) -> None:
+        self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + size
+        self._hot_bytes += size
+
+    def _spill(self, session_id: str, entry: Tuple[int, Dict]) -> None:
+        """Move one message out of the hot window"""
+        seq, message = entry
+        self._account(session_id, -_message_size(message))
+        if self.cold_store is None:
+            self._counters["dropped_messages"] += 1
+            return
+        self._pending_cold.append((session_id, seq, message))
+        self._counters["spilled_messages"] += 1
+        if len(self._pending_cold) >= self.cold_flush_size:
+            self._flush_cold()
+
+    def _stored_next_seq(self, session_id: str) -> int:
+        """Continue numbering after rows already spilled for a reused id,
+        so ``INSERT OR REPLACE`` never overwrites older cold messages."""
+        if self.cold_store is None:
+            return 0
+        pending = [seq for sid, seq, _ in self._pending_cold if sid == session_id]
+        return max(self.cold_store.next_seq(session_id), max(pending, default=-1) + 1)
+
+    def _flush_cold(self) -> None:
+        if self._pending_cold and self.cold_store is not None:
+            rows, self._pending_cold = self._pending_cold, []
+            self.cold_store.append_messages(rows)
+
     def _update_session_activity(self, session_id: str) -> None:
         """Update session last activity timestamp"""
         if session_id in self.sessions:
@@ -116,5 +380,20 @@ class SessionManagementService:
 
     def _remove_session(self, session_id: str) -> None:
         """Remove session and its history"""
-        self.sessions.pop(session_id, None)
-        self.session_history.pop(session_id, None)
+        history = self.session_history.pop(session_id, None)
+        if history and self.cold_store is not None:
+            for entry in history:
+                self._pending_cold.append((session_id, *entry))
+            self._counters["spilled_messages"] += len(history)
+        self._hot_bytes -= self._session_bytes.pop(session_id, 0)
+        session = self.sessions.pop(session_id, None)
+        self._next_seq.pop(session_id, None)
+
+        child_id = session.get("user_id") if session else None
+        if child_id:
+            remaining = self._sessions_per_child.get(child_id, 0) - 1
+            if remaining > 0:
+                self._sessions_per_child[child_id] = remaining
+            else:
+                self._sessions_per_child.pop(child_id, None)
+                self._release_aggregates(child_id)
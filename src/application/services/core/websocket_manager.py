@@ -25,6 +25,10 @@ class WebSocketConfig:
     max_connections: int = 1000
     ping_timeout: int = 10  # seconds
     message_queue_size: int = 100
+    # Per-session message limit; off by default because audio sockets send
+    # many small frames per second
+    messages_per_second: float = 0.0
+    message_burst: int = 20
 
 
 @dataclass
@@ -57,9 +61,29 @@ class ModernWebSocketManager:
     - Message queuing for reliability
     """
 
-    def __init__(self, config: Optional[WebSocketConfig] = None):
+    def __init__(
+        self,
+        config: Optional[WebSocketConfig] = None,
+        rate_limiter: Optional[Any] = None,
+    ):
         self.config = config or WebSocketConfig()
 
+        # Per-session message limiter; pass a DistributedRateLimiter to share
+        # limits between workers
+        if rate_limiter is None and self.config.messages_per_second > 0:
+            # Imported lazily so the manager does not depend on the
+            # security package unless limiting is enabled
+            from src.infrastructure.security.rate_limiter import (
+                LocalTokenBucketLimiter,
+            )
+
+            rate_limiter = LocalTokenBucketLimiter(
+                self.config.messages_per_second,
+                self.config.message_burst,
+                max_keys=max(self.config.max_connections * 2, 1000),
+            )
+        self.rate_limiter = rate_limiter
+
         # Active connections registry
         self.connections: Dict[str, ConnectionInfo] = {}
 
@@ -78,6 +102,7 @@ class ModernWebSocketManager:
             "messages_received": 0,
             "disconnections": 0,
             "heartbeat_failures": 0,
+            "messages_rate_limited": 0,
         }
 
         logger.info("✅ Modern WebSocket Manager initialized")
@@ -290,6 +315,20 @@ class ModernWebSocketManager:
                 connection.last_pong = datetime.utcnow()
                 return None  # Pong handled internally
 
+            if self.rate_limiter is not None:
+                decision = self.rate_limiter.acquire(f"ws:{session_id}")
+                if asyncio.iscoroutine(decision):
+                    decision = await decision
+                if not decision.allowed:
+                    self.stats["messages_rate_limited"] += 1
+                    await self.send_message(session_id, {
+                        "type": "rate_limited",
+                        "error": "Too many messages",
+                        "retry_after": round(decision.retry_after, 3),
+                        "original_type": message.get("type"),
+                    })
+                    return None
+
             return message
 
         except WebSocketDisconnect:
@@ -502,9 +541,10 @@ class ModernWebSocketManager:
 
 def create_websocket_manager(
     config: Optional[WebSocketConfig] = None,
+    rate_limiter: Optional[Any] = None,
 ) -> ModernWebSocketManager:
     """Factory function to create WebSocket manager"""
-    return ModernWebSocketManager(config or WebSocketConfig())
+    return ModernWebSocketManager(config or WebSocketConfig(), rate_limiter)
 
 
 # Re-export for compatibility
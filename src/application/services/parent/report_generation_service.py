@@ -3,12 +3,14 @@ Report Generation Application Service
 Orchestrates the generation of comprehensive reports
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
 from src.domain.reporting.models import ChildProgress, InteractionAnalysis, ReportPeriod
 from src.domain.reporting.services import (
+    BatchProgressEngine,
     BehaviorAnalyzer,
     EmotionAnalyzerService,
     ProgressAnalyzer,
@@ -29,6 +31,7 @@ class ReportGenerationService:
         self.emotion_analyzer = EmotionAnalyzerService()
         self.skill_analyzer = SkillAnalyzer()
         self.behavior_analyzer = BehaviorAnalyzer()
+        self.batch_engine = BatchProgressEngine()
 
     async def generate_weekly_report(
         self, child_id: str, week_offset: int = 0
@@ -43,97 +46,89 @@ class ReportGenerationService:
         Returns:
             ChildProgress object with all metrics
         """
+        reports = await self.generate_weekly_reports([child_id], week_offset)
+        return reports[child_id]
+
+    async def generate_weekly_reports(
+        self, child_ids: List[str], week_offset: int = 0
+    ) -> Dict[str, ChildProgress]:
+        """
+        Generate weekly reports for many children in one batch
+
+        Progress metrics for all children are computed in grouped vectorized
+        passes by the batch engine instead of per-child loops.
+
+        Args:
+            child_ids: Children to report on
+            week_offset: 0 = current week, 1 = last week, etc.
+
+        Returns:
+            ChildProgress per child id
+        """
         try:
             # Calculate date range
             end_date = datetime.now() - timedelta(weeks=week_offset)
             start_date = end_date - timedelta(days=7)
             period = ReportPeriod(start_date=start_date, end_date=end_date)
 
-            # Get child info
-            child_info = await self._get_child_info(child_id)
-
-            # Get interaction data
-            interactions = await self._get_interactions(child_id, start_date, end_date)
-
-            # Analyze all metrics using domain services
-            emotion_analysis = self.emotion_analyzer.analyze_emotion_distribution(
-                interactions)
-            skill_analysis = self.skill_analyzer.analyze_skills_practiced(
-                interactions)
-
-            # Build comprehensive progress report
-            progress = ChildProgress(
-                child_id=child_id,
-                child_name=child_info.get("name", "Unknown"),
-                age=child_info.get("age", 5),
-                period=period,
-                # Basic interaction metrics
-                total_interactions=len(interactions),
-                avg_daily_interactions=len(interactions) / 7,
-                longest_conversation=self.progress_analyzer.calculate_longest_conversation(
-                    interactions
-                ),
-                favorite_topics=self.progress_analyzer.extract_favorite_topics(
-                    interactions
-                ),
-                # Emotional analysis
-                emotion_analysis=emotion_analysis,
-                mood_trends=self.progress_analyzer.analyze_mood_trends(
-                    interactions, start_date, end_date
-                ),
-                # Behavioral analysis
-                attention_span=self.progress_analyzer.calculate_attention_span(
-                    interactions
-                ),
-                response_time=self.progress_analyzer.calculate_response_time(
-                    interactions
-                ),
-                vocabulary_growth=self.progress_analyzer.estimate_vocabulary_growth(
-                    interactions
-                ),
-                question_frequency=self.progress_analyzer.calculate_question_frequency(
-                    interactions
-                ),
-                # Learning analysis
-                skill_analysis=skill_analysis,
-                learning_achievements=self.skill_analyzer.identify_achievements(
-                    interactions
-                ),
-                recommended_activities=self.skill_analyzer.generate_activity_recommendations(
-                    interactions
-                ),
-                # Social analysis
-                empathy_indicators=self.emotion_analyzer.count_empathy_indicators(
-                    interactions
-                ),
-                sharing_behavior=self.emotion_analyzer.analyze_sharing_behavior(
-                    interactions
-                ),
-                cooperation_level=self.emotion_analyzer.calculate_cooperation_level(
-                    interactions
-                ),
-                # Sleep analysis (if data available)
-                sleep_pattern_quality=self.emotion_analyzer.analyze_sleep_patterns(
-                    interactions
-                ),
-                bedtime_conversations=self.emotion_analyzer.count_bedtime_conversations(
-                    interactions
-                ),
-                # Red flags
-                concerning_patterns=self.emotion_analyzer.identify_concerning_patterns(
-                    interactions
-                ),
-                urgent_recommendations=self.emotion_analyzer.generate_urgent_recommendations(
-                    interactions
-                ),
-            )
+            # Get child info and interaction data
+            child_infos = await asyncio.gather(
+                *(self._get_child_info(child_id) for child_id in child_ids))
+            interactions_by_child = dict(zip(child_ids, await asyncio.gather(
+                *(self._get_interactions(child_id, start_date, end_date)
+                  for child_id in child_ids))))
+
+            # Progress, emotion and skill metrics for all children at once
+            metrics = self.batch_engine.compute_metrics(
+                interactions_by_child, period)
+
+            reports = {}
+            for child_id, child_info in zip(child_ids, child_infos):
+                interactions = interactions_by_child[child_id]
+                reports[child_id] = self.batch_engine.build_child_progress(
+                    child_id,
+                    child_info,
+                    period,
+                    metrics[child_id],
+                    # Learning analysis
+                    learning_achievements=self.skill_analyzer.identify_achievements(
+                        interactions
+                    ),
+                    recommended_activities=self.skill_analyzer.generate_activity_recommendations(
+                        interactions
+                    ),
+                    # Social analysis
+                    empathy_indicators=self.emotion_analyzer.count_empathy_indicators(
+                        interactions
+                    ),
+                    sharing_behavior=self.emotion_analyzer.analyze_sharing_behavior(
+                        interactions
+                    ),
+                    cooperation_level=self.emotion_analyzer.calculate_cooperation_level(
+                        interactions
+                    ),
+                    # Sleep analysis (if data available)
+                    sleep_pattern_quality=self.emotion_analyzer.analyze_sleep_patterns(
+                        interactions
+                    ),
+                    bedtime_conversations=self.emotion_analyzer.count_bedtime_conversations(
+                        interactions
+                    ),
+                    # Red flags
+                    concerning_patterns=self.emotion_analyzer.identify_concerning_patterns(
+                        interactions
+                    ),
+                    urgent_recommendations=self.emotion_analyzer.generate_urgent_recommendations(
+                        interactions
+                    ),
+                )
 
-            self.logger.info(f"Generated weekly report for child {child_id}")
-            return progress
+            self.logger.info(f"Generated weekly reports for {len(reports)} children")
+            return reports
 
         except Exception as e:
             self.logger.error(
-                f"Weekly report generation failed for child {child_id}: {e}"
+                f"Weekly report generation failed for {len(child_ids)} children: {e}"
             )
             raise
 
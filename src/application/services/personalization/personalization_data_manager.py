@@ -2,46 +2,240 @@
 """
 💾 Personalization Data Management Service
 خدمة إدارة بيانات التخصيص
+
+Child records live in an embedded SQLite table keyed by (child_id, kind),
+so saving one child's interaction touches only that child's rows.
+Changed children are tracked as dirty and written in batched group
+commits; every commit is a single WAL transaction, so a crash leaves
+either the old or the new state. A background thread commits staged
+changes every ``commit_interval_seconds`` and ``close`` (also run at
+interpreter exit) writes whatever is left. Legacy JSON files are
+migrated once.
 """
 
+import atexit
 import json
 import logging
+import sqlite3
+import threading
+import time
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .data_models import ChildPersonality, InteractionPattern, AdaptiveContent
 
 logger = logging.getLogger(__name__)
 
+PERSONALITY = "personality"
+PATTERNS = "interaction_patterns"
+CONTENT = "content_performance"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS child_records (
+    child_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (child_id, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _serialize_contents(contents: List[Any]) -> List[Dict]:
+    return [
+        asdict(content) if isinstance(content, AdaptiveContent) else content
+        for content in contents
+    ]
+
 
 class PersonalizationDataManager:
     """مدير بيانات التخصيص"""
 
-    def __init__(self, data_dir: str = "data/personalization"):
+    DB_NAME = "personalization.db"
+
+    def __init__(
+        self,
+        data_dir: str = "data/personalization",
+        commit_batch_size: int = 64,
+        commit_interval_seconds: float = 1.0,
+    ):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # مسارات الملفات
+        # مسارات الملفات القديمة (للترحيل فقط)
         self.personalities_file = self.data_dir / "personalities.json"
         self.patterns_file = self.data_dir / "interaction_patterns.json"
         self.content_file = self.data_dir / "content_performance.json"
+        self.db_path = self.data_dir / self.DB_NAME
+
+        # Group commit settings
+        self.commit_batch_size = commit_batch_size
+        self.commit_interval_seconds = commit_interval_seconds
+
+        # child_id -> (personality, patterns, contents) awaiting commit
+        self._dirty: Dict[str, Tuple[Any, Any, Any]] = {}
+        self._last_commit = time.monotonic()
+        self._lock = threading.RLock()
+
+        self._db = self._connect()
+        self._migrate_legacy_json()
+
+        # Timed flush so staged changes do not wait for the next mark_dirty
+        self._closed = False
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if commit_interval_seconds > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name="personalization-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        db.commit()
+        return db
+
+    # === Per-child API ===
+
+    def load_child(self, child_id: str) -> Dict[str, Any]:
+        """تحميل بيانات طفل واحد عند الطلب"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, data FROM child_records WHERE child_id = ?",
+                (child_id,),
+            ).fetchall()
+            record = {kind: json.loads(data) for kind, data in rows}
+
+            # Staged but not yet committed changes win
+            pending = self._dirty.get(child_id)
+            if pending is not None:
+                for kind, value in zip((PERSONALITY, PATTERNS, CONTENT),
+                                       self._serialize_child(*pending)):
+                    if value is not None:
+                        record[kind] = value
+
+        return record
+
+    def mark_dirty(
+        self,
+        child_id: str,
+        personality: Optional[ChildPersonality] = None,
+        patterns: Optional[InteractionPattern] = None,
+        contents: Optional[List[AdaptiveContent]] = None,
+    ) -> None:
+        """تسجيل تغيير بيانات طفل - تُكتب في دفعة لاحقة"""
+        with self._lock:
+            self._dirty[child_id] = (personality, patterns, contents)
+            if (len(self._dirty) >= self.commit_batch_size
+                    or time.monotonic() - self._last_commit
+                    >= self.commit_interval_seconds):
+                self.commit()
+
+    def commit(self) -> int:
+        """كتابة جميع التغييرات المعلقة في معاملة واحدة"""
+        with self._lock:
+            if not self._dirty:
+                self._last_commit = time.monotonic()
+                return 0
+
+            dirty, self._dirty = self._dirty, {}
+            now = time.time()
+            rows = []
+            for child_id, objects in dirty.items():
+                for kind, value in zip(
+                        (PERSONALITY, PATTERNS, CONTENT),
+                        self._serialize_child(*objects)):
+                    if value is not None:
+                        count = len(value) if kind == CONTENT else 1
+                        rows.append((child_id, kind, json.dumps(
+                            value, ensure_ascii=False), count, now))
+
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO child_records "
+                        "(child_id, kind, data, item_count, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                # Keep the changes staged so the next commit retries them
+                for child_id, objects in dirty.items():
+                    self._dirty.setdefault(child_id, objects)
+                logger.error(f"خطأ في حفظ البيانات: {e}")
+                return 0
+
+            self._last_commit = time.monotonic()
+            return len(dirty)
+
+    def flush(self) -> int:
+        """Alias of ``commit`` for shutdown paths"""
+        return self.commit()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flusher.wait(self.commit_interval_seconds):
+            with self._lock:
+                if self._dirty:
+                    self.commit()
+
+    def iter_child_ids(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT child_id FROM child_records").fetchall()
+        yield from (row[0] for row in rows)
+
+    def close(self) -> None:
+        """Stop the timed flush, write staged changes and close the database"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stop_flusher.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            self.commit()
+            self._db.close()
+        atexit.unregister(self.close)
+
+    @staticmethod
+    def _serialize_child(personality, patterns, contents) -> Tuple:
+        return (
+            asdict(personality) if personality is not None else None,
+            asdict(patterns) if patterns is not None else None,
+            _serialize_contents(contents) if contents is not None else None,
+        )
+
+    # === Whole-dataset API (kept for compatibility) ===
 
     def load_all_data(self) -> Dict[str, Dict]:
         """تحميل جميع البيانات"""
+        data = {"personalities": {}, "interaction_patterns": {},
+                "content_performance": {}}
+        keys = {PERSONALITY: "personalities", PATTERNS: "interaction_patterns",
+                CONTENT: "content_performance"}
         try:
-            return {
-                "personalities": self._load_personalities(),
-                "interaction_patterns": self._load_interaction_patterns(),
-                "content_performance": self._load_content_performance(),
-            }
+            self.commit()
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT child_id, kind, data FROM child_records").fetchall()
+            for child_id, kind, value in rows:
+                data[keys[kind]][child_id] = json.loads(value)
         except Exception as e:
             logger.error(f"خطأ في تحميل البيانات: {e}")
-            return {
-                "personalities": {},
-                "interaction_patterns": {},
-                "content_performance": {},
-            }
+        return data
 
     def save_all_data(
         self,
@@ -51,90 +245,76 @@ class PersonalizationDataManager:
     ) -> None:
         """حفظ جميع البيانات"""
         try:
-            self._save_personalities(personalities)
-            self._save_interaction_patterns(patterns)
-            self._save_content_performance(content_performance)
+            with self._lock:
+                for child_id in set(personalities) | set(patterns) | set(content_performance):
+                    self._dirty[child_id] = (
+                        personalities.get(child_id),
+                        patterns.get(child_id),
+                        content_performance.get(child_id),
+                    )
+                self.commit()
         except Exception as e:
             logger.error(f"خطأ في حفظ البيانات: {e}")
 
-    def _load_personalities(self) -> Dict[str, Dict]:
-        """تحميل بيانات الشخصيات"""
-        if not self.personalities_file.exists():
-            return {}
-
-        try:
-            with open(self.personalities_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"خطأ في تحميل بيانات الشخصيات: {e}")
-            return {}
-
-    def _load_interaction_patterns(self) -> Dict[str, Dict]:
-        """تحميل بيانات أنماط التفاعل"""
-        if not self.patterns_file.exists():
-            return {}
-
-        try:
-            with open(self.patterns_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"خطأ في تحميل أنماط التفاعل: {e}")
-            return {}
-
-    def _load_content_performance(self) -> Dict[str, list]:
-        """تحميل بيانات أداء المحتوى"""
-        if not self.content_file.exists():
-            return {}
-
-        try:
-            with open(self.content_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"خطأ في تحميل بيانات أداء المحتوى: {e}")
-            return {}
-
-    def _save_personalities(self,
-                            personalities: Dict[str,
-                                                ChildPersonality]) -> None:
-        """حفظ بيانات الشخصيات"""
-        try:
-            data = {
-                child_id: asdict(personality)
-                for child_id, personality in personalities.items()
-            }
-            with open(self.personalities_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"خطأ في حفظ بيانات الشخصيات: {e}")
-
-    def _save_interaction_patterns(
-        self, patterns: Dict[str, InteractionPattern]
-    ) -> None:
-        """حفظ بيانات أنماط التفاعل"""
-        try:
-            data = {child_id: asdict(pattern)
-                    for child_id, pattern in patterns.items()}
-            with open(self.patterns_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"خطأ في حفظ أنماط التفاعل: {e}")
-
-    def _save_content_performance(
-            self, content_performance: Dict[str, list]) -> None:
-        """حفظ بيانات أداء المحتوى"""
-        try:
-            # تحويل كائنات AdaptiveContent إلى قواميس
-            data = {}
-            for child_id, contents in content_performance.items():
-                data[child_id] = [
-                    asdict(content) if isinstance(content, AdaptiveContent) else content
-                    for content in contents
-                ]
-
-            with open(self.content_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"خطأ في حفظ بيانات أداء المحتوى: {e}")
+    # === Legacy JSON migration ===
+
+    def _migrate_legacy_json(self) -> None:
+        """ترحيل ملفات JSON القديمة إلى SQLite مرة واحدة"""
+        with self._lock:
+            migrated = self._db.execute(
+                "SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if migrated:
+            return
+
+        legacy_files = [self.personalities_file, self.patterns_file, self.content_file]
+        if any(path.exists() for path in legacy_files):
+            count = self._import_json_dir(self.data_dir)
+            for path in legacy_files:
+                if path.exists():
+                    # Kept for rollback; no longer read
+                    path.replace(path.with_suffix(".json.migrated"))
+            logger.info(f"تم ترحيل بيانات {count} طفل من JSON إلى SQLite")
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (str(time.time()),),
+            )
+
+    def _import_json_dir(self, directory: Path) -> int:
+        """Import legacy JSON files from a directory in one transaction"""
+        sources = [
+            (directory / "personalities.json", PERSONALITY),
+            (directory / "interaction_patterns.json", PATTERNS),
+            (directory / "content_performance.json", CONTENT),
+        ]
+        now = time.time()
+        rows = []
+        children = set()
+        for path, kind in sources:
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    records = json.load(f)
+            except Exception as e:
+                logger.error(f"خطأ في قراءة {path.name}: {e}")
+                continue
+            for child_id, value in records.items():
+                count = len(value) if kind == CONTENT else 1
+                rows.append((child_id, kind, json.dumps(value, ensure_ascii=False),
+                             count, now))
+                children.add(child_id)
+
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO child_records "
+                "(child_id, kind, data, item_count, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(children)
+
+    # === Backup and maintenance ===
 
     def backup_data(self, backup_suffix: str = None) -> bool:
         """إنشاء نسخة احتياطية من البيانات"""
@@ -147,17 +327,14 @@ class PersonalizationDataManager:
             backup_dir = self.data_dir / f"backup_{backup_suffix}"
             backup_dir.mkdir(exist_ok=True)
 
-            # نسخ الملفات
-            import shutil
-
-            for file_path in [
-                self.personalities_file,
-                self.patterns_file,
-                self.content_file,
-            ]:
-                if file_path.exists():
-                    backup_file = backup_dir / file_path.name
-                    shutil.copy2(file_path, backup_file)
+            # نسخة متسقة من قاعدة البيانات أثناء التشغيل
+            self.commit()
+            target = sqlite3.connect(str(backup_dir / self.DB_NAME))
+            try:
+                with self._lock:
+                    self._db.backup(target)
+            finally:
+                target.close()
 
             logger.info(f"تم إنشاء النسخة الاحتياطية في: {backup_dir}")
             return True
@@ -174,17 +351,20 @@ class PersonalizationDataManager:
                 logger.error(f"النسخة الاحتياطية غير موجودة: {backup_dir}")
                 return False
 
-            import shutil
-
-            for file_name in [
-                "personalities.json",
-                "interaction_patterns.json",
-                "content_performance.json",
-            ]:
-                backup_file = backup_dir / file_name
-                if backup_file.exists():
-                    target_file = self.data_dir / file_name
-                    shutil.copy2(backup_file, target_file)
+            backup_db = backup_dir / self.DB_NAME
+            with self._lock:
+                self._dirty.clear()
+                if backup_db.exists():
+                    source = sqlite3.connect(str(backup_db))
+                    try:
+                        source.backup(self._db)
+                    finally:
+                        source.close()
+                else:
+                    # Backups taken before the SQLite store hold JSON files
+                    with self._db:
+                        self._db.execute("DELETE FROM child_records")
+                    self._import_json_dir(backup_dir)
 
             logger.info(f"تم استعادة البيانات من: {backup_dir}")
             return True
@@ -196,38 +376,26 @@ class PersonalizationDataManager:
     def get_data_statistics(self) -> Dict[str, Any]:
         """إحصائيات البيانات المحفوظة"""
         try:
-            stats = {
-                "personalities_count": 0,
-                "patterns_count": 0,
-                "content_entries_count": 0,
-                "total_interactions": 0,
-                "file_sizes": {},
-            }
+            self.commit()
+            with self._lock:
+                counts = dict(self._db.execute(
+                    "SELECT kind, COUNT(*) FROM child_records GROUP BY kind"
+                ).fetchall())
+                content_entries = self._db.execute(
+                    "SELECT COALESCE(SUM(item_count), 0) FROM child_records "
+                    "WHERE kind = ?", (CONTENT,)
+                ).fetchone()[0]
 
-            # إحصائيات الملفات
-            for file_path, key in [
-                (self.personalities_file, "personalities"),
-                (self.patterns_file, "patterns"),
-                (self.content_file, "content"),
-            ]:
-                if file_path.exists():
-                    stats["file_sizes"][key] = file_path.stat().st_size
-
-                    # إحصائيات المحتوى
-                    if key == "personalities":
-                        data = self._load_personalities()
-                        stats["personalities_count"] = len(data)
-                    elif key == "patterns":
-                        data = self._load_interaction_patterns()
-                        stats["patterns_count"] = len(data)
-                    elif key == "content":
-                        data = self._load_content_performance()
-                        stats["content_entries_count"] = sum(
-                            len(contents) for contents in data.values()
-                        )
-                        stats["total_interactions"] = stats["content_entries_count"]
-
-            return stats
+            return {
+                "personalities_count": counts.get(PERSONALITY, 0),
+                "patterns_count": counts.get(PATTERNS, 0),
+                "content_entries_count": content_entries,
+                "total_interactions": content_entries,
+                "file_sizes": {
+                    "database": self.db_path.stat().st_size
+                    if self.db_path.exists() else 0
+                },
+            }
 
         except Exception as e:
             logger.error(f"خطأ في جمع الإحصائيات: {e}")
@@ -241,22 +409,36 @@ class PersonalizationDataManager:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             cutoff_str = cutoff_date.isoformat()
 
-            # تنظيف المحتوى القديم
-            content_data = self._load_content_performance()
             cleaned_count = 0
-
-            for child_id, contents in content_data.items():
-                original_count = len(contents)
-                # إبقاء المحتوى الحديث فقط
-                contents[:] = [
-                    content
-                    for content in contents
-                    if content.get("last_used", "") > cutoff_str
-                ]
-                cleaned_count += original_count - len(contents)
-
-            # حفظ البيانات المنظفة
-            self._save_content_performance(content_data)
+            # Read and rewrite under one lock so no update lands in between
+            with self._lock:
+                self.commit()
+                rows = self._db.execute(
+                    "SELECT child_id, data FROM child_records WHERE kind = ?",
+                    (CONTENT,),
+                ).fetchall()
+
+                updates = []
+                for child_id, value in rows:
+                    contents = json.loads(value)
+                    # إبقاء المحتوى الحديث فقط
+                    kept = [
+                        content
+                        for content in contents
+                        if content.get("last_used", "") > cutoff_str
+                    ]
+                    if len(kept) != len(contents):
+                        cleaned_count += len(contents) - len(kept)
+                        updates.append((json.dumps(kept, ensure_ascii=False),
+                                        len(kept), time.time(), child_id, CONTENT))
+
+                # حفظ البيانات المنظفة
+                with self._db:
+                    self._db.executemany(
+                        "UPDATE child_records SET data = ?, item_count = ?, "
+                        "updated_at = ? WHERE child_id = ? AND kind = ?",
+                        updates,
+                    )
 
             logger.info(f"تم تنظيف {cleaned_count} عنصر من البيانات القديمة")
             return True
@@ -22,7 +22,16 @@ from .providers import (
     FallbackProvider,
 )
 from .synthesis_service import ModernSynthesisService
+from .phrase_cache import (
+    PhraseAudioLibrary,
+    PhraseCacheConfig,
+    PhraseSynthesisLayer,
+    detect_audio_format,
+    split_into_phrases,
+    stitch_segments,
+)
 from .factory import (
+    create_phrase_synthesis_layer,
     create_synthesis_service,
     create_synthesis_service_legacy,
     create_synthesis_service_old,
@@ -52,7 +61,15 @@ __all__ = [
     # Main Service
     "ModernSynthesisService",
     "SynthesisService",  # Legacy alias
+    # Phrase-level cache
+    "PhraseAudioLibrary",
+    "PhraseCacheConfig",
+    "PhraseSynthesisLayer",
+    "detect_audio_format",
+    "split_into_phrases",
+    "stitch_segments",
     # Factory Functions
+    "create_phrase_synthesis_layer",
     "create_synthesis_service",
     "create_synthesis_service_legacy",
     "create_synthesis_service_old",
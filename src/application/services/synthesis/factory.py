@@ -9,6 +9,7 @@ import warnings
 from typing import Dict, Optional
 
 from .models import SynthesisConfig, SynthesisServiceCredentials
+from .phrase_cache import PhraseCacheConfig, PhraseSynthesisLayer
 from .synthesis_service import ModernSynthesisService
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,26 @@ async def create_synthesis_service(
         raise
 
 
+async def create_phrase_synthesis_layer(
+    config: Optional[SynthesisConfig] = None,
+    credentials: Optional[SynthesisServiceCredentials] = None,
+    phrase_config: Optional[PhraseCacheConfig] = None,
+) -> PhraseSynthesisLayer:
+    """
+    🧩 Factory function for a synthesis service behind the phrase cache
+
+    Recurring phrases are served from the on-disk phrase library; only
+    misses reach the providers. Call ``close()`` on shutdown to write
+    pending library index updates.
+
+    Example:
+        >>> layer = await create_phrase_synthesis_layer(credentials=credentials)
+        >>> audio = await layer.synthesize("Great job! Let's read a story.")
+    """
+    service = await create_synthesis_service(config=config, credentials=credentials)
+    return PhraseSynthesisLayer(service, phrase_config)
+
+
 async def create_synthesis_service_legacy(
     config: Optional[SynthesisConfig] = None,
     api_keys: Optional[Dict[str, str]] = None,
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+🧩 Phrase-Level Synthesis Cache
+تخزين الصوت على مستوى العبارات - إعادة استخدام العبارات المتكررة
+
+Teddy replies are dominated by recurring phrases (greetings, praise,
+apologies, story openers). Replies are split into normalized phrases, each
+phrase is looked up in a persistent per-character/emotion audio library,
+only the misses are sent to the provider, and the segments are stitched.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import re
+import time
+import unicodedata
+import wave
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.value_objects import EmotionalTone
+
+from .synthesis_service import ModernSynthesisService
+
+logger = logging.getLogger(__name__)
+
+# Sentence and clause boundaries, including Arabic punctuation
+_PHRASE_BOUNDARY = re.compile(r"(?<=[.!?؟،;؛:\n])\s+")
+_WHITESPACE = re.compile(r"\s+")
+# Directory-safe voice/emotion names; anything else is hashed
+_SAFE_SEGMENT = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+@dataclass
+class PhraseCacheConfig:
+    """Configuration for the phrase-level synthesis cache"""
+
+    library_path: Path = Path("data/tts_phrase_library")
+    # auto (sniffed per segment) | pcm16 (raw, headerless) | wav | mp3 | ogg
+    audio_format: str = "auto"
+    sample_rate: int = 24000  # only used for raw pcm16
+    crossfade_ms: float = 15.0
+    min_phrase_chars: int = 12
+    max_phrase_chars: int = 160
+    max_concurrent_syntheses: int = 4
+    # New phrases per partition before its index.json is rewritten
+    index_flush_every: int = 32
+
+
+def normalize_phrase(text: str) -> str:
+    """Canonical display form of a phrase (NFKC, collapsed whitespace)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def phrase_key(text: str) -> str:
+    """Case-insensitive cache key of a phrase"""
+    return normalize_phrase(text).casefold()
+
+
+def split_into_phrases(
+    text: str, min_chars: int = 12, max_chars: int = 160
+) -> List[str]:
+    """Split a reply into cacheable phrases.
+
+    Fragments shorter than ``min_chars`` are merged into the following
+    phrase so prosody is not broken into single words.
+    """
+    fragments = [
+        normalize_phrase(part)
+        for part in _PHRASE_BOUNDARY.split(normalize_phrase(text))
+    ]
+
+    phrases: List[str] = []
+    pending = ""
+    for fragment in fragments:
+        if not fragment:
+            continue
+        candidate = f"{pending} {fragment}".strip() if pending else fragment
+        if len(candidate) < min_chars:
+            pending = candidate
+            continue
+        if pending and len(candidate) > max_chars:
+            phrases.append(pending)
+            candidate = fragment
+        phrases.append(candidate)
+        pending = ""
+
+    if pending:
+        if phrases and len(phrases[-1]) + len(pending) < max_chars:
+            phrases[-1] = f"{phrases[-1]} {pending}"
+        else:
+            phrases.append(pending)
+
+    return phrases
+
+
+def detect_audio_format(data: bytes) -> Optional[str]:
+    """Sniff a container format from its magic bytes (None if unknown)"""
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "wav"
+    if data[:4] == b"OggS":
+        return "ogg"
+    if data[:3] == b"ID3" or (
+        len(data) > 1 and data[0] == 0xFF and data[1] & 0xE0 == 0xE0
+    ):
+        return "mp3"
+    return None
+
+
+def _strip_id3(data: bytes) -> bytes:
+    """Drop a leading ID3v2 tag so MP3 segments concatenate cleanly"""
+    if data[:3] != b"ID3" or len(data) < 10:
+        return data
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    return data[10 + size:]
+
+
+def _crossfade(chunks: List[np.ndarray], fade: int) -> np.ndarray:
+    """Linear crossfade of (frames, channels) int16 chunks"""
+    output = chunks[0].astype(np.float32)
+    for chunk in chunks[1:]:
+        samples = chunk.astype(np.float32)
+        overlap = min(fade, len(output), len(samples))
+        if overlap:
+            ramp = np.linspace(0.0, 1.0, overlap, dtype=np.float32)[:, None]
+            mixed = output[-overlap:] * (1.0 - ramp) + samples[:overlap] * ramp
+            output = np.concatenate(
+                (output[:-overlap], mixed, samples[overlap:]))
+        else:
+            output = np.concatenate((output, samples))
+    return np.clip(output, -32768, 32767).astype(np.int16)
+
+
+def _stitch_pcm16(segments: List[bytes], sample_rate: int, crossfade_ms: float) -> bytes:
+    if any(len(segment) % 2 for segment in segments):
+        raise ValueError("pcm16 segment has an odd byte length")
+    chunks = [np.frombuffer(segment, dtype=np.int16)[:, None] for segment in segments]
+    fade = int(sample_rate * crossfade_ms / 1000)
+    return _crossfade(chunks, fade).tobytes()
+
+
+def _stitch_wav(segments: List[bytes], crossfade_ms: float) -> bytes:
+    params = None
+    chunks = []
+    for segment in segments:
+        with wave.open(io.BytesIO(segment), "rb") as reader:
+            shape = (reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+            if params is None:
+                params = shape
+            elif shape != params:
+                raise ValueError(f"WAV segments disagree: {shape} != {params}")
+            frames = reader.readframes(reader.getnframes())
+        if params[1] != 2:
+            raise ValueError("only 16-bit WAV segments can be crossfaded")
+        chunks.append(np.frombuffer(frames, dtype=np.int16).reshape(-1, params[0]))
+
+    channels, sample_width, rate = params
+    output = io.BytesIO()
+    with wave.open(output, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(sample_width)
+        writer.setframerate(rate)
+        writer.writeframes(_crossfade(chunks, int(rate * crossfade_ms / 1000)).tobytes())
+    return output.getvalue()
+
+
+def stitch_segments(
+    segments: List[bytes],
+    audio_format: str = "auto",
+    sample_rate: int = 24000,
+    crossfade_ms: float = 15.0,
+) -> bytes:
+    """Join audio segments.
+
+    Raw 16-bit PCM and 16-bit WAV segments are joined with a linear
+    crossfade. MP3 frames and chained Ogg/Opus pages are concatenated.
+    ``auto`` sniffs the container of every segment; mixed or unrecognised
+    formats raise ``ValueError`` rather than producing corrupt audio.
+    """
+    segments = [segment for segment in segments if segment]
+    if not segments:
+        return b""
+
+    if audio_format == "auto":
+        formats = {detect_audio_format(segment) for segment in segments}
+        if len(formats) != 1 or None in formats:
+            raise ValueError(f"Cannot stitch audio segments of formats {formats}")
+        audio_format = formats.pop()
+
+    if audio_format == "pcm16":
+        return _stitch_pcm16(segments, sample_rate, crossfade_ms)
+    if len(segments) == 1:
+        return segments[0]
+    if audio_format == "wav":
+        return _stitch_wav(segments, crossfade_ms)
+    if audio_format == "mp3":
+        return segments[0] + b"".join(_strip_id3(s) for s in segments[1:])
+    if audio_format in ("ogg", "opus"):
+        return b"".join(segments)
+    raise ValueError(f"Unsupported audio format: {audio_format}")
+
+
+class PhraseAudioLibrary:
+    """Persistent phrase → audio library, partitioned by voice and emotion.
+
+    Audio files are written on every ``put``; a partition's ``index.json``
+    only every ``index_flush_every`` new phrases and on :meth:`flush`.
+    Audio files missing from an index are picked up again on load.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        audio_format: str = "auto",
+        index_flush_every: int = 32,
+    ):
+        self.base_path = Path(base_path)
+        self.audio_format = audio_format
+        self.index_flush_every = max(1, index_flush_every)
+        # (voice, emotion) -> {digest: metadata}, keyed by directory names
+        self._index: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._unflushed: Dict[Tuple[str, str], int] = {}
+        self._load_index()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        """Directory name for a voice or emotion; never a path"""
+        if _SAFE_SEGMENT.match(name):
+            return name
+        return "h-" + hashlib.sha256(name.encode("utf-8")).hexdigest()[:32]
+
+    def _key(self, voice: str, emotion: str) -> Tuple[str, str]:
+        return self._safe_name(voice), self._safe_name(emotion)
+
+    def _partition(self, key: Tuple[str, str]) -> Path:
+        return self.base_path / self.audio_format / key[0] / key[1]
+
+    def _load_index(self) -> None:
+        """Load per-partition indexes plus any audio written since"""
+        root = self.base_path / self.audio_format
+        if not root.exists():
+            return
+
+        for partition in root.glob("*/*/"):
+            key = (partition.parent.name, partition.name)
+            entries: Dict[str, Dict[str, Any]] = {}
+            index_file = partition / "index.json"
+            if index_file.exists():
+                try:
+                    entries = json.loads(index_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"⚠️ Unreadable phrase index {index_file}: {e}")
+            for audio_file in partition.glob("*.bin"):
+                entries.setdefault(
+                    audio_file.stem,
+                    {"bytes": audio_file.stat().st_size, "provider_seconds": 0.0, "hits": 0},
+                )
+            if entries:
+                self._index[key] = entries
+
+    def contains(self, voice: str, emotion: str, text: str) -> bool:
+        partition = self._index.get(self._key(voice, emotion), {})
+        return self._digest(phrase_key(text)) in partition
+
+    def get(self, voice: str, emotion: str, text: str) -> Optional[Tuple[bytes, float]]:
+        """Return (audio, provider_seconds) for a cached phrase"""
+        key = self._key(voice, emotion)
+        digest = self._digest(phrase_key(text))
+        partition = self._index.get(key, {})
+        meta = partition.get(digest)
+        if meta is None:
+            return None
+
+        try:
+            audio = (self._partition(key) / f"{digest}.bin").read_bytes()
+        except OSError:
+            partition.pop(digest, None)
+            return None
+
+        meta["hits"] = meta.get("hits", 0) + 1
+        return audio, meta.get("provider_seconds", 0.0)
+
+    def put(
+        self,
+        voice: str,
+        emotion: str,
+        text: str,
+        audio: bytes,
+        provider_seconds: float,
+    ) -> None:
+        """Store a phrase's audio atomically; the index is written in batches"""
+        key = self._key(voice, emotion)
+        digest = self._digest(phrase_key(text))
+        partition = self._partition(key)
+        partition.mkdir(parents=True, exist_ok=True)
+
+        audio_path = partition / f"{digest}.bin"
+        tmp_path = audio_path.with_suffix(".tmp")
+        tmp_path.write_bytes(audio)
+        tmp_path.replace(audio_path)
+
+        self._index.setdefault(key, {})[digest] = {
+            "text": normalize_phrase(text),
+            "bytes": len(audio),
+            "provider_seconds": provider_seconds,
+            "hits": 0,
+        }
+        self._unflushed[key] = self._unflushed.get(key, 0) + 1
+        if self._unflushed[key] >= self.index_flush_every:
+            self._write_partition_index(key)
+
+    def flush(self) -> int:
+        """Write every partition index with unflushed phrases"""
+        keys = list(self._unflushed)
+        for key in keys:
+            self._write_partition_index(key)
+        return len(keys)
+
+    def _write_partition_index(self, key: Tuple[str, str]) -> None:
+        entries = self._index.get(key, {})
+        index_path = self._partition(key) / "index.json"
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(index_path)
+        self._unflushed.pop(key, None)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+
+class PhraseSynthesisLayer:
+    """
+    🧩 Phrase-segmenting synthesis over ``ModernSynthesisService``
+
+    Only phrases missing from the library are synthesized; all phrase
+    lookups and misses are tracked for hit-ratio and provider-time metrics.
+    """
+
+    def __init__(
+        self,
+        synthesis_service: ModernSynthesisService,
+        config: Optional[PhraseCacheConfig] = None,
+        library: Optional[PhraseAudioLibrary] = None,
+    ):
+        self.synthesis_service = synthesis_service
+        self.config = config or PhraseCacheConfig()
+        self.library = library or PhraseAudioLibrary(
+            self.config.library_path,
+            self.config.audio_format,
+            self.config.index_flush_every,
+        )
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent_syntheses)
+        self.stats = {
+            "phrase_hits": 0,
+            "phrase_misses": 0,
+            "provider_seconds": 0.0,
+            "provider_seconds_saved": 0.0,
+        }
+
+    async def synthesize(
+        self,
+        text: str,
+        emotion: EmotionalTone = EmotionalTone.FRIENDLY,
+        character_id: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """Synthesize a reply from cached and freshly rendered phrases"""
+        phrases = split_into_phrases(
+            text, self.config.min_phrase_chars, self.config.max_phrase_chars
+        )
+        if not phrases:
+            return None
+
+        voice = character_id or "default"
+        emotion_key = getattr(emotion, "value", str(emotion))
+        segments: List[Optional[bytes]] = [None] * len(phrases)
+        misses: List[int] = []
+
+        for i, phrase in enumerate(phrases):
+            cached = self.library.get(voice, emotion_key, phrase)
+            if cached is None:
+                misses.append(i)
+                continue
+            segments[i] = cached[0]
+            self.stats["phrase_hits"] += 1
+            self.stats["provider_seconds_saved"] += cached[1]
+
+        rendered = await asyncio.gather(
+            *(
+                self._render_phrase(
+                    phrases[i], voice, emotion_key, emotion, character_id, language
+                )
+                for i in misses
+            )
+        )
+        for i, audio in zip(misses, rendered):
+            if audio is None:
+                # Keep the reply intact rather than dropping a phrase
+                logger.warning("⚠️ Phrase synthesis failed, rendering full reply")
+                return await self.synthesis_service.synthesize_audio(
+                    text, emotion, character_id, language
+                )
+            segments[i] = audio
+
+        try:
+            return stitch_segments(
+                segments,
+                self.config.audio_format,
+                self.config.sample_rate,
+                self.config.crossfade_ms,
+            )
+        except (ValueError, wave.Error) as e:
+            logger.warning(f"⚠️ Cannot stitch phrase audio ({e}), rendering full reply")
+            return await self.synthesis_service.synthesize_audio(
+                text, emotion, character_id, language
+            )
+
+    async def _render_phrase(
+        self,
+        phrase: str,
+        voice: str,
+        emotion_key: str,
+        emotion: EmotionalTone,
+        character_id: Optional[str],
+        language: Optional[str],
+    ) -> Optional[bytes]:
+        async with self._semaphore:
+            start_time = time.time()
+            audio = await self.synthesis_service.synthesize_audio(
+                phrase, emotion, character_id, language
+            )
+            provider_seconds = time.time() - start_time
+
+        self.stats["phrase_misses"] += 1
+        self.stats["provider_seconds"] += provider_seconds
+        if audio:
+            self.library.put(voice, emotion_key, phrase, audio, provider_seconds)
+        return audio
+
+    async def prerender_phrases(
+        self,
+        phrases: Iterable[str],
+        character_ids: Iterable[Optional[str]],
+        emotion: EmotionalTone = EmotionalTone.FRIENDLY,
+        language: Optional[str] = None,
+    ) -> int:
+        """Offline job: render phrases for each character, skipping cached ones"""
+        emotion_key = getattr(emotion, "value", str(emotion))
+        jobs = []
+        for character_id in character_ids:
+            voice = character_id or "default"
+            for phrase in phrases:
+                if not self.library.contains(voice, emotion_key, phrase):
+                    jobs.append(
+                        self._render_phrase(
+                            phrase, voice, emotion_key, emotion, character_id, language
+                        )
+                    )
+
+        results = await asyncio.gather(*jobs)
+        self.library.flush()
+        rendered = sum(1 for audio in results if audio)
+        logger.info(f"🧩 Pre-rendered {rendered}/{len(jobs)} phrases")
+        return rendered
+
+    async def prerender_top_phrases(
+        self,
+        corpus: Iterable[str],
+        character_ids: Iterable[Optional[str]],
+        top_n: int = 200,
+        emotion: EmotionalTone = EmotionalTone.FRIENDLY,
+        language: Optional[str] = None,
+    ) -> int:
+        """Offline job: pre-render the top-N phrases of a reply corpus"""
+        counts: Counter = Counter()
+        display: Dict[str, str] = {}
+        for reply in corpus:
+            for phrase in split_into_phrases(
+                reply, self.config.min_phrase_chars, self.config.max_phrase_chars
+            ):
+                key = phrase_key(phrase)
+                counts[key] += 1
+                display.setdefault(key, phrase)
+
+        top_phrases = [display[key] for key, _ in counts.most_common(top_n)]
+        return await self.prerender_phrases(
+            top_phrases, list(character_ids), emotion, language
+        )
+
+    def close(self) -> None:
+        """Write any pending library index updates"""
+        self.library.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit ratio and provider time saved"""
+        lookups = self.stats["phrase_hits"] + self.stats["phrase_misses"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["phrase_hits"] / lookups if lookups else 0.0,
+            "library_size": len(self.library),
+        }
@@ -9,6 +9,7 @@ Original God Class has been refactored into:
 """
 
 import json
+import logging
 import os
 import sqlite3
 import uuid
@@ -36,6 +37,7 @@ from src.domain.child.services.child_interaction_service import (
 from src.infrastructure.persistence.base import QueryOptions, SearchCriteria, SortOrder
 from src.infrastructure.persistence.base_sqlite_repository import BaseSQLiteRepository
 from src.infrastructure.persistence.child_repository import ChildRepository
+from src.infrastructure.persistence.sqlite.sqlite_async_pool import AsyncSQLitePool
 
 
 class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
@@ -52,19 +54,29 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
         db_path: str = os.path.join(
             os.path.dirname(__file__), "..", "..", "..", "data", "teddyai.db"
         ),
+        pool: Optional[AsyncSQLitePool] = None,
     ):
+        """With a ``pool`` no direct connection is opened and every query
+        runs on the pool's connection threads."""
         self.session_factory = session_factory
+        self.logger = logging.getLogger(__name__)
 
-        # Ensure data directory exists
-        data_dir = os.path.dirname(db_path)
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir, exist_ok=True)
+        if pool is None:
+            # Ensure data directory exists
+            data_dir = os.path.dirname(db_path)
+            if not os.path.exists(data_dir):
+                os.makedirs(data_dir, exist_ok=True)
 
-        # Create connection
-        connection = sqlite3.connect(db_path, check_same_thread=False)
+            # Create connection
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+        else:
+            connection = None
 
         super().__init__(
-            connection=connection, table_name="children", entity_class=Child
+            connection=connection,
+            table_name="children",
+            entity_class=Child,
+            pool=pool,
         )
 
         # Initialize domain services
@@ -124,21 +136,21 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
     async def create(self, child: Child) -> Child:
         """Create a new child profile"""
         try:
-            with self.transaction() as cursor:
-                data = self._serialize_child_for_db(child)
+            data = self._serialize_child_for_db(child)
 
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join(["?" for _ in data])
-                sql = (
-                    f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
-                )
+            columns = ", ".join(data.keys())
+            placeholders = ", ".join(["?" for _ in data])
+            sql = (
+                f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
+            )
 
-                cursor.execute(sql, list(data.values()))
+            await self._executor.write(
+                lambda conn: conn.execute(sql, list(data.values())))
 
-                if not child.id:
-                    child.id = data["id"]
+            if not child.id:
+                child.id = data["id"]
 
-                return child
+            return child
 
         except sqlite3.Error as e:
             self.logger.error(f"Error creating child: {e}")
@@ -147,11 +159,9 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
     async def get_by_id(self, child_id: str) -> Optional[Child]:
         """Retrieve child by ID"""
         try:
-            cursor = self._connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE id = ? AND is_active = 1"
-            cursor.execute(sql, (child_id,))
-
-            row = cursor.fetchone()
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (child_id,)).fetchone())
             if row:
                 return self._deserialize_child_from_db(dict(row))
             return None
@@ -163,16 +173,16 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
     async def update(self, child: Child) -> Child:
         """Update existing child profile by delegating query prep to a helper."""
         try:
-            with self.transaction() as cursor:
-                data = self._serialize_child_for_db(child)
-                sql, update_values = self._prepare_update_query(data)
+            data = self._serialize_child_for_db(child)
+            sql, update_values = self._prepare_update_query(data)
 
-                cursor.execute(sql, update_values)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, update_values).rowcount)
 
-                if cursor.rowcount == 0:
-                    raise ValueError(f"No child found with ID {data['id']}")
+            if rowcount == 0:
+                raise ValueError(f"No child found with ID {data['id']}")
 
-                return child
+            return child
 
         except sqlite3.Error as e:
             self.logger.error(f"Error updating child: {e}")
@@ -196,10 +206,11 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
     async def delete(self, child_id: str) -> bool:
         """Soft delete child (mark as inactive)"""
         try:
-            with self.transaction() as cursor:
-                sql = f"UPDATE {self.table_name} SET is_active = 0, updated_at = ? WHERE id = ?"
-                cursor.execute(sql, (datetime.now().isoformat(), child_id))
-                return cursor.rowcount > 0
+            sql = f"UPDATE {self.table_name} SET is_active = 0, updated_at = ? WHERE id = ?"
+            params = (datetime.now().isoformat(), child_id)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, params).rowcount)
+            return rowcount > 0
 
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting child {child_id}: {e}")
@@ -225,15 +236,14 @@ class ChildSQLiteRepository(BaseSQLiteRepository[Child, int], ChildRepository):
             options: Optional[QueryOptions] = None) -> List[Child]:
         """List active children with optional filtering and sorting"""
         try:
-            cursor = self._connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE is_active = 1"
 
             if options:
                 sql = self._add_sorting_to_query(sql, options)
                 sql = self._add_pagination_to_query(sql, options)
 
-            cursor.execute(sql)
-            rows = cursor.fetchall()
+            rows = await self._executor.read(
+                lambda conn: conn.execute(sql).fetchall())
 
             return [self._deserialize_child_from_db(dict(row)) for row in rows]
 
@@ -3,6 +3,7 @@ Domain Reporting Services
 Core reporting domain services and analyzers
 """
 
+from .batch_progress_engine import BatchProgressEngine
 from .behavior_analyzer import BehaviorAnalyzer
 from .emotion_analyzer_service import EmotionAnalyzerService
 from .progress_analyzer import ProgressAnalyzer
@@ -13,4 +14,5 @@ __all__ = [
     "EmotionAnalyzerService",
     "SkillAnalyzer",
     "BehaviorAnalyzer",
+    "BatchProgressEngine",
 ]
@@ -0,0 +1,441 @@
+"""
+Batch Progress Engine
+Computes progress metrics for many children in grouped vectorized passes
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.report_models import (
+    ChildProgress,
+    EmotionDistribution,
+    InteractionAnalysis,
+    ReportPeriod,
+    SkillAnalysis,
+)
+
+# Fields of ChildProgress produced by the engine
+METRIC_FIELDS = (
+    "total_interactions",
+    "avg_daily_interactions",
+    "longest_conversation",
+    "favorite_topics",
+    "emotion_analysis",
+    "mood_trends",
+    "attention_span",
+    "response_time",
+    "vocabulary_growth",
+    "question_frequency",
+    "skill_analysis",
+)
+
+
+class _Vocabulary:
+    """String -> dense integer code"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@dataclass
+class InteractionFrame:
+    """Columnar view of interactions for many children.
+
+    Rows are grouped by child (in input order); multi-valued fields are
+    stored as (row, code[, value]) pairs.
+    """
+
+    child_ids: List[str]
+    child: np.ndarray  # per row: child index
+    day: np.ndarray  # per row: date ordinal
+    duration: np.ndarray  # per row: seconds
+    quality: np.ndarray
+    primary_emotion: np.ndarray  # per row: emotion code
+    topic_count: np.ndarray
+    emotion_row: np.ndarray
+    emotion_code: np.ndarray
+    emotion_score: np.ndarray
+    topic_row: np.ndarray
+    topic_code: np.ndarray
+    skill_row: np.ndarray
+    skill_code: np.ndarray
+    emotions: List[str]
+    topics: List[str]
+    skills: List[str]
+
+    @classmethod
+    def from_interactions(
+        cls, interactions_by_child: Mapping[str, Sequence[InteractionAnalysis]]
+    ) -> "InteractionFrame":
+        emotions, topics, skills = _Vocabulary(), _Vocabulary(), _Vocabulary()
+        child, day, duration, quality, primary, topic_count = [], [], [], [], [], []
+        emotion_row, emotion_code, emotion_score = [], [], []
+        topic_row, topic_code = [], []
+        skill_row, skill_code = [], []
+
+        child_ids = list(interactions_by_child)
+        row = 0
+        emotion_code_of, topic_code_of, skill_code_of = (
+            emotions.code, topics.code, skills.code)
+        for child_index, child_id in enumerate(child_ids):
+            interactions = interactions_by_child[child_id]
+            child.extend([child_index] * len(interactions))
+            for interaction in interactions:
+                day.append(interaction.timestamp.toordinal())
+                duration.append(interaction.duration)
+                quality.append(interaction.quality_score)
+                primary.append(emotion_code_of(interaction.primary_emotion))
+                topic_count.append(len(interaction.topics_discussed))
+
+                for emotion, score in interaction.emotions.items():
+                    emotion_row.append(row)
+                    emotion_code.append(emotion_code_of(emotion))
+                    emotion_score.append(score)
+                for topic in interaction.topics_discussed:
+                    topic_row.append(row)
+                    topic_code.append(topic_code_of(topic))
+                for skill in interaction.skills_used:
+                    skill_row.append(row)
+                    skill_code.append(skill_code_of(skill))
+                row += 1
+
+        def ints(values):
+            return np.asarray(values, dtype=np.int64)
+
+        def floats(values):
+            return np.asarray(values, dtype=np.float64)
+
+        return cls(
+            child_ids=child_ids,
+            child=ints(child),
+            day=ints(day),
+            duration=floats(duration),
+            quality=floats(quality),
+            primary_emotion=ints(primary),
+            topic_count=ints(topic_count),
+            emotion_row=ints(emotion_row),
+            emotion_code=ints(emotion_code),
+            emotion_score=floats(emotion_score),
+            topic_row=ints(topic_row),
+            topic_code=ints(topic_code),
+            skill_row=ints(skill_row),
+            skill_code=ints(skill_code),
+            emotions=emotions.values,
+            topics=topics.values,
+            skills=skills.values,
+        )
+
+    def __len__(self) -> int:
+        return len(self.child)
+
+
+def _grouped_counts(
+    child: np.ndarray, codes: np.ndarray, vocabulary_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per (child, code) occurrence count and first occurrence, sorted by child.
+
+    Returns (child, code, count, first_seen) for every pair that occurs;
+    ``first_seen`` is the index of the first occurrence in ``codes``, which
+    reproduces dict/Counter insertion order.
+    """
+    keys = child * max(vocabulary_size, 1) + codes
+    unique, first_seen, counts = np.unique(
+        keys, return_index=True, return_counts=True)
+    return (
+        unique // max(vocabulary_size, 1),
+        unique % max(vocabulary_size, 1),
+        counts,
+        first_seen,
+    )
+
+
+def _group_bounds(sorted_groups: np.ndarray, group_count: int) -> np.ndarray:
+    """Start offsets of each group in an array sorted by group"""
+    return np.searchsorted(sorted_groups, np.arange(group_count + 1))
+
+
+def _empty_metrics() -> Dict[str, Any]:
+    """Metrics for a child without interactions (matches the analyzers)"""
+    return {
+        "total_interactions": 0,
+        "avg_daily_interactions": 0.0,
+        "longest_conversation": 0,
+        "favorite_topics": [],
+        "emotion_analysis": EmotionDistribution(
+            emotions={}, dominant_emotion="neutral", stability_score=0.0
+        ),
+        "mood_trends": {},
+        "attention_span": 0.0,
+        "response_time": 0.0,
+        "vocabulary_growth": 0,
+        "question_frequency": 0.0,
+        "skill_analysis": SkillAnalysis(
+            skills_practiced={},
+            new_skills_learned=[],
+            improvement_areas=[],
+            mastery_level={},
+        ),
+    }
+
+
+def compute_frame_metrics(
+    frame: InteractionFrame, start_date: datetime, end_date: datetime
+) -> Dict[str, Dict[str, Any]]:
+    """All progress metrics for every child in the frame.
+
+    Each metric reproduces the per-child ``ProgressAnalyzer`` /
+    ``SkillAnalyzer`` computation as one grouped pass over all rows.
+    """
+    children = len(frame.child_ids)
+    results = {child_id: _empty_metrics() for child_id in frame.child_ids}
+    if len(frame) == 0:
+        return results
+
+    child = frame.child
+    counts = np.bincount(child, minlength=children)
+    safe_counts = np.maximum(counts, 1)
+    row_bounds = _group_bounds(child, children)
+    period_days = max((end_date - start_date).days, 1)
+
+    # Scalar metrics
+    durations_min = frame.duration / 60.0
+    longest = np.zeros(children)
+    nonempty = counts > 0
+    longest[nonempty] = np.maximum.reduceat(
+        frame.duration, row_bounds[:-1][nonempty])
+    attention = np.bincount(child, durations_min, children) / safe_counts
+    avg_quality = np.bincount(child, frame.quality, children) / safe_counts
+    response_time = np.maximum(1.0, 10.0 - avg_quality * 8.0)
+    high_quality = np.bincount(
+        child, (frame.quality >= 0.7).astype(np.float64), children)
+    questions = np.bincount(
+        child,
+        frame.topic_count * np.minimum(durations_min / 5, 3.0) * frame.quality,
+        children,
+    ) / safe_counts
+
+    # Emotional stability: primary emotion changes between consecutive rows
+    same_child = child[1:] == child[:-1]
+    changed = same_child & (frame.primary_emotion[1:] != frame.primary_emotion[:-1])
+    changes = np.bincount(child[1:][changed], minlength=children)
+    stability = np.where(
+        counts >= 2,
+        np.clip(1.0 - changes / np.maximum(counts - 1, 1), 0.0, 1.0),
+        1.0,
+    )
+
+    # Emotion totals per (child, emotion), first-seen order per child
+    emotion_count = len(frame.emotions)
+    emotion_child = child[frame.emotion_row]
+    e_child, e_code, _, e_first = _grouped_counts(
+        emotion_child, frame.emotion_code, emotion_count)
+    emotion_pair = np.searchsorted(
+        e_child * max(emotion_count, 1) + e_code,
+        emotion_child * max(emotion_count, 1) + frame.emotion_code,
+    )
+    emotion_totals = np.bincount(emotion_pair, frame.emotion_score, len(e_code))
+    e_order = np.lexsort((e_first, e_child))
+    e_bounds = _group_bounds(e_child[e_order], children)
+
+    # Daily mood: mean score per (child, day, emotion), absent emotion = 0
+    start_day = start_date.date().toordinal()
+    total_days = (end_date.date() - start_date.date()).days + 1
+    row_day = frame.day - start_day
+    in_range = (row_day >= 0) & (row_day < total_days)
+    day_counts = np.bincount(
+        (child * total_days + row_day)[in_range], minlength=children * total_days
+    ).reshape(children, total_days)
+    emotion_day = row_day[frame.emotion_row]
+    emotion_in_range = in_range[frame.emotion_row]
+    mood_sums = np.bincount(
+        (emotion_pair * total_days + emotion_day)[emotion_in_range],
+        frame.emotion_score[emotion_in_range],
+        len(e_code) * total_days,
+    ).reshape(len(e_code), total_days)
+    pair_day_counts = day_counts[e_child]
+    mood_means = np.divide(
+        mood_sums,
+        pair_day_counts,
+        out=np.zeros_like(mood_sums),
+        where=pair_day_counts > 0,
+    ).tolist()
+
+    # Topics: top 5 by count, ties by first mention
+    t_child, t_code, t_count, t_first = _grouped_counts(
+        child[frame.topic_row], frame.topic_code, len(frame.topics))
+    t_order = np.lexsort((t_first, -t_count, t_child))
+    t_bounds = _group_bounds(t_child[t_order], children)
+
+    # Skills: usage counts in first-use order
+    s_child, s_code, s_count, s_first = _grouped_counts(
+        child[frame.skill_row], frame.skill_code, len(frame.skills))
+    s_order = np.lexsort((s_first, s_child))
+    s_bounds = _group_bounds(s_child[s_order], children)
+
+    for index, child_id in enumerate(frame.child_ids):
+        if not counts[index]:
+            continue
+
+        metrics = results[child_id]
+        metrics.update(
+            total_interactions=int(counts[index]),
+            avg_daily_interactions=float(counts[index] / period_days),
+            longest_conversation=int(longest[index] / 60),
+            attention_span=float(attention[index]),
+            response_time=float(response_time[index]),
+            vocabulary_growth=int(high_quality[index] * 1.5),
+            question_frequency=float(questions[index]),
+        )
+
+        pairs = e_order[e_bounds[index]:e_bounds[index + 1]]
+        totals = emotion_totals[pairs]
+        total_score = totals.sum()
+        names = [frame.emotions[code] for code in e_code[pairs]]
+        percentages = (
+            dict(zip(names, (totals / total_score).tolist())) if total_score else {}
+        )
+        metrics["emotion_analysis"] = EmotionDistribution(
+            emotions=percentages,
+            dominant_emotion=(
+                max(percentages.items(), key=lambda item: item[1])[0]
+                if percentages else "neutral"
+            ),
+            stability_score=float(stability[index]),
+        )
+
+        metrics["mood_trends"] = {
+            name: mood_means[pair] for name, pair in zip(names, pairs)
+        }
+
+        top_topics = t_order[t_bounds[index]:t_bounds[index + 1]][:5]
+        metrics["favorite_topics"] = [frame.topics[c] for c in t_code[top_topics]]
+
+        skill_pairs = s_order[s_bounds[index]:s_bounds[index + 1]]
+        skill_counts = dict(zip(
+            (frame.skills[c] for c in s_code[skill_pairs]),
+            s_count[skill_pairs].tolist(),
+        ))
+        max_count = max(skill_counts.values()) if skill_counts else 1
+        new_skills = [s for s, c in skill_counts.items() if c <= 2]
+        metrics["skill_analysis"] = SkillAnalysis(
+            skills_practiced=skill_counts,
+            new_skills_learned=new_skills,
+            improvement_areas=[
+                s for s, c in skill_counts.items() if c <= 3 and s not in new_skills
+            ],
+            mastery_level={
+                s: min(c / max_count, 1.0) for s, c in skill_counts.items()
+            },
+        )
+
+    return results
+
+
+def _compute_chunk(
+    interactions_by_child: Dict[str, List[InteractionAnalysis]],
+    start_date: datetime,
+    end_date: datetime,
+) -> Dict[str, Dict[str, Any]]:
+    frame = InteractionFrame.from_interactions(interactions_by_child)
+    return compute_frame_metrics(frame, start_date, end_date)
+
+
+class BatchProgressEngine:
+    """
+    Vectorized progress metrics for one or many children.
+
+    Children are processed in chunks so peak memory stays bounded; with
+    ``max_workers`` > 1 the chunks run in worker processes.
+    """
+
+    def __init__(self, chunk_size: int = 5000, max_workers: Optional[int] = None):
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def compute_metrics(
+        self,
+        interactions_by_child: Mapping[str, Sequence[InteractionAnalysis]],
+        period: ReportPeriod,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Metrics keyed by child id, named after ``ChildProgress`` fields"""
+        child_ids = list(interactions_by_child)
+        chunks = [
+            {cid: list(interactions_by_child[cid])
+             for cid in child_ids[i:i + self.chunk_size]}
+            for i in range(0, len(child_ids), self.chunk_size)
+        ]
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if self.max_workers and self.max_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(_compute_chunk, chunk,
+                                period.start_date, period.end_date)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    results.update(future.result())
+        else:
+            for chunk in chunks:
+                results.update(
+                    _compute_chunk(chunk, period.start_date, period.end_date))
+
+        self.logger.debug(f"Computed progress metrics for {len(results)} children")
+        return results
+
+    def compute_child_metrics(
+        self,
+        child_id: str,
+        interactions: Sequence[InteractionAnalysis],
+        period: ReportPeriod,
+    ) -> Dict[str, Any]:
+        """Single-child on-demand metrics through the same engine"""
+        return self.compute_metrics({child_id: interactions}, period)[child_id]
+
+    @staticmethod
+    def build_child_progress(
+        child_id: str,
+        child_info: Dict[str, Any],
+        period: ReportPeriod,
+        metrics: Dict[str, Any],
+        **extras: Any,
+    ) -> ChildProgress:
+        """Assemble a ``ChildProgress``; ``extras`` fill (or override) other fields"""
+        fields = {
+            "learning_achievements": [],
+            "recommended_activities": [],
+            "empathy_indicators": 0,
+            "sharing_behavior": 0,
+            "cooperation_level": 0.0,
+            "sleep_pattern_quality": None,
+            "bedtime_conversations": 0,
+            "concerning_patterns": [],
+            "urgent_recommendations": [],
+        }
+        fields.update({name: metrics[name] for name in METRIC_FIELDS})
+        fields.update(extras)
+
+        return ChildProgress(
+            child_id=child_id,
+            child_name=child_info.get("name", "Unknown"),
+            age=child_info.get("age", 5),
+            period=period,
+            **fields,
+        )
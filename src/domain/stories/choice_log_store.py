@@ -0,0 +1,318 @@
+"""
+Per-child story choice log with incremental aggregates.
+
+Choices are partitioned by (child, device) and then by calendar day. Each
+day segment stores its rows column-wise and keeps running sums/counts per
+trait and choice type, so a windowed analysis only touches the day
+segments in the window (and scans rows of the boundary day). Segments are
+persisted per month as columnar JSON; only months that changed are
+rewritten on ``flush``.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChoiceLogSegment:
+    """One day of one child's choices, stored column-wise"""
+
+    def __init__(self, day: int):
+        self.day = day  # date ordinal
+        self.ids: List[str] = []
+        self.timestamps = array("d")
+        self.story_ids: List[str] = []
+        self.scene_ids: List[str] = []
+        self.choice_ids: List[str] = []
+        self.choice_types: List[str] = []
+        self.response_times = array("d")  # NaN when missing
+        # Scores are flattened: row i owns score_traits/score_values[offsets[i]:offsets[i+1]]
+        self.score_offsets = array("I", [0])
+        self.score_traits: List[str] = []
+        self.score_values = array("d")
+        self.voice_analysis: Dict[int, Dict] = {}
+
+        self.trait_sums: Dict[str, float] = {}
+        self.trait_counts: Dict[str, int] = {}
+        self.choice_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(
+        self,
+        log_id: str,
+        timestamp: float,
+        story_id: str,
+        scene_id: str,
+        choice_id: str,
+        choice_type: str,
+        behavioral_scores: Dict[str, float],
+        voice_analysis: Optional[Dict] = None,
+        response_time: Optional[float] = None,
+    ) -> None:
+        # Keep rows time-ordered so the boundary day can be bisected
+        row = bisect.bisect_right(self.timestamps, timestamp)
+        if row != len(self.ids):
+            self._insert(row, log_id, timestamp, story_id, scene_id, choice_id,
+                         choice_type, behavioral_scores, voice_analysis, response_time)
+            return
+
+        self.ids.append(log_id)
+        self.timestamps.append(timestamp)
+        self.story_ids.append(story_id)
+        self.scene_ids.append(scene_id)
+        self.choice_ids.append(choice_id)
+        self.choice_types.append(choice_type)
+        self.response_times.append(
+            float("nan") if response_time is None else response_time)
+        for trait, score in behavioral_scores.items():
+            self.score_traits.append(trait)
+            self.score_values.append(score)
+        self.score_offsets.append(len(self.score_traits))
+        if voice_analysis is not None:
+            self.voice_analysis[row] = voice_analysis
+
+        for trait, score in behavioral_scores.items():
+            self.trait_sums[trait] = self.trait_sums.get(trait, 0.0) + score
+            self.trait_counts[trait] = self.trait_counts.get(trait, 0) + 1
+        self.choice_counts[choice_type] = self.choice_counts.get(choice_type, 0) + 1
+
+    def _insert(self, row: int, *values) -> None:
+        """Rare out-of-order insert: rebuild the segment with the new row"""
+        rows = list(self.rows())
+        rows.insert(row, values)
+        self.__init__(self.day)
+        for values in rows:
+            self.append(*values)
+
+    def scores(self, row: int) -> Dict[str, float]:
+        start, end = self.score_offsets[row], self.score_offsets[row + 1]
+        return dict(zip(self.score_traits[start:end], self.score_values[start:end]))
+
+    def rows(self) -> Iterator[Tuple]:
+        """Rows in the argument order of ``append``"""
+        for row in range(len(self.ids)):
+            response_time = self.response_times[row]
+            yield (
+                self.ids[row],
+                self.timestamps[row],
+                self.story_ids[row],
+                self.scene_ids[row],
+                self.choice_ids[row],
+                self.choice_types[row],
+                self.scores(row),
+                self.voice_analysis.get(row),
+                None if response_time != response_time else response_time,
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "day": self.day,
+            "ids": self.ids,
+            "timestamps": self.timestamps.tolist(),
+            "story_ids": self.story_ids,
+            "scene_ids": self.scene_ids,
+            "choice_ids": self.choice_ids,
+            "choice_types": self.choice_types,
+            "response_times": [
+                None if t != t else t for t in self.response_times],
+            "score_offsets": self.score_offsets.tolist(),
+            "score_traits": self.score_traits,
+            "score_values": self.score_values.tolist(),
+            "voice_analysis": {str(k): v for k, v in self.voice_analysis.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChoiceLogSegment":
+        segment = cls(data["day"])
+        offsets = data["score_offsets"]
+        voice = {int(k): v for k, v in data.get("voice_analysis", {}).items()}
+        for row, log_id in enumerate(data["ids"]):
+            start, end = offsets[row], offsets[row + 1]
+            segment.append(
+                log_id,
+                data["timestamps"][row],
+                data["story_ids"][row],
+                data["scene_ids"][row],
+                data["choice_ids"][row],
+                data["choice_types"][row],
+                dict(zip(data["score_traits"][start:end],
+                         data["score_values"][start:end])),
+                voice.get(row),
+                data["response_times"][row],
+            )
+        return segment
+
+
+class ChildChoiceLog:
+    """All day segments for one (child, device)"""
+
+    def __init__(self):
+        self.days: List[int] = []  # sorted day ordinals
+        self.segments: Dict[int, ChoiceLogSegment] = {}
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments.values())
+
+    def segment_for(self, day: int) -> ChoiceLogSegment:
+        segment = self.segments.get(day)
+        if segment is None:
+            segment = self.segments[day] = ChoiceLogSegment(day)
+            bisect.insort(self.days, day)
+        return segment
+
+    def add_segment(self, segment: ChoiceLogSegment) -> None:
+        if segment.day not in self.segments:
+            bisect.insort(self.days, segment.day)
+        self.segments[segment.day] = segment
+
+    def window_aggregates(
+        self, cutoff: datetime
+    ) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, int], int]:
+        """(trait_sums, trait_counts, choice_counts, total) since cutoff"""
+        cutoff_day = cutoff.toordinal()
+        cutoff_ts = cutoff.timestamp()
+        trait_sums: Dict[str, float] = {}
+        trait_counts: Dict[str, int] = {}
+        choice_counts: Dict[str, int] = {}
+        total = 0
+
+        for day in self.days[bisect.bisect_left(self.days, cutoff_day):]:
+            segment = self.segments[day]
+            if day == cutoff_day:
+                # Boundary day: only rows at or after the cutoff time
+                for row in range(
+                        bisect.bisect_left(segment.timestamps, cutoff_ts), len(segment)):
+                    for trait, score in segment.scores(row).items():
+                        trait_sums[trait] = trait_sums.get(trait, 0.0) + score
+                        trait_counts[trait] = trait_counts.get(trait, 0) + 1
+                    choice_type = segment.choice_types[row]
+                    choice_counts[choice_type] = choice_counts.get(choice_type, 0) + 1
+                    total += 1
+                continue
+
+            for trait, value in segment.trait_sums.items():
+                trait_sums[trait] = trait_sums.get(trait, 0.0) + value
+            for trait, count in segment.trait_counts.items():
+                trait_counts[trait] = trait_counts.get(trait, 0) + count
+            for choice_type, count in segment.choice_counts.items():
+                choice_counts[choice_type] = choice_counts.get(choice_type, 0) + count
+            total += len(segment)
+
+        return trait_sums, trait_counts, choice_counts, total
+
+    def iter_rows(self, newest_first: bool = False) -> Iterator[Tuple]:
+        days = reversed(self.days) if newest_first else self.days
+        for day in days:
+            rows = list(self.segments[day].rows())
+            yield from (reversed(rows) if newest_first else rows)
+
+
+class ChoiceLogStore:
+    """Choice logs partitioned by (child, device), persisted per month"""
+
+    def __init__(self, storage_dir: Optional[Path] = None):
+        self.storage_dir = Path(storage_dir) if storage_dir else None
+        self._logs: Dict[Tuple[str, str], ChildChoiceLog] = {}
+        self._dirty_months: Dict[Tuple[str, str], set] = {}
+        self._loaded: set = set()
+
+    @staticmethod
+    def _partition_id(child_name: str, device_id: str) -> str:
+        # Hashed so child names never appear in file paths
+        return hashlib.sha256(
+            f"{child_name}\x00{device_id}".encode("utf-8")).hexdigest()[:32]
+
+    def _month_key(self, day: int) -> str:
+        return date.fromordinal(day).strftime("%Y-%m")
+
+    def _partition(self, child_name: str, device_id: str) -> ChildChoiceLog:
+        key = (child_name, device_id)
+        if key not in self._loaded:
+            self._loaded.add(key)
+            self._logs[key] = self._load(child_name, device_id)
+        return self._logs[key]
+
+    def __len__(self) -> int:
+        return sum(len(log) for log in self._logs.values())
+
+    def append(self, log) -> None:
+        """Append a ``StoryChoiceLog``"""
+        partition = self._partition(log.child_name, log.device_id)
+        day = log.timestamp.toordinal()
+        partition.segment_for(day).append(
+            log.id,
+            log.timestamp.timestamp(),
+            log.story_id,
+            log.scene_id,
+            log.choice_id,
+            log.choice_type.value,
+            log.behavioral_scores,
+            log.voice_analysis,
+            log.response_time,
+        )
+        self._dirty_months.setdefault(
+            (log.child_name, log.device_id), set()).add(self._month_key(day))
+
+    def window_aggregates(
+        self, child_name: str, device_id: str, cutoff: datetime
+    ) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, int], int]:
+        return self._partition(child_name, device_id).window_aggregates(cutoff)
+
+    def iter_rows(
+        self, child_name: str, device_id: str, newest_first: bool = False
+    ) -> Iterator[Tuple]:
+        return self._partition(child_name, device_id).iter_rows(newest_first)
+
+    def flush(self) -> int:
+        """Write changed month files; returns the number of files written"""
+        if self.storage_dir is None:
+            self._dirty_months.clear()
+            return 0
+
+        written = 0
+        for (child_name, device_id), months in self._dirty_months.items():
+            partition = self._logs[(child_name, device_id)]
+            directory = self.storage_dir / self._partition_id(child_name, device_id)
+            directory.mkdir(parents=True, exist_ok=True)
+
+            for month in months:
+                segments = [
+                    partition.segments[day].to_dict()
+                    for day in partition.days
+                    if self._month_key(day) == month
+                ]
+                path = directory / f"{month}.json"
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_text(
+                    json.dumps({"segments": segments}, ensure_ascii=False),
+                    encoding="utf-8")
+                tmp_path.replace(path)
+                written += 1
+
+        self._dirty_months.clear()
+        return written
+
+    def _load(self, child_name: str, device_id: str) -> ChildChoiceLog:
+        partition = ChildChoiceLog()
+        if self.storage_dir is None:
+            return partition
+
+        directory = self.storage_dir / self._partition_id(child_name, device_id)
+        for path in sorted(directory.glob("*.json")):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable choice log {path}: {e}")
+                continue
+            for segment_data in data.get("segments", []):
+                partition.add_segment(ChoiceLogSegment.from_dict(segment_data))
+        return partition
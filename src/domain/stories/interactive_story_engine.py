@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from .choice_log_store import ChoiceLogStore
+
 
 class StoryType(Enum):
     """أنواع القصص"""
@@ -96,9 +98,10 @@ class BehavioralPattern:
 class InteractiveStoryEngine:
     """محرك القصص التفاعلي المتقدم"""
 
-    def __init__(self):
+    def __init__(self, choice_log_dir: Optional[Path] = None):
         self.stories: Dict[str, Dict] = {}
-        self.choice_logs: List[StoryChoiceLog] = []
+        # سجلات مقسمة لكل (طفل، جهاز) حسب اليوم مع مجاميع تراكمية
+        self.choice_logs = ChoiceLogStore(choice_log_dir)
         self.behavioral_patterns: Dict[str, List[BehavioralPattern]] = {}
         self._load_stored_stories()
 
@@ -311,6 +314,9 @@ class InteractiveStoryEngine:
         scene_for_display = self._format_scene_for_display(
             next_scene, story_state)
 
+        if next_scene.is_ending:
+            self.flush_choice_logs()
+
         return {
             "story_state": story_state,
             "scene": scene_for_display,
@@ -363,50 +369,35 @@ class InteractiveStoryEngine:
             "encouragement": encouragement,
         }
 
-    def _filter_logs(
+    def flush_choice_logs(self) -> int:
+        """Persist choice logs changed since the last flush."""
+        return self.choice_logs.flush()
+
+    def _aggregate_scores(
         self, child_name: str, device_id: str, days_back: int
-    ) -> List[StoryChoiceLog]:
-        """Filters choice logs for a specific child and timeframe."""
+    ) -> (Dict, Dict, int):
+        """Windowed trait averages and choice distribution from day aggregates."""
         cutoff_date = datetime.now() - timedelta(days=days_back)
-        return [
-            log
-            for log in self.choice_logs
-            if log.child_name == child_name
-            and log.device_id == device_id
-            and log.timestamp >= cutoff_date
-        ]
-
-    def _aggregate_scores(self, logs: List[StoryChoiceLog]) -> (Dict, Dict):
-        """Aggregates behavioral scores and choice types from logs."""
-        behavioral_scores = {}
-        choice_type_distribution = {}
-
-        for log in logs:
-            for trait, score in log.behavioral_scores.items():
-                behavioral_scores.setdefault(trait, []).append(score)
-
-            choice_type = log.choice_type.value
-            choice_type_distribution[choice_type] = (
-                choice_type_distribution.get(choice_type, 0) + 1
-            )
+        trait_sums, trait_counts, choice_distribution, total = (
+            self.choice_logs.window_aggregates(child_name, device_id, cutoff_date)
+        )
 
         behavioral_averages = {
-            trait: sum(scores) / len(scores)
-            for trait, scores in behavioral_scores.items()
+            trait: trait_sums[trait] / count
+            for trait, count in trait_counts.items()
         }
-        return behavioral_averages, choice_type_distribution
+        return behavioral_averages, choice_distribution, total
 
     def analyze_behavioral_patterns(
         self, child_name: str, device_id: str, days_back: int = 30
     ) -> Dict[str, Any]:
         """تحليل الأنماط السلوكية للطفل"""
-        relevant_logs = self._filter_logs(child_name, device_id, days_back)
+        behavioral_averages, choice_distribution, total_choices = (
+            self._aggregate_scores(child_name, device_id, days_back)
+        )
 
-        if not relevant_logs:
+        if not total_choices:
             return {"message": "لا توجد بيانات كافية للتحليل"}
-
-        behavioral_averages, choice_distribution = self._aggregate_scores(
-            relevant_logs)
         patterns = self._identify_patterns(
             behavioral_averages, choice_distribution)
         recommendations = self._generate_parent_recommendations(
@@ -416,7 +407,7 @@ class InteractiveStoryEngine:
         return {
             "child_name": child_name,
             "analysis_period": f"{days_back} days",
-            "total_choices": len(relevant_logs),
+            "total_choices": total_choices,
             "behavioral_averages": behavioral_averages,
             "choice_distribution": choice_distribution,
             "patterns_identified": patterns,
@@ -504,24 +495,20 @@ class InteractiveStoryEngine:
             child_name: str,
             device_id: str) -> List[Dict]:
         """الحصول على تاريخ اختيارات الطفل"""
-        relevant_logs = [
+        return [
             {
-                "story_id": log.story_id,
-                "scene_id": log.scene_id,
-                "choice_type": log.choice_type.value,
-                "behavioral_scores": log.behavioral_scores,
-                "timestamp": log.timestamp.isoformat(),
-                "voice_analysis": log.voice_analysis,
+                "story_id": story_id,
+                "scene_id": scene_id,
+                "choice_type": choice_type,
+                "behavioral_scores": scores,
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "voice_analysis": voice_analysis,
             }
-            for log in self.choice_logs
-            if log.child_name == child_name and log.device_id == device_id
+            for (_, timestamp, story_id, scene_id, _, choice_type, scores,
+                 voice_analysis, _) in self.choice_logs.iter_rows(
+                child_name, device_id, newest_first=True)
         ]
 
-        return sorted(
-            relevant_logs,
-            key=lambda x: x["timestamp"],
-            reverse=True)
-
     def generate_story_report(self, child_name: str,
                               device_id: str) -> Dict[str, Any]:
         """توليد تقرير شامل عن القصص والسلوك"""
@@ -0,0 +1,301 @@
+"""
+Level 4 content-addressed blob store for large audio payloads.
+
+Blobs are stored once per SHA-256 digest in hash-sharded directories.
+``open_view`` reads them back through ``mmap`` so they can be handed to
+WebSocket/HTTP writers without an extra copy. A SQLite index tracks size
+and last access for LRU eviction under a byte budget; Redis only needs to
+hold the digest.
+"""
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from src.infrastructure.caching.models import CacheConfig
+
+
+@dataclass(frozen=True)
+class BlobPointer:
+    """Reference to a blob stored in the L4 blob store."""
+    digest: str
+    size: int
+
+
+class ContentAddressedBlobStore:
+    """Hash-sharded on-disk blob store with LRU byte budget."""
+
+    def __init__(
+        self,
+        root_dir: str,
+        max_bytes: int,
+        high_watermark: float = 0.95,
+        low_watermark: float = 0.80,
+        eviction_interval_seconds: float = 30.0,
+    ):
+        self.root = Path(root_dir)
+        self.max_bytes = max_bytes
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.eviction_interval_seconds = eviction_interval_seconds
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.root / "index.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_blobs_last_access "
+            "ON blobs(last_access)"
+        )
+        self._db.commit()
+
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        self.total_bytes = int(row[0])
+
+        # Access times are batched in memory and flushed by the evictor
+        self._pending_access: Dict[str, float] = {}
+        self._eviction_task: Optional[asyncio.Task] = None
+
+        self.stats = {"puts": 0, "dedup_hits": 0, "reads": 0,
+                      "misses": 0, "evictions": 0, "evicted_bytes": 0}
+        self.logger = logging.getLogger(
+            f"{__name__}.{self.__class__.__name__}")
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "ContentAddressedBlobStore":
+        """Create a store from the L4 settings of a cache config."""
+        return cls(
+            root_dir=config.l4_cache_dir,
+            max_bytes=config.l4_max_size_gb * 1024 ** 3,
+        )
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    # ------------------------------------------------------------------
+    # Synchronous API (safe to call from worker threads)
+    # ------------------------------------------------------------------
+
+    def put_bytes(self, data: bytes) -> BlobPointer:
+        """Store data, returning its pointer. Identical data is stored once.
+
+        The blob is written to a private temp file outside the lock; moving
+        it into place and inserting the index row happen under the lock,
+        so concurrent puts of one digest count its bytes exactly once.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path_for(digest)
+        pointer = BlobPointer(digest, len(data))
+
+        with self._lock:
+            if self._dedup_locked(digest, path):
+                return pointer
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+        try:
+            with self._lock:
+                if self._dedup_locked(digest, path):
+                    return pointer
+                os.replace(tmp_path, path)
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size, last_access) "
+                    "VALUES (?, ?, ?)",
+                    (digest, len(data), time.time()),
+                )
+                if cursor.rowcount == 1:
+                    self.total_bytes += len(data)
+                self._db.commit()
+                self.stats["puts"] += 1
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        return pointer
+
+    def _dedup_locked(self, digest: str, path: Path) -> bool:
+        """True (and access recorded) if the blob is already stored"""
+        exists = self._db.execute(
+            "SELECT 1 FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        if not (exists and path.exists()):
+            return False
+        self._pending_access[digest] = time.time()
+        self.stats["dedup_hits"] += 1
+        return True
+
+    @contextmanager
+    def open_view(self, digest: str) -> Iterator[Optional[memoryview]]:
+        """Zero-copy read: yields a memoryview over an mmap of the blob.
+
+        Yields None if the blob is not stored. The view is only valid inside
+        the ``with`` block; eviction may unlink the file meanwhile, which
+        leaves the mapping readable on POSIX.
+        """
+        try:
+            f = open(self._path_for(digest), "rb")
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            yield None
+            return
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._touch(digest)
+                yield memoryview(b"")
+                return
+
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                self._touch(digest)
+                yield view
+            finally:
+                view.release()
+                mapped.close()
+
+    def get_bytes(self, digest: str) -> Optional[bytes]:
+        """Read a blob, or None if it is not stored (copies; see open_view)."""
+        try:
+            data = self._path_for(digest).read_bytes()
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        self._touch(digest)
+        return data
+
+    def contains(self, digest: str) -> bool:
+        return self._path_for(digest).exists()
+
+    def delete(self, digest: str) -> bool:
+        with self._lock:
+            return self._delete_locked(digest)
+
+    def _touch(self, digest: str) -> None:
+        self.stats["reads"] += 1
+        self._pending_access[digest] = time.time()
+
+    def _delete_locked(self, digest: str) -> bool:
+        row = self._db.execute(
+            "SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        self._db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+        self._pending_access.pop(digest, None)
+        try:
+            self._path_for(digest).unlink()
+        except FileNotFoundError:
+            pass
+        if row:
+            self.total_bytes -= int(row[0])
+        return row is not None
+
+    def flush_access_times(self) -> None:
+        """Persist batched last-access updates."""
+        with self._lock:
+            if not self._pending_access:
+                return
+            updates = [(ts, digest) for digest, ts in self._pending_access.items()]
+            self._pending_access.clear()
+            self._db.executemany(
+                "UPDATE blobs SET last_access = ? WHERE digest = ?", updates)
+            self._db.commit()
+
+    def evict_if_needed(self) -> int:
+        """Evict least recently accessed blobs down to the low watermark."""
+        if self.total_bytes <= self.max_bytes * self.high_watermark:
+            return 0
+
+        self.flush_access_times()
+        target = self.max_bytes * self.low_watermark
+        evicted = 0
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT digest, size FROM blobs ORDER BY last_access ASC")
+            victims = []
+            projected = self.total_bytes
+            for digest, size in rows:
+                if projected <= target:
+                    break
+                victims.append(digest)
+                projected -= size
+
+            for digest in victims:
+                size_before = self.total_bytes
+                if self._delete_locked(digest):
+                    evicted += 1
+                    self.stats["evicted_bytes"] += size_before - self.total_bytes
+            self._db.commit()
+
+        self.stats["evictions"] += evicted
+        if evicted:
+            self.logger.info(
+                f"L4 blob store evicted {evicted} blobs "
+                f"({self.total_bytes / 1024 ** 2:.1f} MB in use)")
+        return evicted
+
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+
+    async def put(self, data: bytes) -> BlobPointer:
+        return await asyncio.to_thread(self.put_bytes, data)
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.get_bytes, digest)
+
+    def start_background_eviction(self) -> None:
+        """Start the periodic access-time flush and eviction task."""
+        if self._eviction_task is None or self._eviction_task.done():
+            self._eviction_task = asyncio.create_task(self._eviction_loop())
+
+    async def _eviction_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.eviction_interval_seconds)
+                await asyncio.to_thread(self.flush_access_times)
+                await asyncio.to_thread(self.evict_if_needed)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"L4 blob store eviction error: {e}")
+
+    async def close(self) -> None:
+        if self._eviction_task:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+        self.flush_access_times()
+        with self._lock:
+            self._db.close()
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            **self.stats,
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "utilization": self.total_bytes / self.max_bytes if self.max_bytes else 0.0,
+        }
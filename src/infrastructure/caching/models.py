@@ -63,6 +63,7 @@ class CacheConfig:
     l4_cache_dir: str = "/tmp/teddy_cache"
     l4_max_size_gb: int = 10
     l4_ttl_seconds: int = 604800
+    l4_min_blob_bytes: int = 32 * 1024
 
     # Performance settings
     compression_enabled: bool = True
@@ -21,6 +21,10 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 from src.infrastructure.caching.layers.l1_memory_cache import L1MemoryCache
 from src.infrastructure.caching.layers.l2_redis_cache import L2RedisCache
 from src.infrastructure.caching.layers.l3_cdn_cache import L3CDNCache
+from src.infrastructure.caching.layers.l4_blob_store import (
+    BlobPointer,
+    ContentAddressedBlobStore,
+)
 from src.infrastructure.caching.models import (
     CacheConfig,
     CacheLayer,
@@ -29,6 +33,10 @@ from src.infrastructure.caching.models import (
 )
 
 
+# Content types whose large binary payloads go to the L4 blob store
+BLOB_CONTENT_TYPES = {ContentType.VOICE_SYNTHESIS, ContentType.AUDIO_TRANSCRIPTION}
+
+
 class MultiLayerCache:
     """Enterprise-grade multi-layer caching system."""
 
@@ -42,6 +50,9 @@ class MultiLayerCache:
             self.config) if self.config.l2_enabled else None
         self.l3_cache = L3CDNCache(
             self.config) if self.config.l3_enabled else None
+        # Large audio blobs live on disk; L1/L2 only hold a BlobPointer
+        self.l4_store = ContentAddressedBlobStore.from_config(
+            self.config) if self.config.l4_enabled else None
 
         # Performance metrics
         self.metrics = CacheMetrics()
@@ -61,6 +72,9 @@ class MultiLayerCache:
             if self.l2_cache:
                 await self.l2_cache.initialize()
 
+            if self.l4_store:
+                self.l4_store.start_background_eviction()
+
             # Start background tasks
             if self.config.cache_warming_enabled:
                 task = asyncio.create_task(self._cache_warming_task())
@@ -88,12 +102,15 @@ class MultiLayerCache:
         """Get value with multi-layer fallback."""
         start_time = time.time()
         self.metrics.total_requests += 1
+        # Blobs already found missing during this lookup
+        missing_blobs: set = set()
 
         try:
             # L1 Memory Cache
             if self.l1_cache:
                 l1_start = time.time()
-                value = await self.l1_cache.get(key)
+                value = await self._resolve_blob(
+                    await self.l1_cache.get(key), missing_blobs)
                 l1_time = (time.time() - l1_start) * 1000
                 self.metrics.l1_latency_ms += l1_time
 
@@ -109,18 +126,19 @@ class MultiLayerCache:
             # L2 Redis Cache
             if self.l2_cache:
                 l2_start = time.time()
-                value = await self.l2_cache.get(key)
+                stored = await self.l2_cache.get(key)
+                value = await self._resolve_blob(stored, missing_blobs)
                 l2_time = (time.time() - l2_start) * 1000
                 self.metrics.l2_latency_ms += l2_time
 
                 if value is not None:
                     self.metrics.l2_hits += 1
 
-                    # Populate L1 cache
+                    # Populate L1 cache (with the pointer for blobs)
                     if self.l1_cache:
                         config = self.content_configs[content_type]
                         await self.l1_cache.set(
-                            key, value, content_type, config['l1_ttl']
+                            key, stored, content_type, config['l1_ttl']
                         )
 
                     self.metrics.total_latency_ms += (
@@ -184,6 +202,7 @@ class MultiLayerCache:
             self.metrics.write_operations += 1
 
             success = True
+            value = await self._store_blob(value, content_type)
 
             # L1 Memory Cache
             if self.l1_cache and config['use_l1']:
@@ -303,6 +322,43 @@ class MultiLayerCache:
         if self.l1_cache and config['use_l1']:
             await self.l1_cache.set(key, value, content_type, config['l1_ttl'])
 
+    async def _store_blob(self, value: Any, content_type: ContentType) -> Any:
+        """Move large audio payloads to the L4 blob store, returning a pointer."""
+        if (self.l4_store is None
+                or content_type not in BLOB_CONTENT_TYPES
+                or not isinstance(value, (bytes, bytearray))
+                or len(value) < self.config.l4_min_blob_bytes):
+            return value
+
+        try:
+            return await self.l4_store.put(bytes(value))
+        except OSError as e:
+            self.logger.error(f"L4 blob store write failed: {e}")
+            return value
+
+    async def _resolve_blob(self, value: Any, missing: Optional[set] = None) -> Any:
+        """Replace a BlobPointer with its bytes (None if it was evicted).
+
+        ``missing`` collects digests already found evicted during one
+        lookup, so L1 and L2 holding the same pointer count one L4 miss.
+        """
+        if not isinstance(value, BlobPointer):
+            return value
+
+        if self.l4_store is None:
+            return None
+        if missing is not None and value.digest in missing:
+            return None
+
+        data = await self.l4_store.get(value.digest)
+        if data is None:
+            self.metrics.l4_misses += 1
+            if missing is not None:
+                missing.add(value.digest)
+        else:
+            self.metrics.l4_hits += 1
+        return data
+
     def _setup_content_configs(self) -> Dict[ContentType, Dict[str, Any]]:
         """Setup cache configurations for different content types."""
         return {
@@ -415,6 +471,8 @@ class MultiLayerCache:
         # Add layer statistics
         if self.l1_cache:
             metrics_dict["l1_stats"] = self.l1_cache.get_stats()
+        if self.l4_store:
+            metrics_dict["l4_stats"] = self.l4_store.get_stats()
 
         return metrics_dict
 
@@ -478,6 +536,9 @@ class MultiLayerCache:
             if self.l2_cache and self.l2_cache.redis_client and hasattr(self.l2_cache.redis_client, 'close'):
                 await self.l2_cache.redis_client.close()
 
+            if self.l4_store:
+                await self.l4_store.close()
+
             self.logger.info("Multi-layer cache cleanup completed")
 
         except Exception as e:
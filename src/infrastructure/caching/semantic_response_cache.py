@@ -0,0 +1,337 @@
+"""
+Semantic response cache for repeated child questions.
+
+Exact-match response caches miss on trivially different phrasings
+("why is the sky blue" / "why the sky is blue?"). This cache embeds the
+normalized question locally (hashing vectorizer, no network), partitions
+entries by content type, age band and language, and serves the best
+cached response above a cosine similarity threshold. Filler words are
+dropped but negations and word order are kept, so "is a dog bigger than a
+cat" never answers "is a cat bigger than a dog". Every hit is re-moderated
+against the current rules before it is returned.
+"""
+
+import logging
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.services.content_moderator import ContentModerator
+from src.infrastructure.caching.models import ContentType
+from src.infrastructure.memory.memory_vector_index import HashingTextVectorizer
+
+# Arabic diacritics and tatweel carry no meaning for matching
+_ARABIC_MARKS = re.compile(r"[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_LETTER_FORMS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه"})
+_NON_WORD = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE = re.compile(r"\s+")
+_CONTRACTIONS = (
+    (re.compile(r"\bcan[’']t\b"), "can not"),
+    (re.compile(r"\bwon[’']t\b"), "will not"),
+    (re.compile(r"\bcannot\b"), "can not"),
+    (re.compile(r"n[’']t\b"), " not"),
+)
+
+# Filler words that do not change what a question asks
+_STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "am", "was", "were", "be", "been",
+    "do", "does", "did", "it", "its", "this", "that", "these", "those",
+    "please", "هل", "يا",
+})
+_NEGATIONS = frozenset({
+    "not", "no", "never", "nothing", "nobody", "none",
+    "لا", "لم", "لن", "ليس", "ليست", "غير",
+})
+_NEGATION = "not"
+
+# Nearest entries checked against the negation and word-order guards
+_CANDIDATES = 4
+
+PartitionKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class SemanticCacheConfig:
+    """Configuration for the semantic response cache (opt-in)."""
+    enabled: bool = False
+    similarity_threshold: float = 0.92
+    dimension: int = 512
+    max_entries_per_partition: int = 5000
+    ttl_seconds: int = 1800
+    default_language: str = "ar"
+
+
+def normalize_question(text: str) -> str:
+    """Canonical form of a question: NFKC, case-folded, no punctuation."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    for pattern, replacement in _CONTRACTIONS:
+        text = pattern.sub(replacement, text)
+    text = _ARABIC_MARKS.sub("", text).translate(_ARABIC_LETTER_FORMS)
+    text = _NON_WORD.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_tokens(normalized: str) -> Tuple[str, ...]:
+    """Words of a normalized question without filler, negations unified."""
+    return tuple(
+        _NEGATION if word in _NEGATIONS else word
+        for word in normalized.split()
+        if word not in _STOPWORDS
+    )
+
+
+def _same_meaning(first: Tuple[str, ...], second: Tuple[str, ...]) -> bool:
+    """Guard against near-duplicates that ask the opposite question.
+
+    Both questions must carry the same number of negations, and the words
+    they share must appear in the same order.
+    """
+    if first.count(_NEGATION) != second.count(_NEGATION):
+        return False
+    shared = set(first) & set(second)
+    return (
+        list(dict.fromkeys(w for w in first if w in shared))
+        == list(dict.fromkeys(w for w in second if w in shared))
+    )
+
+
+def age_band(child_age: Optional[int]) -> str:
+    """Coarse age band so answers are only shared between similar ages."""
+    if child_age is None:
+        return "unknown"
+    if child_age <= 5:
+        return "3-5"
+    if child_age <= 8:
+        return "6-8"
+    if child_age <= 12:
+        return "9-12"
+    return "13+"
+
+
+def _response_text(response: Any) -> str:
+    if isinstance(response, dict):
+        return str(response.get("content", ""))
+    return str(response)
+
+
+class _SemanticPartition:
+    """Fixed-capacity matrix of question vectors with LRU replacement."""
+
+    def __init__(self, dimension: int, capacity: int, initial_capacity: int = 64):
+        self.capacity = capacity
+        size = min(initial_capacity, capacity)
+        self.vectors = np.zeros((size, dimension), dtype=np.float32)
+        self.created_at = np.zeros(size, dtype=np.float64)
+        self.last_used = np.zeros(size, dtype=np.float64)
+        # (content tokens, response) per slot
+        self.entries: List[Optional[Tuple[Tuple[str, ...], Any]]] = []
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self.entries if entry is not None)
+
+    def search(
+        self, vector: np.ndarray, min_created_at: float, k: int = 1
+    ) -> List[Tuple[int, float]]:
+        """Top-k (slot, score) among live entries, best first."""
+        count = len(self.entries)
+        if count == 0:
+            return []
+
+        scores = self.vectors[:count] @ vector
+        scores[self.created_at[:count] < min_created_at] = -np.inf
+        k = min(k, count)
+        top = np.argpartition(scores, -k)[-k:] if k < count else np.arange(count)
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(int(slot), float(scores[slot])) for slot in top if np.isfinite(scores[slot])]
+
+    def add(
+        self, vector: np.ndarray, entry: Tuple[Tuple[str, ...], Any], now: float
+    ) -> None:
+        count = len(self.entries)
+        if count < self.capacity:
+            if count >= self.vectors.shape[0]:
+                self._grow()
+            slot = count
+            self.entries.append(entry)
+        else:
+            # Replace the least recently used entry (invalidated slots first)
+            slot = int(np.argmin(self.last_used))
+            self.entries[slot] = entry
+
+        self.vectors[slot] = vector
+        self.created_at[slot] = now
+        self.last_used[slot] = now
+
+    def invalidate(self, slot: int) -> None:
+        self.entries[slot] = None
+        self.vectors[slot] = 0.0
+        self.created_at[slot] = 0.0
+        self.last_used[slot] = 0.0
+
+    def _grow(self) -> None:
+        new_size = min(self.vectors.shape[0] * 2, self.capacity)
+        extra = new_size - self.vectors.shape[0]
+        self.vectors = np.vstack(
+            (self.vectors, np.zeros((extra, self.vectors.shape[1]), dtype=np.float32)))
+        self.created_at = np.concatenate((self.created_at, np.zeros(extra)))
+        self.last_used = np.concatenate((self.last_used, np.zeros(extra)))
+
+
+class SemanticResponseCache:
+    """Local embedding cache that answers paraphrased questions."""
+
+    def __init__(
+        self,
+        config: Optional[SemanticCacheConfig] = None,
+        moderator: Optional[Callable[[str], bool]] = None,
+        vectorizer: Optional[HashingTextVectorizer] = None,
+    ):
+        self.config = config or SemanticCacheConfig()
+        # Bigrams keep word order and negation in the embedding
+        self.vectorizer = vectorizer or HashingTextVectorizer(
+            dimension=self.config.dimension, use_bigrams=True)
+        self.moderator = moderator or ContentModerator().is_appropriate
+        self._partitions: Dict[PartitionKey, _SemanticPartition] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.logger = logging.getLogger(
+            f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def _partition_key(
+        self,
+        content_type: ContentType,
+        child_age: Optional[int],
+        language: Optional[str],
+        variant: str,
+    ) -> PartitionKey:
+        return (
+            content_type.value,
+            age_band(child_age),
+            (language or self.config.default_language).lower(),
+            variant,
+        )
+
+    def _stats_for(self, content_type: ContentType) -> Dict[str, int]:
+        return self._stats.setdefault(content_type.value, {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "moderation_rejections": 0,
+            "stores": 0,
+            "llm_calls_avoided": 0,
+        })
+
+    def _embed(
+        self, question: str
+    ) -> Tuple[Tuple[str, ...], Optional[np.ndarray]]:
+        tokens = content_tokens(normalize_question(question))
+        if not tokens:
+            return tokens, None
+        vector = self.vectorizer.embed(" ".join(tokens))
+        return tokens, vector if np.any(vector) else None
+
+    def lookup(
+        self,
+        question: str,
+        child_age: Optional[int] = None,
+        language: Optional[str] = None,
+        content_type: ContentType = ContentType.AI_RESPONSE,
+        variant: str = "",
+    ) -> Optional[Any]:
+        """Return a cached response for a semantically equivalent question."""
+        if not self.enabled:
+            return None
+
+        stats = self._stats_for(content_type)
+        stats["lookups"] += 1
+
+        partition = self._partitions.get(
+            self._partition_key(content_type, child_age, language, variant))
+        tokens, vector = self._embed(question)
+        if partition is None or vector is None:
+            stats["misses"] += 1
+            return None
+
+        now = time.time()
+        candidates = partition.search(
+            vector, now - self.config.ttl_seconds, _CANDIDATES)
+        slot, score = next(
+            (
+                (slot, score) for slot, score in candidates
+                if score >= self.config.similarity_threshold
+                and _same_meaning(tokens, partition.entries[slot][0])
+            ),
+            (-1, 0.0),
+        )
+        if slot < 0:
+            stats["misses"] += 1
+            return None
+
+        _, response = partition.entries[slot]
+
+        # Rules may have changed since the response was cached
+        if not self.moderator(_response_text(response)):
+            partition.invalidate(slot)
+            stats["moderation_rejections"] += 1
+            stats["misses"] += 1
+            self.logger.warning("Semantic cache entry failed re-moderation, dropped")
+            return None
+
+        partition.last_used[slot] = now
+        stats["hits"] += 1
+        stats["llm_calls_avoided"] += 1
+        self.logger.debug(f"Semantic cache hit (similarity {score:.3f})")
+        return response
+
+    def store(
+        self,
+        question: str,
+        response: Any,
+        child_age: Optional[int] = None,
+        language: Optional[str] = None,
+        content_type: ContentType = ContentType.AI_RESPONSE,
+        variant: str = "",
+    ) -> bool:
+        """Cache a response under the question's embedding."""
+        if not self.enabled or response is None:
+            return False
+
+        tokens, vector = self._embed(question)
+        if vector is None:
+            return False
+
+        key = self._partition_key(content_type, child_age, language, variant)
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = _SemanticPartition(
+                self.config.dimension, self.config.max_entries_per_partition)
+
+        partition.add(vector, (tokens, response), time.time())
+        self._stats_for(content_type)["stores"] += 1
+        return True
+
+    def clear(self) -> None:
+        self._partitions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and LLM calls avoided per content type."""
+        by_content_type = {}
+        for content_type, stats in self._stats.items():
+            by_content_type[content_type] = {
+                **stats,
+                "hit_rate": stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0,
+            }
+
+        return {
+            "enabled": self.enabled,
+            "partitions": len(self._partitions),
+            "entries": sum(len(p) for p in self._partitions.values()),
+            "by_content_type": by_content_type,
+        }
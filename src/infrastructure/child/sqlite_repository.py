@@ -5,6 +5,7 @@ Clean Architecture implementation of Child Repository with separated concerns.
 """
 
 import json
+import logging
 import os
 import sqlite3
 import uuid
@@ -15,6 +16,7 @@ from src.core.domain.entities.child import Child
 from src.infrastructure.persistence.base import QueryOptions, SortOrder
 from src.infrastructure.persistence.base_sqlite_repository import BaseSQLiteRepository
 from src.infrastructure.persistence.child_repository import ChildRepository
+from src.infrastructure.persistence.sqlite.sqlite_async_pool import AsyncSQLitePool
 
 
 class ChildSQLiteRepositoryRefactored(
@@ -60,19 +62,29 @@ class ChildSQLiteRepositoryRefactored(
         db_path: str = os.path.join(
             os.path.dirname(__file__), "..", "..", "..", "data", "teddyai.db"
         ),
+        pool: Optional[AsyncSQLitePool] = None,
     ):
+        """With a ``pool`` no direct connection is opened and every query
+        runs on the pool's connection threads."""
         self.session_factory = session_factory
+        self.logger = logging.getLogger(__name__)
 
-        # Ensure data directory exists
-        data_dir = os.path.dirname(db_path)
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir, exist_ok=True)
+        if pool is None:
+            # Ensure data directory exists
+            data_dir = os.path.dirname(db_path)
+            if not os.path.exists(data_dir):
+                os.makedirs(data_dir, exist_ok=True)
 
-        # Create connection
-        connection = sqlite3.connect(db_path, check_same_thread=False)
+            # Create connection
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+        else:
+            connection = None
 
         super().__init__(
-            connection=connection, table_name="children", entity_class=Child
+            connection=connection,
+            table_name="children",
+            entity_class=Child,
+            pool=pool,
         )
 
     async def initialize(self):
@@ -117,21 +129,21 @@ class ChildSQLiteRepositoryRefactored(
     async def create(self, child: Child) -> Child:
         """Create a new child profile"""
         try:
-            with self.transaction() as cursor:
-                data = self._serialize_child_for_db(child)
+            data = self._serialize_child_for_db(child)
 
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join(["?" for _ in data])
-                sql = (
-                    f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
-                )
+            columns = ", ".join(data.keys())
+            placeholders = ", ".join(["?" for _ in data])
+            sql = (
+                f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
+            )
 
-                cursor.execute(sql, list(data.values()))
+            await self._executor.write(
+                lambda conn: conn.execute(sql, list(data.values())))
 
-                if not child.id:
-                    child.id = data["id"]
+            if not child.id:
+                child.id = data["id"]
 
-                return child
+            return child
 
         except sqlite3.Error as e:
             self.logger.error(f"Error creating child: {e}")
@@ -140,11 +152,9 @@ class ChildSQLiteRepositoryRefactored(
     async def get_by_id(self, child_id: str) -> Optional[Child]:
         """Retrieve child by ID"""
         try:
-            cursor = self._connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE id = ? AND is_active = 1"
-            cursor.execute(sql, (child_id,))
-
-            row = cursor.fetchone()
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (child_id,)).fetchone())
             if row:
                 return self._deserialize_child_from_db(dict(row))
             return None
@@ -182,20 +192,20 @@ class ChildSQLiteRepositoryRefactored(
             raise ValueError("Child must have an ID for update")
 
         try:
-            with self.transaction() as cursor:
-                update_data = self._prepare_update_data(child)
-                if not update_data:
-                    return child
+            update_data = self._prepare_update_data(child)
+            if not update_data:
+                return child
 
-                sql, update_values = self._build_update_query(update_data)
-                update_values.append(child.id)
+            sql, update_values = self._build_update_query(update_data)
+            update_values.append(child.id)
 
-                cursor.execute(sql, update_values)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, update_values).rowcount)
 
-                if cursor.rowcount == 0:
-                    raise ValueError(f"No child found with ID {child.id}")
+            if rowcount == 0:
+                raise ValueError(f"No child found with ID {child.id}")
 
-                return child
+            return child
 
         except sqlite3.Error as e:
             self.logger.error(f"Error updating child {child.id}: {e}")
@@ -204,10 +214,11 @@ class ChildSQLiteRepositoryRefactored(
     async def delete(self, child_id: str) -> bool:
         """Soft delete child (mark as inactive)"""
         try:
-            with self.transaction() as cursor:
-                sql = f"UPDATE {self.table_name} SET is_active = 0, updated_at = ? WHERE id = ?"
-                cursor.execute(sql, (datetime.now().isoformat(), child_id))
-                return cursor.rowcount > 0
+            sql = f"UPDATE {self.table_name} SET is_active = 0, updated_at = ? WHERE id = ?"
+            params = (datetime.now().isoformat(), child_id)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, params).rowcount)
+            return rowcount > 0
 
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting child {child_id}: {e}")
@@ -244,7 +255,6 @@ class ChildSQLiteRepositoryRefactored(
             options: Optional[QueryOptions] = None) -> List[Child]:
         """List active children with optional filtering and sorting"""
         try:
-            cursor = self._connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE is_active = 1"
             params = []
 
@@ -252,8 +262,8 @@ class ChildSQLiteRepositoryRefactored(
                 sql = self._apply_sorting(sql, options)
                 sql, params = self._apply_pagination(sql, params, options)
 
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            rows = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchall())
 
             return [self._deserialize_child_from_db(dict(row)) for row in rows]
 
@@ -9,11 +9,16 @@ Features:
 - Connection pooling with PgBouncer
 - Read replicas and database sharding
 - Query performance monitoring
+- Query result cache with table-level invalidation (query_result_cache)
+- Lag-aware replica routing with read-your-writes per session
 """
 
 import asyncio
+import hashlib
 import logging
+import math
 import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
@@ -26,6 +31,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from prometheus_client import Counter, Histogram, Gauge
 
+from .query_result_cache import QueryResultCache, StatementInfo, fingerprint_statement
+
 logger = logging.getLogger(__name__)
 
 # Prometheus metrics
@@ -73,9 +80,33 @@ class AsyncDatabaseOptimizer:
         self.read_replicas: List[ReadReplica] = []
         self.shards: List[DatabaseShard] = []
         self.pg_bouncer_config = config.get("pg_bouncer", {})
-        self.query_cache: Dict[str, Any] = {}
         self.performance_stats: Dict[str, Any] = {}
 
+        cache_config = config.get("query_cache", {})
+        self.result_cache = QueryResultCache(
+            max_bytes=cache_config.get("max_bytes", 64 * 1024 * 1024),
+            default_ttl=cache_config.get("default_ttl", 300),
+            max_entry_fraction=cache_config.get("max_entry_fraction", 0.1),
+        )
+
+        # Read-your-writes: a session's reads stay on the primary until
+        # replicas have had time to replay its last write
+        routing_config = config.get("routing", {})
+        self.consistency_margin = routing_config.get("consistency_margin_seconds", 1.0)
+        self.max_tracked_sessions = routing_config.get("max_tracked_sessions", 10000)
+        self._session_writes: "OrderedDict[str, float]" = OrderedDict()
+        self._table_writes: Dict[str, float] = {}
+        self._replica_cursor = 0
+        self.routing_stats: Dict[str, Any] = {
+            "primary_reads": 0,
+            "replica_reads": 0,
+            "shard_queries": 0,
+            "writes": 0,
+            "consistency_reroutes": 0,
+            "replica_results_not_cached": 0,
+            "max_replica_lag_served": 0.0,
+        }
+
     async def initialize(self) -> None:
         """Initialize all database connections"""
         logger.info("🚀 Initializing advanced database optimizer...")
@@ -218,30 +249,50 @@ class AsyncDatabaseOptimizer:
         logger.info("✅ PgBouncer configuration validated")
 
     @asynccontextmanager
-    async def get_primary_session(self):
-        """Get session from primary database"""
-        if not self.primary_engine:
-            raise RuntimeError("Primary database not initialized")
-
+    async def _engine_session(self, engine: AsyncEngine, commit: bool = True):
+        """Session on ``engine``, committed on success when ``commit``"""
         async_session = sessionmaker(
-            self.primary_engine, class_=AsyncSession, expire_on_commit=False
+            engine, class_=AsyncSession, expire_on_commit=False
         )
 
         async with async_session() as session:
             try:
                 yield session
-                await session.commit()
-            except Exception as e:
+                if commit:
+                    await session.commit()
+            except Exception:
                 await session.rollback()
                 raise
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def get_primary_session(self):
+        """Get session from primary database"""
+        if not self.primary_engine:
+            raise RuntimeError("Primary database not initialized")
+
+        async with self._engine_session(self.primary_engine) as session:
+            yield session
+
     def _select_replica(
-        self, replica_name: Optional[str] = None
+        self,
+        replica_name: Optional[str] = None,
+        max_lag: Optional[float] = None,
     ) -> Optional[ReadReplica]:
-        """Selects a healthy read replica, either by name or round-robin."""
-        healthy_replicas = [r for r in self.read_replicas if r.is_healthy]
+        """Selects a healthy read replica, either by name or round-robin.
+
+        Replicas lagging more than their ``lag_threshold`` (or ``max_lag``,
+        when given) are skipped.
+        """
+        healthy_replicas = [
+            r
+            for r in self.read_replicas
+            if r.is_healthy
+            and r.engine is not None
+            and r.replication_lag <= r.lag_threshold
+            and (max_lag is None or r.replication_lag <= max_lag)
+        ]
         if not healthy_replicas:
             return None
 
@@ -255,9 +306,13 @@ class AsyncDatabaseOptimizer:
                 )
             return replica
 
-        # Simplified round-robin selection for now
-        return healthy_replicas[0]
+        # Least-lagged replica first, round-robin among equals
+        self._replica_cursor = (self._replica_cursor + 1) % len(healthy_replicas)
+        cursor = self._replica_cursor
+        rotated = healthy_replicas[cursor:] + healthy_replicas[:cursor]
+        return min(rotated, key=lambda r: r.replication_lag)
 
+    @asynccontextmanager
     async def get_read_replica_session(
             self, replica_name: Optional[str] = None):
         """Get session from read replica with load balancing"""
@@ -265,37 +320,85 @@ class AsyncDatabaseOptimizer:
 
         if not replica:
             # Fallback to primary if no healthy replicas
-            return self.get_primary_session()
-
-        async_session = sessionmaker(
-            replica.engine, class_=AsyncSession, expire_on_commit=False
-        )
-
-        async with async_session() as session:
-            try:
+            async with self.get_primary_session() as session:
                 yield session
-            except Exception as e:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
+            return
 
-    def _check_cache(
-        self, cache_key: str, cache_ttl: int
-    ) -> Optional[List[Dict[str, Any]]]:
-        """Checks if a valid result exists in the cache."""
-        if cache_key in self.query_cache:
-            cached_result = self.query_cache[cache_key]
-            if time.time() - cached_result["timestamp"] < cache_ttl:
-                DB_QUERY_TOTAL.labels(
-                    operation="cache_hit",
-                    status="success").inc()
-                return cached_result["data"]
-        return None
+        async with self._engine_session(replica.engine, commit=False) as session:
+            yield session
 
-    def _cache_result(self, cache_key: str, data: List[Dict[str, Any]]):
-        """Caches a query result."""
-        self.query_cache[cache_key] = {"data": data, "timestamp": time.time()}
+    def _select_shard(self, shard_key: str) -> Optional[DatabaseShard]:
+        """Weighted rendezvous hashing: a key moves only when its shard
+        leaves the healthy set"""
+        best, best_score = None, -math.inf
+        for shard in self.shards:
+            if shard.engine is None or shard.health_status == "unhealthy":
+                continue
+            digest = hashlib.blake2b(
+                f"{shard.name}:{shard_key}".encode("utf-8"), digest_size=8).digest()
+            unit = (int.from_bytes(digest, "big") + 1) / (2 ** 64 + 1)
+            score = shard.weight / -math.log(unit)
+            if score > best_score:
+                best, best_score = shard, score
+        return best
+
+    def _record_write(self, statement: StatementInfo, session_id: Optional[str]) -> None:
+        now = time.monotonic()
+        self.result_cache.invalidate_tables(statement.tables)
+        for table in statement.tables:
+            self._table_writes[table] = now
+        if session_id is not None:
+            self._session_writes[session_id] = now
+            self._session_writes.move_to_end(session_id)
+            while len(self._session_writes) > self.max_tracked_sessions:
+                self._session_writes.popitem(last=False)
+
+    def _recent_write_age(
+        self, statement: StatementInfo, session_id: Optional[str]
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Seconds since the session's last write and since the last write
+        to any table the statement reads (None when unknown)"""
+        now = time.monotonic()
+        session_write = self._session_writes.get(session_id) if session_id else None
+        table_writes = [
+            self._table_writes[t] for t in statement.tables if t in self._table_writes
+        ]
+        return (
+            now - session_write if session_write is not None else None,
+            now - max(table_writes) if table_writes else None,
+        )
+
+    def _route_read(
+        self, statement: StatementInfo, session_id: Optional[str]
+    ) -> Tuple[AsyncEngine, Optional[ReadReplica], bool]:
+        """(engine, replica or None, whether the result may be cached)"""
+        session_age, table_age = self._recent_write_age(statement, session_id)
+        max_lag = None
+        if session_age is not None:
+            # Replicas must have replayed this session's last write
+            max_lag = max(0.0, session_age - self.consistency_margin)
+
+        replica = self._select_replica(max_lag=max_lag)
+        if replica is None:
+            if max_lag is not None and self._select_replica() is not None:
+                self.routing_stats["consistency_reroutes"] += 1
+            if not self.primary_engine:
+                raise RuntimeError("Primary database not initialized")
+            self.routing_stats["primary_reads"] += 1
+            return self.primary_engine, None, True
+
+        self.routing_stats["replica_reads"] += 1
+        self.routing_stats["max_replica_lag_served"] = max(
+            self.routing_stats["max_replica_lag_served"], replica.replication_lag)
+        # A lagging replica may not have replayed a recent write yet; such
+        # a result is served but not cached under the new table versions
+        cacheable = (
+            table_age is None
+            or table_age > replica.replication_lag + self.consistency_margin
+        )
+        if not cacheable:
+            self.routing_stats["replica_results_not_cached"] += 1
+        return replica.engine, replica, cacheable
 
     async def execute_optimized_query(
         self,
@@ -303,43 +406,88 @@ class AsyncDatabaseOptimizer:
         params: Optional[Dict] = None,
         use_cache: bool = True,
         cache_ttl: int = 300,
+        session_id: Optional[str] = None,
+        shard_key: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Execute optimized query with caching and monitoring. Only parameterized queries allowed. Do NOT build SQL from user input."""
+        """Execute optimized query with caching and monitoring. Only parameterized queries allowed. Do NOT build SQL from user input.
+
+        Reads are served from the result cache or routed to a replica that
+        is fresh enough for ``session_id``; writes go to the primary (or the
+        shard owning ``shard_key``) and invalidate cached results of the
+        tables they touch.
+        """
         if "'" in query or '"' in query or ";" in query:
             raise ValueError(
                 "Potentially unsafe SQL detected. Only parameterized queries allowed."
             )
 
-        cache_key = f"{query}:{hash(str(params))}"
+        statement = fingerprint_statement(query)
+        operation = "write" if statement.is_write else "select"
+        table_label = min(statement.tables) if statement.tables else "unknown"
+
+        shard = None
+        if shard_key is not None and self.shards:
+            shard = self._select_shard(shard_key)
+            if shard is None:
+                raise RuntimeError("No healthy database shard available")
+
+        cache_params: Optional[Dict[str, Any]] = params
+        if shard is not None:
+            cache_params = {"shard": shard.name, "params": params}
+
+        use_cache = use_cache and not statement.is_write
         if use_cache:
-            cached_data = self._check_cache(cache_key, cache_ttl)
+            cached_data = self.result_cache.get(statement, cache_params)
             if cached_data is not None:
+                DB_QUERY_TOTAL.labels(
+                    operation="cache_hit",
+                    status="success").inc()
                 return cached_data
+            # Captured before the query runs: a write landing meanwhile
+            # leaves this entry stale instead of caching pre-write rows
+            versions = self.result_cache.snapshot_versions(statement)
+
+        cacheable = True
+        if shard is not None:
+            self.routing_stats["shard_queries"] += 1
+            engine = shard.engine
+        elif statement.is_write:
+            if not self.primary_engine:
+                raise RuntimeError("Primary database not initialized")
+            engine = self.primary_engine
+        else:
+            engine, _, cacheable = self._route_read(statement, session_id)
 
         start_time = time.time()
         try:
-            async with self.get_primary_session() as session:
+            async with self._engine_session(engine, commit=statement.is_write) as session:
                 result = await session.execute(text(query), params or {})
-                rows = result.fetchall()
-                data = [dict(row._mapping) for row in rows]
-
-                if use_cache:
-                    self._cache_result(cache_key, data)
-
-                duration = time.time() - start_time
-                DB_QUERY_DURATION.labels(
-                    operation="select",
-                    table="unknown").observe(duration)
-                DB_QUERY_TOTAL.labels(
-                    operation="select", status="success").inc()
-
-                return data
-
+                data = (
+                    [dict(row._mapping) for row in result.fetchall()]
+                    if result.returns_rows
+                    else []
+                )
         except Exception as e:
-            DB_QUERY_TOTAL.labels(operation="select", status="error").inc()
+            DB_QUERY_TOTAL.labels(operation=operation, status="error").inc()
             logger.error(f"Query execution failed: {e}")
             raise
 
+        if statement.is_write:
+            self.routing_stats["writes"] += 1
+            self._record_write(statement, session_id)
+        elif use_cache and cacheable:
+            self.result_cache.put(
+                statement, cache_params, data, ttl=cache_ttl, table_versions=versions)
+
+        duration = time.time() - start_time
+        DB_QUERY_DURATION.labels(
+            operation=operation,
+            table=table_label).observe(duration)
+        DB_QUERY_TOTAL.labels(
+            operation=operation, status="success").inc()
+
+        return data
+
     async def create_optimized_indexes(self) -> None:
         """Create optimized indexes for better performance"""
         index_queries = [
@@ -465,7 +613,7 @@ class AsyncDatabaseOptimizer:
                     self.performance_stats = {
                         "timestamp": datetime.now().isoformat(),
                         "table_stats": [dict(row._mapping) for row in stats],
-                        "cache_size": len(self.query_cache),
+                        "cache_size": len(self.result_cache),
                         "healthy_replicas": len(
                             [r for r in self.read_replicas if r.is_healthy]
                         ),
@@ -499,17 +647,18 @@ class AsyncDatabaseOptimizer:
                     for shard in self.shards
                 },
                 "cache_stats": {
-                    "cache_size": len(self.query_cache),
+                    "cache_size": len(self.result_cache),
                     "cache_hit_ratio": self._calculate_cache_hit_ratio(),
+                    **self.result_cache.get_stats(),
                 },
+                "routing_stats": dict(self.routing_stats),
                 "performance_stats": self.performance_stats,
             }
         }
 
     def _calculate_cache_hit_ratio(self) -> float:
         """Calculate cache hit ratio"""
-        # This would be calculated from actual usage metrics
-        return 0.85  # Placeholder
+        return self.result_cache.hit_ratio
 
     async def cleanup(self) -> None:
         """Cleanup database connections"""
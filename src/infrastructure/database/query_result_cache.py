@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+🗄️ Query Result Cache - AI Teddy Bear Project
+ذاكرة مؤقتة لنتائج الاستعلامات مع إبطال حسب الجداول
+
+- Statement fingerprints: comments stripped, whitespace collapsed, case
+  folded, hashed with BLAKE2b (stable across processes, unlike ``hash()``)
+- Parameter hashing over a canonical, type-tagged JSON encoding
+- LRU bounded by (estimated) result bytes, with per-entry TTL
+- Table tags: every cached entry remembers the version of each table it
+  reads; a write bumps the versions of the tables it touches, which makes
+  all dependent entries stale at once without scanning the cache
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+_TABLE_RE = re.compile(
+    r"\b(?:from|join|into|update|table)\s+(?:only\s+)?([a-z_][a-z0-9_$.]*)")
+# "from a, b x, c" lists (up to the next clause keyword)
+_FROM_LIST_RE = re.compile(
+    r"\bfrom\s+([a-z_][^()]*?)(?=\b(?:where|group|order|limit|join|left|right|inner"
+    r"|full|cross|having|union|returning|on)\b|\)|$)")
+# "truncate [table] [only] a, b [restart identity] [cascade]"
+_TRUNCATE_RE = re.compile(r"^truncate\s+(?:table\s+)?([a-z_][^;]*)")
+_CTE_WRITE_RE = re.compile(r"\b(?:insert|update|delete)\b")
+_WRITE_VERBS = {
+    "insert", "update", "delete", "merge", "upsert", "replace", "truncate",
+    "create", "alter", "drop", "vacuum", "reindex", "grant", "revoke", "copy",
+}
+
+
+@dataclass(frozen=True)
+class StatementInfo:
+    """Normalized statement and what it touches"""
+
+    fingerprint: str
+    normalized: str
+    tables: FrozenSet[str]
+    is_write: bool
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_statement(sql: str) -> StatementInfo:
+    """Fingerprint, referenced tables and read/write kind of a statement"""
+    normalized = _SPACE_RE.sub(" ", _COMMENT_RE.sub(" ", sql)).strip().lower()
+    names = set(_TABLE_RE.findall(normalized))
+    for from_list in _FROM_LIST_RE.findall(normalized):
+        names.update(part.split()[0] for part in from_list.split(",") if part.strip())
+    truncated = _TRUNCATE_RE.match(normalized)
+    if truncated:
+        for part in truncated.group(1).split(","):
+            words = [word for word in part.split() if word != "only"]
+            if words:
+                names.add(words[0])
+    tables = frozenset(name.strip().rsplit(".", 1)[-1] for name in names if name.strip())
+    words = normalized.split(" ", 3)
+    verb = words[0] if words else ""
+    if verb == "with":
+        # CTEs: a data-modifying CTE makes the whole statement a write
+        is_write = _CTE_WRITE_RE.search(normalized) is not None
+    else:
+        is_write = verb in _WRITE_VERBS
+    fingerprint = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return StatementInfo(fingerprint, normalized, tables, is_write)
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready value that keeps types apart (1, 1.0, "1", True differ)"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return {"f": repr(value)}
+    if isinstance(value, Mapping):
+        return {"m": sorted((str(k), _canonical(v)) for k, v in value.items())}
+    if isinstance(value, (list, tuple)):
+        return {"l": [_canonical(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"s": sorted(json.dumps(_canonical(v), sort_keys=True) for v in value)}
+    if isinstance(value, (datetime, date, dt_time)):
+        return {"t": value.isoformat()}
+    if isinstance(value, (Decimal, UUID)):
+        return {type(value).__name__: str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"b": bytes(value).hex()}
+    return {type(value).__name__: repr(value)}
+
+
+def hash_params(params: Optional[Mapping[str, Any]]) -> str:
+    """Stable digest of bind parameters"""
+    if not params:
+        return "-"
+    encoded = json.dumps(_canonical(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def estimate_result_bytes(rows: List[Dict[str, Any]]) -> int:
+    """Approximate memory held by a list of row dicts"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+@dataclass
+class _CacheEntry:
+    rows: List[Dict[str, Any]]
+    size: int
+    created_at: float
+    expires_at: float
+    table_versions: Tuple[Tuple[str, int], ...]
+
+
+@dataclass
+class QueryCacheStats:
+    """Cache hit/miss and staleness counters"""
+
+    hits: int = 0
+    misses: int = 0
+    invalidated: int = 0  # entries found stale because a table changed
+    expired: int = 0
+    evictions: int = 0
+    oversized: int = 0
+    served_age_total: float = 0.0
+    served_age_max: float = 0.0
+    writes_seen: int = 0
+
+
+class QueryResultCache:
+    """Byte-bounded LRU of query results with TTL and table tags"""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 300.0,
+        max_entry_fraction: float = 0.1,
+        clock=time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.max_entry_bytes = int(max_bytes * max_entry_fraction)
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._table_versions: Dict[str, int] = {}
+        self.current_bytes = 0
+        self.stats = QueryCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(statement: StatementInfo, params: Optional[Mapping[str, Any]]) -> Tuple[str, str]:
+        return statement.fingerprint, hash_params(params)
+
+    def _versions(self, tables: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        return tuple(sorted((t, self._table_versions.get(t, 0)) for t in tables))
+
+    def get(
+        self, statement: StatementInfo, params: Optional[Mapping[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        key = self.key_for(statement, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        now = self._clock()
+        if entry.expires_at <= now:
+            self.stats.expired += 1
+        elif entry.table_versions != self._versions(statement.tables):
+            self.stats.invalidated += 1
+        else:
+            self._entries.move_to_end(key)
+            age = now - entry.created_at
+            self.stats.hits += 1
+            self.stats.served_age_total += age
+            self.stats.served_age_max = max(self.stats.served_age_max, age)
+            return entry.rows
+
+        self._remove(key)
+        self.stats.misses += 1
+        return None
+
+    def put(
+        self,
+        statement: StatementInfo,
+        params: Optional[Mapping[str, Any]],
+        rows: List[Dict[str, Any]],
+        ttl: Optional[float] = None,
+        table_versions: Optional[Tuple[Tuple[str, int], ...]] = None,
+    ) -> bool:
+        """Cache ``rows``; ``table_versions`` should be captured before the
+        query ran so a write that raced with it leaves the entry stale"""
+        size = estimate_result_bytes(rows)
+        if size > self.max_entry_bytes:
+            self.stats.oversized += 1
+            return False
+
+        key = self.key_for(statement, params)
+        self._remove(key)
+        now = self._clock()
+        self._entries[key] = _CacheEntry(
+            rows=rows,
+            size=size,
+            created_at=now,
+            expires_at=now + (self.default_ttl if ttl is None else ttl),
+            table_versions=table_versions or self._versions(statement.tables),
+        )
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        return True
+
+    def snapshot_versions(self, statement: StatementInfo) -> Tuple[Tuple[str, int], ...]:
+        return self._versions(statement.tables)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> None:
+        """Bump table tags after a write (dependent entries become stale)"""
+        for table in tables:
+            self._table_versions[table] = self._table_versions.get(table, 0) + 1
+        self.stats.writes_seen += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.stats.hits + self.stats.misses
+        return self.stats.hits / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_ratio": self.hit_ratio,
+            "invalidated": self.stats.invalidated,
+            "expired": self.stats.expired,
+            "evictions": self.stats.evictions,
+            "oversized": self.stats.oversized,
+            "avg_served_age_seconds": (
+                self.stats.served_age_total / self.stats.hits if self.stats.hits else 0.0),
+            "max_served_age_seconds": self.stats.served_age_max,
+            "writes_seen": self.stats.writes_seen,
+        }
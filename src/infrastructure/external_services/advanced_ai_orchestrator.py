@@ -13,11 +13,22 @@ import hashlib
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import structlog
 from cachetools import TTLCache
 
+try:
+    from src.infrastructure.caching.models import ContentType
+    from src.infrastructure.caching.semantic_response_cache import (
+        SemanticResponseCache,
+    )
+
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+    SemanticResponseCache = None
+
 logger = structlog.get_logger(__name__)
 
 
@@ -203,10 +214,12 @@ class ConversationContextManager:
 class AdvancedAIOrchestrator:
     """منظم ذكاء اصطناعي متقدم"""
 
-    def __init__(self):
+    def __init__(self, semantic_cache: Optional["SemanticResponseCache"] = None):
         self.model_router = ModelRouter()
         self.context_manager = ConversationContextManager()
         self.response_cache = TTLCache(maxsize=500, ttl=900)
+        # كاش دلالي اختياري للأسئلة المعاد صياغتها
+        self.semantic_cache = semantic_cache
         self.performance_tracker = {}
         self.logger = structlog.get_logger(__name__)
 
@@ -244,6 +257,21 @@ class AdvancedAIOrchestrator:
                 self.logger.info("🎯 Cache hit for response generation")
                 return cached_response
 
+            semantic_variant = f"{model_config.model_name}:{request.emotion_state}"
+            language = request.session_context.get("language")
+            if self.semantic_cache:
+                semantic_response = self.semantic_cache.lookup(
+                    request.text,
+                    request.child_age,
+                    language,
+                    ContentType.AI_RESPONSE,
+                    semantic_variant,
+                )
+                if semantic_response is not None:
+                    self.logger.info("🎯 Semantic cache hit for response generation")
+                    self.response_cache[cache_key] = semantic_response
+                    return semantic_response
+
             # 5. توليد الاستجابة
             response = await self._generate_with_model(
                 model_config=model_config,
@@ -258,6 +286,15 @@ class AdvancedAIOrchestrator:
 
             # 7. حفظ في الكاش
             self.response_cache[cache_key] = enhanced_response
+            if self.semantic_cache:
+                self.semantic_cache.store(
+                    request.text,
+                    enhanced_response,
+                    request.child_age,
+                    language,
+                    ContentType.AI_RESPONSE,
+                    semantic_variant,
+                )
 
             # 8. تحديث الإحصائيات
             processing_time = time.time() - start_time
@@ -444,6 +481,9 @@ class AdvancedAIOrchestrator:
             "cache_stats": {
                 "response_cache_size": len(self.response_cache),
                 "context_cache_size": len(self.context_manager.context_cache),
+                "semantic_cache": (
+                    self.semantic_cache.get_stats() if self.semantic_cache else None
+                ),
             },
             "model_performance": self.performance_tracker,
         }
@@ -453,6 +493,8 @@ class AdvancedAIOrchestrator:
         try:
             self.response_cache.clear()
             self.context_manager.context_cache.clear()
+            if self.semantic_cache:
+                self.semantic_cache.clear()
             self.logger.info("✅ AI Orchestrator cleanup completed")
         except Exception as e:
             self.logger.error(f"❌ Cleanup failed: {e}")
@@ -0,0 +1,269 @@
+"""
+Memory Graph - Related-memory graph built from topic/emotion inverted indexes
+
+Two memories can only be related if they share a topic or an emotion, so
+candidate pairs come from inverted-index postings instead of an all-pairs
+scan. Batch construction uses sparse co-occurrence products; the
+incremental ``MemoryGraph`` keeps the same edges up to date as memories are
+stored or forgotten.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from ...domain.memory.models import Memory
+
+
+def _pair_similarity(
+    topics1: Set[str],
+    topic_len1: int,
+    emotions1: Set[str],
+    emotion_len1: int,
+    topics2: Set[str],
+    topic_len2: int,
+    emotions2: Set[str],
+    emotion_len2: int,
+) -> float:
+    """Same formula as ``calculate_memory_similarity`` on precomputed sets"""
+    topic_sim = len(topics1 & topics2) / max(topic_len1 + topic_len2, 1)
+    emotion_sim = len(emotions1 & emotions2) / max(
+        emotion_len1 + emotion_len2, 1)
+    return (topic_sim + emotion_sim) / 2
+
+
+def _incidence_matrix(
+        term_lists: List[List[str]]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Binary memory x term matrix plus the raw (list) lengths per memory"""
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+
+    for row, terms in enumerate(term_lists):
+        for term in set(terms):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+        shape=(len(term_lists), max(len(vocabulary), 1)),
+    )
+    lengths = np.fromiter(
+        (len(terms) for terms in term_lists), dtype=np.float64, count=len(term_lists)
+    )
+    return matrix, lengths
+
+
+def build_memory_graph(
+    memories: List[Memory], threshold: float = 0.5, block_size: int = 512
+) -> Dict[str, List[str]]:
+    """Build the related-memory graph with sparse co-occurrence products.
+
+    Similarity only depends on a memory's topic and emotion lists, so
+    memories are first grouped by that signature and similarity is computed
+    between distinct signatures, then expanded back to memory IDs.
+    """
+    if not memories:
+        return {}
+
+    ids = [memory.id for memory in memories]
+    if threshold <= 0:
+        # Every pair scores >= 0, so everything is related to everything
+        return {
+            memory_id: [other for other in ids if other != memory_id]
+            for memory_id in ids
+        }
+
+    groups: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], List[str]] = {}
+    for memory in memories:
+        signature = (tuple(sorted(memory.topics)), tuple(sorted(memory.emotions)))
+        groups.setdefault(signature, []).append(memory.id)
+
+    signatures = list(groups)
+    members = [groups[signature] for signature in signatures]
+    topics, topic_lengths = _incidence_matrix([list(s[0]) for s in signatures])
+    emotions, emotion_lengths = _incidence_matrix(
+        [list(s[1]) for s in signatures])
+    topics_t = topics.T.tocsr()
+    emotions_t = emotions.T.tocsr()
+
+    # Each half of the score is at most 0.25, so above that threshold a pair
+    # must share both a topic and an emotion: drive candidate generation
+    # from the sparser co-occurrence and score the other half on its support
+    require_both = threshold > 0.25
+    if _cooccurrence_cost(topics) <= _cooccurrence_cost(emotions):
+        driver = (topics, topics_t, topic_lengths)
+        other = (emotions, emotion_lengths)
+    else:
+        driver = (emotions, emotions_t, emotion_lengths)
+        other = (topics, topic_lengths)
+
+    graph: Dict[str, List[str]] = {}
+
+    # Row blocks bound peak memory when a few terms are shared very widely
+    for start in range(0, len(signatures), block_size):
+        end = min(start + block_size, len(signatures))
+        if require_both:
+            similarity = _block_joint_similarity(driver, other, start, end)
+        else:
+            similarity = (
+                _block_term_similarity(
+                    topics, topics_t, topic_lengths, start, end)
+                + _block_term_similarity(
+                    emotions, emotions_t, emotion_lengths, start, end)
+            ) * 0.5
+        similarity.sort_indices()
+
+        for offset in range(end - start):
+            lo, hi = similarity.indptr[offset], similarity.indptr[offset + 1]
+            related: List[str] = []
+            for col, score in zip(
+                    similarity.indices[lo:hi], similarity.data[lo:hi]):
+                if score >= threshold:
+                    related.extend(members[col])
+
+            for memory_id in members[start + offset]:
+                graph[memory_id] = [
+                    other for other in related if other != memory_id]
+
+    return graph
+
+
+def _block_term_similarity(
+    incidence: sparse.csr_matrix,
+    incidence_t: sparse.csr_matrix,
+    lengths: np.ndarray,
+    start: int,
+    end: int,
+) -> sparse.csr_matrix:
+    """Shared-term ratio for rows [start, end) against every memory.
+
+    Only pairs sharing at least one term produce a stored entry.
+    """
+    shared = (incidence[start:end] @ incidence_t).tocoo()
+    denominators = np.maximum(
+        lengths[shared.row + start] + lengths[shared.col], 1)
+    return sparse.csr_matrix(
+        (shared.data / denominators, (shared.row, shared.col)),
+        shape=shared.shape,
+    )
+
+
+def _block_joint_similarity(driver, other, start: int, end: int) -> sparse.csr_matrix:
+    """Full score for pairs sharing a driver term, rows [start, end)"""
+    incidence, incidence_t, lengths = driver
+    other_incidence, other_lengths = other
+
+    candidates = _block_term_similarity(
+        incidence, incidence_t, lengths, start, end).tocoo()
+    rows = candidates.row + start
+    cols = candidates.col
+
+    shared = np.asarray(
+        other_incidence[rows].multiply(other_incidence[cols]).sum(axis=1)
+    ).ravel()
+    other_part = shared / np.maximum(other_lengths[rows] + other_lengths[cols], 1)
+
+    return sparse.csr_matrix(
+        ((candidates.data + other_part) * 0.5, (candidates.row, candidates.col)),
+        shape=candidates.shape,
+    )
+
+
+def _cooccurrence_cost(incidence: sparse.csr_matrix) -> int:
+    """Number of co-occurring pairs the incidence matrix would generate"""
+    document_frequency = np.asarray(incidence.sum(axis=0)).ravel()
+    return int(np.square(document_frequency).sum())
+
+
+class MemoryGraph:
+    """Incrementally maintained related-memory graph.
+
+    Only memories sharing a topic or emotion are compared, so the threshold
+    is expected to be positive.
+    """
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._topic_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._emotion_postings: Dict[str, Set[str]] = defaultdict(set)
+        self._features: Dict[str, Tuple[Set[str], int, Set[str], int]] = {}
+        self._edges: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._features
+
+    def add(self, memory: Memory) -> List[str]:
+        """Add a memory and link it to related memories already present"""
+        if memory.id in self._features:
+            self.remove(memory.id)
+
+        features = (
+            set(memory.topics),
+            len(memory.topics),
+            set(memory.emotions),
+            len(memory.emotions),
+        )
+
+        candidates: Set[str] = set()
+        for topic in features[0]:
+            candidates |= self._topic_postings.get(topic, set())
+        for emotion in features[2]:
+            candidates |= self._emotion_postings.get(emotion, set())
+
+        related = set()
+        for candidate_id in candidates:
+            score = _pair_similarity(*features, *self._features[candidate_id])
+            if score >= self.threshold:
+                related.add(candidate_id)
+                self._edges[candidate_id].add(memory.id)
+
+        self._features[memory.id] = features
+        self._edges[memory.id] = related
+        for topic in features[0]:
+            self._topic_postings[topic].add(memory.id)
+        for emotion in features[2]:
+            self._emotion_postings[emotion].add(memory.id)
+
+        return list(related)
+
+    def remove(self, memory_id: str) -> bool:
+        """Remove a memory and all of its edges"""
+        features = self._features.pop(memory_id, None)
+        if features is None:
+            return False
+
+        for neighbour_id in self._edges.pop(memory_id, set()):
+            self._edges[neighbour_id].discard(memory_id)
+
+        for topic in features[0]:
+            self._discard_posting(self._topic_postings, topic, memory_id)
+        for emotion in features[2]:
+            self._discard_posting(self._emotion_postings, emotion, memory_id)
+
+        return True
+
+    def related(self, memory_id: str) -> List[str]:
+        """IDs of memories related to the given memory"""
+        return list(self._edges.get(memory_id, ()))
+
+    def to_dict(self, memory_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Export the adjacency lists"""
+        keys = memory_ids if memory_ids is not None else list(self._edges)
+        return {memory_id: self.related(memory_id) for memory_id in keys}
+
+    @staticmethod
+    def _discard_posting(
+        postings: Dict[str, Set[str]], term: str, memory_id: str
+    ) -> None:
+        posting = postings.get(term)
+        if posting is None:
+            return
+        posting.discard(memory_id)
+        if not posting:
+            del postings[term]
@@ -0,0 +1,408 @@
+"""
+Memory Vector Index - Local embedding and per-child cosine search
+
+Embeddings are computed locally with a signed hashing vectorizer (no model
+download, no network) over memory content, topics and emotions. Each child
+gets a dense NumPy matrix of unit vectors so top-k cosine search is one
+matrix-vector product plus an ``argpartition``.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ...domain.memory.models import Memory, MemoryImportance, MemoryType
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Per-child capacity the index is sized and benchmarked for
+DEFAULT_MAX_MEMORIES_PER_CHILD = 100_000
+# Child indexes kept in memory; the least recently used is unloaded
+DEFAULT_MAX_LOADED_CHILDREN = 64
+
+
+class HashingTextVectorizer:
+    """Stateless hashing vectorizer with word unigrams and bigrams"""
+
+    def __init__(
+        self,
+        dimension: int = 256,
+        topic_weight: float = 2.0,
+        emotion_weight: float = 1.5,
+        use_bigrams: bool = True,
+    ):
+        self.dimension = dimension
+        self.topic_weight = topic_weight
+        self.emotion_weight = emotion_weight
+        self.use_bigrams = use_bigrams
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lower-case word unigrams plus (optionally) adjacent bigrams"""
+        words = _TOKEN_PATTERN.findall(text.lower())
+        if not self.use_bigrams:
+            return words
+        bigrams = [f"{a}_{b}" for a, b in zip(words, words[1:])]
+        return words + bigrams
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        """Stable (bucket, sign) for a token - independent of PYTHONHASHSEED"""
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        sign = 1.0 if value & 1 else -1.0
+        return (value >> 1) % self.dimension, sign
+
+    def embed(
+        self,
+        text: str,
+        topics: Iterable[str] = (),
+        emotions: Iterable[str] = (),
+    ) -> np.ndarray:
+        """Embed text (and optional topics/emotions) as a unit vector"""
+        vector = np.zeros(self.dimension, dtype=np.float32)
+
+        weighted: Dict[str, float] = {}
+        for token, count in Counter(self.tokenize(text)).items():
+            weighted[token] = 1.0 + math.log(count)  # sublinear tf
+        for topic in topics:
+            weighted[f"topic:{topic.lower()}"] = self.topic_weight
+        for emotion in emotions:
+            weighted[f"emotion:{emotion.lower()}"] = self.emotion_weight
+
+        for token, weight in weighted.items():
+            bucket, sign = self._bucket(token)
+            vector[bucket] += sign * weight
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_memory(self, memory: Memory) -> np.ndarray:
+        """Embed a memory from its content, topics and emotions"""
+        return self.embed(memory.content, memory.topics, memory.emotions)
+
+
+def _memory_to_record(memory: Memory) -> Dict[str, Any]:
+    """JSON-safe record of a memory (the embedding is not kept)"""
+    return {
+        "id": memory.id,
+        "child_id": memory.child_id,
+        "content": memory.content,
+        "memory_type": memory.memory_type.value,
+        "importance": memory.importance.value,
+        "timestamp": memory.timestamp.isoformat(),
+        "context": memory.context,
+        "emotions": list(memory.emotions),
+        "topics": list(memory.topics),
+        "related_memories": list(memory.related_memories),
+        "access_count": memory.access_count,
+        "last_accessed": (
+            memory.last_accessed.isoformat() if memory.last_accessed else None
+        ),
+        "decay_rate": memory.decay_rate,
+    }
+
+
+def _memory_from_record(record: Dict[str, Any]) -> Memory:
+    """Rebuild a memory written by :func:`_memory_to_record`"""
+    last_accessed = record.get("last_accessed")
+    return Memory(
+        id=record["id"],
+        child_id=record["child_id"],
+        content=record["content"],
+        memory_type=MemoryType(record["memory_type"]),
+        importance=MemoryImportance(record["importance"]),
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+        context=record.get("context") or {},
+        emotions=record.get("emotions") or [],
+        topics=record.get("topics") or [],
+        related_memories=record.get("related_memories") or [],
+        access_count=record.get("access_count", 0),
+        last_accessed=datetime.fromisoformat(last_accessed) if last_accessed else None,
+        decay_rate=record.get("decay_rate", 0.1),
+    )
+
+
+class ChildVectorIndex:
+    """Dense vector index for one child with O(1) add/remove.
+
+    Holds at most ``max_size`` entries; adding past the limit evicts the
+    least recently (re-)indexed one.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        initial_capacity: int = 256,
+        max_size: int = DEFAULT_MAX_MEMORIES_PER_CHILD,
+    ):
+        self.dimension = dimension
+        self.max_size = max_size
+        self._vectors = np.zeros(
+            (initial_capacity, dimension), dtype=np.float32)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        # Every indexed id in (re-)index order; None until a memory is attached
+        self._memories: "OrderedDict[str, Optional[Memory]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._positions
+
+    def add(
+        self,
+        memory_id: str,
+        vector: np.ndarray,
+        memory: Optional[Memory] = None,
+    ) -> None:
+        """Add or replace a vector"""
+        position = self._positions.get(memory_id)
+        if position is None:
+            position = len(self._ids)
+            if position >= self._vectors.shape[0]:
+                self._grow()
+            self._ids.append(memory_id)
+            self._positions[memory_id] = position
+
+        self._vectors[position] = vector
+        if memory is not None or memory_id not in self._memories:
+            self._memories[memory_id] = memory
+        self._memories.move_to_end(memory_id)
+
+        while len(self._ids) > self.max_size:
+            self.remove(next(iter(self._memories)))
+
+    def attach(self, memory: Memory) -> None:
+        """Attach a memory object to an already indexed vector"""
+        if memory.id in self._positions:
+            self._memories[memory.id] = memory
+
+    def remove(self, memory_id: str) -> bool:
+        """Remove a vector by swapping the last row into its slot"""
+        position = self._positions.pop(memory_id, None)
+        if position is None:
+            return False
+
+        self._memories.pop(memory_id, None)
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._vectors[position] = self._vectors[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+        self._ids.pop()
+        return True
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        """Top-k cosine search (vectors are unit length)"""
+        size = len(self._ids)
+        if size == 0 or k <= 0:
+            return []
+
+        scores = self._vectors[:size] @ query
+        k = min(k, size)
+        if k < size:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(size)
+        top = top[np.argsort(scores[top])[::-1]]
+
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    def get_memory(self, memory_id: str) -> Optional[Memory]:
+        """Get the memory object for an indexed id, if attached"""
+        return self._memories.get(memory_id)
+
+    def save(self, path: Path) -> None:
+        """Persist vectors, ids and attached memories to an ``.npz`` file.
+
+        Everything is stored as plain numeric or unicode arrays so the
+        file loads with ``allow_pickle=False``.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        records = [
+            json.dumps(
+                _memory_to_record(memory) if memory is not None else None,
+                default=str,
+            )
+            for memory in (self._memories.get(memory_id) for memory_id in self._ids)
+        ]
+        np.savez(
+            tmp_path,
+            vectors=self._vectors[: len(self._ids)],
+            ids=np.array(self._ids, dtype=str),
+            memories=np.array(records, dtype=str),
+            order=np.array(list(self._memories), dtype=str),
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        dimension: int,
+        max_size: int = DEFAULT_MAX_MEMORIES_PER_CHILD,
+    ) -> "ChildVectorIndex":
+        """Load an index written by :meth:`save`"""
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            ids = data["ids"].tolist()
+            records = data["memories"].tolist()
+            order = data["order"].tolist()
+
+        if vectors.ndim != 2 or (ids and vectors.shape[1] != dimension):
+            raise ValueError(f"Index dimension mismatch in {path}")
+        if len(records) != len(ids) or sorted(order) != sorted(ids):
+            raise ValueError(f"Index ids and memories disagree in {path}")
+
+        index = cls(dimension, initial_capacity=max(len(ids), 256), max_size=max_size)
+        index._vectors[: len(ids)] = vectors
+        index._ids = ids
+        index._positions = {memory_id: i for i, memory_id in enumerate(ids)}
+        memories = {
+            memory_id: _memory_from_record(record) if record is not None else None
+            for memory_id, record in zip(ids, map(json.loads, records))
+        }
+        index._memories = OrderedDict(
+            (memory_id, memories[memory_id]) for memory_id in order)
+        while len(index._ids) > index.max_size:
+            index.remove(next(iter(index._memories)))
+        return index
+
+    def _grow(self) -> None:
+        """Double the capacity of the vector matrix"""
+        grown = np.zeros(
+            (self._vectors.shape[0] * 2, self.dimension), dtype=np.float32)
+        grown[: self._vectors.shape[0]] = self._vectors
+        self._vectors = grown
+
+
+class MemoryVectorIndex:
+    """Per-child vector indexes with lazy loading and disk persistence.
+
+    At most ``max_loaded_children`` child indexes stay in memory. The least
+    recently used one is unloaded past that limit, after being written to
+    disk if it has unsaved changes; without a ``storage_path`` it is dropped.
+    """
+
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        vectorizer: Optional[HashingTextVectorizer] = None,
+        max_memories_per_child: int = DEFAULT_MAX_MEMORIES_PER_CHILD,
+        max_loaded_children: int = DEFAULT_MAX_LOADED_CHILDREN,
+    ):
+        self.storage_path = Path(storage_path) if storage_path else None
+        self.vectorizer = vectorizer or HashingTextVectorizer()
+        self.max_memories_per_child = max_memories_per_child
+        self.max_loaded_children = max(1, max_loaded_children)
+        self._indexes: "OrderedDict[str, ChildVectorIndex]" = OrderedDict()
+        self._dirty: set = set()
+
+    def add_memory(self, memory: Memory) -> None:
+        """Index a memory (re-indexing replaces the previous vector)"""
+        index = self._get_index(memory.child_id)
+        index.add(memory.id, self.vectorizer.embed_memory(memory), memory)
+        self._dirty.add(memory.child_id)
+
+    def forget(self, child_id: str, memory_id: str) -> bool:
+        """Remove a memory from the child's index"""
+        removed = self._get_index(child_id).remove(memory_id)
+        if removed:
+            self._dirty.add(child_id)
+        return removed
+
+    def search(
+        self, child_id: str, query: str, k: int = 5
+    ) -> List[Tuple[Memory, float]]:
+        """Return up to k (memory, score) pairs most similar to the query"""
+        index = self._get_index(child_id)
+        if not len(index):
+            return []
+
+        query_vector = self.vectorizer.embed(query)
+        results = []
+        for memory_id, score in index.search(query_vector, k):
+            memory = index.get_memory(memory_id)
+            if memory is not None:
+                results.append((memory, score))
+        return results
+
+    def count(self, child_id: str) -> int:
+        """Number of indexed memories for a child"""
+        return len(self._get_index(child_id))
+
+    def persist(self) -> int:
+        """Write dirty child indexes to disk, returns number written"""
+        if not self.storage_path:
+            return 0
+
+        written = 0
+        for child_id in list(self._dirty):
+            index = self._indexes.get(child_id)
+            if index is not None:
+                index.save(self._index_path(child_id))
+                written += 1
+            self._dirty.discard(child_id)
+        return written
+
+    def loaded_children(self) -> int:
+        """Number of child indexes currently held in memory"""
+        return len(self._indexes)
+
+    def _get_index(self, child_id: str) -> ChildVectorIndex:
+        index = self._indexes.get(child_id)
+        if index is not None:
+            self._indexes.move_to_end(child_id)
+            return index
+
+        index = self._load_index(child_id)
+        if index is None:
+            index = ChildVectorIndex(
+                self.vectorizer.dimension, max_size=self.max_memories_per_child)
+        self._indexes[child_id] = index
+        while len(self._indexes) > self.max_loaded_children:
+            self._unload(next(iter(self._indexes)))
+        return index
+
+    def _unload(self, child_id: str) -> None:
+        """Drop a child index from memory, saving it first if dirty"""
+        index = self._indexes.pop(child_id)
+        if child_id in self._dirty and self.storage_path:
+            try:
+                index.save(self._index_path(child_id))
+            except Exception as e:
+                logger.error(f"Failed to save vector index for {child_id}: {e}")
+        self._dirty.discard(child_id)
+
+    def _load_index(self, child_id: str) -> Optional[ChildVectorIndex]:
+        if not self.storage_path:
+            return None
+
+        path = self._index_path(child_id)
+        if not path.exists():
+            return None
+
+        try:
+            return ChildVectorIndex.load(
+                path, self.vectorizer.dimension, self.max_memories_per_child)
+        except Exception as e:
+            logger.error(f"Failed to load vector index for {child_id}: {e}")
+            return None
+
+    def _index_path(self, child_id: str) -> Path:
+        safe_id = hashlib.sha256(child_id.encode("utf-8")).hexdigest()[:32]
+        return self.storage_path / f"{safe_id}.npz"
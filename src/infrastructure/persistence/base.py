@@ -147,6 +147,12 @@ class ValidationError(RepositoryError):
         self.errors = errors
 
 
+class DatabaseError(RepositoryError):
+    """Raised when the underlying database operation fails"""
+
+    pass
+
+
 class BaseRepository(ABC, Generic[T, ID]):
     """
     Enhanced abstract base repository with advanced features
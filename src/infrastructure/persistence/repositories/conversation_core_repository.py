@@ -8,6 +8,10 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from src.core.domain.entities.conversation import Conversation
+from src.infrastructure.persistence.sqlite.sqlite_async_pool import (
+    AsyncSQLitePool,
+    SQLiteExecutor,
+)
 
 
 class ConversationCoreRepository:
@@ -31,24 +35,28 @@ class ConversationCoreRepository:
         "archived",
     ]
 
-    def __init__(self, connection: sqlite3.Connection):
-        """Initialize core repository with database connection."""
+    def __init__(
+        self,
+        connection: Optional[sqlite3.Connection],
+        pool: Optional[AsyncSQLitePool] = None,
+    ):
+        """Initialize core repository with a database connection or pool."""
         self.connection = connection
+        self._executor = SQLiteExecutor(connection, pool)
         self.table_name = "conversations"
         self.logger = logging.getLogger(__name__)
 
     async def create(self, conversation: Conversation) -> Conversation:
         """Create a new conversation."""
         try:
-            cursor = self.connection.cursor()
             data = self._serialize_conversation_for_db(conversation)
 
             columns = ", ".join(data.keys())
             placeholders = ", ".join(["?" for _ in data])
             sql = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
 
-            cursor.execute(sql, list(data.values()))
-            self.connection.commit()
+            values = list(data.values())
+            await self._executor.write(lambda conn: conn.execute(sql, values))
 
             # Assign ID if not already present
             if not conversation.id:
@@ -63,11 +71,9 @@ class ConversationCoreRepository:
     async def get_by_id(self, conversation_id: str) -> Optional[Conversation]:
         """Retrieve conversation by ID."""
         try:
-            cursor = self.connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE id = ? AND archived = 0"
-            cursor.execute(sql, (conversation_id,))
-
-            row = cursor.fetchone()
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (conversation_id,)).fetchone())
             if row:
                 return self._deserialize_conversation_from_db(dict(row))
             return None
@@ -81,13 +87,11 @@ class ConversationCoreRepository:
             self, session_id: str) -> Optional[Conversation]:
         """Get conversation by session ID."""
         try:
-            cursor = self.connection.cursor()
             sql = (
                 f"SELECT * FROM {self.table_name} WHERE session_id = ? AND archived = 0"
             )
-            cursor.execute(sql, (session_id,))
-
-            row = cursor.fetchone()
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (session_id,)).fetchone())
             if row:
                 return self._deserialize_conversation_from_db(dict(row))
             return None
@@ -124,7 +128,6 @@ class ConversationCoreRepository:
     async def update(self, conversation: Conversation) -> Conversation:
         """Update existing conversation."""
         try:
-            cursor = self.connection.cursor()
             data = self._serialize_conversation_for_db(conversation)
 
             sql, update_values = self._prepare_update_data(data)
@@ -132,10 +135,10 @@ class ConversationCoreRepository:
             if not sql:
                 return conversation
 
-            cursor.execute(sql, update_values)
-            self.connection.commit()
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, update_values).rowcount)
 
-            if cursor.rowcount == 0:
+            if rowcount == 0:
                 raise ValueError(f"No conversation found with ID {data['id']}")
 
             return conversation
@@ -147,11 +150,11 @@ class ConversationCoreRepository:
     async def delete(self, conversation_id: str) -> bool:
         """Soft delete conversation (mark as archived)."""
         try:
-            cursor = self.connection.cursor()
             sql = f"UPDATE {self.table_name} SET archived = 1, updated_at = ? WHERE id = ?"
-            cursor.execute(sql, (datetime.now().isoformat(), conversation_id))
-            self.connection.commit()
-            return cursor.rowcount > 0
+            params = (datetime.now().isoformat(), conversation_id)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, params).rowcount)
+            return rowcount > 0
 
         except sqlite3.Error as e:
             self.logger.error(
@@ -167,7 +170,6 @@ class ConversationCoreRepository:
     ) -> List[Conversation]:
         """Retrieve conversations for a specific child."""
         try:
-            cursor = self.connection.cursor()
             sql = f"SELECT * FROM {self.table_name} WHERE child_id = ? AND archived = 0"
             params = [child_id]
 
@@ -185,8 +187,8 @@ class ConversationCoreRepository:
                 sql += " LIMIT ?"
                 params.append(limit)
 
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            rows = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchall())
 
             return [
                 self._deserialize_conversation_from_db(
@@ -295,7 +297,11 @@ class ConversationCoreRepository:
         return Conversation(**data)
 
     def transaction(self):
-        """Create a transaction context manager."""
+        """Create a transaction context manager (direct connection only)."""
+        if self._executor.pool is not None:
+            raise RuntimeError(
+                "transaction() is not available with a pool; writes go through "
+                "the pool's writer")
         return TransactionContext(self.connection)
 
 
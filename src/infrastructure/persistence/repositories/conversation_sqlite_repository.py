@@ -1,5 +1,6 @@
 """Clean conversation repository coordinator - Replaces God Class."""
 
+import asyncio
 import logging
 import os
 import sqlite3
@@ -11,6 +12,7 @@ from src.infrastructure.persistence.base_sqlite_repository import BaseSQLiteRepo
 from src.infrastructure.persistence.conversation_repository import (
     ConversationRepository,
 )
+from src.infrastructure.persistence.sqlite.sqlite_async_pool import AsyncSQLitePool
 
 from ...application.services.conversation.conversation_analytics_service import (
     ConversationAnalyticsService, )
@@ -28,6 +30,17 @@ from .conversation_core_repository import ConversationCoreRepository
 from .conversation_schema_manager import ConversationSchemaManager
 
 
+def _service_job(service_class, method: str, args: tuple):
+    """Pool job running a connection-bound service method on that connection"""
+
+    def job(connection: sqlite3.Connection):
+        # The services never await I/O, so a private event loop on the
+        # pool's connection thread runs them to completion
+        return asyncio.run(getattr(service_class(connection), method)(*args))
+
+    return job
+
+
 class ConversationSQLiteRepository(
     BaseSQLiteRepository[Conversation, str], ConversationRepository
 ):
@@ -42,37 +55,58 @@ class ConversationSQLiteRepository(
         db_path: str = os.path.join(
             os.path.dirname(__file__), "..", "..", "..", "data", "teddyai.db"
         ),
+        pool: Optional[AsyncSQLitePool] = None,
     ):
-        """Initialize conversation repository coordinator."""
+        """Initialize conversation repository coordinator.
+
+        With a ``pool`` no direct connection is opened: core CRUD and the
+        specialized services all run on the pool's connection threads, so
+        the pool's writer is the only writer.
+        """
         self.session_factory = session_factory
         self.logger = logging.getLogger(__name__)
+        self._pool = pool
 
-        # Ensure data directory exists
-        data_dir = os.path.dirname(db_path)
-        if not os.path.exists(data_dir):
-            os.makedirs(data_dir, exist_ok=True)
+        if pool is None:
+            # Ensure data directory exists
+            data_dir = os.path.dirname(db_path)
+            if not os.path.exists(data_dir):
+                os.makedirs(data_dir, exist_ok=True)
 
-        # Create connection
-        connection = sqlite3.connect(db_path, check_same_thread=False)
+            # Create connection
+            connection = sqlite3.connect(db_path, check_same_thread=False)
+        else:
+            connection = None
 
         super().__init__(
             connection=connection,
             table_name="conversations",
-            entity_class=Conversation)
+            entity_class=Conversation,
+            pool=pool)
 
         # Initialize specialized services
         self.schema_manager = ConversationSchemaManager(connection)
-        self.core_repository = ConversationCoreRepository(connection)
+        self.core_repository = ConversationCoreRepository(connection, pool)
         self.analytics_service = ConversationAnalyticsService(connection)
         self.export_service = ConversationExportService(connection)
         self.search_service = ConversationSearchService(connection)
         self.maintenance_service = ConversationMaintenanceService(connection)
 
         # Initialize database schema
-        self.schema_manager.create_all_tables()
+        self._executor.write_sync(
+            lambda conn: ConversationSchemaManager(conn).create_all_tables())
 
         self.logger.info("Conversation repository initialized")
 
+    async def _call_service(self, service, method: str, *args, write: bool = False):
+        """Call a specialized service, on the pool's threads when pooled."""
+        if self._pool is None:
+            return await getattr(service, method)(*args)
+        job = _service_job(type(service), method, args)
+        if write:
+            return await self._executor.write(job)
+        return await self._executor.read(job)
+
     # === Core CRUD Operations ===
 
     async def create(self, conversation: Conversation) -> Conversation:
@@ -118,25 +152,29 @@ class ConversationSQLiteRepository(
         group_by: str = "day",
     ) -> Dict[str, Any]:
         """Generate comprehensive conversation analytics."""
-        return await self.analytics_service.get_conversation_analytics(
-            child_id, start_date, end_date, group_by
+        return await self._call_service(
+            self.analytics_service, "get_conversation_analytics",
+            child_id, start_date, end_date, group_by,
         )
 
     async def get_conversation_statistics(self) -> Dict[str, Any]:
         """Get overall conversation statistics."""
-        return await self.analytics_service.get_conversation_statistics()
+        return await self._call_service(
+            self.analytics_service, "get_conversation_statistics")
 
     async def generate_daily_summary(
         self, date: date, child_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate daily conversation summary."""
-        return await self.analytics_service.generate_daily_summary(date, child_id)
+        return await self._call_service(
+            self.analytics_service, "generate_daily_summary", date, child_id)
 
     async def get_conversation_health_metrics(
             self, child_id: str) -> Dict[str, Any]:
         """Generate comprehensive health metrics for a child's conversations."""
         # Use analytics service for basic statistics
-        stats = await self.analytics_service.get_conversation_statistics()
+        stats = await self._call_service(
+            self.analytics_service, "get_conversation_statistics")
         return {
             "status": "success",
             "child_id": child_id,
@@ -158,8 +196,9 @@ class ConversationSQLiteRepository(
         include_transcripts: bool = True,
     ) -> bytes:
         """Export conversations to specified format."""
-        return await self.export_service.export_conversations(
-            child_id, start_date, end_date, format, include_transcripts
+        return await self._call_service(
+            self.export_service, "export_conversations",
+            child_id, start_date, end_date, format, include_transcripts,
         )
 
     # === Search Operations ===
@@ -168,8 +207,9 @@ class ConversationSQLiteRepository(
         self, query: str, child_id: Optional[str] = None, search_in: List[str] = None
     ) -> List[Tuple[Conversation, List[Message]]]:
         """Full-text search in conversation messages."""
-        raw_results = await self.search_service.search_conversation_content(
-            query, child_id, search_in
+        raw_results = await self._call_service(
+            self.search_service, "search_conversation_content",
+            query, child_id, search_in,
         )
 
         # Convert raw results to proper entities
@@ -197,7 +237,8 @@ class ConversationSQLiteRepository(
 
     async def find_conversations_requiring_review(self) -> List[Conversation]:
         """Find conversations that may require manual review."""
-        conv_data_list = await self.search_service.get_conversations_requiring_review()
+        conv_data_list = await self._call_service(
+            self.search_service, "get_conversations_requiring_review")
         return [
             self.core_repository._deserialize_conversation_from_db(data)
             for data in conv_data_list
@@ -207,8 +248,9 @@ class ConversationSQLiteRepository(
         self, inactive_threshold_minutes: int = 30
     ) -> List[Conversation]:
         """Get currently active conversations."""
-        conv_data_list = await self.search_service.get_active_conversations(
-            inactive_threshold_minutes
+        conv_data_list = await self._call_service(
+            self.search_service, "get_active_conversations",
+            inactive_threshold_minutes,
         )
         return [
             self.core_repository._deserialize_conversation_from_db(data)
@@ -221,21 +263,24 @@ class ConversationSQLiteRepository(
         self, retention_days: int = 90, exclude_flagged: bool = True
     ) -> int:
         """Delete old conversations."""
-        return await self.maintenance_service.delete_old_conversations(
-            retention_days, exclude_flagged
+        return await self._call_service(
+            self.maintenance_service, "delete_old_conversations",
+            retention_days, exclude_flagged, write=True,
         )
 
     async def archive_conversations(
         self, days_old: int = 30, archive_path: str = "archives/"
     ) -> int:
         """Archive old conversations to storage."""
-        return await self.maintenance_service.archive_conversations(
-            days_old, archive_path
+        return await self._call_service(
+            self.maintenance_service, "archive_conversations",
+            days_old, archive_path, write=True,
         )
 
     async def optimize_conversation_performance(self) -> Dict[str, Any]:
         """Analyze and suggest optimizations for conversation performance."""
-        return await self.maintenance_service.analyze_performance()
+        return await self._call_service(
+            self.maintenance_service, "analyze_performance")
 
     # === Utility Methods ===
 
@@ -283,8 +328,6 @@ class ConversationSQLiteRepository(
     ) -> Any:
         """Perform aggregation operations on conversation data."""
         try:
-            cursor = self._connection.cursor()
-
             if operation.lower() == "count":
                 sql = f"SELECT COUNT(*) FROM {self.table_name}"
             else:
@@ -292,8 +335,7 @@ class ConversationSQLiteRepository(
 
             sql += " WHERE archived = 0"
 
-            cursor.execute(sql)
-            result = cursor.fetchone()
+            result = await self._executor.read(lambda conn: conn.execute(sql).fetchone())
 
             return result[0] if result and result[0] is not None else 0
 
@@ -5,9 +5,14 @@
 Repository that rebuilds aggregates from events with snapshots.
 """
 
+import asyncio
+import copy
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Type, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
 
 from ...shared.kernel import AggregateRoot, DomainEvent
 from .event_store import EventStore, StoredEvent, get_event_store
@@ -31,6 +36,58 @@ class EventSourcingRepository(ABC):
         pass
 
 
+@dataclass
+class ReplayCost:
+    """Replay cost observed for a stream since its last snapshot"""
+
+    events_replayed: int = 0
+    replay_seconds: float = 0.0
+
+
+class HydratedAggregateCache:
+    """Bounded LRU cache of hydrated aggregates keyed by stream ID.
+
+    Entries carry the aggregate version they were hydrated at, so a
+    lookup is only a hit while no newer event has been stored.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[int, AggregateRoot]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, stream_id: str) -> Optional[Tuple[int, AggregateRoot]]:
+        """Return (version, aggregate) for a stream if cached"""
+        entry = self._entries.get(stream_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(stream_id)
+        self.hits += 1
+        return entry
+
+    def put(self, stream_id: str, aggregate: AggregateRoot) -> None:
+        """Cache a hydrated aggregate at its current version"""
+        if self.max_size <= 0:
+            return
+        self._entries[stream_id] = (aggregate.version, aggregate)
+        self._entries.move_to_end(stream_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, stream_id: str) -> None:
+        """Drop a cached aggregate"""
+        self._entries.pop(stream_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached aggregates"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class EventSourcingRepositoryImpl(EventSourcingRepository):
     """Event sourcing repository implementation"""
 
@@ -39,10 +96,22 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
         aggregate_type: Type[T],
         event_store: Optional[EventStore] = None,
         snapshot_store: Optional[SnapshotStore] = None,
+        cache_size: int = 1000,
+        max_concurrent_loads: int = 32,
+        snapshot_event_threshold: int = 100,
+        snapshot_replay_budget_ms: float = 50.0,
     ):
         self.aggregate_type = aggregate_type
         self.event_store = event_store or get_event_store()
         self.snapshot_store = snapshot_store or get_snapshot_store()
+        self.cache = HydratedAggregateCache(max_size=cache_size)
+        self.max_concurrent_loads = max_concurrent_loads
+        self.snapshot_event_threshold = snapshot_event_threshold
+        self.snapshot_replay_budget_ms = snapshot_replay_budget_ms
+        # Bounded like the aggregate cache; evicted streams just fall back
+        # to the snapshot store's fixed rule
+        self.max_tracked_replay_costs = max(cache_size, 1)
+        self._replay_costs: "OrderedDict[str, ReplayCost]" = OrderedDict()
 
     async def save(self, aggregate: T) -> None:
         """Save aggregate by persisting uncommitted events"""
@@ -53,6 +122,7 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
         events = aggregate.get_domain_events()
         stream_id = self._get_stream_id(aggregate)
 
+        self.cache.invalidate(stream_id)
         await self._persist_events(aggregate, events, stream_id)
         await self._handle_snapshotting(aggregate, stream_id)
 
@@ -64,17 +134,67 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
 
         stream_id = self._get_stream_id_from_id(aggregate_id)
 
-        # Try snapshot-based loading first
-        aggregate = await self._load_from_snapshot(stream_id)
+        aggregate = await self._load_from_cache(stream_id)
         if not aggregate:
-            aggregate = await self._load_from_events(stream_id)
+            # Try snapshot-based loading first
+            aggregate = await self._load_from_snapshot(stream_id)
+            if not aggregate:
+                aggregate = await self._load_from_events(stream_id)
+            if aggregate:
+                self.cache.put(stream_id, copy.deepcopy(aggregate))
 
         if aggregate:
             aggregate.clear_domain_events()
-            logger.info(f"Loaded aggregate {stream_id}")
+            logger.debug(f"Loaded aggregate {stream_id}")
 
         return aggregate
 
+    async def load_many(self, aggregate_ids: List[str]) -> Dict[str, T]:
+        """Load many aggregates concurrently.
+
+        Snapshots and event tails are fetched in parallel, bounded by
+        ``max_concurrent_loads``. Missing aggregates are omitted.
+        """
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_loads)
+
+        async def _load_one(aggregate_id: str) -> Optional[T]:
+            async with semaphore:
+                return await self.load(aggregate_id)
+
+        unique_ids = list(dict.fromkeys(aggregate_ids))
+        results = await asyncio.gather(
+            *(_load_one(aggregate_id) for aggregate_id in unique_ids)
+        )
+
+        return {
+            aggregate_id: aggregate
+            for aggregate_id, aggregate in zip(unique_ids, results)
+            if aggregate is not None
+        }
+
+    def get_replay_cost(self, stream_id: str) -> ReplayCost:
+        """Get replay cost accumulated since the last snapshot"""
+        return self._replay_costs.get(stream_id, ReplayCost())
+
+    async def _load_from_cache(self, stream_id: str) -> Optional[T]:
+        """Load aggregate from cache, catching up on newer events"""
+
+        entry = self.cache.get(stream_id)
+        if not entry:
+            return None
+
+        cached_version, cached = entry
+        events = await self.event_store.load_events(
+            stream_id=stream_id, from_version=cached_version + 1
+        )
+        if events:
+            # Cached copy is stale - bring it up to date and re-cache
+            self._apply_events_to_aggregate(cached, events)
+            self.cache.put(stream_id, cached)
+
+        return copy.deepcopy(cached)
+
     async def _persist_events(
             self,
             aggregate: T,
@@ -93,12 +213,25 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
     async def _handle_snapshotting(self, aggregate: T, stream_id: str) -> None:
         """Handle snapshot creation if needed"""
 
-        if await self.snapshot_store.should_create_snapshot(
-            stream_id, aggregate.version
-        ):
+        if self._replay_too_costly(
+            stream_id
+        ) or await self.snapshot_store.should_create_snapshot(stream_id, aggregate.version):
             await self.snapshot_store.save_snapshot(
                 stream_id=stream_id, aggregate=aggregate, version=aggregate.version
             )
+            self._replay_costs.pop(stream_id, None)
+
+    def _replay_too_costly(self, stream_id: str) -> bool:
+        """Adaptive snapshot rule based on observed replay cost"""
+
+        cost = self._replay_costs.get(stream_id)
+        if not cost:
+            return False
+
+        return (
+            cost.events_replayed >= self.snapshot_event_threshold
+            or cost.replay_seconds * 1000 >= self.snapshot_replay_budget_ms
+        )
 
     async def _load_from_snapshot(self, stream_id: str) -> Optional[T]:
         """Load aggregate from snapshot + subsequent events"""
@@ -114,7 +247,7 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
             stream_id=stream_id, from_version=snapshot.metadata.version + 1
         )
 
-        return self._apply_events_to_aggregate(aggregate, events)
+        return self._replay_events(stream_id, aggregate, events)
 
     async def _load_from_events(self, stream_id: str) -> Optional[T]:
         """Load aggregate from all events"""
@@ -126,7 +259,21 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
         aggregate_id = stream_id.split(".")[1]
         aggregate = self._create_empty_aggregate(aggregate_id)
 
-        return self._apply_events_to_aggregate(aggregate, events)
+        return self._replay_events(stream_id, aggregate, events)
+
+    def _replay_events(self, stream_id: str, aggregate: T, events) -> T:
+        """Apply events and record the replay cost for adaptive snapshotting"""
+
+        started = time.perf_counter()
+        aggregate = self._apply_events_to_aggregate(aggregate, events)
+        self._replay_costs[stream_id] = ReplayCost(
+            events_replayed=len(events),
+            replay_seconds=time.perf_counter() - started,
+        )
+        self._replay_costs.move_to_end(stream_id)
+        while len(self._replay_costs) > self.max_tracked_replay_costs:
+            self._replay_costs.popitem(last=False)
+        return aggregate
 
     def _apply_events_to_aggregate(self, aggregate: T, events) -> T:
         """Apply events to rebuild aggregate state"""
@@ -135,7 +282,9 @@ class EventSourcingRepositoryImpl(EventSourcingRepository):
             domain_event = self._deserialize_event(stored_event)
             if domain_event:
                 self._apply_event_to_aggregate(aggregate, domain_event)
-                aggregate.increment_version()
+            # Version tracks the stream position, applied or not, so the
+            # next incremental load starts after every stored event
+            aggregate.increment_version()
 
         return aggregate
 
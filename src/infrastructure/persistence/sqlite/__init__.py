@@ -2,9 +2,17 @@
 Expose public components of the SQLite persistence layer.
 """
 
+from .sqlite_async_pool import AsyncSQLitePool, SQLiteExecutor, SQLitePoolConfig
 from .sqlite_base import BaseSQLiteRepository, DatabaseError
+from .sqlite_bulk_ingest import BulkLoadOptions, BulkLoadStats, SQLiteBulkLoader
 
 __all__ = [
+    "AsyncSQLitePool",
+    "SQLiteExecutor",
+    "SQLitePoolConfig",
     "BaseSQLiteRepository",
     "DatabaseError",
+    "BulkLoadOptions",
+    "BulkLoadStats",
+    "SQLiteBulkLoader",
 ]
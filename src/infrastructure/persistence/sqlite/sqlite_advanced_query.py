@@ -5,8 +5,7 @@ import logging
 import sqlite3
 from typing import Any, List, Optional, TypeVar
 
-from src.infrastructure.persistence.base import QueryOptions, SearchCriteria
-from src.infrastructure.persistence.repositories.base_sqlite_repository import DatabaseError
+from src.infrastructure.persistence.base import DatabaseError, QueryOptions, SearchCriteria
 
 from .sqlite_query_builder import QueryBuilderMixin
 
@@ -22,11 +21,10 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
     ) -> List[T]:
         """Searches for entities with advanced criteria, including validation and pagination."""
         try:
-            cursor = self._connection.cursor()
             options = options or QueryOptions()
             sql, params = self._build_search_query(criteria, options)
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            rows = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchall())
             return [self._dict_to_entity(dict(row)) for row in rows]
         except sqlite3.Error as e:
             logger.error(f"Error searching entities: {e}", exc_info=True)
@@ -35,7 +33,6 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
     async def count(self, criteria: Optional[List[SearchCriteria]] = None) -> int:
         """Counts entities that match the given search criteria."""
         try:
-            cursor = self._connection.cursor()
             self._validate_table_and_column(self.table_name)
             sql = f"SELECT COUNT(*) FROM {self.table_name}"
             params: List[Any] = []
@@ -44,8 +41,8 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
                 sql, params = self._apply_criteria_to_query(
                     sql, params, criteria)
 
-            cursor.execute(sql, params)
-            result = cursor.fetchone()
+            result = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchone())
             return result[0] if result else 0
         except sqlite3.Error as e:
             logger.error(f"Error counting entities: {e}", exc_info=True)
@@ -54,11 +51,11 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
     async def exists(self, entity_id: str) -> bool:
         """Checks if an entity with the given ID exists."""
         try:
-            cursor = self._connection.cursor()
             self._validate_table_and_column("id")
             sql = f"SELECT 1 FROM {self.table_name} WHERE id = ? LIMIT 1"
-            cursor.execute(sql, (entity_id,))
-            return cursor.fetchone() is not None
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (entity_id,)).fetchone())
+            return row is not None
         except sqlite3.Error as e:
             logger.error(
                 f"Error checking entity existence for ID {entity_id}: {e}", exc_info=True)
@@ -84,7 +81,6 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
     ) -> Any:
         """Performs an aggregation operation (e.g., COUNT, SUM, AVG) on a specific field."""
         try:
-            cursor = self._connection.cursor()
             self._validate_table_and_column(self.table_name)
             agg_func = self._build_aggregation_function(operation, field)
             sql = f"SELECT {agg_func} FROM {self.table_name}"
@@ -94,8 +90,8 @@ class SQLiteAdvancedQueryMixin(QueryBuilderMixin):
                 sql, params = self._apply_criteria_to_query(
                     sql, params, criteria)
 
-            cursor.execute(sql, params)
-            result = cursor.fetchone()
+            result = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchone())
             return result[0] if result else None
         except sqlite3.Error as e:
             logger.error(
@@ -0,0 +1,384 @@
+"""
+Async SQLite access with a reader/writer split.
+
+Every connection lives on its own thread and only ever runs there, so
+``sqlite3`` calls never block the event loop:
+
+- one writer connection; writes are serialized through its queue, each
+  job runs in its own transaction (commit on success, rollback on error)
+- a pool of WAL-mode reader connections (``query_only``), each job goes to
+  the least busy reader; readers see everything the writer has committed
+  before the awaiting coroutine resumes
+
+Statements are prepared once per connection (``cached_statements``), and
+writer and readers get their own pragma sets. Queue-wait and statement
+time are recorded per role, and an optional monitor task measures how
+late the event loop wakes up (loop stall).
+"""
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union,
+)
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+Job = Callable[[sqlite3.Connection], R]
+
+WRITER_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # crash-safe under WAL
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -16384,  # KiB
+    "wal_autocheckpoint": 1000,
+}
+
+READER_PRAGMAS: Dict[str, Any] = {
+    "query_only": "ON",
+    "temp_store": "MEMORY",
+    "cache_size": -8192,
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+@dataclass
+class SQLitePoolConfig:
+    """Connection layout and tuning for one database file"""
+
+    db_path: str
+    readers: int = 4
+    busy_timeout_ms: int = 5000
+    cached_statements: int = 256
+    writer_pragmas: Dict[str, Any] = field(default_factory=lambda: dict(WRITER_PRAGMAS))
+    reader_pragmas: Dict[str, Any] = field(default_factory=lambda: dict(READER_PRAGMAS))
+    stall_check_interval: float = 0.1
+
+
+class LatencyStats:
+    """Thread-safe count/avg/max/p95 over recent observations"""
+
+    def __init__(self, window: int = 2048):
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, peak = self.count, self.total, self.max
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": count,
+            "avg_ms": total / count * 1000 if count else 0.0,
+            "p95_ms": p95 * 1000,
+            "max_ms": peak * 1000,
+        }
+
+
+class _ConnectionWorker:
+    """One connection, one thread, one FIFO of jobs"""
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], sqlite3.Connection],
+        queue_wait: LatencyStats,
+        statement_time: LatencyStats,
+    ):
+        self.name = name
+        self._connect = connect
+        self._queue_wait = queue_wait
+        self._statement_time = statement_time
+        self._jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._pending_lock = threading.Lock()
+        self.pending = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, job: Job) -> Future:
+        future: Future = Future()
+        with self._pending_lock:
+            self.pending += 1
+        self._jobs.put((job, future, time.perf_counter()))
+        return future
+
+    def stop(self) -> None:
+        self._jobs.put(None)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        connection, error = None, None
+        try:
+            connection = self._connect()
+        except Exception as e:
+            logger.error(f"❌ SQLite worker {self.name} failed to connect: {e}")
+            error = e
+
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            job, future, enqueued_at = item
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue  # Awaiting coroutine was cancelled before we got here
+                started = time.perf_counter()
+                self._queue_wait.observe(started - enqueued_at)
+                if error is not None:
+                    future.set_exception(error)
+                    continue
+                try:
+                    result = job(connection)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+                self._statement_time.observe(time.perf_counter() - started)
+            finally:
+                with self._pending_lock:
+                    self.pending -= 1
+
+        if connection is not None:
+            connection.close()
+
+
+def _in_transaction(job: Job) -> Job:
+    """Run ``job`` as one transaction on the connection it is given"""
+
+    def run(connection: sqlite3.Connection):
+        try:
+            result = job(connection)
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        if connection.in_transaction:
+            connection.commit()
+        return result
+
+    return run
+
+
+class AsyncSQLitePool:
+    """Awaitable SQLite access: one serialized writer, N WAL readers"""
+
+    def __init__(self, config: Union[SQLitePoolConfig, str]):
+        if not isinstance(config, SQLitePoolConfig):
+            config = SQLitePoolConfig(config)
+        self.config = config
+        self._writer: Optional[_ConnectionWorker] = None
+        self._readers: List[_ConnectionWorker] = []
+        self._lock = threading.Lock()
+        self._stall_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.metrics = {
+            "writer_queue_wait": LatencyStats(),
+            "writer_statement": LatencyStats(),
+            "reader_queue_wait": LatencyStats(),
+            "reader_statement": LatencyStats(),
+            "loop_stall": LatencyStats(),
+        }
+
+    @property
+    def is_memory(self) -> bool:
+        path = self.config.db_path
+        return path == ":memory:" or path.startswith("file::memory:")
+
+    # ---------------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------------
+
+    def _connect(self, pragmas: Dict[str, Any]) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.config.db_path,
+            timeout=self.config.busy_timeout_ms / 1000,
+            cached_statements=self.config.cached_statements,
+            uri=self.config.db_path.startswith("file:"),
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute(f"PRAGMA busy_timeout = {int(self.config.busy_timeout_ms)}")
+        for name, value in pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def open(self) -> None:
+        """Start the worker threads (idempotent; also done on first use)"""
+        with self._lock:
+            if self._writer is not None:
+                return
+            if self._closed:
+                raise RuntimeError("SQLite pool is closed")
+
+            writer = _ConnectionWorker(
+                "sqlite-writer",
+                lambda: self._connect(self.config.writer_pragmas),
+                self.metrics["writer_queue_wait"],
+                self.metrics["writer_statement"],
+            )
+            writer.start()
+            # Readers open after the writer has switched the file to WAL
+            writer.submit(lambda connection: None).result()
+            self._writer = writer
+
+            # An in-memory database is private to its connection
+            reader_count = 0 if self.is_memory else self.config.readers
+            for index in range(reader_count):
+                reader = _ConnectionWorker(
+                    f"sqlite-reader-{index}",
+                    lambda: self._connect(self.config.reader_pragmas),
+                    self.metrics["reader_queue_wait"],
+                    self.metrics["reader_statement"],
+                )
+                reader.start()
+                self._readers.append(reader)
+
+        logger.info(
+            f"✅ SQLite pool ready: 1 writer, {len(self._readers)} readers "
+            f"({self.config.db_path})")
+
+    async def initialize(self) -> None:
+        """Open the pool and start the loop-stall monitor"""
+        self.open()
+        if self._stall_task is None and self.config.stall_check_interval > 0:
+            self._stall_task = asyncio.create_task(self._monitor_loop_stall())
+
+    async def close(self) -> None:
+        if self._stall_task is not None:
+            self._stall_task.cancel()
+            self._stall_task = None
+        with self._lock:
+            workers = ([self._writer] if self._writer else []) + self._readers
+            self._writer, self._readers, self._closed = None, [], True
+        for worker in workers:
+            worker.stop()
+        loop = asyncio.get_running_loop()
+        for worker in workers:
+            await loop.run_in_executor(None, worker.join, 5.0)
+        logger.info("✅ SQLite pool closed")
+
+    async def _monitor_loop_stall(self) -> None:
+        interval = self.config.stall_check_interval
+        stall = self.metrics["loop_stall"]
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                started = loop.time()
+                await asyncio.sleep(interval)
+                stall.observe(max(0.0, loop.time() - started - interval))
+            except asyncio.CancelledError:
+                break
+
+    # ---------------------------------------------------------------
+    # Jobs
+    # ---------------------------------------------------------------
+
+    def submit_write(self, job: Job) -> Future:
+        """Queue ``job(connection)`` on the writer as one transaction"""
+        self.open()
+        return self._writer.submit(_in_transaction(job))
+
+    def submit_read(self, job: Job) -> Future:
+        """Queue ``job(connection)`` on the least busy reader"""
+        self.open()
+        if not self._readers:
+            return self._writer.submit(job)
+        return min(self._readers, key=lambda reader: reader.pending).submit(job)
+
+    async def run_write(self, job: Job) -> R:
+        return await asyncio.wrap_future(self.submit_write(job))
+
+    async def run_read(self, job: Job) -> R:
+        return await asyncio.wrap_future(self.submit_read(job))
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return await self.run_read(
+            lambda connection: connection.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return await self.run_read(
+            lambda connection: connection.execute(sql, params).fetchone())
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> Tuple[int, Optional[int]]:
+        """Run a write statement: (rowcount, lastrowid)"""
+
+        def job(connection: sqlite3.Connection):
+            cursor = connection.execute(sql, params)
+            return cursor.rowcount, cursor.lastrowid
+
+        return await self.run_write(job)
+
+    async def executemany(self, sql: str, params: Iterable[Sequence[Any]]) -> int:
+        return await self.run_write(
+            lambda connection: connection.executemany(sql, params).rowcount)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "db_path": self.config.db_path,
+            "readers": len(self._readers),
+            "writer_pending": self._writer.pending if self._writer else 0,
+            "reader_pending": sum(reader.pending for reader in self._readers),
+            **{name: stats.snapshot() for name, stats in self.metrics.items()},
+        }
+
+
+class SQLiteExecutor:
+    """Runs repository jobs on a pool, or inline on a plain connection.
+
+    Lets a repository keep its ``async def`` interface either way: with a
+    pool the job runs on a connection thread, without one it runs on
+    ``connection`` directly (the old, loop-blocking behaviour).
+    """
+
+    def __init__(
+        self,
+        connection: Optional[sqlite3.Connection] = None,
+        pool: Optional[AsyncSQLitePool] = None,
+    ):
+        if connection is None and pool is None:
+            raise ValueError("Either a connection or a pool is required")
+        self.connection = connection
+        self.pool = pool
+
+    async def read(self, job: Job) -> R:
+        if self.pool is not None:
+            return await self.pool.run_read(job)
+        return job(self.connection)
+
+    def read_sync(self, job: Job) -> R:
+        """Blocking read, for synchronous callers outside the event loop"""
+        if self.pool is not None:
+            return self.pool.submit_read(job).result()
+        return job(self.connection)
+
+    async def write(self, job: Job) -> R:
+        if self.pool is not None:
+            return await self.pool.run_write(job)
+        return _in_transaction(job)(self.connection)
+
+    def write_sync(self, job: Job) -> R:
+        """Blocking write, for setup code outside the event loop"""
+        if self.pool is not None:
+            return self.pool.submit_write(job).result()
+        return _in_transaction(job)(self.connection)
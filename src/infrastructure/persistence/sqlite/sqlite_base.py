@@ -5,12 +5,12 @@ import logging
 import sqlite3
 from abc import abstractmethod
 from contextlib import contextmanager
-from typing import Any, List, Optional, Type, TypeVar
+from typing import Any, Callable, List, Optional, Type, TypeVar
 
-from src.infrastructure.persistence.base import BaseRepository, QueryOptions
-from src.infrastructure.persistence.repositories.base_sqlite_repository import DatabaseError
+from src.infrastructure.persistence.base import BaseRepository, DatabaseError, QueryOptions
 
 from .sqlite_advanced_query import SQLiteAdvancedQueryMixin
+from .sqlite_async_pool import AsyncSQLitePool, SQLiteExecutor
 from .sqlite_bulk_operations import SQLiteBulkOperationsMixin
 from .sqlite_utils import SQLiteUtilityMixin
 
@@ -29,14 +29,27 @@ class BaseSQLiteRepository(
     """
     An enhanced and modular base repository for SQLite, providing comprehensive
     CRUD, bulk, and advanced query operations through mixins.
+
+    With a ``pool`` every operation runs on the pool's connection threads
+    instead of blocking the event loop, and the pool's writer is the only
+    writer; ``connection`` may then be None. Use :meth:`run_in_transaction`
+    rather than :meth:`transaction` on a pooled repository.
     """
 
-    def __init__(self, connection: sqlite3.Connection, table_name: str, entity_class: Type[T]):
+    def __init__(
+        self,
+        connection: Optional[sqlite3.Connection],
+        table_name: str,
+        entity_class: Type[T],
+        pool: Optional[AsyncSQLitePool] = None,
+    ):
         self._connection = connection
         self._table_name = table_name
         self._entity_class = entity_class
+        self._executor = SQLiteExecutor(connection, pool)
 
-        self._configure_connection()
+        if connection is not None:
+            self._configure_connection()
         self._ensure_table_exists()
 
     def _configure_connection(self):
@@ -60,8 +73,7 @@ class BaseSQLiteRepository(
         """Ensures the repository's table exists in the database, creating it if necessary."""
         try:
             schema = self._get_table_schema()
-            self._connection.execute(schema)
-            self._connection.commit()
+            self._executor.write_sync(lambda conn: conn.execute(schema))
         except sqlite3.Error as e:
             logger.error(
                 f"Error creating table {self.table_name}: {e}", exc_info=True)
@@ -71,6 +83,11 @@ class BaseSQLiteRepository(
     @contextmanager
     def transaction(self):
         """Provides a transactional context manager for database operations."""
+        if self._executor.pool is not None:
+            # A second connection would be a second writer next to the pool
+            raise DatabaseError(
+                "transaction() needs a direct connection; use run_in_transaction() "
+                "on a pooled repository")
         try:
             yield self._connection
             self._connection.commit()
@@ -80,17 +97,25 @@ class BaseSQLiteRepository(
             self._connection.rollback()
             raise DatabaseError(f"Transaction failed: {e}")
 
+    async def run_in_transaction(self, job: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Runs ``job(connection)`` as one transaction (on the pool writer, if any)."""
+        try:
+            return await self._executor.write(job)
+        except sqlite3.Error as e:
+            logger.error(
+                f"Transaction failed, rolling back changes for table {self.table_name}: {e}", exc_info=True)
+            raise DatabaseError(f"Transaction failed: {e}")
+
     async def create(self, entity: T) -> T:
         """Creates a new entity in the database."""
+        entity_dict = self._entity_to_dict(entity)
+        sql, values = self._prepare_insert_sql(entity_dict)
         try:
-            with self.transaction() as conn:
-                entity_dict = self._entity_to_dict(entity)
-                sql, values = self._prepare_insert_sql(entity_dict)
-                cursor = conn.cursor()
-                cursor.execute(sql, values)
-                if hasattr(entity, "id") and not getattr(entity, "id", None):
-                    setattr(entity, "id", cursor.lastrowid)
-                return entity
+            lastrowid = await self._executor.write(
+                lambda conn: conn.execute(sql, values).lastrowid)
+            if hasattr(entity, "id") and not getattr(entity, "id", None):
+                setattr(entity, "id", lastrowid)
+            return entity
         except sqlite3.Error as e:
             logger.error(
                 f"Error creating entity in {self.table_name}: {e}", exc_info=True)
@@ -99,11 +124,10 @@ class BaseSQLiteRepository(
     async def get_by_id(self, entity_id: ID) -> Optional[T]:
         """Retrieves an entity by its unique identifier."""
         try:
-            cursor = self._connection.cursor()
             self._validate_table_and_column("id")
             sql = f"SELECT * FROM {self.table_name} WHERE id = ?"
-            cursor.execute(sql, (entity_id,))
-            row = cursor.fetchone()
+            row = await self._executor.read(
+                lambda conn: conn.execute(sql, (entity_id,)).fetchone())
             return self._dict_to_entity(row) if row else None
         except sqlite3.Error as e:
             logger.error(
@@ -113,15 +137,14 @@ class BaseSQLiteRepository(
     async def update(self, entity: T) -> T:
         """Updates an existing entity in the database."""
         try:
-            with self.transaction() as conn:
-                entity_dict = self._entity_to_dict(entity)
-                sql, values = self._prepare_update_sql(entity_dict)
-                cursor = conn.cursor()
-                cursor.execute(sql, values)
-                if cursor.rowcount == 0:
-                    raise ValueError(
-                        f"No entity found with ID {entity_dict.get('id')} to update.")
-                return entity
+            entity_dict = self._entity_to_dict(entity)
+            sql, values = self._prepare_update_sql(entity_dict)
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, values).rowcount)
+            if rowcount == 0:
+                raise ValueError(
+                    f"No entity found with ID {entity_dict.get('id')} to update.")
+            return entity
         except (sqlite3.Error, ValueError) as e:
             logger.error(
                 f"Error updating entity in {self.table_name}: {e}", exc_info=True)
@@ -130,12 +153,11 @@ class BaseSQLiteRepository(
     async def delete(self, entity_id: ID) -> bool:
         """Deletes an entity from the database by its ID."""
         try:
-            with self.transaction() as conn:
-                self._validate_table_and_column("id")
-                sql = f"DELETE FROM {self.table_name} WHERE id = ?"
-                cursor = conn.cursor()
-                cursor.execute(sql, (entity_id,))
-                return cursor.rowcount > 0
+            self._validate_table_and_column("id")
+            sql = f"DELETE FROM {self.table_name} WHERE id = ?"
+            rowcount = await self._executor.write(
+                lambda conn: conn.execute(sql, (entity_id,)).rowcount)
+            return rowcount > 0
         except sqlite3.Error as e:
             logger.error(
                 f"Error deleting entity {entity_id} from {self.table_name}: {e}", exc_info=True)
@@ -144,11 +166,10 @@ class BaseSQLiteRepository(
     async def list(self, options: Optional[QueryOptions] = None) -> List[T]:
         """Lists entities with optional filtering, sorting, and pagination."""
         try:
-            cursor = self._connection.cursor()
             options = options or QueryOptions()
             sql, params = self._build_list_query(options)
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+            rows = await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchall())
             return [self._dict_to_entity(row) for row in rows]
         except sqlite3.Error as e:
             logger.error(
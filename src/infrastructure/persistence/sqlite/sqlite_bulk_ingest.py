@@ -0,0 +1,272 @@
+"""
+Set-based bulk ingestion for SQLite tables.
+
+Rows are written with one ``executemany`` per chunk, all chunks inside a
+single transaction, so SQLite prepares the statement once and syncs once
+per load instead of once per row. Loads can UPSERT (``INSERT ... ON
+CONFLICT``), drop and rebuild secondary indexes around a large load, and
+run with relaxed pragmas that are restored afterwards.
+"""
+import logging
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+_NAME_RE = re.compile(r"^[a-zA-Z0-9_]+$")
+
+# Applied for the duration of a load only. synchronous=NORMAL is
+# crash-safe under WAL (the mode BaseSQLiteRepository configures).
+LOAD_PRAGMAS: Dict[str, Any] = {
+    "synchronous": "NORMAL",
+    "cache_size": -65536,  # KiB
+    "temp_store": "MEMORY",
+}
+
+
+def _validate_name(name: str) -> str:
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Invalid table or column name: {name}")
+    return name
+
+
+@dataclass
+class BulkLoadOptions:
+    """How a bulk load writes its rows"""
+
+    chunk_size: int = 5000
+    # UPSERT target; None means a plain INSERT
+    conflict_columns: Optional[Sequence[str]] = None
+    # Columns overwritten on conflict; None = every non-key column,
+    # empty = keep the existing row (DO NOTHING)
+    update_columns: Optional[Sequence[str]] = None
+    # Drop non-unique secondary indexes and rebuild them once at the end
+    defer_indexes: bool = False
+    pragmas: Optional[Dict[str, Any]] = field(default_factory=lambda: dict(LOAD_PRAGMAS))
+
+
+@dataclass
+class BulkLoadStats:
+    """Outcome of one bulk load"""
+
+    rows: int = 0
+    chunks: int = 0
+    changes: int = 0
+    indexes_rebuilt: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class SQLiteBulkLoader:
+    """Chunked ``executemany`` loader for one table of a connection"""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        table_name: str,
+        serialize: Optional[Callable[[Any], Any]] = None,
+    ):
+        self._connection = connection
+        self.table_name = _validate_name(table_name)
+        self._serialize = serialize
+        self._sql_cache: Dict[Tuple, str] = {}
+
+    def build_insert_sql(
+        self,
+        columns: Sequence[str],
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> str:
+        """INSERT (or UPSERT) statement for ``columns``, built once per shape"""
+        key = (
+            tuple(columns),
+            tuple(conflict_columns) if conflict_columns is not None else None,
+            tuple(update_columns) if update_columns is not None else None,
+        )
+        sql = self._sql_cache.get(key)
+        if sql is not None:
+            return sql
+
+        for column in columns:
+            _validate_name(column)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        if conflict_columns:
+            for column in conflict_columns:
+                _validate_name(column)
+            if update_columns is None:
+                update_columns = [c for c in columns if c not in conflict_columns]
+            target = ", ".join(conflict_columns)
+            if update_columns:
+                assignments = ", ".join(
+                    f"{_validate_name(c)} = excluded.{c}" for c in update_columns)
+                sql += f" ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+            else:
+                sql += f" ON CONFLICT ({target}) DO NOTHING"
+        self._sql_cache[key] = sql
+        return sql
+
+    def _row_values(self, rows: Iterable[Any], columns: Sequence[str]) -> Iterator[Tuple]:
+        serialize = self._serialize
+        for row in rows:
+            if isinstance(row, Mapping):
+                try:
+                    values = tuple(row[c] for c in columns)
+                except KeyError as e:
+                    raise ValueError(f"Row is missing column {e.args[0]!r}") from None
+            else:
+                values = tuple(row)
+                if len(values) != len(columns):
+                    raise ValueError(
+                        f"Row has {len(values)} values, expected {len(columns)}")
+            yield tuple(map(serialize, values)) if serialize else values
+
+    def load(
+        self,
+        rows: Iterable[Any],
+        columns: Optional[Sequence[str]] = None,
+        options: Optional[BulkLoadOptions] = None,
+    ) -> BulkLoadStats:
+        """Write ``rows`` (mappings, or sequences ordered like ``columns``).
+
+        All chunks commit together; on any error the whole load is rolled
+        back and the error re-raised.
+        """
+        options = options or BulkLoadOptions()
+        rows = iter(rows)
+        if columns is None:
+            first = next(rows, None)
+            if first is None:
+                return BulkLoadStats()
+            if not isinstance(first, Mapping):
+                raise ValueError("columns are required for sequence rows")
+            columns = list(first.keys())
+            rows = _chain_first(first, rows)
+
+        sql = self.build_insert_sql(columns, options.conflict_columns, options.update_columns)
+        stats = BulkLoadStats()
+        start = time.perf_counter()
+        values = self._row_values(rows, columns)
+
+        with self.load_pragmas(options.pragmas), self.write_transaction():
+            before = self._connection.total_changes
+            dropped = self._drop_indexes() if options.defer_indexes else []
+            cursor = self._connection.cursor()
+            while True:
+                chunk = list(islice(values, options.chunk_size))
+                if not chunk:
+                    break
+                cursor.executemany(sql, chunk)
+                stats.rows += len(chunk)
+                stats.chunks += 1
+            for _, index_sql in dropped:
+                self._connection.execute(index_sql)
+            stats.indexes_rebuilt = len(dropped)
+            stats.changes = self._connection.total_changes - before
+
+        stats.seconds = time.perf_counter() - start
+        logger.info(
+            f"Bulk loaded {stats.rows} rows into {self.table_name} "
+            f"({stats.rows_per_second:.0f} rows/s, {stats.chunks} chunks)")
+        return stats
+
+    def execute_many(
+        self, sql: str, params: Iterable[Sequence[Any]], chunk_size: int = 5000
+    ) -> int:
+        """Run one statement over many parameter sets in a single
+        transaction; returns the number of rows changed"""
+        params = iter(params)
+        with self.write_transaction():
+            before = self._connection.total_changes
+            cursor = self._connection.cursor()
+            while True:
+                chunk = list(islice(params, chunk_size))
+                if not chunk:
+                    break
+                cursor.executemany(sql, chunk)
+            return self._connection.total_changes - before
+
+    @contextmanager
+    def write_transaction(self):
+        """One write transaction; nested inside a caller's open transaction
+        as a savepoint"""
+        connection = self._connection
+        if connection.in_transaction:
+            connection.execute("SAVEPOINT bulk_load")
+            try:
+                yield
+            except BaseException:
+                connection.execute("ROLLBACK TO bulk_load")
+                connection.execute("RELEASE bulk_load")
+                raise
+            connection.execute("RELEASE bulk_load")
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+
+    @contextmanager
+    def load_pragmas(self, pragmas: Optional[Dict[str, Any]]):
+        """Apply ``pragmas`` for the duration of the block, then restore"""
+        if not pragmas or self._connection.in_transaction:
+            # synchronous cannot change inside a transaction
+            yield
+            return
+
+        previous = {}
+        for name, value in pragmas.items():
+            _validate_name(name)
+            previous[name] = self._connection.execute(f"PRAGMA {name}").fetchone()[0]
+            self._connection.execute(f"PRAGMA {name} = {_pragma_literal(value)}")
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                self._connection.execute(f"PRAGMA {name} = {_pragma_literal(value)}")
+
+    def _drop_indexes(self) -> List[Tuple[str, str]]:
+        """Drop the table's explicit non-unique indexes: [(name, create sql)].
+
+        Unique indexes stay, they enforce constraints (and UPSERT targets)
+        during the load.
+        """
+        rows = self._connection.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (self.table_name,),
+        ).fetchall()
+        dropped = []
+        for name, sql in rows:
+            if re.match(r"\s*create\s+unique\b", sql, re.IGNORECASE):
+                continue
+            self._connection.execute(f'DROP INDEX "{name}"')
+            dropped.append((name, sql))
+        return dropped
+
+
+def _chain_first(first: Any, rest: Iterator[Any]) -> Iterator[Any]:
+    yield first
+    yield from rest
+
+
+def _pragma_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return "ON" if value else "OFF"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return _validate_name(str(value))
@@ -3,132 +3,211 @@ Mixin for bulk database operations in SQLite.
 """
 import logging
 import sqlite3
-from typing import List, TypeVar
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
 from src.infrastructure.persistence.base import BulkOperationResult
 
+from .sqlite_async_pool import SQLiteExecutor
+from .sqlite_bulk_ingest import BulkLoadOptions, BulkLoadStats, SQLiteBulkLoader
 from .sqlite_query_builder import QueryBuilderMixin
 
 T = TypeVar("T")
 logger = logging.getLogger(__name__)
 
+# SQLite's default limit on host parameters per statement is 999 before 3.32
+ID_CHUNK_SIZE = 500
+
 
 class SQLiteBulkOperationsMixin(QueryBuilderMixin):
     """A mixin to add bulk create, update, and delete capabilities."""
 
-    def _create_entity_in_bulk(self, cursor, entity: T) -> bool:
-        """Creates a single entity within a bulk transaction."""
-        try:
+    bulk_chunk_size: int = 5000
+
+    @property
+    def _bulk_executor(self) -> SQLiteExecutor:
+        """The repository's executor (pool or plain connection)."""
+        executor = getattr(self, "_executor", None)
+        if executor is None:
+            executor = self._executor = SQLiteExecutor(self._connection)
+        return executor
+
+    def _bulk_loader_for(self, conn) -> SQLiteBulkLoader:
+        """Loader bound to ``conn`` and this repository's table."""
+        loaders = self.__dict__.setdefault("_bulk_loaders", {})
+        loader = loaders.get(id(conn))
+        if loader is None:
+            loader = loaders[id(conn)] = SQLiteBulkLoader(
+                conn, self.table_name, self._serialize_for_db)
+        return loader
+
+    async def bulk_ingest(
+        self,
+        rows: Iterable[Any],
+        columns: Optional[Sequence[str]] = None,
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        defer_indexes: bool = False,
+        chunk_size: Optional[int] = None,
+    ) -> BulkLoadStats:
+        """Loads raw rows (dicts, or tuples ordered like ``columns``) in one
+        transaction, optionally as an UPSERT on ``conflict_columns``."""
+        options = BulkLoadOptions(
+            chunk_size=chunk_size or self.bulk_chunk_size,
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+            defer_indexes=defer_indexes,
+        )
+        return await self._bulk_executor.write(
+            lambda conn: self._bulk_loader_for(conn).load(rows, columns, options))
+
+    def _group_by_columns(
+        self, entities: List[T], drop_empty_id: bool
+    ) -> Dict[Tuple[str, ...], List[Tuple[T, Dict[str, Any]]]]:
+        """Groups entity dicts by column set so each group is one statement."""
+        groups: Dict[Tuple[str, ...], List[Tuple[T, Dict[str, Any]]]] = {}
+        for entity in entities:
             entity_dict = self._entity_to_dict(entity)
-            sql, values = self._prepare_insert_sql(entity_dict)
-            cursor.execute(sql, values)
-            if hasattr(entity, "id") and not getattr(entity, "id", None):
+            if drop_empty_id and "id" in entity_dict and not entity_dict["id"]:
+                del entity_dict["id"]
+            groups.setdefault(tuple(entity_dict), []).append((entity, entity_dict))
+        return groups
+
+    def _existing_ids(self, conn, entity_ids: Sequence[Any]) -> set:
+        """Which of ``entity_ids`` exist in the table."""
+        found = set()
+        ids = iter(entity_ids)
+        while True:
+            chunk = list(islice(ids, ID_CHUNK_SIZE))
+            if not chunk:
+                return found
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor = conn.execute(
+                f"SELECT id FROM {self.table_name} WHERE id IN ({placeholders})", chunk)
+            found.update(row[0] for row in cursor.fetchall())
+
+    def _create_rowid_entities(self, cursor, sql: str, group) -> None:
+        """Inserts entities without an id one by one to read back their
+        rowids (the prepared statement is reused from SQLite's cache)."""
+        for entity, entity_dict in group:
+            cursor.execute(sql, [self._serialize_for_db(v) for v in entity_dict.values()])
+            if hasattr(entity, "id"):
                 setattr(entity, "id", cursor.lastrowid)
-            return True
-        except Exception as e:
-            entity_id = getattr(entity, "id", "unknown_id")
-            logger.error(
-                f"Failed to create entity {entity_id} in bulk operation: {e}", exc_info=True)
-            return False
+
+    def _bulk_create_sync(self, conn, groups) -> None:
+        loader = self._bulk_loader_for(conn)
+        with loader.write_transaction():
+            cursor = conn.cursor()
+            for columns, group in groups.items():
+                sql = loader.build_insert_sql(columns)
+                if "id" not in columns:
+                    self._create_rowid_entities(cursor, sql, group)
+                    continue
+                for start in range(0, len(group), self.bulk_chunk_size):
+                    cursor.executemany(sql, [
+                        [self._serialize_for_db(v) for v in entity_dict.values()]
+                        for _, entity_dict in group[start:start + self.bulk_chunk_size]
+                    ])
 
     async def bulk_create(self, entities: List[T]) -> BulkOperationResult:
         """Creates multiple entities in a single, efficient transaction."""
-        success_count = 0
-        failed_ids = []
         try:
-            with self.transaction() as cursor:
-                for entity in entities:
-                    if self._create_entity_in_bulk(cursor, entity):
-                        success_count += 1
-                    else:
-                        failed_ids.append(
-                            str(getattr(entity, "id", "unknown_id")))
-        except sqlite3.Error as e:
+            groups = self._group_by_columns(entities, True)
+            await self._bulk_executor.write(lambda conn: self._bulk_create_sync(conn, groups))
+        except (sqlite3.Error, ValueError) as e:
             logger.error(f"Bulk create transaction failed: {e}", exc_info=True)
             # All entities in the transaction are considered failed
             return BulkOperationResult(
+                total_count=len(entities),
                 success_count=0,
                 failed_count=len(entities),
-                failed_ids=[str(getattr(e, "id", "unknown_id"))
-                            for e in entities],
+                failed_ids=[str(getattr(entity, "id", "unknown_id"))
+                            for entity in entities],
+                errors={"transaction": str(e)},
             )
 
         return BulkOperationResult(
-            success_count=success_count,
-            failed_count=len(failed_ids),
-            failed_ids=failed_ids,
+            total_count=len(entities),
+            success_count=len(entities),
+            failed_count=0,
         )
 
-    def _update_entity_in_bulk(self, cursor, entity: T) -> bool:
-        """Updates a single entity within a bulk transaction."""
-        try:
-            entity_dict = self._entity_to_dict(entity)
-            sql, values = self._prepare_update_sql(entity_dict)
-            cursor.execute(sql, values)
-            return cursor.rowcount > 0
-        except Exception as e:
-            entity_id = getattr(entity, "id", "unknown_id")
-            logger.error(
-                f"Failed to update entity {entity_id} in bulk operation: {e}", exc_info=True)
-            return False
+    def _bulk_update_sync(self, conn, groups) -> List[str]:
+        """Applies grouped updates; returns the ids that do not exist."""
+        failed_ids: List[str] = []
+        with self._bulk_loader_for(conn).write_transaction():
+            cursor = conn.cursor()
+            for columns, group in groups.items():
+                ids = [entity_dict.get("id") for _, entity_dict in group]
+                if not all(ids):
+                    raise ValueError("Entity must have an ID for an update operation.")
+                existing = self._existing_ids(conn, ids)
+                failed_ids.extend(str(i) for i in ids if i not in existing)
+
+                sql, _ = self._prepare_update_sql(group[0][1])
+                update_columns = [c for c in columns if c != "id"]
+                for start in range(0, len(group), self.bulk_chunk_size):
+                    cursor.executemany(sql, [
+                        [self._serialize_for_db(entity_dict[c]) for c in update_columns]
+                        + [self._serialize_for_db(entity_dict["id"])]
+                        for _, entity_dict in group[start:start + self.bulk_chunk_size]
+                        if entity_dict["id"] in existing
+                    ])
+        return failed_ids
 
     async def bulk_update(self, entities: List[T]) -> BulkOperationResult:
         """Updates multiple entities in a single, efficient transaction."""
-        success_count = 0
-        failed_ids = []
         try:
-            with self.transaction() as cursor:
-                for entity in entities:
-                    if self._update_entity_in_bulk(cursor, entity):
-                        success_count += 1
-                    else:
-                        failed_ids.append(
-                            str(getattr(entity, "id", "unknown_id")))
-        except sqlite3.Error as e:
+            groups = self._group_by_columns(entities, False)
+            failed_ids = await self._bulk_executor.write(
+                lambda conn: self._bulk_update_sync(conn, groups))
+        except (sqlite3.Error, ValueError) as e:
             logger.error(f"Bulk update transaction failed: {e}", exc_info=True)
             return BulkOperationResult(
+                total_count=len(entities),
                 success_count=0,
                 failed_count=len(entities),
-                failed_ids=[str(getattr(e, "id", "unknown_id"))
-                            for e in entities],
+                failed_ids=[str(getattr(entity, "id", "unknown_id"))
+                            for entity in entities],
+                errors={"transaction": str(e)},
             )
 
         return BulkOperationResult(
-            success_count=success_count,
+            total_count=len(entities),
+            success_count=len(entities) - len(failed_ids),
             failed_count=len(failed_ids),
             failed_ids=failed_ids,
         )
 
     async def bulk_delete(self, entity_ids: List[str]) -> BulkOperationResult:
         """Deletes multiple entities in a single transaction by their IDs."""
-        success_count = 0
-        failed_ids = []
+        def delete_existing(conn) -> set:
+            existing = self._existing_ids(conn, entity_ids)
+            self._bulk_loader_for(conn).execute_many(
+                f"DELETE FROM {self.table_name} WHERE id = ?",
+                ((entity_id,) for entity_id in entity_ids if entity_id in existing),
+                self.bulk_chunk_size,
+            )
+            return existing
+
         try:
-            with self.transaction() as cursor:
-                for entity_id in entity_ids:
-                    try:
-                        self._validate_table_and_column(self.table_name)
-                        sql = f"DELETE FROM {self.table_name} WHERE id = ?"
-                        cursor.execute(sql, (entity_id,))
-                        if cursor.rowcount > 0:
-                            success_count += 1
-                        else:
-                            failed_ids.append(entity_id)
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to delete entity {entity_id} in bulk: {e}", exc_info=True)
-                        failed_ids.append(entity_id)
-        except sqlite3.Error as e:
+            self._validate_table_and_column(self.table_name)
+            existing = await self._bulk_executor.write(delete_existing)
+        except (sqlite3.Error, ValueError) as e:
             logger.error(f"Bulk delete transaction failed: {e}", exc_info=True)
             # If the transaction fails, all are considered failed
             return BulkOperationResult(
+                total_count=len(entity_ids),
                 success_count=0,
                 failed_count=len(entity_ids),
                 failed_ids=entity_ids,
+                errors={"transaction": str(e)},
             )
 
+        failed_ids = [entity_id for entity_id in entity_ids if entity_id not in existing]
         return BulkOperationResult(
-            success_count=success_count,
+            total_count=len(entity_ids),
+            success_count=len(entity_ids) - len(failed_ids),
             failed_count=len(failed_ids),
             failed_ids=failed_ids,
         )
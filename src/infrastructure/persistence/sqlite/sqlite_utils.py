@@ -5,7 +5,7 @@ import logging
 import sqlite3
 from typing import Any, Dict
 
-from src.infrastructure.persistence.repositories.base_sqlite_repository import DatabaseError
+from src.infrastructure.persistence.base import DatabaseError
 
 from .sqlite_query_builder import QueryBuilderMixin
 
@@ -18,17 +18,15 @@ class SQLiteUtilityMixin(QueryBuilderMixin):
     def get_table_info(self) -> Dict[str, Any]:
         """Gets detailed information about the repository's table, including schema, indexes, and foreign keys."""
         try:
-            cursor = self._connection.cursor()
-            self._validate_table_and_column(self.table_name)
+            table = self.table_name
 
-            cursor.execute(f"PRAGMA table_info({self.table_name})")
-            columns = [dict(row) for row in cursor.fetchall()]
+            def read_info(conn):
+                return [
+                    [dict(row) for row in conn.execute(f"PRAGMA {pragma}({table})")]
+                    for pragma in ("table_info", "index_list", "foreign_key_list")
+                ]
 
-            cursor.execute(f"PRAGMA index_list({self.table_name})")
-            indexes = [dict(row) for row in cursor.fetchall()]
-
-            cursor.execute(f"PRAGMA foreign_key_list({self.table_name})")
-            foreign_keys = [dict(row) for row in cursor.fetchall()]
+            columns, indexes, foreign_keys = self._executor.read_sync(read_info)
 
             return {
                 "table_name": self.table_name,
@@ -44,8 +42,8 @@ class SQLiteUtilityMixin(QueryBuilderMixin):
     def vacuum(self) -> None:
         """Vacuums the database to reclaim space and improve performance."""
         try:
-            self._connection.execute("VACUUM")
-            self._connection.commit()
+            # VACUUM cannot run inside a transaction; the job opens none
+            self._executor.write_sync(lambda conn: conn.execute("VACUUM"))
             logger.info("Database vacuumed successfully.")
         except sqlite3.Error as e:
             logger.error(f"Error vacuuming database: {e}", exc_info=True)
@@ -54,8 +52,7 @@ class SQLiteUtilityMixin(QueryBuilderMixin):
     def analyze(self) -> None:
         """Analyzes the database to update statistics for the query planner."""
         try:
-            self._connection.execute("ANALYZE")
-            self._connection.commit()
+            self._executor.write_sync(lambda conn: conn.execute("ANALYZE"))
             logger.info("Database analyzed successfully.")
         except sqlite3.Error as e:
             logger.error(f"Error analyzing database: {e}", exc_info=True)
@@ -71,9 +68,8 @@ class SQLiteUtilityMixin(QueryBuilderMixin):
                 "Only SELECT queries are allowed for safe execution.")
 
         try:
-            cursor = self._connection.cursor()
-            cursor.execute(sql, params)
-            return cursor.fetchall()
+            return await self._executor.read(
+                lambda conn: conn.execute(sql, params).fetchall())
         except sqlite3.Error as e:
             logger.error(f"Error executing safe query: {e}", exc_info=True)
             raise DatabaseError(f"Failed to execute safe query: {e}")
@@ -12,6 +12,7 @@ from .models import (
 )
 from .performance import PerformanceMonitor
 from .processor import AdvancedAsyncProcessor
+from .scheduler import ExecutionLane, LaneScheduler, SchedulerConfig
 from .task_manager import TaskManager
 
 __all__ = [
@@ -19,6 +20,9 @@ __all__ = [
     "AdvancedAsyncProcessor",
     "TaskManager",
     "PerformanceMonitor",
+    "LaneScheduler",
+    "SchedulerConfig",
+    "ExecutionLane",
     # Models
     "ProcessingTask",
     "TaskResult",
@@ -70,6 +70,8 @@ class ProcessingTask:
     retry_count: int = 0
     max_retries: int = 3
     callback: Union[Callable, None] = None
+    # Latest wanted start (UTC); the scheduler orders the task by it if earlier
+    deadline: Union[datetime, None] = None
     depends_on: List[str] = field(default_factory=list)
     tags: Set[str] = field(default_factory=set)
 
@@ -103,6 +105,7 @@ class ProcessingTask:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "retry_count": self.retry_count,
             "max_retries": self.max_retries,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
             "tags": list(self.tags),
             "worker_id": self.worker_id,
         }
@@ -2,12 +2,15 @@
 The core AdvancedAsyncProcessor implementation.
 """
 import asyncio
+import inspect
 import logging
 import signal
 import sys
 import time
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from typing import Any, Callable, Dict, List, Optional, Set
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
 
 from .models import ProcessingTask, ProcessingType, TaskResult, TaskStatus
 from .performance import PerformanceMonitor
@@ -24,11 +27,41 @@ from .processors import (
     process_notification,
     process_text_analysis,
 )
+from .scheduler import ExecutionLane, LaneScheduler, SchedulerConfig
 from .task_manager import TaskManager
 
 logger = logging.getLogger(__name__)
 
 
+def _invoke(processor: Callable, task: ProcessingTask) -> Any:
+    """Runs a sync or async processor to completion off the event loop."""
+    result = processor(task)
+    if inspect.isawaitable(result):
+        loop = asyncio.new_event_loop()
+        try:
+            result = loop.run_until_complete(result)
+        finally:
+            loop.close()
+    return result
+
+
+def _run_cpu_batch(
+    processor: Callable, tasks: List[ProcessingTask]
+) -> List[Tuple[bool, Any, float]]:
+    """
+    Runs a batch of same-type tasks inside one process worker.
+    Returns (succeeded, result or error message, seconds) per task.
+    """
+    outcomes = []
+    for task in tasks:
+        start_time = time.monotonic()
+        try:
+            outcomes.append((True, _invoke(processor, task), time.monotonic() - start_time))
+        except Exception as e:
+            outcomes.append((False, str(e), time.monotonic() - start_time))
+    return outcomes
+
+
 class AdvancedAsyncProcessor:
     """
     High-performance async processor with task management, multiple execution
@@ -41,12 +74,25 @@ class AdvancedAsyncProcessor:
         max_thread_workers: int = 5,
         max_process_workers: int = 2,
         enable_monitoring: bool = True,
+        aging_interval: float = 5.0,
+        cpu_batch_size: int = 8,
     ):
         self.max_workers = max_workers
-        self.priority_queue = asyncio.PriorityQueue()
         self.task_manager = TaskManager()
         self.performance_monitor = PerformanceMonitor() if enable_monitoring else None
 
+        # One admission lane per execution context, each with its own limit
+        self.scheduler = LaneScheduler(
+            SchedulerConfig(
+                cpu_limit=max_process_workers,
+                io_limit=max_thread_workers,
+                async_limit=max_workers,
+                aging_interval=aging_interval,
+                cpu_batch_size=cpu_batch_size,
+            ),
+            self._run_lane_batch,
+        )
+
         self.workers: List[asyncio.Task] = []
         self._running = False
         self._shutdown_event = asyncio.Event()
@@ -59,9 +105,12 @@ class AdvancedAsyncProcessor:
         self.processors: Dict[ProcessingType, Callable] = {}
         self._register_default_processors()
 
-        self.running_tasks: Dict[str, asyncio.Task] = {}
         self._setup_signal_handlers()
 
+    @property
+    def running_tasks(self) -> Dict[str, asyncio.Task]:
+        return self.scheduler.running_tasks
+
     def _register_default_processors(self):
         """Registers the default set of task processors."""
         self.register_processor(
@@ -102,12 +151,12 @@ class AdvancedAsyncProcessor:
         if self._running:
             return
         self._running = True
-        self.workers = [
-            asyncio.create_task(self._worker(f"worker-{i}")) for i in range(self.max_workers)
-        ]
+        self.scheduler.start()
         if self.performance_monitor:
             self.workers.append(asyncio.create_task(self._monitoring_loop()))
-        logger.info(f"AsyncProcessor started with {self.max_workers} workers.")
+        logger.info(
+            f"AsyncProcessor started: {self.scheduler.config.async_limit} async, "
+            f"{self.scheduler.config.io_limit} IO, {self.scheduler.config.cpu_limit} CPU slots.")
 
     async def shutdown(self, timeout: float = 30.0):
         if not self._running:
@@ -116,14 +165,10 @@ class AdvancedAsyncProcessor:
         self._running = False
         self._shutdown_event.set()
 
-        for task in self.running_tasks.values():
-            task.cancel()
-
-        await asyncio.sleep(0.1)  # allow tasks to receive cancellation
-
-        for _ in self.workers:
-            await self.priority_queue.put(None)
+        await self.scheduler.stop()
 
+        for worker in self.workers:
+            worker.cancel()
         await asyncio.gather(*self.workers, return_exceptions=True)
 
         self.thread_executor.shutdown(wait=True)
@@ -131,66 +176,70 @@ class AdvancedAsyncProcessor:
         logger.info("AsyncProcessor shutdown complete.")
 
     async def submit_task(self, task: ProcessingTask) -> str:
-        await self.task_manager.register_task(task)
-        if await self._is_task_ready(task):
-            await self.priority_queue.put(task)
+        if await self.task_manager.register_task(task):
+            self.scheduler.submit(task)
         return task.id
 
-    async def _is_task_ready(self, task: ProcessingTask) -> bool:
-        if task.status != TaskStatus.PENDING:
-            return False
-        if not task.depends_on:
-            return True
+    async def _run_lane_batch(self, lane: ExecutionLane, tasks: List[ProcessingTask]):
+        """Executes a batch dispatched by the scheduler and records the results."""
+        for task in tasks:
+            task.status = TaskStatus.RUNNING
+            task.worker_id = f"{lane.value}-lane"
+            task.started_at = datetime.utcnow()
 
-        results = await asyncio.gather(*[self.task_manager.get_result(dep_id) for dep_id in task.depends_on])
-        return all(res and res.status == TaskStatus.COMPLETED for res in results)
+        if lane == ExecutionLane.CPU:
+            results = await self._execute_cpu_batch(tasks)
+        else:
+            results = [await self._execute(tasks[0], lane)]
 
-    async def _worker(self, worker_id: str):
-        while self._running:
-            try:
-                task = await self.priority_queue.get()
-                if task is None:
-                    break
-
-                self.running_tasks[task.id] = asyncio.current_task()
-                await self._process_and_update(task, worker_id)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(
-                    f"Worker {worker_id} encountered an error: {e}", exc_info=True)
-            finally:
-                if 'task' in locals() and task:
-                    self.running_tasks.pop(task.id, None)
-                    self.priority_queue.task_done()
-
-    async def _process_and_update(self, task: ProcessingTask, worker_id: str):
-        task.status = TaskStatus.RUNNING
-        task.worker_id = worker_id
-        start_time = time.monotonic()
+        for task, result in zip(tasks, results):
+            await self._complete(task, result)
 
+    async def _execute_cpu_batch(self, tasks: List[ProcessingTask]) -> List[TaskResult]:
         try:
-            processor = self.processors[task.task_type]
+            processor = self.processors[tasks[0].task_type]
+            # Callbacks stay in this process; they are often not picklable
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                self.process_executor, _run_cpu_batch, processor,
+                [replace(task, callback=None) for task in tasks],
+            )
+        except Exception as e:
+            outcomes = [(False, str(e), 0.0)] * len(tasks)
+
+        return [
+            TaskResult(task_id=task.id, status=TaskStatus.COMPLETED,
+                       result=value, execution_time=seconds)
+            if succeeded else
+            TaskResult(task_id=task.id, status=TaskStatus.FAILED,
+                       error=value, execution_time=seconds)
+            for task, (succeeded, value, seconds) in zip(tasks, outcomes)
+        ]
 
-            if task.cpu_intensive:
-                result_data = await asyncio.get_running_loop().run_in_executor(
-                    self.process_executor, processor, task
-                )
-            elif task.io_bound:
-                result_data = await asyncio.get_running_loop().run_in_executor(
-                    self.thread_executor, processor, task
-                )
+    async def _execute(self, task: ProcessingTask, lane: ExecutionLane) -> TaskResult:
+        start_time = time.monotonic()
+        try:
+            processor = self.processors[task.task_type]
+            if lane == ExecutionLane.IO:
+                pending = asyncio.get_running_loop().run_in_executor(
+                    self.thread_executor, _invoke, processor, task)
             else:
-                result_data = await processor(task)
-
+                pending = processor(task)
+            result_data = await asyncio.wait_for(pending, task.timeout)
             result = TaskResult(
                 task_id=task.id, status=TaskStatus.COMPLETED, result=result_data)
+        except asyncio.TimeoutError:
+            result = TaskResult(
+                task_id=task.id, status=TaskStatus.TIMEOUT,
+                error=f"Timed out after {task.timeout}s")
         except Exception as e:
             result = TaskResult(
                 task_id=task.id, status=TaskStatus.FAILED, error=str(e))
 
         result.execution_time = time.monotonic() - start_time
+        return result
 
+    async def _complete(self, task: ProcessingTask, result: TaskResult):
+        result.completed_at = datetime.utcnow()
         if self.performance_monitor:
             self.performance_monitor.record_task_completion(task, result)
 
@@ -198,11 +247,18 @@ class AdvancedAsyncProcessor:
         for ready_task_id in ready_tasks:
             ready_task = await self.task_manager.get_task(ready_task_id)
             if ready_task:
-                await self.priority_queue.put(ready_task)
+                self.scheduler.submit(ready_task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Performance summary plus per-lane load and queue-latency percentiles."""
+        return {
+            "performance": self.performance_monitor.get_summary()
+            if self.performance_monitor else None,
+            "lanes": self.scheduler.get_stats(),
+        }
 
     async def _monitoring_loop(self):
         while self._running:
             await asyncio.sleep(5)
-            self.performance_monitor.record_queue_size(
-                self.priority_queue.qsize())
+            self.performance_monitor.record_queue_size(self.scheduler.qsize())
             self.performance_monitor.calculate_and_record_throughput()
@@ -0,0 +1,237 @@
+"""
+Lane-based task scheduling for the async processor.
+
+Ready tasks are admitted into one of three lanes, each with its own
+concurrency limit, so a CPU task waiting on the process pool never takes
+a slot from IO or async work:
+
+- ``CPU``: tasks marked ``cpu_intensive``; same-type tasks are dispatched
+  to a process worker in batches
+- ``IO``: tasks marked ``io_bound``; run on the thread pool
+- ``ASYNC``: everything else; awaited on the event loop
+
+Within a lane, tasks are ordered by a virtual start time,
+``enqueued_at + priority * aging_interval``, so a task waiting for longer
+than ``aging_interval`` overtakes fresh tasks of the next better
+priority. A task with a ``deadline`` is ordered no later than the
+deadline itself. Both keys are fixed when the task is enqueued, so
+ordering stays a plain heap.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from .models import ProcessingTask, ProcessingType
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionLane(Enum):
+    """Admission lanes, each with its own concurrency limit."""
+    CPU = "cpu"
+    IO = "io"
+    ASYNC = "async"
+
+
+def lane_for(task: ProcessingTask) -> ExecutionLane:
+    if task.cpu_intensive:
+        return ExecutionLane.CPU
+    if task.io_bound:
+        return ExecutionLane.IO
+    return ExecutionLane.ASYNC
+
+
+@dataclass
+class SchedulerConfig:
+    """Lane limits and ordering parameters."""
+    cpu_limit: int = 2
+    io_limit: int = 5
+    async_limit: int = 10
+    # Seconds of waiting that are worth one priority level
+    aging_interval: float = 5.0
+    # Max same-type tasks sent to one process worker at once
+    cpu_batch_size: int = 8
+
+    def limit_for(self, lane: ExecutionLane) -> int:
+        return {
+            ExecutionLane.CPU: self.cpu_limit,
+            ExecutionLane.IO: self.io_limit,
+            ExecutionLane.ASYNC: self.async_limit,
+        }[lane]
+
+
+class QueueLatency:
+    """Recent queue waits for one lane, with percentiles."""
+
+    def __init__(self, window: int = 2048):
+        self._recent: deque = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(len(recent) * p))] * 1000
+
+        return {
+            "count": self.count,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": self.max * 1000,
+        }
+
+
+class _Lane:
+    """Per-type heaps of waiting tasks plus the lane's admission state."""
+
+    def __init__(self, lane: ExecutionLane, limit: int):
+        self.lane = lane
+        self.limit = limit
+        self.active = 0
+        # task_type -> heap of (key, seq, enqueued_at, task)
+        self.heaps: Dict[ProcessingType, List[Tuple[float, int, float, ProcessingTask]]] = {}
+        self.size = 0
+        self.wakeup = asyncio.Event()
+        self.latency = QueueLatency()
+        self.dispatched = 0
+        self.batches = 0
+
+    def push(self, entry: Tuple[float, int, float, ProcessingTask]) -> None:
+        heapq.heappush(self.heaps.setdefault(entry[3].task_type, []), entry)
+        self.size += 1
+        self.wakeup.set()
+
+    def pop_batch(self, max_batch: int) -> List[Tuple[float, int, float, ProcessingTask]]:
+        """Most urgent task plus up to ``max_batch - 1`` more of its type"""
+        heap = min((h for h in self.heaps.values() if h), key=lambda h: h[0][:2])
+        batch = [heapq.heappop(heap) for _ in range(min(max_batch, len(heap)))]
+        self.size -= len(batch)
+        return batch
+
+
+class LaneScheduler:
+    """
+    Admits ready tasks into CPU, IO and async lanes and dispatches them
+    within each lane's concurrency limit.
+
+    ``run_batch(lane, tasks)`` executes a dispatched batch (one task except
+    for batched CPU work); the scheduler only decides what runs when.
+    """
+
+    def __init__(
+        self,
+        config: SchedulerConfig,
+        run_batch: Callable[[ExecutionLane, List[ProcessingTask]], Awaitable[Any]],
+    ):
+        self.config = config
+        self._run_batch = run_batch
+        self.lanes: Dict[ExecutionLane, _Lane] = {
+            lane: _Lane(lane, config.limit_for(lane)) for lane in ExecutionLane
+        }
+        self._seq = itertools.count()
+        self._dispatchers: List[asyncio.Task] = []
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    def sort_key(self, task: ProcessingTask, enqueued_at: float) -> float:
+        """Virtual start time: earlier runs first (aging + deadline)"""
+        key = enqueued_at + task.priority.value * self.config.aging_interval
+        if task.deadline is not None:
+            remaining = (task.deadline - datetime.utcnow()).total_seconds()
+            key = min(key, enqueued_at + remaining)
+        return key
+
+    def submit(self, task: ProcessingTask) -> ExecutionLane:
+        now = time.monotonic()
+        lane = lane_for(task)
+        self.lanes[lane].push((self.sort_key(task, now), next(self._seq), now, task))
+        return lane
+
+    def qsize(self) -> int:
+        return sum(lane.size for lane in self.lanes.values())
+
+    @property
+    def running_tasks(self) -> Dict[str, asyncio.Task]:
+        return self._in_flight
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch(lane)) for lane in self.lanes.values()
+        ]
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(
+            *self._dispatchers, *self._in_flight.values(), return_exceptions=True)
+        self._dispatchers = []
+
+    async def _dispatch(self, lane: _Lane) -> None:
+        batch_size = self.config.cpu_batch_size if lane.lane == ExecutionLane.CPU else 1
+        while self._running:
+            if not lane.size or lane.active >= lane.limit:
+                lane.wakeup.clear()
+                await lane.wakeup.wait()
+                continue
+
+            entries = lane.pop_batch(batch_size)
+            now = time.monotonic()
+            tasks = []
+            for _, _, enqueued_at, task in entries:
+                lane.latency.observe(now - enqueued_at)
+                tasks.append(task)
+            lane.active += 1
+            lane.dispatched += len(tasks)
+            lane.batches += 1
+
+            runner = asyncio.create_task(self._run(lane, tasks))
+            for task in tasks:
+                self._in_flight[task.id] = runner
+
+    async def _run(self, lane: _Lane, tasks: List[ProcessingTask]) -> None:
+        try:
+            await self._run_batch(lane.lane, tasks)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{lane.lane.value} lane batch failed: {e}", exc_info=True)
+        finally:
+            lane.active -= 1
+            for task in tasks:
+                self._in_flight.pop(task.id, None)
+            lane.wakeup.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            lane.lane.value: {
+                "limit": lane.limit,
+                "active": lane.active,
+                "queued": lane.size,
+                "dispatched": lane.dispatched,
+                "batches": lane.batches,
+                "queue_latency": lane.latency.snapshot(),
+            }
+            for lane in self.lanes.values()
+        }
@@ -19,19 +19,30 @@ class TaskManager:
         self.results: Dict[str, TaskResult] = {}
         self.dependencies: Dict[str, Set[str]] = defaultdict(set)
         self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        # task_id -> dependencies not yet completed successfully
+        self.pending_dependencies: Dict[str, int] = {}
         self.completed_tasks: deque = deque(
             maxlen=1000)  # Cache of recent completions
         self._lock = asyncio.Lock()
 
-    async def register_task(self, task: ProcessingTask) -> None:
-        """Registers a new task and its dependencies."""
+    async def register_task(self, task: ProcessingTask) -> bool:
+        """
+        Registers a new task and its dependencies. Returns whether the task
+        is ready to run right away.
+        """
         async with self._lock:
             if task.id in self.tasks:
-                return  # Avoid re-registering
+                return False  # Avoid re-registering
             self.tasks[task.id] = task
-            for dep_id in task.depends_on:
+            pending = 0
+            for dep_id in set(task.depends_on):
                 self.dependencies[task.id].add(dep_id)
                 self.dependents[dep_id].add(task.id)
+                dep_result = self.results.get(dep_id)
+                if not dep_result or dep_result.status != TaskStatus.COMPLETED:
+                    pending += 1
+            self.pending_dependencies[task.id] = pending
+            return self._is_task_ready(task.id)
 
     async def complete_task(self, task_id: str, result: TaskResult) -> List[str]:
         """
@@ -43,6 +54,8 @@ class TaskManager:
                 return []
 
             task = self.tasks[task_id]
+            if task_id in self.results:
+                return []  # Completed twice; dependents were already counted down
             task.status = result.status
             task.completed_at = result.completed_at
             self.results[task_id] = result
@@ -50,28 +63,25 @@ class TaskManager:
             if result.status == TaskStatus.COMPLETED:
                 self.completed_tasks.append(task_id)
 
-            # Check dependents to see if they are now ready
+            # Count down dependents; a failed dependency keeps them waiting
             ready_tasks = []
-            if task_id in self.dependents:
+            if result.status == TaskStatus.COMPLETED and task_id in self.dependents:
                 for dependent_id in self.dependents[task_id]:
-                    if self._is_task_ready(dependent_id):
-                        ready_tasks.append(dependent_id)
+                    if dependent_id in self.pending_dependencies:
+                        self.pending_dependencies[dependent_id] -= 1
+                        if self._is_task_ready(dependent_id):
+                            ready_tasks.append(dependent_id)
             return ready_tasks
 
     def _is_task_ready(self, task_id: str) -> bool:
         """
-        Checks if a task is ready to be executed by verifying that all of
-        its dependencies have been successfully completed.
+        Checks if a task is ready to be executed: it is pending and its
+        countdown of uncompleted dependencies has reached zero (O(1)).
         """
         task = self.tasks.get(task_id)
         if not task or task.status != TaskStatus.PENDING:
             return False
-
-        for dep_id in self.dependencies.get(task_id, set()):
-            dep_result = self.results.get(dep_id)
-            if not dep_result or dep_result.status != TaskStatus.COMPLETED:
-                return False
-        return True
+        return self.pending_dependencies.get(task_id, 0) == 0
 
     async def get_ready_tasks(self) -> List[ProcessingTask]:
         """Returns a list of all tasks that are pending and have their dependencies met."""
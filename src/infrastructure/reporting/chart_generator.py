@@ -1,33 +1,256 @@
 """
 Chart Generation Infrastructure
-Handles chart creation using matplotlib and seaborn
+Handles chart creation using matplotlib's object-oriented Figure API
+
+Every chart is first described by a ``ChartSpec`` (plain data), which is
+content-hashed; rendering a spec touches no global pyplot state, so specs
+can be rendered from threads or worker processes and identical charts are
+served from the cache.
 """
 
 import base64
+import hashlib
 import io
+import json
 import logging
-from typing import Dict
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from src.domain.reporting.models import ChildProgress, EmotionDistribution
 
 # Optional imports for chart generation
 try:
-    import matplotlib.pyplot as plt
     import numpy as np
-    import seaborn as sns
+    from matplotlib.figure import Figure
 
     PLOTTING_AVAILABLE = True
-    plt.style.use("seaborn-v0_8" if hasattr(plt.style,
-                  "seaborn-v0_8") else "default")
 except ImportError:
     PLOTTING_AVAILABLE = False
 
+# Bump when rendering code changes so cached charts are not reused
+RENDER_VERSION = 1
+
+SUPPORTED_FORMATS = ("png", "svg")
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """Everything needed to draw one chart"""
+
+    kind: str  # pie | line | bar | radar
+    title: str
+    data: Dict[str, Any]
+    figsize: Tuple[float, float] = (10, 6)
+
+    def digest(self, output_format: str, dpi: int) -> str:
+        """Content hash of the spec and its output settings"""
+        payload = json.dumps(
+            {
+                "v": RENDER_VERSION,
+                "kind": self.kind,
+                "title": self.title,
+                "data": self.data,
+                "figsize": self.figsize,
+                "format": output_format,
+                "dpi": dpi if output_format == "png" else None,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RenderedChart:
+    """Rendered chart bytes (PNG or SVG)"""
+
+    name: str
+    digest: str
+    format: str
+    data: bytes = field(repr=False)
+
+    def open(self) -> io.BytesIO:
+        """File-like view for consumers such as the PDF generator"""
+        return io.BytesIO(self.data)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode()
+
+
+def _draw_pie(fig, data: Dict[str, Any], title: str) -> None:
+    ax = fig.add_subplot(111)
+    ax.pie(
+        data["sizes"],
+        labels=data["labels"],
+        colors=data["colors"],
+        autopct="%1.1f%%",
+        startangle=90)
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.axis("equal")
+
+
+def _draw_line(fig, data: Dict[str, Any], title: str) -> None:
+    ax = fig.add_subplot(111)
+    for series in data["series"]:
+        ax.plot(
+            list(range(len(series["values"]))),
+            series["values"],
+            label=series["label"],
+            color=series["color"],
+            linewidth=2,
+            marker="o",
+        )
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel(data["xlabel"])
+    ax.set_ylabel(data["ylabel"])
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_bar(fig, data: Dict[str, Any], title: str) -> None:
+    ax = fig.add_subplot(111)
+    bars = ax.bar(data["labels"], data["values"], color=data["color"], alpha=0.7)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width() / 2.0,
+            height,
+            f"{int(height)}",
+            ha="center",
+            va="bottom",
+        )
+
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel(data["xlabel"])
+    ax.set_ylabel(data["ylabel"])
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+    fig.tight_layout()
+
+
+def _draw_radar(fig, data: Dict[str, Any], title: str) -> None:
+    labels = data["labels"]
+    # Add first point to close the radar
+    scores = data["values"] + data["values"][:1]
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+    angles += angles[:1]
+
+    ax = fig.add_subplot(111, polar=True)
+    ax.plot(angles, scores, "o-", linewidth=2, color=data["color"])
+    ax.fill(angles, scores, alpha=0.25, color=data["color"])
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(labels)
+    ax.set_ylim(0, 1)
+    ax.set_title(title, size=16, pad=20)
+
+
+_DRAWERS = {
+    "pie": _draw_pie,
+    "line": _draw_line,
+    "bar": _draw_bar,
+    "radar": _draw_radar,
+}
+
+
+def render_chart(spec: ChartSpec, output_format: str = "png", dpi: int = 150) -> bytes:
+    """Render a spec to PNG/SVG bytes without touching pyplot state.
+
+    Module-level so it can run in worker processes.
+    """
+    fig = Figure(figsize=spec.figsize)
+    _DRAWERS[spec.kind](fig, spec.data, spec.title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=output_format, dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """Thread-safe LRU of rendered charts keyed by spec digest,
+    optionally backed by a directory shared between processes."""
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(digest)
+            if data is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return data
+
+        if self.directory:
+            try:
+                data = (self.directory / digest).read_bytes()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                self._remember(digest, data)
+                with self._lock:
+                    self.hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, digest: str, data: bytes) -> None:
+        self._remember(digest, data)
+        if self.directory:
+            path = self.directory / digest
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+
+    def _remember(self, digest: str, data: bytes) -> None:
+        with self._lock:
+            self._entries[digest] = data
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
 
 class ChartGenerator:
     """Infrastructure component for generating charts"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        output_format: str = "png",
+        dpi: int = 150,
+        cache: Optional[ChartCache] = None,
+        max_workers: Optional[int] = None,
+    ):
+        if output_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported chart format: {output_format}")
+
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.output_format = output_format
+        self.dpi = dpi
+        self.cache = cache or ChartCache()
+        self.max_workers = max_workers
         self.color_palette = {
             "happy": "#FFD700",  # Gold
             "sad": "#87CEEB",  # Sky Blue
@@ -41,231 +264,265 @@ class ChartGenerator:
             "danger": "#D0021B",  # Danger Red
         }
 
-    def generate_charts(self, progress: ChildProgress) -> Dict[str, str]:
-        """Generate all charts for the report"""
-        try:
-            if not PLOTTING_AVAILABLE:
-                self.logger.warning(
-                    "Matplotlib not available, skipping chart generation"
-                )
-                return {}
-
-            charts = {}
-
+    # ------------------------------------------------------------------
+    # Chart specs
+    # ------------------------------------------------------------------
+
+    def emotion_pie_spec(
+            self, emotion_analysis: EmotionDistribution) -> Optional[ChartSpec]:
+        """Emotion distribution pie chart"""
+        if not emotion_analysis.emotions:
+            return None
+
+        labels = list(emotion_analysis.emotions.keys())
+        return ChartSpec(
+            kind="pie",
+            title="توزيع المشاعر خلال الفترة",
+            data={
+                "labels": labels,
+                "sizes": [round(v, 4) for v in emotion_analysis.emotions.values()],
+                "colors": [self.color_palette.get(e, "#CCCCCC") for e in labels],
+            },
+            figsize=(8, 6),
+        )
+
+    def mood_trends_spec(self, mood_trends: Dict[str, list]) -> Optional[ChartSpec]:
+        """Mood trends over time"""
+        # Only plot emotions that have values
+        series = [
+            {
+                "label": emotion,
+                "values": [round(v, 4) for v in values],
+                "color": self.color_palette.get(emotion, "#CCCCCC"),
+            }
+            for emotion, values in (mood_trends or {}).items()
+            if values
+        ]
+        if not series:
+            return None
+
+        return ChartSpec(
+            kind="line",
+            title="اتجاهات المزاج خلال الفترة",
+            data={"series": series, "xlabel": "اليوم", "ylabel": "شدة المشاعر"},
+        )
+
+    def skills_bar_spec(self, skills: Dict[str, int]) -> Optional[ChartSpec]:
+        """Skills practice frequency chart"""
+        if not skills:
+            return None
+
+        # Sort skills by frequency
+        sorted_skills = sorted(skills.items(), key=lambda x: x[1], reverse=True)
+        return ChartSpec(
+            kind="bar",
+            title="المهارات المُمارسة خلال الفترة",
+            data={
+                "labels": [skill for skill, _ in sorted_skills],
+                "values": [count for _, count in sorted_skills],
+                "color": self.color_palette["primary"],
+                "xlabel": "المهارة",
+                "ylabel": "عدد مرات الممارسة",
+            },
+        )
+
+    def development_radar_spec(self, progress: ChildProgress) -> ChartSpec:
+        """Developmental areas radar chart"""
+        # Developmental areas and their scores (0-1)
+        scores = [
+            min(progress.attention_span / 10, 1.0),  # Normalize to 0-1
+            min(progress.vocabulary_growth / 20, 1.0),
+            min(progress.empathy_indicators / 10, 1.0),
+            progress.cooperation_level,
+            progress.emotion_analysis.stability_score,
+            min(progress.question_frequency / 5, 1.0),
+            min(
+                (progress.sharing_behavior + progress.empathy_indicators) / 20, 1.0
+            ),
+        ]
+        return ChartSpec(
+            kind="radar",
+            title="مناطق التطور",
+            data={
+                "labels": [
+                    "التركيز",
+                    "المفردات",
+                    "التعاطف",
+                    "التعاون",
+                    "الاستقرار العاطفي",
+                    "الفضول",
+                    "التفاعل الاجتماعي",
+                ],
+                "values": [round(float(s), 4) for s in scores],
+                "color": self.color_palette["primary"],
+            },
+            figsize=(8, 8),
+        )
+
+    def build_chart_specs(self, progress: ChildProgress) -> Dict[str, ChartSpec]:
+        """All chart specs for a report; charts without data are left out"""
+        specs = {
             # 1. Emotion distribution pie chart
-            charts["emotions"] = self.create_emotion_pie_chart(
-                progress.emotion_analysis
-            )
-
+            "emotions": self.emotion_pie_spec(progress.emotion_analysis),
             # 2. Mood trends line chart
-            charts["mood_trends"] = self.create_mood_trends_chart(
-                progress.mood_trends)
-
+            "mood_trends": self.mood_trends_spec(progress.mood_trends),
             # 3. Skills practice bar chart
-            charts["skills"] = self.create_skills_bar_chart(
-                progress.skill_analysis.skills_practiced
-            )
-
+            "skills": self.skills_bar_spec(
+                progress.skill_analysis.skills_practiced),
             # 4. Development radar chart
-            charts["development"] = self.create_development_radar_chart(
-                progress)
+            "development": self.development_radar_spec(progress),
+        }
+        return {name: spec for name, spec in specs.items() if spec is not None}
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def render_specs(
+        self,
+        specs: Sequence[Tuple[str, ChartSpec]],
+        output_format: Optional[str] = None,
+        dpi: Optional[int] = None,
+    ) -> List[Optional[RenderedChart]]:
+        """Render (name, spec) pairs, reusing cached and duplicate charts.
+
+        Cache misses are rendered once per distinct digest; with
+        ``max_workers`` > 1 they are rendered in worker processes.
+        """
+        output_format = output_format or self.output_format
+        dpi = dpi or self.dpi
+        if not PLOTTING_AVAILABLE:
+            self.logger.warning(
+                "Matplotlib not available, skipping chart generation")
+            return [None] * len(specs)
+
+        digests = [spec.digest(output_format, dpi) for _, spec in specs]
+        rendered: Dict[str, bytes] = {}
+        missing: Dict[str, ChartSpec] = {}
+        for digest, (_, spec) in zip(digests, specs):
+            if digest in rendered or digest in missing:
+                continue
+            data = self.cache.get(digest)
+            if data is None:
+                missing[digest] = spec
+            else:
+                rendered[digest] = data
+
+        if missing:
+            rendered.update(self._render_missing(missing, output_format, dpi))
+
+        return [
+            RenderedChart(name, digest, output_format, rendered[digest])
+            if digest in rendered else None
+            for digest, (name, _) in zip(digests, specs)
+        ]
+
+    def _render_missing(
+        self, missing: Dict[str, ChartSpec], output_format: str, dpi: int
+    ) -> Dict[str, bytes]:
+        digests = list(missing)
+        specs = [missing[digest] for digest in digests]
+        results: Dict[str, bytes] = {}
+
+        if self.max_workers and self.max_workers > 1 and len(specs) > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(render_chart, spec, output_format, dpi)
+                    for spec in specs
+                ]
+                outcomes = []
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append(e)
+        else:
+            outcomes = []
+            for spec in specs:
+                try:
+                    outcomes.append(render_chart(spec, output_format, dpi))
+                except Exception as e:
+                    outcomes.append(e)
+
+        for digest, spec, outcome in zip(digests, specs, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"{spec.kind} chart rendering error: {outcome}")
+                continue
+            self.cache.put(digest, outcome)
+            results[digest] = outcome
+        return results
+
+    def render_charts(
+        self,
+        progress: ChildProgress,
+        output_format: Optional[str] = None,
+        dpi: Optional[int] = None,
+    ) -> Dict[str, RenderedChart]:
+        """Rendered charts for one report"""
+        return self.render_batch([progress], output_format, dpi)[0]
+
+    def render_batch(
+        self,
+        progresses: Sequence[ChildProgress],
+        output_format: Optional[str] = None,
+        dpi: Optional[int] = None,
+    ) -> List[Dict[str, RenderedChart]]:
+        """Rendered charts for many reports in one pass"""
+        owners: List[int] = []
+        specs: List[Tuple[str, ChartSpec]] = []
+        for index, progress in enumerate(progresses):
+            try:
+                chart_specs = self.build_chart_specs(progress)
+            except Exception as e:
+                self.logger.error(f"Chart spec error for {progress.child_id}: {e}")
+                continue
+            for name, spec in chart_specs.items():
+                owners.append(index)
+                specs.append((name, spec))
+
+        charts: List[Dict[str, RenderedChart]] = [{} for _ in progresses]
+        for owner, chart in zip(owners, self.render_specs(specs, output_format, dpi)):
+            if chart is not None:
+                charts[owner][chart.name] = chart
+        return charts
 
-            return charts
+    def generate_charts(self, progress: ChildProgress) -> Dict[str, str]:
+        """Generate all charts for the report as base64 strings"""
+        try:
+            return {
+                name: chart.to_base64()
+                for name, chart in self.render_charts(progress).items()
+            }
 
         except Exception as e:
             self.logger.error(f"Chart generation error: {e}")
             return {}
 
+    def _render_one_base64(self, name: str, spec: Optional[ChartSpec]) -> str:
+        if spec is None:
+            return ""
+        chart = self.render_specs([(name, spec)])[0]
+        return chart.to_base64() if chart else ""
+
     def create_emotion_pie_chart(
             self, emotion_analysis: EmotionDistribution) -> str:
         """Create emotion distribution pie chart"""
-        try:
-            if not PLOTTING_AVAILABLE or not emotion_analysis.emotions:
-                return ""
-
-            plt.figure(figsize=(8, 6))
-
-            # Prepare data
-            labels = list(emotion_analysis.emotions.keys())
-            sizes = list(emotion_analysis.emotions.values())
-            colors = [
-                self.color_palette.get(
-                    emotion,
-                    "#CCCCCC") for emotion in labels]
-
-            # Create pie chart
-            plt.pie(
-                sizes,
-                labels=labels,
-                colors=colors,
-                autopct="%1.1f%%",
-                startangle=90)
-            plt.title("توزيع المشاعر خلال الفترة", fontsize=14, pad=20)
-            plt.axis("equal")
-
-            # Convert to base64
-            return self._chart_to_base64()
-
-        except Exception as e:
-            self.logger.error(f"Emotion pie chart creation error: {e}")
-            return ""
+        return self._render_one_base64(
+            "emotions", self.emotion_pie_spec(emotion_analysis))
 
     def create_mood_trends_chart(self, mood_trends: Dict[str, list]) -> str:
         """Create mood trends over time"""
-        try:
-            if not PLOTTING_AVAILABLE or not mood_trends:
-                return ""
-
-            plt.figure(figsize=(10, 6))
-
-            # Plot each emotion trend
-            for emotion, values in mood_trends.items():
-                if values:  # Only plot if there are values
-                    days = list(range(len(values)))
-                    color = self.color_palette.get(emotion, "#CCCCCC")
-                    plt.plot(
-                        days,
-                        values,
-                        label=emotion,
-                        color=color,
-                        linewidth=2,
-                        marker="o",
-                    )
-
-            plt.title("اتجاهات المزاج خلال الفترة", fontsize=14)
-            plt.xlabel("اليوم")
-            plt.ylabel("شدة المشاعر")
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-
-            return self._chart_to_base64()
-
-        except Exception as e:
-            self.logger.error(f"Mood trends chart creation error: {e}")
-            return ""
+        return self._render_one_base64(
+            "mood_trends", self.mood_trends_spec(mood_trends))
 
     def create_skills_bar_chart(self, skills: Dict[str, int]) -> str:
         """Create skills practice frequency chart"""
-        try:
-            if not PLOTTING_AVAILABLE or not skills:
-                return ""
-
-            plt.figure(figsize=(10, 6))
-
-            # Sort skills by frequency
-            sorted_skills = sorted(
-                skills.items(),
-                key=lambda x: x[1],
-                reverse=True)
-            skill_names = [skill[0] for skill in sorted_skills]
-            frequencies = [skill[1] for skill in sorted_skills]
-
-            # Create bar chart
-            bars = plt.bar(
-                skill_names,
-                frequencies,
-                color=self.color_palette["primary"],
-                alpha=0.7)
-
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                plt.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height,
-                    f"{int(height)}",
-                    ha="center",
-                    va="bottom",
-                )
-
-            plt.title("المهارات المُمارسة خلال الفترة", fontsize=14)
-            plt.xlabel("المهارة")
-            plt.ylabel("عدد مرات الممارسة")
-            plt.xticks(rotation=45, ha="right")
-            plt.tight_layout()
-
-            return self._chart_to_base64()
-
-        except Exception as e:
-            self.logger.error(f"Skills bar chart creation error: {e}")
-            return ""
+        return self._render_one_base64("skills", self.skills_bar_spec(skills))
 
     def create_development_radar_chart(self, progress: ChildProgress) -> str:
         """Create developmental areas radar chart"""
-        try:
-            if not PLOTTING_AVAILABLE:
-                return ""
-
-            plt.figure(figsize=(8, 8))
-
-            # Define developmental areas and their scores (0-1)
-            areas = [
-                "التركيز",
-                "المفردات",
-                "التعاطف",
-                "التعاون",
-                "الاستقرار العاطفي",
-                "الفضول",
-                "التفاعل الاجتماعي",
-            ]
-
-            scores = [
-                min(progress.attention_span / 10, 1.0),  # Normalize to 0-1
-                min(progress.vocabulary_growth / 20, 1.0),
-                min(progress.empathy_indicators / 10, 1.0),
-                progress.cooperation_level,
-                progress.emotion_analysis.stability_score,
-                min(progress.question_frequency / 5, 1.0),
-                min(
-                    (progress.sharing_behavior +
-                     progress.empathy_indicators) / 20, 1.0
-                ),
-            ]
-
-            # Add first point to close the radar
-            scores += scores[:1]
-
-            # Angles for each area
-            angles = np.linspace(
-                0, 2 * np.pi, len(areas), endpoint=False).tolist()
-            angles += angles[:1]
-
-            # Create radar chart
-            ax = plt.subplot(111, polar=True)
-            ax.plot(angles, scores, "o-", linewidth=2,
-                    color=self.color_palette["primary"])
-            ax.fill(
-                angles,
-                scores,
-                alpha=0.25,
-                color=self.color_palette["primary"])
-
-            # Add labels
-            ax.set_xticks(angles[:-1])
-            ax.set_xticklabels(areas)
-            ax.set_ylim(0, 1)
-            ax.set_title("مناطق التطور", size=16, pad=20)
-
-            return self._chart_to_base64()
-
-        except Exception as e:
-            self.logger.error(f"Development radar chart creation error: {e}")
-            return ""
-
-    def _chart_to_base64(self) -> str:
-        """Convert current matplotlib figure to base64 string"""
-        try:
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format="png", dpi=150, bbox_inches="tight")
-            buffer.seek(0)
-            chart_data = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
-            return chart_data
-
-        except Exception as e:
-            self.logger.error(f"Chart to base64 conversion error: {e}")
-            plt.close()  # Ensure figure is closed
-            return ""
+        return self._render_one_base64(
+            "development", self.development_radar_spec(progress))
 
     def is_available(self) -> bool:
         """Check if chart generation is available"""
@@ -3,20 +3,30 @@ PDF Generation Infrastructure
 Handles PDF report creation using ReportLab
 """
 
+import base64
+import io
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Union
 
 from src.domain.reporting.models import ChildProgress
 
+from .chart_generator import RenderedChart
+
+# Charts are rendered bytes; base64 strings are still accepted
+ChartInput = Union[RenderedChart, str]
+
 # Optional imports for PDF generation
 try:
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4, letter
     from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.lib.utils import ImageReader
     from reportlab.pdfgen import canvas
     from reportlab.platypus import (
+        Image,
         Paragraph,
         SimpleDocTemplate,
         Spacer,
@@ -38,7 +48,7 @@ class PDFGenerator:
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def create_pdf_report(self, progress: ChildProgress,
-                          charts: Dict[str, str]) -> str:
+                          charts: Dict[str, ChartInput]) -> str:
         """Create comprehensive PDF report"""
         try:
             if not PDF_AVAILABLE:
@@ -154,17 +164,39 @@ class PDFGenerator:
                 story.append(Paragraph(f"⚠️ {concern}", styles["Normal"]))
             story.append(Spacer(1, 12))
 
-    def _add_charts(self, story: list, charts: Dict[str, str], styles):
-        """Adds placeholders for charts to the story."""
-        for chart_name in charts.keys():
+    def _chart_flowable(self, chart: ChartInput, max_width: float) -> Optional["Image"]:
+        """Image flowable streamed from the chart bytes (PNG only)."""
+        if isinstance(chart, RenderedChart):
+            if chart.format != "png":
+                return None
+            stream = chart.open()
+        elif chart:
+            stream = io.BytesIO(base64.b64decode(chart))
+        else:
+            return None
+
+        width, height = ImageReader(stream).getSize()
+        stream.seek(0)
+        scale = min(1.0, max_width / width)
+        return Image(stream, width=width * scale, height=height * scale)
+
+    def _add_charts(self, story: list, charts: Dict[str, ChartInput], styles):
+        """Adds the charts to the story."""
+        for chart_name, chart in charts.items():
             story.append(
                 Paragraph(
                     f"الرسم البياني: {chart_name}",
                     styles["Heading3"]))
-            story.append(Spacer(1, 100))
+            try:
+                image = self._chart_flowable(chart, max_width=16 * cm)
+            except Exception as e:
+                self.logger.warning(f"Could not embed chart {chart_name}: {e}")
+                image = None
+            story.append(image if image is not None else Spacer(1, 100))
+            story.append(Spacer(1, 12))
 
     def _build_pdf_content(
-        self, progress: ChildProgress, charts: Dict[str, str]
+        self, progress: ChildProgress, charts: Dict[str, ChartInput]
     ) -> list:
         """Build PDF content structure"""
         try:
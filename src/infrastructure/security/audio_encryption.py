@@ -8,6 +8,7 @@ Advanced audio encryption for AI Teddy Bear with:
 - Secure key exchange
 - Audio integrity verification
 - Performance optimization for real-time audio
+- Streaming binary frame codec (see audio_frame_codec)
 
 Author: Jaafar Adeeb - Security Lead
 """
@@ -19,7 +20,7 @@ import secrets
 import struct
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import structlog
 from cryptography.hazmat.backends import default_backend
@@ -27,6 +28,15 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
+from .audio_frame_codec import (
+    DOWNSTREAM,
+    UPSTREAM,
+    AudioFrameDecoder,
+    AudioFrameEncoder,
+    frame_session_bytes,
+    session_id_bytes,
+)
+
 logger = structlog.get_logger(__name__)
 
 
@@ -39,6 +49,8 @@ class AudioEncryptionContext:
     user_id: str
     encryption_key: bytes
     nonce_counter: int = 0
+    key_epoch: int = 0
+    previous_key: Optional[bytes] = None
     created_at: datetime = None
     expires_at: datetime = None
 
@@ -74,6 +86,11 @@ class AudioEncryptionManager:
         self.cipher_cache: Dict[bytes, AESGCM] = {}
         self.max_cache_size = 100
 
+        # Streaming frame codecs per (session, direction)
+        self.frame_encoders: Dict[Tuple[str, str], AudioFrameEncoder] = {}
+        self.frame_decoders: Dict[Tuple[str, str], AudioFrameDecoder] = {}
+        self._sessions_by_wire_id: Dict[bytes, str] = {}
+
         # Security parameters
         self.key_rotation_interval = timedelta(hours=24)
         self.max_session_duration = timedelta(hours=48)
@@ -126,6 +143,7 @@ class AudioEncryptionManager:
 
         self.active_sessions[session_id] = context
         self.session_keys[session_id] = session_key
+        self._sessions_by_wire_id[session_id_bytes(session_id)] = session_id
 
         logger.info(
             "Audio encryption session created",
@@ -329,18 +347,25 @@ class AudioEncryptionManager:
             context.user_id,
         )
 
+        # Clear cipher cache for old key
+        self.cipher_cache.pop(context.encryption_key, None)
+
         # Update context
+        context.previous_key = context.encryption_key
         context.encryption_key = new_key
         context.nonce_counter = 0  # Reset counter
+        context.key_epoch += 1
         context.created_at = datetime.utcnow()
         context.expires_at = context.created_at + timedelta(hours=24)
 
         # Update session keys
         self.session_keys[session_id] = new_key
 
-        # Clear cipher cache for old key
-        if context.encryption_key in self.cipher_cache:
-            del self.cipher_cache[context.encryption_key]
+        # Frame codecs move to the new epoch (decoders keep the previous one)
+        for codecs in (self.frame_encoders, self.frame_decoders):
+            for (codec_session, _), codec in codecs.items():
+                if codec_session == session_id:
+                    codec.rekey(new_key, context.key_epoch)
 
         logger.info("Session key rotated", session_id=session_id)
         return True
@@ -361,6 +386,10 @@ class AudioEncryptionManager:
         del self.active_sessions[session_id]
         if session_id in self.session_keys:
             del self.session_keys[session_id]
+        self._sessions_by_wire_id.pop(session_id_bytes(session_id), None)
+        for direction in (UPSTREAM, DOWNSTREAM):
+            self.frame_encoders.pop((session_id, direction), None)
+            self.frame_decoders.pop((session_id, direction), None)
 
         logger.info("Encryption session closed", session_id=session_id)
         return True
@@ -381,6 +410,7 @@ class AudioEncryptionManager:
             "created_at": context.created_at.isoformat(),
             "expires_at": context.expires_at.isoformat(),
             "nonce_counter": context.nonce_counter,
+            "key_epoch": context.key_epoch,
             "is_expired": datetime.utcnow() > context.expires_at,
         }
 
@@ -442,6 +472,86 @@ class AudioEncryptionManager:
 
         return full_audio
 
+    # ---------------------------------------------------------------
+    # Streaming frames (binary, counter nonces, replay window)
+    # ---------------------------------------------------------------
+
+    def _valid_context(self, session_id: str) -> AudioEncryptionContext:
+        context = self.active_sessions.get(session_id)
+        if context is None:
+            raise ValueError(f"Invalid session ID: {session_id}")
+        if datetime.utcnow() > context.expires_at:
+            raise ValueError(f"Session expired: {session_id}")
+        return context
+
+    def get_frame_encoder(
+        self, session_id: str, direction: str = DOWNSTREAM
+    ) -> AudioFrameEncoder:
+        """Frame encoder for a session; reuse it for the whole stream"""
+        encoder = self.frame_encoders.get((session_id, direction))
+        if encoder is None:
+            context = self._valid_context(session_id)
+            encoder = AudioFrameEncoder(
+                session_id, context.encryption_key, direction, context.key_epoch)
+            self.frame_encoders[(session_id, direction)] = encoder
+        return encoder
+
+    def get_frame_decoder(
+        self, session_id: str, direction: str = UPSTREAM
+    ) -> AudioFrameDecoder:
+        """Frame decoder (with replay window) for a session"""
+        decoder = self.frame_decoders.get((session_id, direction))
+        if decoder is None:
+            context = self._valid_context(session_id)
+            if context.previous_key is not None:
+                # Accept frames still in flight from before the last rotation
+                decoder = AudioFrameDecoder(
+                    session_id, context.previous_key, direction, context.key_epoch - 1)
+                decoder.rekey(context.encryption_key, context.key_epoch)
+            else:
+                decoder = AudioFrameDecoder(
+                    session_id, context.encryption_key, direction, context.key_epoch)
+            self.frame_decoders[(session_id, direction)] = decoder
+        return decoder
+
+    def encrypt_frame(
+        self, session_id: str, audio_data: bytes, direction: str = DOWNSTREAM
+    ) -> bytes:
+        """Seal one audio frame into the compact binary format"""
+        self._valid_context(session_id)
+        return self.get_frame_encoder(session_id, direction).encrypt_frame(audio_data)
+
+    def decrypt_frame(
+        self, frame: bytes, direction: str = UPSTREAM
+    ) -> Tuple[str, int, bytes]:
+        """Open a frame from any session: (session_id, sequence, audio)"""
+        session_id = self._sessions_by_wire_id.get(frame_session_bytes(frame))
+        if session_id is None:
+            raise ValueError("Frame for unknown session")
+        self._valid_context(session_id)
+        sequence, audio = self.get_frame_decoder(session_id, direction).decrypt_frame(frame)
+        return session_id, sequence, audio
+
+    async def encrypt_audio_frames(
+        self, session_id: str, audio_chunks: List[bytes], direction: str = DOWNSTREAM
+    ) -> List[bytes]:
+        """Encrypt a stream of chunks as binary frames"""
+        self._valid_context(session_id)
+        encoder = self.get_frame_encoder(session_id, direction)
+        return [encoder.encrypt_frame(chunk) for chunk in audio_chunks]
+
+    async def decrypt_audio_frames(
+        self, frames: List[bytes], direction: str = UPSTREAM
+    ) -> bytes:
+        """Decrypt binary frames of one session back to a stream"""
+        opened = []
+        for frame in frames:
+            epoch = AudioFrameDecoder.parse_header(frame)[2]
+            _, sequence, audio = self.decrypt_frame(frame, direction)
+            opened.append((epoch, sequence, audio))
+        opened.sort(key=lambda item: item[:2])
+        return b"".join(audio for _, _, audio in opened)
+
     def serialize_packet(self, packet: EncryptedAudioPacket) -> str:
         """Serialize encrypted packet for transmission"""
 
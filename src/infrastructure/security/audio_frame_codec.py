@@ -0,0 +1,252 @@
+"""
+🔐 Audio Frame Codec - Streaming AES-256-GCM framing
+====================================================
+
+Compact binary framing for real-time voice frames:
+
+    version (1) | session id (16) | key epoch (4) | sequence (8) | length (4)
+    ciphertext (length) | GCM tag (16)
+
+- Nonces are derived from the sequence number (TLS 1.3 style: per-direction
+  IV XOR counter), so no hashing per frame
+- The header is authenticated as associated data; the GCM tag is the only
+  integrity check
+- Receivers keep a sliding replay window per key epoch, accepting frames
+  that arrive out of order but never the same sequence twice
+- Frames can be sealed into / opened from caller-owned buffers
+"""
+
+import hashlib
+import struct
+from typing import Dict, Tuple, Union
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+FRAME_VERSION = 1
+HEADER = struct.Struct(">B16sIQI")
+HEADER_SIZE = HEADER.size  # 33 bytes
+TAG_SIZE = 16
+FRAME_OVERHEAD = HEADER_SIZE + TAG_SIZE
+NONCE_SIZE = 12
+
+UPSTREAM = "upstream"  # device -> server
+DOWNSTREAM = "downstream"  # server -> device
+
+# encrypt_into / decrypt_into need cryptography >= 45
+_HAS_INTO = hasattr(AESGCM, "encrypt_into") and hasattr(AESGCM, "decrypt_into")
+
+Buffer = Union[bytearray, memoryview]
+
+
+class FrameError(ValueError):
+    """Frame could not be authenticated or was rejected"""
+
+
+class ReplayError(FrameError):
+    """Frame sequence was already seen or is too old"""
+
+
+def session_id_bytes(session_id: str) -> bytes:
+    """16-byte wire form of a session id (``audio_sess_<32 hex>``)"""
+    suffix = session_id.rsplit("_", 1)[-1]
+    if len(suffix) == 32:
+        try:
+            return bytes.fromhex(suffix)
+        except ValueError:
+            pass
+    return hashlib.sha256(session_id.encode("utf-8")).digest()[:16]
+
+
+def derive_frame_keys(session_key: bytes, direction: str, epoch: int) -> Tuple[bytes, int]:
+    """AES key and 96-bit IV for one direction and key epoch"""
+    material = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32 + NONCE_SIZE,
+        salt=None,
+        info=f"audio-frame:{direction}:{epoch}".encode("utf-8"),
+        backend=default_backend(),
+    ).derive(session_key)
+    return material[:32], int.from_bytes(material[32:], "big")
+
+
+class ReplayWindow:
+    """Sliding-window replay protection (RFC 4303 style bitmap)"""
+
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.highest = -1
+        self.bitmap = 0  # bit i set -> (highest - i) seen
+
+    def check(self, sequence: int) -> None:
+        if sequence > self.highest:
+            return
+        offset = self.highest - sequence
+        if offset >= self.size:
+            raise ReplayError(f"Frame {sequence} is outside the replay window")
+        if self.bitmap >> offset & 1:
+            raise ReplayError(f"Replayed frame {sequence}")
+
+    def mark(self, sequence: int) -> None:
+        """Record a sequence after its frame authenticated"""
+        if sequence > self.highest:
+            shift = sequence - self.highest
+            self.bitmap = ((self.bitmap << shift) | 1) & ((1 << self.size) - 1)
+            self.highest = sequence
+        else:
+            self.bitmap |= 1 << (self.highest - sequence)
+
+
+class _EpochKeys:
+    __slots__ = ("cipher", "iv")
+
+    def __init__(self, session_key: bytes, direction: str, epoch: int):
+        key, self.iv = derive_frame_keys(session_key, direction, epoch)
+        self.cipher = AESGCM(key)
+
+    def nonce(self, sequence: int) -> bytes:
+        return (self.iv ^ sequence).to_bytes(NONCE_SIZE, "big")
+
+
+class AudioFrameEncoder:
+    """Seals audio frames for one session and direction"""
+
+    def __init__(
+        self, session_id: str, session_key: bytes, direction: str = UPSTREAM, epoch: int = 0
+    ):
+        self.session_id = session_id
+        self.session_bytes = session_id_bytes(session_id)
+        self.direction = direction
+        self.rekey(session_key, epoch)
+
+    def rekey(self, session_key: bytes, epoch: int) -> None:
+        """Switch to a new key epoch; sequence numbers restart at 0"""
+        self.epoch = epoch
+        self.sequence = 0
+        self._keys = _EpochKeys(session_key, self.direction, epoch)
+
+    @staticmethod
+    def frame_size(payload_size: int) -> int:
+        return payload_size + FRAME_OVERHEAD
+
+    def _next_header(self, payload_size: int) -> Tuple[int, bytes]:
+        sequence = self.sequence
+        if sequence >= 1 << 64:
+            raise FrameError("Sequence space exhausted, rotate the session key")
+        self.sequence += 1
+        return sequence, HEADER.pack(
+            FRAME_VERSION, self.session_bytes, self.epoch, sequence, payload_size)
+
+    def encrypt_frame(self, payload: bytes) -> bytes:
+        sequence, header = self._next_header(len(payload))
+        return header + self._keys.cipher.encrypt(
+            self._keys.nonce(sequence), payload, header)
+
+    def encrypt_frame_into(self, payload: bytes, out: Buffer, offset: int = 0) -> int:
+        """Seal ``payload`` into ``out[offset:]``; returns bytes written"""
+        size = self.frame_size(len(payload))
+        view = memoryview(out)[offset:offset + size]
+        if len(view) < size:
+            raise ValueError(f"Output buffer too small: need {size} bytes")
+
+        sequence, header = self._next_header(len(payload))
+        view[:HEADER_SIZE] = header
+        nonce = self._keys.nonce(sequence)
+        if _HAS_INTO:
+            self._keys.cipher.encrypt_into(nonce, payload, header, view[HEADER_SIZE:])
+        else:
+            view[HEADER_SIZE:] = self._keys.cipher.encrypt(nonce, payload, header)
+        return size
+
+
+class AudioFrameDecoder:
+    """Opens frames for one session and direction with replay protection.
+
+    The previous key epoch stays accepted after a rotation so frames that
+    were in flight when the key changed still decrypt.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        session_key: bytes,
+        direction: str = UPSTREAM,
+        epoch: int = 0,
+        replay_window: int = 1024,
+    ):
+        self.session_id = session_id
+        self.session_bytes = session_id_bytes(session_id)
+        self.direction = direction
+        self.replay_window = replay_window
+        self._keys: Dict[int, _EpochKeys] = {}
+        self._windows: Dict[int, ReplayWindow] = {}
+        self.rekey(session_key, epoch)
+
+    def rekey(self, session_key: bytes, epoch: int) -> None:
+        self._keys[epoch] = _EpochKeys(session_key, self.direction, epoch)
+        self._windows[epoch] = ReplayWindow(self.replay_window)
+        for old in [e for e in self._keys if e < epoch - 1]:
+            del self._keys[old]
+            del self._windows[old]
+        self.epoch = epoch
+
+    @staticmethod
+    def parse_header(frame: Union[bytes, Buffer]) -> Tuple[int, bytes, int, int, int]:
+        """(version, session id bytes, epoch, sequence, payload length)"""
+        if len(frame) < FRAME_OVERHEAD:
+            raise FrameError("Truncated frame")
+        return HEADER.unpack_from(frame, 0)
+
+    def _open(self, frame: Union[bytes, Buffer]):
+        version, session_bytes, epoch, sequence, length = self.parse_header(frame)
+        if version != FRAME_VERSION:
+            raise FrameError(f"Unsupported frame version {version}")
+        if session_bytes != self.session_bytes:
+            raise FrameError("Frame belongs to another session")
+        if len(frame) != HEADER_SIZE + length + TAG_SIZE:
+            raise FrameError("Frame length mismatch")
+        keys = self._keys.get(epoch)
+        if keys is None:
+            raise FrameError(f"Unknown key epoch {epoch}")
+        window = self._windows[epoch]
+        window.check(sequence)
+
+        view = memoryview(frame)
+        return keys, window, sequence, length, view[:HEADER_SIZE], view[HEADER_SIZE:]
+
+    def decrypt_frame(self, frame: Union[bytes, Buffer]) -> Tuple[int, bytes]:
+        """(sequence, payload); raises FrameError on any failure"""
+        keys, window, sequence, _, header, sealed = self._open(frame)
+        try:
+            payload = keys.cipher.decrypt(keys.nonce(sequence), bytes(sealed), bytes(header))
+        except Exception as e:
+            raise FrameError("Frame authentication failed") from e
+        window.mark(sequence)
+        return sequence, payload
+
+    def decrypt_frame_into(
+        self, frame: Union[bytes, Buffer], out: Buffer, offset: int = 0
+    ) -> Tuple[int, int]:
+        """Open into ``out[offset:]``: (sequence, payload bytes written)"""
+        keys, window, sequence, length, header, sealed = self._open(frame)
+        view = memoryview(out)[offset:offset + length]
+        if len(view) < length:
+            raise ValueError(f"Output buffer too small: need {length} bytes")
+        try:
+            if _HAS_INTO:
+                keys.cipher.decrypt_into(keys.nonce(sequence), sealed, header, view)
+            else:
+                view[:] = keys.cipher.decrypt(
+                    keys.nonce(sequence), bytes(sealed), bytes(header))
+        except Exception as e:
+            raise FrameError("Frame authentication failed") from e
+        window.mark(sequence)
+        return sequence, length
+
+
+def frame_session_bytes(frame: Union[bytes, Buffer]) -> bytes:
+    """Session id bytes of a frame, for routing before decryption"""
+    return AudioFrameDecoder.parse_header(frame)[1]
+
@@ -4,25 +4,33 @@ Comprehensive audit trail for child safety and compliance
 """
 
 import asyncio
+import atexit
 import hashlib
 import json
 import logging
 import os
+import threading
 import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
-import aiofiles
 import structlog
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from pydantic import BaseModel, Field, validator
 
-from domain.exceptions import SecurityException
+from .audit_segments import (
+    AuditSegmentReader,
+    AuditSegmentWriter,
+    encode_record,
+    list_segment_files,
+    segment_file_date,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -178,6 +186,15 @@ class AuditConfig(BaseModel):
     async_writing: bool = Field(
         default=True,
         description="Use async log writing")
+    max_queue_size: int = Field(
+        default=10000, description="Events waiting for the writer thread")
+    backpressure_policy: str = Field(
+        default="block",
+        description="When the queue is full: 'block' (wait) or 'raise'")
+    backpressure_timeout_seconds: float = Field(
+        default=5.0, description="Longest wait for queue space")
+    fsync_on_commit: bool = Field(
+        default=True, description="fsync every committed segment")
 
     # Monitoring settings
     enable_real_time_monitoring: bool = Field(
@@ -196,8 +213,26 @@ class AuditConfig(BaseModel):
         validate_assignment = True
 
 
+class AuditBackpressureError(RuntimeError):
+    """Audit events arrive faster than they can be committed"""
+
+
 class AuditLogWriter:
-    """Thread-safe audit log writer with encryption"""
+    """Group-commit audit log writer with encryption
+
+    ``write_event`` only serializes the event and hands it to a dedicated
+    writer thread through a bounded deque (append/popleft are atomic, no
+    lock on the caller's path). The thread commits everything queued as
+    one encrypted, hash-chained segment when ``batch_size`` events are
+    waiting, ``flush_interval_seconds`` has passed, or a caller asked for a
+    durable write, and fsyncs before acknowledging.
+
+    Backpressure when ``max_queue_size`` events are waiting (queued plus
+    drained but not yet committed) is explicit:
+    ``"block"`` waits (up to ``backpressure_timeout_seconds``) for the
+    writer to catch up, ``"raise"`` fails immediately. Audit events are
+    never dropped silently.
+    """
 
     def __init__(self, config: AuditConfig):
         self.config = config
@@ -208,119 +243,224 @@ class AuditLogWriter:
         self.encryption_key = self._get_or_create_encryption_key()
         self.cipher_suite = Fernet(self.encryption_key)
 
-        # Log file management
-        self.current_file = None
-        self.current_file_path = None
+        self.segments = AuditSegmentWriter(
+            self.log_directory,
+            cipher=self.cipher_suite if config.enable_encryption else None,
+            compress=config.enable_compression,
+            fsync=config.fsync_on_commit,
+            max_file_bytes=config.max_file_size_mb * 1024 * 1024,
+        )
         self.event_count = 0
-
-        # Batch processing
-        self.event_buffer: List[AuditEvent] = []
+        # segments.files_started at the last retention cleanup
+        self._cleaned_at_file: Optional[int] = None
+
+        # Handoff to the writer thread: (timestamp, record) or a waiter
+        self._queue: Deque[Any] = deque()
+        # Events the writer thread drained but has not committed yet
+        self._uncommitted = 0
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._atexit_registered = False
         self.last_flush = time.time()
-
-        # Thread safety
-        self._lock = asyncio.Lock()
+        self.stats = {"segments": 0, "events_committed": 0, "commit_failures": 0,
+                      "backpressure_waits": 0}
 
         logger.info(f"🔐 Audit log writer initialized at {self.log_directory}")
 
     def _get_or_create_encryption_key(self) -> bytes:
-        """Get or create encryption key for audit logs"""
+        """Get or create encryption key for audit logs.
+
+        A new key file is created owner-only in the same call that creates
+        it, so it is never readable by others, and two writers starting at
+        once cannot each write their own key.
+        """
         key_file = self.log_directory / ".audit_key"
 
-        if key_file.exists():
+        try:
+            fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
             with open(key_file, "rb") as f:
                 return f.read()
-        else:
-            key = Fernet.generate_key()
-            with open(key_file, "wb") as f:
-                f.write(key)
-            # Set restrictive permissions
-            os.chmod(key_file, 0o600)
-            return key
-
-    def _get_current_log_file(self) -> Path:
-        """Get current log file path based on date"""
-        today = datetime.now().date()
-        return self.log_directory / f"audit_{today.isoformat()}.log.enc"
-
-    async def write_event(self, event: AuditEvent):
-        """Write audit event to log file"""
-        async with self._lock:
-            self.event_buffer.append(event)
-            self.event_count += 1
-
-            # Check if we need to flush
-            if (len(self.event_buffer) >= self.config.batch_size or time.time(
-            ) - self.last_flush >= self.config.flush_interval_seconds):
-                await self._flush_buffer()
-
-    async def _flush_buffer(self):
-        """Flush event buffer to log file"""
-        if not self.event_buffer:
-            return
 
+        key = Fernet.generate_key()
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def reader(self) -> AuditSegmentReader:
+        """Reader over the committed segments"""
+        return AuditSegmentReader(self.log_directory, self.cipher_suite)
+
+    # ---------------------------------------------------------------
+    # Caller side
+    # ---------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def _waiting(self) -> int:
+        return len(self._queue) + self._uncommitted
+
+    async def _wait_for_capacity(self) -> None:
+        if self._waiting() < self.config.max_queue_size:
+            return
+        if self.config.backpressure_policy == "raise":
+            raise AuditBackpressureError("Audit log queue is full")
+
+        self.stats["backpressure_waits"] += 1
+        self._wakeup.set()
+        deadline = time.monotonic() + self.config.backpressure_timeout_seconds
+        while self._waiting() >= self.config.max_queue_size:
+            if time.monotonic() > deadline:
+                raise AuditBackpressureError("Audit log writer is not keeping up")
+            await asyncio.sleep(0.005)
+
+    async def write_event(self, event: AuditEvent, durable: bool = False):
+        """Queue an audit event; with ``durable`` wait until it is fsynced"""
+        await self._wait_for_capacity()
+        self._ensure_thread()
+
+        record = encode_record(event_to_record(event))
+        self._queue.append((event.timestamp.timestamp(), record))
+        self.event_count += 1
+
+        if durable:
+            await self.flush()
+        elif len(self._queue) >= self.config.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Wait until everything queued so far is committed"""
+        if self._thread is None and not self._queue:
+            return
+        self._ensure_thread()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._queue.append(_CommitWaiter(loop, waiter))
+        self._wakeup.set()
+        await waiter
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Commit what is queued and stop the writer thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        thread.join(timeout)
+
+    # ---------------------------------------------------------------
+    # Writer thread
+    # ---------------------------------------------------------------
+
+    def _run(self) -> None:
+        pending: List[Tuple[float, bytes]] = []
+        while True:
+            self._wakeup.wait(self.config.flush_interval_seconds)
+            self._wakeup.clear()
+
+            waiters = []
+            while self._queue:
+                item = self._queue.popleft()
+                if isinstance(item, _CommitWaiter):
+                    waiters.append(item)
+                else:
+                    pending.append(item)
+                    self._uncommitted += 1
+
+            error = None
+            if pending:
+                error = self._commit(pending)
+                if error is None:
+                    pending = []
+                    self._uncommitted = 0
+                # On failure events stay pending, still count against
+                # max_queue_size, and are retried next round
+            for waiter in waiters:
+                waiter.resolve(error)
+
+            if self._stopping and not self._queue and (not pending or error):
+                return
+
+    def _commit(self, batch: List[Tuple[float, bytes]]) -> Optional[Exception]:
         try:
-            # Get current log file
-            log_file = self._get_current_log_file()
-
-            # Rotate file if needed
-            if (log_file.exists() and log_file.stat().st_size >
-                    self.config.max_file_size_mb * 1024 * 1024):
-                await self._rotate_log_file(log_file)
-
-            # Write events
-            events_data = []
-            for event in self.event_buffer:
-                event_dict = asdict(event)
-                event_dict["timestamp"] = event.timestamp.isoformat()
-                events_data.append(event_dict)
-
-            # Encrypt and write
-            data = json.dumps(
-                events_data,
-                ensure_ascii=False,
-                separators=(
-                    ",",
-                    ":"))
-            encrypted_data = self.cipher_suite.encrypt(data.encode())
-
-            async with aiofiles.open(log_file, "ab") as f:
-                await f.write(encrypted_data + b"\n")
-
-            # Clear buffer
-            self.event_buffer.clear()
+            timestamps = [ts for ts, _ in batch]
+            self.segments.append(
+                [record for _, record in batch], min(timestamps), max(timestamps))
+            self.stats["segments"] += 1
+            self.stats["events_committed"] += len(batch)
             self.last_flush = time.time()
-
         except Exception as e:
-            logger.error(f"❌ Failed to flush audit buffer: {e}")
-            # Don't lose events - keep them in buffer for retry
-
-    async def _rotate_log_file(self, current_file: Path):
-        """Rotate log file when it gets too large"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        new_file = current_file.parent / \
-            f"{current_file.stem}_{timestamp}.log.enc"
-        current_file.rename(new_file)
+            self.stats["commit_failures"] += 1
+            logger.error(f"❌ Failed to commit audit segment: {e}")
+            return e
 
-        # Clean up old files
-        await self._cleanup_old_files()
+        # Enforce retention on start-up and whenever a new file is started
+        if self._cleaned_at_file != self.segments.files_started:
+            self._cleaned_at_file = self.segments.files_started
+            self._cleanup_old_files()
+        return None
 
-    async def _cleanup_old_files(self):
+    def _cleanup_old_files(self):
         """Clean up old log files based on retention policy"""
-        cutoff_date = datetime.now() - timedelta(days=self.config.retention_days)
+        cutoff_date = (datetime.now(timezone.utc)
+                       - timedelta(days=self.config.retention_days)).date()
 
-        for log_file in self.log_directory.glob("audit_*.log.enc"):
-            try:
-                file_date_str = log_file.stem.split("_")[
-                    1
-                ]  # Extract date from filename
-                file_date = datetime.strptime(file_date_str, "%Y-%m-%d").date()
-
-                if file_date < cutoff_date.date():
+        for log_file in list_segment_files(self.log_directory):
+            file_date = segment_file_date(log_file)
+            if file_date and file_date < cutoff_date:
+                try:
                     log_file.unlink()
                     logger.info(f"🗑️ Deleted old audit log: {log_file}")
-            except Exception as e:
-                logger.warning(
-                    f"⚠️ Failed to process log file {log_file}: {e}")
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ Failed to process log file {log_file}: {e}")
+
+
+class _CommitWaiter:
+    """Resolves an asyncio future from the writer thread"""
+
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        self.loop = loop
+        self.future = future
+
+    def resolve(self, error: Optional[Exception]) -> None:
+        def _set():
+            if self.future.done():
+                return
+            if error is None:
+                self.future.set_result(None)
+            else:
+                self.future.set_exception(error)
+
+        try:
+            self.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            pass  # Loop already closed
+
+
+def event_to_record(event: AuditEvent) -> Dict[str, Any]:
+    """JSON-ready dict of an audit event (enums and datetimes flattened)"""
+    record = asdict(event)
+    record["event_type"] = event.event_type.value
+    record["severity"] = event.severity.value
+    record["category"] = event.category.value
+    record["timestamp"] = event.timestamp.isoformat()
+    return record
 
 
 class AuditMonitor:
@@ -373,7 +513,7 @@ class AuditMonitor:
             "context": asdict(event.context),
         }
 
-        logger.critical(alert_message, **alert_data)
+        logger.critical(alert_message, extra=alert_data)
 
         # Send alerts to all handlers
         for handler in self.alert_handlers:
@@ -386,7 +526,7 @@ class AuditMonitor:
         """Handle rate limit exceeded"""
         alert_message = f"⚠️ AUDIT RATE LIMIT EXCEEDED: {total_events} events/minute"
 
-        logger.warning(alert_message, total_events=total_events)
+        logger.warning(alert_message, extra={"total_events": total_events})
 
         for handler in self.alert_handlers:
             try:
@@ -432,7 +572,7 @@ class AuditLogger:
     async def _default_alert_handler(self, message: str, data: Dict[str, Any]):
         """Default alert handler"""
         # TODO: Integrate with external alerting systems (Slack, email, etc.)
-        logger.warning(f"🚨 AUDIT ALERT: {message}", **data)
+        logger.warning(f"🚨 AUDIT ALERT: {message}", extra=data)
 
     async def log_event(
         self,
@@ -465,8 +605,9 @@ class AuditLogger:
             metadata=metadata or {},
         )
 
-        # Write to log
-        await self.writer.write_event(event)
+        # Write to log; critical events are acknowledged only once durable
+        await self.writer.write_event(
+            event, durable=event_type.value in self.config.critical_event_types)
 
         # Process for monitoring
         await self.monitor.process_event(event)
@@ -581,6 +722,10 @@ class AuditLogger:
             details=details,
         )
 
+    async def flush(self):
+        """Wait until all logged events are committed to disk"""
+        await self.writer.flush()
+
     async def generate_compliance_report(
         self,
         start_date: datetime,
@@ -588,25 +733,84 @@ class AuditLogger:
         report_type: str = "coppa",
     ) -> Dict[str, Any]:
         """Generate compliance report"""
-        # TODO: Implement compliance report generation
-        # This would read from audit logs and generate structured reports
+        await self.writer.flush()
+
+        def scan() -> Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]:
+            reader = self.writer.reader()
+            summary = {
+                "total_events": 0,
+                "safety_incidents": 0,
+                "data_access_events": 0,
+                "authentication_events": 0,
+            }
+            details = []
+            for record in reader.read_events(start_date, end_date):
+                summary["total_events"] += 1
+                event_type = record["event_type"]
+                if event_type in SAFETY_INCIDENT_TYPES:
+                    summary["safety_incidents"] += 1
+                    details.append({
+                        key: record.get(key) for key in (
+                            "event_id", "event_type", "severity",
+                            "timestamp", "description")
+                    })
+                if event_type in DATA_ACCESS_TYPES:
+                    summary["data_access_events"] += 1
+                if record["category"] == AuditCategory.AUTHENTICATION.value:
+                    summary["authentication_events"] += 1
+            integrity = reader.verify_chain()
+            integrity["segments_decrypted"] = reader.segments_decrypted
+            return summary, details, integrity
+
+        # Decryption and file reads stay off the event loop
+        summary, details, integrity = await asyncio.get_running_loop().run_in_executor(
+            None, scan)
+
         return {
             "report_type": report_type,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
             "generated_at": datetime.now(timezone.utc).isoformat(),
-            "summary": {
-                "total_events": 0,
-                "safety_incidents": 0,
-                "data_access_events": 0,
-                "authentication_events": 0,
-            },
-            "details": [],
+            "summary": summary,
+            "integrity": integrity,
+            "details": details,
         }
 
 
-# Global audit logger instance
-audit_logger = AuditLogger()
+SAFETY_INCIDENT_TYPES = {
+    AuditEventType.SAFETY_INCIDENT.value,
+    AuditEventType.INAPPROPRIATE_CONTENT.value,
+    AuditEventType.EMERGENCY_ALERT.value,
+}
+DATA_ACCESS_TYPES = {
+    AuditEventType.DATA_ACCESS.value,
+    AuditEventType.DATA_MODIFICATION.value,
+    AuditEventType.DATA_DELETION.value,
+    AuditEventType.DATA_EXPORT.value,
+}
+
+
+# Global audit logger instance, created on first use so importing this
+# module does not create ./audit_logs or an encryption key
+_audit_logger: Optional[AuditLogger] = None
+_audit_logger_lock = threading.Lock()
+
+
+def get_audit_logger() -> AuditLogger:
+    """Return the global audit logger, creating it on first use"""
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_logger_lock:
+            if _audit_logger is None:
+                _audit_logger = AuditLogger()
+    return _audit_logger
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``from ...audit_logger import audit_logger`` working
+    if name == "audit_logger":
+        return get_audit_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Convenience functions
@@ -618,7 +822,7 @@ async def log_audit_event(
     **kwargs,
 ) -> str:
     """Convenience function for logging audit events"""
-    return await audit_logger.log_event(
+    return await get_audit_logger().log_event(
         event_type=event_type,
         severity=severity,
         category=category,
@@ -635,7 +839,7 @@ async def log_child_safety_incident(
     **kwargs,
 ) -> str:
     """Convenience function for logging child safety incidents"""
-    return await audit_logger.log_safety_incident(
+    return await get_audit_logger().log_safety_incident(
         child_id=child_id,
         incident_type=incident_type,
         severity=severity,
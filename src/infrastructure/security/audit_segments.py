@@ -0,0 +1,343 @@
+"""
+Audit Log Segments
+Binary, hash-chained storage for audit events
+
+Each group commit appends one segment to the day's ``audit_<date>.seg``
+file:
+
+    header: magic | flags | first_ts | last_ts | count | payload_len
+            | prev_chain (32) | chain (32)
+    payload: length-prefixed JSON records, optionally zlib-compressed,
+             then Fernet-encrypted as a whole
+
+``chain = sha256(prev_chain || header fields || sha256(payload))`` links
+every segment to the one before it, so removing, reordering or editing a
+segment breaks verification without needing the encryption key. Time
+ranges are in the clear header, so a reader can skip segments (and whole
+files) outside the range it needs without decrypting them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"ADS1"
+SEGMENT_HEADER = struct.Struct(">4sBddII32s32s")
+RECORD_LENGTH = struct.Struct(">I")
+GENESIS_CHAIN = b"\x00" * 32
+
+FLAG_ENCRYPTED = 0x01
+FLAG_COMPRESSED = 0x02
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """One length-prefixed record"""
+    body = json.dumps(
+        record, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+    return RECORD_LENGTH.pack(len(body)) + body
+
+
+def decode_records(data: bytes) -> List[Dict[str, Any]]:
+    records = []
+    offset = 0
+    while offset < len(data):
+        (length,) = RECORD_LENGTH.unpack_from(data, offset)
+        offset += RECORD_LENGTH.size
+        records.append(json.loads(data[offset:offset + length].decode("utf-8")))
+        offset += length
+    return records
+
+
+def segment_file_date(path: Path) -> Optional[date]:
+    """Date from ``audit_<YYYY-MM-DD>[_HHMMSS].seg``"""
+    try:
+        return datetime.strptime(path.name[6:16], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class SegmentHeader:
+    """Clear-text segment header"""
+
+    flags: int
+    first_ts: float
+    last_ts: float
+    count: int
+    payload_len: int
+    prev_chain: bytes
+    chain: bytes
+
+    @staticmethod
+    def compute_chain(
+        prev_chain: bytes, flags: int, first_ts: float, last_ts: float,
+        count: int, payload: bytes,
+    ) -> bytes:
+        fields = SEGMENT_HEADER.pack(
+            SEGMENT_MAGIC, flags, first_ts, last_ts, count, len(payload),
+            prev_chain, GENESIS_CHAIN)
+        return hashlib.sha256(
+            prev_chain + fields + hashlib.sha256(payload).digest()).digest()
+
+    def pack(self) -> bytes:
+        return SEGMENT_HEADER.pack(
+            SEGMENT_MAGIC, self.flags, self.first_ts, self.last_ts, self.count,
+            self.payload_len, self.prev_chain, self.chain)
+
+    def overlaps(self, start: Optional[float], end: Optional[float]) -> bool:
+        return ((start is None or self.last_ts >= start)
+                and (end is None or self.first_ts <= end))
+
+
+def _read_segments(path: Path) -> Iterator[Tuple[int, SegmentHeader]]:
+    """(offset, header) for each complete segment of a file.
+
+    Payloads are read on demand with ``_read_payload``, so a skipped
+    segment costs one header read.
+    """
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        offset = 0
+        while offset + SEGMENT_HEADER.size <= size:
+            f.seek(offset)
+            raw = f.read(SEGMENT_HEADER.size)
+            magic, *fields = SEGMENT_HEADER.unpack(raw)
+            if magic != SEGMENT_MAGIC:
+                logger.warning(f"⚠️ Corrupt audit segment at {path}:{offset}")
+                return
+            header = SegmentHeader(*fields)
+            end = offset + SEGMENT_HEADER.size + header.payload_len
+            if end > size:
+                return  # Torn write at the tail
+            yield offset, header
+            offset = end
+
+
+def _read_payload(path: Path, offset: int, header: SegmentHeader) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset + SEGMENT_HEADER.size)
+        return f.read(header.payload_len)
+
+
+def _complete_length(path: Path) -> int:
+    length = 0
+    for offset, header in _read_segments(path):
+        length = offset + SEGMENT_HEADER.size + header.payload_len
+    return length
+
+
+def list_segment_files(directory: Path) -> List[Path]:
+    """Segment files oldest first (rotated files keep their mtime)"""
+    files = [p for p in directory.glob("audit_*.seg") if segment_file_date(p)]
+    return sorted(files, key=lambda p: (segment_file_date(p), p.stat().st_mtime, p.name))
+
+
+class AuditSegmentWriter:
+    """Appends hash-chained segments; not thread-safe (one writer thread)"""
+
+    def __init__(
+        self,
+        directory: Path,
+        cipher: Any = None,
+        compress: bool = True,
+        fsync: bool = True,
+        max_file_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cipher = cipher
+        self.compress = compress
+        self.fsync = fsync
+        self.max_file_bytes = max_file_bytes
+        self.chain = self._recover_chain()
+        self.segments_written = 0
+        # New files started (daily roll or size rotation)
+        self.files_started = 0
+
+    def _recover_chain(self) -> bytes:
+        """Chain tip of the newest complete segment; trims a torn tail"""
+        files = list_segment_files(self.directory)
+        for path in reversed(files):
+            complete = _complete_length(path)
+            if complete < path.stat().st_size:
+                logger.warning(f"⚠️ Truncating torn audit segment tail in {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(complete)
+            last = None
+            for _, header in _read_segments(path):
+                last = header
+            if last is not None:
+                return last.chain
+        return GENESIS_CHAIN
+
+    def current_path(self, now: Optional[datetime] = None) -> Path:
+        today = (now or datetime.now(timezone.utc)).date()
+        return self.directory / f"audit_{today.isoformat()}.seg"
+
+    def _rotate_if_needed(self, path: Path) -> None:
+        if path.exists() and path.stat().st_size > self.max_file_bytes:
+            stamp = datetime.now(timezone.utc).strftime("%H%M%S%f")
+            path.rename(path.with_name(f"{path.stem}_{stamp}.seg"))
+
+    def build_segment(
+        self, records: Sequence[bytes], first_ts: float, last_ts: float
+    ) -> Tuple[SegmentHeader, bytes]:
+        payload = b"".join(records)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload, 6)
+            flags |= FLAG_COMPRESSED
+        if self.cipher is not None:
+            payload = self.cipher.encrypt(payload)
+            flags |= FLAG_ENCRYPTED
+        chain = SegmentHeader.compute_chain(
+            self.chain, flags, first_ts, last_ts, len(records), payload)
+        header = SegmentHeader(
+            flags, first_ts, last_ts, len(records), len(payload), self.chain, chain)
+        return header, payload
+
+    def append(self, records: Sequence[bytes], first_ts: float, last_ts: float) -> SegmentHeader:
+        """Write one segment and make it durable before returning"""
+        header, payload = self.build_segment(records, first_ts, last_ts)
+        path = self.current_path()
+        self._rotate_if_needed(path)
+        created = not path.exists()
+
+        with open(path, "ab") as f:
+            f.write(header.pack() + payload)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if created:
+            self.files_started += 1
+            if self.fsync:
+                self._fsync_directory()
+
+        self.chain = header.chain
+        self.segments_written += 1
+        return header
+
+    def _fsync_directory(self) -> None:
+        try:
+            fd = os.open(str(self.directory), os.O_RDONLY)
+        except OSError:
+            return  # Not supported on this platform
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class AuditSegmentReader:
+    """Time-range scans and chain verification over segment files"""
+
+    def __init__(self, directory: Path, cipher: Any = None):
+        self.directory = Path(directory)
+        self.cipher = cipher
+        self.segments_scanned = 0
+        self.segments_decrypted = 0
+
+    def _files_for_range(self, start: Optional[datetime], end: Optional[datetime]) -> List[Path]:
+        files = list_segment_files(self.directory)
+        if start is None and end is None:
+            return files
+        # A segment is filed under its commit date, which is on or after
+        # the date of its events (batches can straddle midnight)
+        first_day = start.astimezone(timezone.utc).date() if start else None
+        last_day = end.astimezone(timezone.utc).date() if end else None
+        selected = []
+        for path in files:
+            day = segment_file_date(path)
+            if first_day is not None and day < first_day:
+                continue
+            if last_day is not None and (day - last_day).days > 1:
+                continue
+            selected.append(path)
+        return selected
+
+    def iter_headers(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Tuple[Path, int, SegmentHeader]]:
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        for path in self._files_for_range(start, end):
+            for offset, header in _read_segments(path):
+                self.segments_scanned += 1
+                if header.overlaps(start_ts, end_ts):
+                    yield path, offset, header
+
+    def _open_payload(self, path: Path, offset: int, header: SegmentHeader) -> bytes:
+        payload = _read_payload(path, offset, header)
+        if header.flags & FLAG_ENCRYPTED:
+            if self.cipher is None:
+                raise ValueError("Encrypted audit segment but no key configured")
+            payload = self.cipher.decrypt(payload)
+        if header.flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        self.segments_decrypted += 1
+        return payload
+
+    def read_events(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Event records with ``start <= timestamp <= end``"""
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        for path, offset, header in self.iter_headers(start, end):
+            fully_inside = ((start_ts is None or header.first_ts >= start_ts)
+                            and (end_ts is None or header.last_ts <= end_ts))
+            for record in decode_records(self._open_payload(path, offset, header)):
+                if fully_inside:
+                    yield record
+                    continue
+                ts = datetime.fromisoformat(record["timestamp"]).timestamp()
+                if (start_ts is None or ts >= start_ts) and (end_ts is None or ts <= end_ts):
+                    yield record
+
+    def verify_chain(self) -> Dict[str, Any]:
+        """Recompute the hash chain across all files (no decryption)
+
+        Retention deletes the oldest files, so the chain is checked from the
+        ``prev_chain`` recorded by the oldest remaining segment;
+        ``truncated`` says whether that is later than the genesis link.
+        """
+        prev = None
+        start = GENESIS_CHAIN
+        segments = 0
+        for path in list_segment_files(self.directory):
+            for offset, header in _read_segments(path):
+                if prev is None:
+                    prev = start = header.prev_chain
+                payload = _read_payload(path, offset, header)
+                expected = SegmentHeader.compute_chain(
+                    prev, header.flags, header.first_ts, header.last_ts,
+                    header.count, payload)
+                if header.prev_chain != prev or header.chain != expected:
+                    return {"valid": False, "segments": segments,
+                            "broken_at": f"{path.name}:{offset}"}
+                prev = header.chain
+                segments += 1
+        return {"valid": True, "segments": segments,
+                "chain_tip": (prev or GENESIS_CHAIN).hex(),
+                "truncated": start != GENESIS_CHAIN}
@@ -0,0 +1,417 @@
+"""
+SIMD-packed batch inference for CKKS emotion analysis.
+
+One CKKS ciphertext has ``poly_modulus_degree / 2`` slots. Encrypting
+each child's 5-feature vector on its own uses a handful of them, so this
+module packs many children into one ciphertext and evaluates the linear
+emotion transform for all of them at once:
+
+- every child gets a block of ``2 * stride`` slots holding its (padded)
+  feature vector twice, so a rotation by ``k < stride`` stays inside the
+  block
+- ``W @ x`` is computed with the diagonal method,
+  ``sum_k diag_k * rotate(ct, k)``: one rotation and one plaintext
+  multiplication per non-zero diagonal, for every child in the batch
+- emotion ``e`` of child ``b`` ends up in slot ``b * 2 * stride + e``
+
+Rotations come from SEAL's evaluator (``tenseal.sealapi``); TenSEAL's
+``CKKSVector`` does not expose them. Batches can run in a process pool.
+Each worker deserializes the public context (public, relinearization and
+Galois keys) once at start-up and caches its encoded diagonals. The
+secret key never leaves the parent process.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import tenseal as ts
+    import tenseal.sealapi as sealapi
+
+    TENSEAL_AVAILABLE = True
+except ImportError:
+    TENSEAL_AVAILABLE = False
+    ts = None
+    sealapi = None
+
+logger = logging.getLogger(__name__)
+
+Weights = Tuple[Tuple[float, ...], ...]
+
+
+def _next_power_of_two(value: int) -> int:
+    return 1 << max(0, value - 1).bit_length()
+
+
+@dataclass(frozen=True)
+class SlotLayout:
+    """Where each child's features and scores live in the slot vector."""
+
+    slot_count: int
+    feature_dim: int
+    output_dim: int
+
+    @property
+    def stride(self) -> int:
+        return _next_power_of_two(max(self.feature_dim, self.output_dim))
+
+    @property
+    def block(self) -> int:
+        return 2 * self.stride
+
+    @property
+    def capacity(self) -> int:
+        """Children per ciphertext"""
+        return self.slot_count // self.block
+
+    def pack(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, feature_dim) -> slot vector with each row stored twice"""
+        vectors = np.asarray(vectors, dtype=np.float64)
+        count = vectors.shape[0]
+        if count > self.capacity:
+            raise ValueError(f"{count} vectors exceed slot capacity {self.capacity}")
+        if vectors.shape[1] != self.feature_dim:
+            raise ValueError(
+                f"Expected {self.feature_dim} features, got {vectors.shape[1]}")
+        blocks = np.zeros((self.capacity, self.block))
+        blocks[:count, :self.feature_dim] = vectors
+        blocks[:count, self.stride:self.stride + self.feature_dim] = vectors
+        return blocks.reshape(-1)
+
+    def unpack(self, slots: Sequence[float], count: int) -> np.ndarray:
+        """Slot vector -> (count, output_dim) scores"""
+        blocks = np.asarray(slots[:count * self.block]).reshape(count, self.block)
+        return blocks[:, :self.output_dim]
+
+    def diagonals(self, weights: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """Non-zero generalized diagonals of ``weights``, tiled per block.
+
+        ``diag_k[b * block + i] = W[i, (i + k) % stride]`` for ``i <
+        output_dim``, so ``sum_k diag_k * rotate(x, k)`` puts ``(W @ x)_i``
+        in slot ``b * block + i``.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != (self.output_dim, self.feature_dim):
+            raise ValueError(
+                f"Expected weights of shape {(self.output_dim, self.feature_dim)}, "
+                f"got {weights.shape}")
+        square = np.zeros((self.stride, self.stride))
+        square[:self.output_dim, :self.feature_dim] = weights
+        rows = np.arange(self.stride)
+
+        result = []
+        for k in range(self.stride):
+            diagonal = square[rows, (rows + k) % self.stride]
+            if not diagonal.any():
+                continue
+            block = np.zeros(self.block)
+            block[:self.stride] = diagonal
+            result.append((k, np.tile(block, self.capacity)))
+        return result
+
+    def utilization(self, count: int) -> float:
+        """Share of slots carrying a feature value"""
+        return count * self.feature_dim / self.slot_count
+
+
+@dataclass
+class PackedBatch:
+    """Encrypted scores for up to ``layout.capacity`` children."""
+
+    data: bytes
+    child_id_hashes: List[str]
+    layout: SlotLayout
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.child_id_hashes)
+
+
+@dataclass
+class HEBatchStats:
+    """Throughput of one ``PackedEmotionBatcher.process`` call"""
+
+    ciphertexts: int = 0
+    children: int = 0
+    rotations: int = 0
+    encrypt_seconds: float = 0.0
+    transform_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    slot_utilization: float = 0.0
+
+    @property
+    def ciphertexts_per_second(self) -> float:
+        return self.ciphertexts / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def children_per_second(self) -> float:
+        return self.children / self.wall_seconds if self.wall_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ciphertexts": self.ciphertexts,
+            "children": self.children,
+            "rotations": self.rotations,
+            "encrypt_seconds": self.encrypt_seconds,
+            "transform_seconds": self.transform_seconds,
+            "wall_seconds": self.wall_seconds,
+            "ciphertexts_per_second": self.ciphertexts_per_second,
+            "children_per_second": self.children_per_second,
+            "slot_utilization": self.slot_utilization,
+        }
+
+
+def ciphertext_to_bytes(ciphertext) -> bytes:
+    """SEAL ciphertexts only serialize to a file path in ``sealapi``"""
+    fd, path = tempfile.mkstemp(prefix="he_ct_")
+    os.close(fd)
+    try:
+        ciphertext.save(path)
+        with open(path, "rb") as handle:
+            return handle.read()
+    finally:
+        os.unlink(path)
+
+
+def ciphertext_from_bytes(seal_context, data: bytes):
+    fd, path = tempfile.mkstemp(prefix="he_ct_")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        ciphertext = sealapi.Ciphertext()
+        ciphertext.load(seal_context, path)
+        return ciphertext
+    finally:
+        os.unlink(path)
+
+
+class _PackedKernel:
+    """Encrypt + linear transform + square on one context (one process)."""
+
+    def __init__(self, context, layout: SlotLayout, scale: float):
+        self.context = context
+        self.layout = layout
+        self.scale = scale
+        self.seal_context = context.seal_context().data
+        self.encoder = sealapi.CKKSEncoder(self.seal_context)
+        self.evaluator = sealapi.Evaluator(self.seal_context)
+        self.encryptor = context.encryptor().data
+        self.galois_keys = context.galois_keys().data
+        self.relin_keys = context.relin_keys().data
+        # (weights, parms_id) -> encoded diagonals
+        self._diagonals: Dict[Tuple[Weights, Tuple[int, ...]], List[Tuple[int, Any]]] = {}
+
+    def _encoded_diagonals(self, weights: Weights, parms_id) -> List[Tuple[int, Any]]:
+        key = (weights, tuple(parms_id))
+        encoded = self._diagonals.get(key)
+        if encoded is None:
+            encoded = []
+            for step, diagonal in self.layout.diagonals(np.array(weights)):
+                plaintext = sealapi.Plaintext()
+                self.encoder.encode(diagonal.tolist(), parms_id, self.scale, plaintext)
+                encoded.append((step, plaintext))
+            self._diagonals[key] = encoded
+        return encoded
+
+    def encrypt(self, packed: Sequence[float]):
+        plaintext = sealapi.Plaintext()
+        self.encoder.encode(list(packed), self.scale, plaintext)
+        ciphertext = sealapi.Ciphertext()
+        self.encryptor.encrypt(plaintext, ciphertext)
+        return ciphertext
+
+    def transform(self, ciphertext, weights: Weights) -> Tuple[Any, int]:
+        """``square(W @ x)`` for every block; returns (ciphertext, rotations)"""
+        evaluator = self.evaluator
+        accumulator = None
+        rotations = 0
+        for step, diagonal in self._encoded_diagonals(weights, ciphertext.parms_id()):
+            term = sealapi.Ciphertext()
+            if step:
+                evaluator.rotate_vector(ciphertext, step, self.galois_keys, term)
+                evaluator.multiply_plain_inplace(term, diagonal)
+                rotations += 1
+            else:
+                evaluator.multiply_plain(ciphertext, diagonal, term)
+            if accumulator is None:
+                accumulator = term
+            else:
+                evaluator.add_inplace(accumulator, term)
+        evaluator.rescale_to_next_inplace(accumulator)
+
+        # Same polynomial emotion transform as the per-item path
+        evaluator.square_inplace(accumulator)
+        evaluator.relinearize_inplace(accumulator, self.relin_keys)
+        evaluator.rescale_to_next_inplace(accumulator)
+        return accumulator, rotations
+
+    def run(self, packed: Sequence[float], weights: Weights) -> Tuple[bytes, int, float, float]:
+        started = time.perf_counter()
+        ciphertext = self.encrypt(packed)
+        encrypted = time.perf_counter()
+        result, rotations = self.transform(ciphertext, weights)
+        data = ciphertext_to_bytes(result)
+        return data, rotations, encrypted - started, time.perf_counter() - encrypted
+
+
+# Per-worker state, set once by the pool initializer
+_worker_kernel: Optional[_PackedKernel] = None
+
+
+def _init_worker(context_data: bytes, layout: SlotLayout, scale: float) -> None:
+    global _worker_kernel
+    _worker_kernel = _PackedKernel(ts.context_from(context_data), layout, scale)
+
+
+def _run_in_worker(packed: List[float], weights: Weights) -> Tuple[bytes, int, float, float]:
+    return _worker_kernel.run(packed, weights)
+
+
+class PackedEmotionBatcher:
+    """Packs children's feature vectors into CKKS slots and scores them.
+
+    ``context`` must hold Galois and relinearization keys. ``decrypt``
+    needs its secret key; the workers only ever see the public context.
+    ``max_workers=0`` runs everything in the calling process.
+    """
+
+    def __init__(
+        self,
+        context,
+        feature_dim: int,
+        output_dim: int,
+        max_workers: Optional[int] = None,
+        scale: Optional[float] = None,
+    ):
+        if not TENSEAL_AVAILABLE:
+            raise RuntimeError("TenSEAL not available for homomorphic encryption")
+        if not context.has_galois_keys() or not context.has_relin_keys():
+            raise ValueError("Packed batching needs Galois and relinearization keys")
+
+        self.context = context
+        self.scale = scale or context.global_scale
+        slot_count = sealapi.CKKSEncoder(context.seal_context().data).slot_count()
+        self.layout = SlotLayout(slot_count, feature_dim, output_dim)
+        if self.layout.capacity < 1:
+            raise ValueError("Feature vector does not fit into one ciphertext")
+
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self._local_kernel: Optional[_PackedKernel] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.last_stats = HEBatchStats()
+        self.totals = HEBatchStats()
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def local_kernel(self) -> _PackedKernel:
+        if self._local_kernel is None:
+            self._local_kernel = _PackedKernel(self.context, self.layout, self.scale)
+        return self._local_kernel
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Serialized once; each worker deserializes it once at start-up
+            public_context = self.context.serialize(
+                save_public_key=True,
+                save_secret_key=False,
+                save_galois_keys=True,
+                save_relin_keys=True,
+            )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(public_context, self.layout, self.scale),
+            )
+            self.logger.info(
+                f"HE batch pool started: {self.max_workers} workers, "
+                f"{self.layout.capacity} children per ciphertext")
+        return self._pool
+
+    def process(
+        self,
+        features: Sequence[np.ndarray],
+        weights: np.ndarray,
+        child_id_hashes: Optional[Sequence[str]] = None,
+    ) -> List[PackedBatch]:
+        """Encrypt and score ``features`` (one row per child) in packed batches"""
+        started = time.perf_counter()
+        matrix = np.asarray(features, dtype=np.float64).reshape(len(features), -1)
+        hashes = list(child_id_hashes or [str(i) for i in range(len(matrix))])
+        weight_key: Weights = tuple(
+            tuple(float(w) for w in row) for row in np.asarray(weights, dtype=np.float64))
+
+        capacity = self.layout.capacity
+        chunks = [(start, min(start + capacity, len(matrix)))
+                  for start in range(0, len(matrix), capacity)]
+        packed = [self.layout.pack(matrix[start:end]).tolist() for start, end in chunks]
+
+        if self.max_workers and len(chunks) > 1:
+            pool = self._get_pool()
+            outputs = list(pool.map(_run_in_worker, packed, [weight_key] * len(packed)))
+        else:
+            outputs = [self.local_kernel.run(p, weight_key) for p in packed]
+
+        stats = HEBatchStats(ciphertexts=len(chunks), children=len(matrix))
+        batches = []
+        for (start, end), (data, rotations, encrypt_s, transform_s) in zip(chunks, outputs):
+            stats.rotations += rotations
+            stats.encrypt_seconds += encrypt_s
+            stats.transform_seconds += transform_s
+            batches.append(PackedBatch(
+                data=data,
+                child_id_hashes=hashes[start:end],
+                layout=self.layout,
+                metadata={
+                    "rotations": rotations,
+                    "slot_utilization": self.layout.utilization(end - start),
+                },
+            ))
+        stats.wall_seconds = time.perf_counter() - started
+        if stats.ciphertexts:
+            stats.slot_utilization = self.layout.utilization(len(matrix)) / stats.ciphertexts
+        self._accumulate(stats)
+        return batches
+
+    def decrypt(self, batch: PackedBatch) -> np.ndarray:
+        """(batch.size, output_dim) scores; needs the secret key"""
+        kernel = self.local_kernel
+        ciphertext = ciphertext_from_bytes(kernel.seal_context, batch.data)
+        plaintext = sealapi.Plaintext()
+        self.context.decryptor().data.decrypt(ciphertext, plaintext)
+        return batch.layout.unpack(kernel.encoder.decode_double(plaintext), batch.size)
+
+    def _accumulate(self, stats: HEBatchStats) -> None:
+        self.last_stats = stats
+        totals = self.totals
+        totals.ciphertexts += stats.ciphertexts
+        totals.children += stats.children
+        totals.rotations += stats.rotations
+        totals.encrypt_seconds += stats.encrypt_seconds
+        totals.transform_seconds += stats.transform_seconds
+        totals.wall_seconds += stats.wall_seconds
+        if totals.ciphertexts:
+            totals.slot_utilization = (
+                totals.children * self.layout.feature_dim
+                / (totals.ciphertexts * self.layout.slot_count))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "slot_count": self.layout.slot_count,
+            "children_per_ciphertext": self.layout.capacity,
+            "workers": self.max_workers,
+            "last_batch": self.last_stats.to_dict(),
+            "totals": self.totals.to_dict(),
+        }
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
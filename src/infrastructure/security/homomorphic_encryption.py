@@ -33,6 +33,7 @@ except ImportError:
     ts = None
 
 # Security imports
+from .he_batching import HEBatchStats, PackedBatch, PackedEmotionBatcher
 from .audit_logger import SecurityAuditLogger
 from .data_encryption import DataClassification
 
@@ -67,6 +68,8 @@ class HEConfig:
     enable_galois_keys: bool = True
     enable_relin_keys: bool = True
     security_level: int = 128
+    # Worker processes for packed batches (None = CPU count, 0 = in-process)
+    batch_workers: Optional[int] = None
 
     def __post_init__(self):
         if self.coeff_mod_bit_sizes is None:
@@ -104,12 +107,12 @@ class SecureContextManager:
 
     def __init__(self, config: HEConfig):
         self.config = config
-        self.contexts: Dict[str, ts.TenSEALContext] = {}
+        self.contexts: Dict[str, "ts.Context"] = {}
         self.context_metadata: Dict[str, Dict] = {}
         self.logger = logging.getLogger(
             f"{__name__}.{self.__class__.__name__}")
 
-    def create_context(self, context_id: str) -> ts.TenSEALContext:
+    def create_context(self, context_id: str) -> "ts.Context":
         """Create secure homomorphic encryption context."""
         if not TENSEAL_AVAILABLE:
             raise RuntimeError(
@@ -154,7 +157,7 @@ class SecureContextManager:
             self.logger.error(f"Failed to create HE context: {e}")
             raise
 
-    def get_context(self, context_id: str) -> Optional[ts.TenSEALContext]:
+    def get_context(self, context_id: str) -> Optional["ts.Context"]:
         """Retrieve homomorphic encryption context."""
         return self.contexts.get(context_id)
 
@@ -253,13 +256,12 @@ class EmotionProcessor:
             encrypted_vector = ts.ckks_vector_from(
                 context, encrypted_features.data)
 
-            # Load appropriate model weights
-            weights = self._get_processing_weights(processing_mode)
-            encrypted_weights = ts.ckks_vector(context, weights)
+            # Same emotions x features transform as the packed batch path
+            transform = self.emotion_transform_matrix(processing_mode)
 
-            # Perform homomorphic operations
+            # Perform homomorphic operations: one score per emotion
             operations.append("feature_weighting")
-            result = encrypted_vector.dot(encrypted_weights)
+            result = encrypted_vector.mm(transform.T.tolist())
 
             # Apply emotion classification transformations
             operations.append("emotion_classification")
@@ -309,6 +311,12 @@ class EmotionProcessor:
             "neutral": np.array([0.5, 0.5, 0.5, 0.5, 0.5]),
         }
 
+    def emotion_transform_matrix(self, mode: ProcessingMode) -> np.ndarray:
+        """Linear emotion transform (emotions x features) for both paths."""
+        feature_weights = np.array(self._get_processing_weights(mode))
+        return np.vstack([
+            weights * feature_weights for weights in self.model_weights.values()])
+
     def _get_processing_weights(self, mode: ProcessingMode) -> List[float]:
         """Get appropriate weights for processing mode."""
         if mode == ProcessingMode.EMOTION_ANALYSIS:
@@ -319,8 +327,8 @@ class EmotionProcessor:
             return [0.2, 0.2, 0.2, 0.2, 0.2]  # Equal weights
 
     def _apply_emotion_transform(
-        self, encrypted_result: ts.CKKSVector, context: ts.TenSEALContext
-    ) -> ts.CKKSVector:
+        self, encrypted_result: "ts.CKKSVector", context: "ts.Context"
+    ) -> "ts.CKKSVector":
         """Apply emotion classification transformation."""
         # Apply softmax-like transformation using polynomial approximation
         # This is a simplified version - real implementation would use more
@@ -351,6 +359,7 @@ class HomomorphicEncryption:
         self.emotion_processor = EmotionProcessor(self.context_manager)
         self.audit_logger = SecurityAuditLogger()
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self._batcher: Optional[PackedEmotionBatcher] = None
         self.logger = logging.getLogger(
             f"{__name__}.{self.__class__.__name__}")
 
@@ -493,6 +502,84 @@ class HomomorphicEncryption:
 
         return valid_results
 
+    def _get_batcher(self) -> PackedEmotionBatcher:
+        if self._batcher is None:
+            context = self.context_manager.get_context(self.default_context_id)
+            emotions = len(self.emotion_processor.model_weights)
+            feature_dim = len(next(iter(self.emotion_processor.model_weights.values())))
+            self._batcher = PackedEmotionBatcher(
+                context, feature_dim, emotions, max_workers=self.config.batch_workers)
+        return self._batcher
+
+    async def batch_process_voice_features(
+        self,
+        features_by_child: Dict[str, np.ndarray],
+        processing_mode: ProcessingMode = ProcessingMode.EMOTION_ANALYSIS,
+    ) -> List[PackedBatch]:
+        """Encrypt and score many children at once, packed into CKKS slots.
+
+        Unlike ``batch_process_encrypted_features`` (one ciphertext per
+        child), each returned batch holds the encrypted emotion scores of
+        up to ``children_per_ciphertext`` children.
+        """
+        batcher = self._get_batcher()
+        child_hashes = [
+            hashlib.sha256(child_id.encode()).hexdigest()[:16]
+            for child_id in features_by_child]
+        features = [
+            self.voice_encryptor._normalize_features(np.asarray(f, dtype=np.float64))
+            for f in features_by_child.values()]
+        weights = self.emotion_processor.emotion_transform_matrix(processing_mode)
+
+        await self.audit_logger.log_security_event(
+            event_type="homomorphic_batch_processing_start",
+            details={
+                "processing_mode": processing_mode.value,
+                "children": len(child_hashes),
+            },
+            classification=DataClassification.RESTRICTED,
+        )
+
+        try:
+            batches = await asyncio.get_event_loop().run_in_executor(
+                self.executor, batcher.process, features, weights, child_hashes)
+        except Exception as e:
+            await self.audit_logger.log_security_event(
+                event_type="homomorphic_batch_processing_failure",
+                details={"error": str(e), "processing_mode": processing_mode.value},
+                classification=DataClassification.RESTRICTED,
+            )
+            raise
+
+        stats: HEBatchStats = batcher.last_stats
+        await self.audit_logger.log_security_event(
+            event_type="homomorphic_batch_processing_success",
+            details={
+                "ciphertexts": stats.ciphertexts,
+                "children": stats.children,
+                "slot_utilization": stats.slot_utilization,
+                "processing_time_ms": stats.wall_seconds * 1000,
+            },
+            classification=DataClassification.RESTRICTED,
+        )
+        return batches
+
+    async def decrypt_packed_result(
+        self, batch: PackedBatch
+    ) -> Dict[str, Dict[str, float]]:
+        """Decrypt a packed batch into per-child emotion scores."""
+        await self.audit_logger.log_security_event(
+            event_type="homomorphic_decryption_attempt",
+            details={"data_type": "packed_emotion_scores", "children": batch.size},
+            classification=DataClassification.CRITICAL,
+        )
+        scores = self._get_batcher().decrypt(batch)
+        emotions = list(self.emotion_processor.model_weights)
+        return {
+            child_hash: dict(zip(emotions, row.tolist()))
+            for child_hash, row in zip(batch.child_id_hashes, scores)
+        }
+
     def load_encrypted_model_weights(
         self, model_type: str = "emotion"
     ) -> Dict[str, Any]:
@@ -575,6 +662,7 @@ class HomomorphicEncryption:
                 "voice_feature_encryption": True,
                 "emotion_processing": True,
                 "batch_processing": True,
+                "slot_packed_batching": True,
                 "privacy_preserving": True,
             },
             "security_features": {
@@ -588,6 +676,7 @@ class HomomorphicEncryption:
                 "processing_time_estimate_ms": "< 100",
                 "memory_efficient": True,
                 "concurrent_operations": True,
+                "packed_batching": self._batcher.get_stats() if self._batcher else None,
             },
             "timestamp": datetime.now().isoformat(),
         }
@@ -599,8 +688,11 @@ class HomomorphicEncryption:
             for context_id in list(self.context_manager.contexts.keys()):
                 self.context_manager.cleanup_context(context_id)
 
-            # Shutdown executor
+            # Shutdown executor and batch workers
             self.executor.shutdown(wait=True)
+            if self._batcher is not None:
+                self._batcher.close()
+                self._batcher = None
 
             # Log cleanup
             await self.audit_logger.log_security_event(
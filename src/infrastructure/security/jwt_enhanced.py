@@ -6,7 +6,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 Enhanced JWT system with:
 - Access tokens and refresh tokens
-- Token blacklisting
+- Token revocation per jti with a local Bloom filter replica
+- Verified-claims cache (no signature check for repeat tokens)
 - Role-based claims
 - Secure token rotation
 - Device fingerprinting
@@ -16,16 +17,19 @@ Author: Jaafar Adeeb - Security Lead
 
 import hashlib
 import secrets
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 
 import jwt
 import redis.asyncio as redis
 import structlog
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
+from .token_revocation import RevocationList, VerifiedClaimsCache, token_digest
+
 logger = structlog.get_logger(__name__)
 
 
@@ -89,8 +93,12 @@ class EnhancedJWTManager:
         self.max_refresh_attempts = 3
         self.blacklist_cleanup_interval = 3600  # 1 hour
 
-        # In-memory fallback for blacklist
-        self.blacklisted_tokens: Set[str] = set()
+        # Revocation per jti (Redis + local Bloom replica, or in-memory)
+        self.revocations = RevocationList(
+            redis_client,
+            retention_seconds=self.refresh_token_expire.total_seconds())
+        self.claims_cache: VerifiedClaimsCache[TokenClaims] = VerifiedClaimsCache(
+            max_entries=50_000, max_ttl=self.access_token_expire.total_seconds())
         self.refresh_attempts: Dict[str, int] = {}
 
         # Device fingerprinting
@@ -190,10 +198,15 @@ class EnhancedJWTManager:
         """Verify and decode access token"""
 
         try:
-            # Check if token is blacklisted
-            if await self._is_token_blacklisted(token):
-                logger.warning("Blacklisted token used")
-                return None
+            # Repeat tokens skip signature verification
+            digest = token_digest(token)
+            cached = self.claims_cache.get(digest)
+            if cached is not None:
+                claims, jti = cached
+                if await self.revocations.is_revoked(jti):
+                    logger.warning("Blacklisted token used")
+                    return None
+                return replace(claims, permissions=list(claims.permissions))
 
             # Decode token
             payload = jwt.decode(
@@ -205,6 +218,12 @@ class EnhancedJWTManager:
                 logger.warning("Invalid token type for access token")
                 return None
 
+            # Check if token is revoked
+            jti = payload.get("jti") or digest.hex()
+            if await self.revocations.is_revoked(jti):
+                logger.warning("Blacklisted token used")
+                return None
+
             # Create claims object
             claims = TokenClaims(
                 user_id=payload["user_id"],
@@ -217,8 +236,9 @@ class EnhancedJWTManager:
                 is_parent=payload.get("is_parent", False),
                 is_child=payload.get("is_child", False),
             )
+            self.claims_cache.put(digest, claims, jti, float(payload["exp"]))
 
-            return claims
+            return replace(claims, permissions=list(claims.permissions))
 
         except ExpiredSignatureError:
             logger.debug("Access token expired")
@@ -241,6 +261,10 @@ class EnhancedJWTManager:
         if payload.get("token_type") != TokenType.REFRESH.value:
             raise InvalidTokenError("Invalid token type for refresh token")
 
+        if await self.revocations.is_revoked(
+                payload.get("jti") or token_digest(refresh_token).hex()):
+            raise InvalidTokenError("Refresh token has been revoked")
+
         user_id = payload["user_id"]
         stored_fingerprint = payload.get("device_fingerprint")
 
@@ -432,24 +456,34 @@ class EnhancedJWTManager:
                 f"device_token:{token}", int(self.device_token_expire.total_seconds())
             )
 
+    def _revocation_id(self, token: str) -> Tuple[str, float]:
+        """(jti, exp) of a token, without verifying it"""
+        try:
+            payload = jwt.decode(token, options={"verify_signature": False})
+        except InvalidTokenError:
+            payload = {}
+        jti = payload.get("jti") or token_digest(token).hex()
+        exp = payload.get("exp") or time.time() + self.refresh_token_expire.total_seconds()
+        return jti, float(exp)
+
     async def _is_token_blacklisted(self, token: str) -> bool:
         """Check if token is blacklisted"""
-
-        if self.redis_client:
-            return await self.redis_client.sismember("blacklisted_tokens", token)
-        else:
-            return token in self.blacklisted_tokens
+        jti, _ = self._revocation_id(token)
+        return await self.revocations.is_revoked(jti)
 
     async def _blacklist_token(self, token: str):
-        """Add token to blacklist"""
+        """Add token to blacklist until it expires"""
+        jti, exp = self._revocation_id(token)
+        await self.revocations.revoke(jti, exp)
 
-        if self.redis_client:
-            await self.redis_client.sadd("blacklisted_tokens", token)
-            # Set expiration to match token expiration
-            # 30 days
-            await self.redis_client.expire("blacklisted_tokens", 86400 * 30)
-        else:
-            self.blacklisted_tokens.add(token)
+    def get_verification_stats(self) -> Dict[str, Any]:
+        """Claims cache and revocation propagation statistics"""
+        return {
+            "claims_cache_size": len(self.claims_cache),
+            "claims_cache_hits": self.claims_cache.hits,
+            "claims_cache_misses": self.claims_cache.misses,
+            "revocation": self.revocations.get_stats(),
+        }
 
     async def _check_refresh_attempts(self, user_id: str) -> bool:
         """Check if user has exceeded refresh attempts"""
@@ -1,62 +1,357 @@
+"""
+Token-bucket rate limiting.
+
+Two tiers share one interface (``acquire(key, cost)`` -> ``RateLimitDecision``):
+
+* ``LocalTokenBucketLimiter`` - in-process buckets on a monotonic clock,
+  kept in a bounded LRU so IP churn cannot grow memory without limit.
+* ``DistributedRateLimiter`` - the local tier in front of a shared GCRA
+  store (an atomic Redis script, or ``InMemoryGCRAStore`` for tests and
+  single-process deployments). Tokens are reserved from the shared store
+  in small batches, so most requests never leave the process, and the
+  limiter falls back to the local tier when Redis is unavailable.
+
+``RateLimiter`` / ``RateLimiterMiddleware`` wrap either tier for FastAPI.
+"""
+
+import asyncio
+import logging
+import math
+import threading
 import time
-from collections import defaultdict
-from typing import Callable
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from redis.exceptions import NoScriptError
+from starlette.middleware.base import BaseHTTPMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of one rate-limit check"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # seconds until the request could succeed
+    reset_after: float = 0.0  # seconds until the bucket is full again
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": str(int(time.time() + math.ceil(self.reset_after))),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+# ---------------------------------------------------------------
+# In-process tier
+# ---------------------------------------------------------------
+
+
+class LocalTokenBucketLimiter:
+    """Per-key token buckets in a bounded LRU.
+
+    Evicting the least recently seen key only forgets a client that has been
+    idle the longest; when it comes back it starts with a full bucket, which
+    is what it would have refilled to anyway unless the LRU is undersized.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate_per_second <= 0 or burst < 1:
+            raise ValueError("rate_per_second must be > 0 and burst >= 1")
+        self.rate = float(rate_per_second)
+        self.burst = int(burst)
+        self.max_keys = max_keys
+        self._clock = clock
+        # key -> [tokens, last_update]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, cost: float = 1.0) -> RateLimitDecision:
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            allowed = bucket[0] >= cost
+            if allowed:
+                bucket[0] -= cost
+            tokens = bucket[0]
+
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=self.burst,
+            remaining=int(tokens),
+            retry_after=0.0 if allowed else (cost - tokens) / self.rate,
+            reset_after=(self.burst - tokens) / self.rate,
+        )
+
+    def refund(self, key: str, cost: float = 1.0) -> None:
+        """Give back tokens taken by a request that was rejected elsewhere"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(self.burst, bucket[0] + cost)
+
+
+# ---------------------------------------------------------------
+# Shared tier (GCRA)
+# ---------------------------------------------------------------
+
+# Generic cell rate algorithm: the key stores the theoretical arrival time
+# (TAT) of the next token. Up to ARGV[3] tokens are granted in one call and
+# the server clock is used so workers with skewed clocks agree.
+GCRA_LUA = """
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local tolerance = emission * burst
+local available = math.floor((now + tolerance - tat) / emission + 1e-9)
+local granted = math.min(requested, available)
+if granted > 0 then
+  tat = tat + granted * emission
+  redis.call('SET', KEYS[1], tostring(tat), 'PX',
+             math.ceil((tat - now) * 1000) + 1000)
+end
+local retry_after = math.max(0, tat - tolerance + emission - now)
+return {granted, tostring(retry_after), tostring(tat - now)}
+"""
+
+
+def _gcra(
+    tat: Optional[float], now: float, emission: float, burst: int, requested: int
+) -> Tuple[int, float, float, float]:
+    """Python twin of ``GCRA_LUA``: (granted, new_tat, retry_after, reset_after)"""
+    tat = now if tat is None or tat < now else tat
+    tolerance = emission * burst
+    available = math.floor((now + tolerance - tat) / emission + 1e-9)
+    granted = max(0, min(requested, available))
+    if granted:
+        tat += granted * emission
+    return granted, tat, max(0.0, tat - tolerance + emission - now), tat - now
+
+
+class RedisGCRAStore:
+    """Shared GCRA state in Redis, updated by one atomic script call"""
+
+    def __init__(self, redis_client: Any, prefix: str = "rl:gcra:"):
+        self.redis = redis_client
+        self.prefix = prefix
+        self._sha: Optional[str] = None
+
+    async def reserve(
+        self, key: str, emission: float, burst: int, requested: int
+    ) -> Tuple[int, float, float]:
+        """Take up to ``requested`` tokens: (granted, retry_after, reset_after)"""
+        args = (1, self.prefix + key, repr(emission), burst, requested)
+        if self._sha is None:
+            self._sha = await self.redis.script_load(GCRA_LUA)
+        try:
+            result = await self.redis.evalsha(self._sha, *args)
+        except NoScriptError:
+            # Script cache flushed (restart, failover, SCRIPT FLUSH): reload once
+            self._sha = await self.redis.script_load(GCRA_LUA)
+            result = await self.redis.evalsha(self._sha, *args)
+        granted, retry_after, reset_after = result
+        return int(granted), float(retry_after), float(reset_after)
+
+
+class InMemoryGCRAStore:
+    """Local stand-in for ``RedisGCRAStore`` (tests, single process)"""
 
-from fastapi import HTTPException, Request
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    async def reserve(
+        self, key: str, emission: float, burst: int, requested: int
+    ) -> Tuple[int, float, float]:
+        with self._lock:
+            self.calls += 1
+            now = self._clock()
+            granted, tat, retry_after, reset_after = _gcra(
+                self._tat.get(key), now, emission, burst, requested)
+            self._tat[key] = tat
+            self._tat.move_to_end(key)
+            if len(self._tat) > self.max_keys:
+                self._tat.popitem(last=False)
+        return granted, retry_after, reset_after
+
+
+class DistributedRateLimiter:
+    """Cluster-wide limit with a local fast path.
+
+    Each process leases up to ``reserve_batch`` tokens per round-trip and
+    spends them locally until they run out or the lease expires. Leases are
+    short, so a worker never sits on more than a few tokens other workers
+    could use; unused leased tokens are simply dropped, which can only make
+    the limit slightly stricter, never looser.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        store: Any = None,
+        reserve_batch: int = 5,
+        lease_seconds: float = 1.0,
+        max_keys: int = 100_000,
+        store_retry_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = float(rate_per_second)
+        self.burst = int(burst)
+        self.emission = 1.0 / self.rate
+        self.store = store if store is not None else InMemoryGCRAStore(max_keys, clock)
+        self.reserve_batch = max(1, min(int(reserve_batch), self.burst))
+        self.lease_seconds = lease_seconds
+        self.max_keys = max_keys
+        self.store_retry_seconds = store_retry_seconds
+        self._clock = clock
+
+        self.local = LocalTokenBucketLimiter(rate_per_second, burst, max_keys, clock)
+        # key -> [leased tokens, lease expiry]
+        self._leases: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._store_down_until = 0.0
+        self.stats = {"local_hits": 0, "round_trips": 0, "store_errors": 0}
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitDecision:
+        local = self.local.acquire(key, cost)
+        if not local.allowed:
+            return local
+
+        now = self._clock()
+        if now < self._store_down_until:
+            return local  # Shared tier unavailable: local limit only
+
+        lease = self._leases.get(key)
+        if lease is not None and lease[1] > now and lease[0] >= cost:
+            lease[0] -= cost
+            self._leases.move_to_end(key)
+            self.stats["local_hits"] += 1
+            return RateLimitDecision(True, self.burst, min(local.remaining, int(lease[0])),
+                                     0.0, local.reset_after)
+
+        try:
+            granted, retry_after, reset_after = await self.store.reserve(
+                key, self.emission, self.burst, max(self.reserve_batch, cost))
+            self.stats["round_trips"] += 1
+        except Exception as e:
+            self.stats["store_errors"] += 1
+            self._store_down_until = now + self.store_retry_seconds
+            logger.warning(f"⚠️ Rate limit store unavailable, using local limits: {e}")
+            return local
+
+        if granted < cost:
+            # Partial grants smaller than the cost cannot be used; the tokens
+            # come back to the bucket as the TAT advances anyway.
+            self.local.refund(key, cost)
+            self._leases.pop(key, None)
+            return RateLimitDecision(False, self.burst, 0, retry_after, reset_after)
+
+        self._leases[key] = [float(granted - cost), now + self.lease_seconds]
+        self._leases.move_to_end(key)
+        if len(self._leases) > self.max_keys:
+            self._leases.popitem(last=False)
+        remaining = max(0, int(self.burst - reset_after * self.rate))
+        return RateLimitDecision(True, self.burst, remaining, 0.0, reset_after)
+
+
+def create_rate_limiter(
+    rate_per_second: float,
+    burst: int,
+    redis_client: Any = None,
+    prefix: str = "rl:gcra:",
+    **kwargs: Any,
+):
+    """Local limiter, or distributed one when a Redis client is given"""
+    if redis_client is None:
+        return LocalTokenBucketLimiter(
+            rate_per_second, burst, kwargs.get("max_keys", 100_000))
+    return DistributedRateLimiter(
+        rate_per_second, burst, store=RedisGCRAStore(redis_client, prefix), **kwargs)
+
+
+async def acquire(limiter: Any, key: str, cost: int = 1) -> RateLimitDecision:
+    """Call ``acquire`` on either tier"""
+    decision = limiter.acquire(key, cost)
+    if asyncio.iscoroutine(decision):
+        decision = await decision
+    return decision
+
+
+# ---------------------------------------------------------------
+# FastAPI integration
+# ---------------------------------------------------------------
 
 
 class RateLimiter:
-    """Token bucket rate limiter with sliding window"""
+    """Token bucket rate limiting middleware (``app.middleware("http")``)"""
 
-    def __init__(self, requests_per_minute: int = 60, burst_size: int = 10):
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        burst_size: int = 10,
+        redis_client: Any = None,
+        limiter: Any = None,
+    ):
         self.rate = requests_per_minute / 60.0  # requests per second
         self.burst_size = burst_size
-        self.buckets = defaultdict(
-            lambda: {"tokens": burst_size, "last_update": time.time()}
-        )
+        self.limiter = limiter or create_rate_limiter(
+            self.rate, burst_size, redis_client)
 
     async def __call__(self, request: Request, call_next: Callable):
-        # Get client identifier
-        client_id = self._get_client_id(request)
-
-        # Check rate limit
-        if not self._is_allowed(client_id):
-            raise HTTPException(
+        decision = await self.check(self._get_client_id(request))
+        if not decision.allowed:
+            return JSONResponse(
                 status_code=429,
-                detail="Rate limit exceeded",
-                headers={"Retry-After": "60"},
+                content={"detail": "Rate limit exceeded"},
+                headers=decision.headers(),
             )
 
-        # Process request
         response = await call_next(request)
-
-        # Add rate limit headers
-        bucket = self.buckets[client_id]
-        response.headers["X-RateLimit-Limit"] = str(self.burst_size)
-        response.headers["X-RateLimit-Remaining"] = str(int(bucket["tokens"]))
-        response.headers["X-RateLimit-Reset"] = str(
-            int(time.time() + (self.burst_size - bucket["tokens"]) / self.rate)
-        )
-
+        response.headers.update(decision.headers())
         return response
 
-    def _is_allowed(self, client_id: str) -> bool:
-        """Check if request is allowed"""
-        bucket = self.buckets[client_id]
-        current_time = time.time()
-
-        # Refill tokens based on time elapsed
-        time_elapsed = current_time - bucket["last_update"]
-        bucket["tokens"] = min(
-            self.burst_size, bucket["tokens"] + time_elapsed * self.rate
-        )
-        bucket["last_update"] = current_time
+    async def check(self, client_id: str, cost: int = 1) -> RateLimitDecision:
+        return await acquire(self.limiter, client_id, cost)
 
-        # Check if we have tokens
-        if bucket["tokens"] >= 1:
-            bucket["tokens"] -= 1
-            return True
-        return False
+    async def _is_allowed(self, client_id: str) -> bool:
+        """Check if request is allowed"""
+        return (await self.check(client_id)).allowed
 
     def _get_client_id(self, request: Request) -> str:
         """Get unique client identifier"""
@@ -66,7 +361,31 @@ class RateLimiter:
 
         # Fall back to IP address
         forwarded = request.headers.get("X-Forwarded-For")
-        ip = request.client.host
+        ip = request.client.host if request.client else "unknown"
         if forwarded:
             ip = forwarded.split(",")[0].strip()
         return f"ip:{ip}"
+
+
+class RateLimiterMiddleware(BaseHTTPMiddleware):
+    """``app.add_middleware(RateLimiterMiddleware, calls=100, period=60)``"""
+
+    def __init__(
+        self,
+        app,
+        calls: int = 100,
+        period: int = 60,
+        burst: Optional[int] = None,
+        redis_client: Any = None,
+        limiter: Any = None,
+    ):
+        super().__init__(app)
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=calls * 60 / period,
+            burst_size=burst or max(1, calls // 10),
+            redis_client=redis_client,
+            limiter=limiter,
+        )
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        return await self.rate_limiter(request, call_next)
@@ -0,0 +1,311 @@
+"""
+🔐 Token Revocation & Verified-Claims Cache
+==========================================
+
+Keeps token verification off the network in the common case:
+
+- ``VerifiedClaimsCache`` - bounded LRU of already verified claims keyed by
+  the token's SHA-256 digest; entries never outlive the token's ``exp``
+- ``BloomFilter`` - compact local replica of the revoked ``jti`` set
+- ``RevocationList`` - revocations stored per ``jti`` with their own expiry
+  (``revoked_jti:<jti>``) plus an append-only ``revocation_log`` sorted set
+  that every process reads incrementally into its Bloom filter. Log scores
+  come from the Redis server clock inside one atomic script, so they follow
+  commit order whatever the writers' local clocks say, and every sync
+  re-reads a short overlap window to catch equal scores
+
+Cached claims still go through the (in-memory) filter check, so a cache
+hit never outlives a revocation. A ``jti`` that is not in the local filter
+is known not to be revoked as of the last sync, so only filter hits
+(revoked tokens and rare false positives) are confirmed against Redis. Syncs run at most every
+``sync_interval`` seconds; if the replica is older than ``max_staleness``
+(Redis was unreachable, say) every check goes to Redis directly, so a
+revocation is honoured everywhere within ``max_staleness`` seconds.
+"""
+
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import structlog
+from redis.exceptions import NoScriptError
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# KEYS: jti key, log key; ARGV: log member, exp, ttl, retention seconds.
+# Returns the server time used as the log score.
+REVOKE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+redis.call('ZADD', KEYS[2], now, ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - tonumber(ARGV[4]))
+return tostring(now)
+"""
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class VerifiedClaimsCache(Generic[T]):
+    """Bounded cache of verified claims expiring at the token's ``exp``"""
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        max_ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._clock = clock
+        # digest -> (claims, jti, expires_at)
+        self._entries: "OrderedDict[bytes, Tuple[T, str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: bytes) -> Optional[Tuple[T, str]]:
+        entry = self._entries.get(digest)
+        if entry is None or entry[2] <= self._clock():
+            if entry is not None:
+                del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, digest: bytes, claims: T, jti: str, exp: float) -> None:
+        expires_at = min(exp, self._clock() + self.max_ttl)
+        if expires_at <= self._clock():
+            return
+        self._entries[digest] = (claims, jti, expires_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter with double hashing over one BLAKE2b digest"""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def is_saturated(self) -> bool:
+        return self.count >= self.capacity
+
+
+@dataclass
+class RevocationStats:
+    """Revocation propagation and lookup counters"""
+
+    syncs: int = 0
+    sync_failures: int = 0
+    rebuilds: int = 0
+    local_negative: int = 0
+    remote_checks: int = 0
+    last_sync_at: float = 0.0
+    last_propagation_lag: float = 0.0
+    max_propagation_lag: float = 0.0
+
+
+class RevocationList:
+    """Per-``jti`` revocations with a locally replicated Bloom filter"""
+
+    LOG_KEY = "revocation_log"
+    KEY_PREFIX = "revoked_jti:"
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        retention_seconds: float = 30 * 86400,
+        sync_interval: float = 1.0,
+        max_staleness: float = 5.0,
+        rebuild_interval: float = 600.0,
+        sync_overlap: float = 2.0,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.retention_seconds = retention_seconds
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.rebuild_interval = rebuild_interval
+        self.sync_overlap = sync_overlap
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._clock = clock
+
+        self.filter = BloomFilter(capacity, error_rate)
+        self._cursor = 0.0  # highest revocation_log score applied
+        # Members applied within ``sync_overlap`` of the cursor -> score
+        self._recent: Dict[str, float] = {}
+        self._revoke_sha: Optional[str] = None
+        self._last_rebuild = 0.0
+        self._last_attempt = 0.0
+        self._sync_lock = asyncio.Lock()
+        # Without Redis this process is the source of truth: jti -> exp
+        self._local: Dict[str, float] = {}
+        self.stats = RevocationStats()
+
+    # ---------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        """Revoke ``jti`` until the token would have expired anyway"""
+        now = self._clock()
+        ttl = int(math.ceil(exp - now))
+        self.filter.add(jti)
+        if ttl <= 0:
+            return
+
+        if self.redis is None:
+            self._local[jti] = exp
+            if len(self._local) % 1024 == 0:
+                self._local = {j: e for j, e in self._local.items() if e > now}
+            return
+
+        args = (2, f"{self.KEY_PREFIX}{jti}", self.LOG_KEY, f"{jti}:{int(exp)}",
+                int(exp), ttl, int(self.retention_seconds))
+        if self._revoke_sha is None:
+            self._revoke_sha = await self.redis.script_load(REVOKE_LUA)
+        try:
+            await self.redis.evalsha(self._revoke_sha, *args)
+        except NoScriptError:
+            # Script cache flushed (restart, failover, SCRIPT FLUSH): reload once
+            self._revoke_sha = await self.redis.script_load(REVOKE_LUA)
+            await self.redis.evalsha(self._revoke_sha, *args)
+
+    # ---------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------
+
+    @property
+    def staleness(self) -> float:
+        return self._clock() - self.stats.last_sync_at
+
+    async def is_revoked(self, jti: str) -> bool:
+        if self.redis is None:
+            exp = self._local.get(jti)
+            if exp is not None and exp <= self._clock():
+                del self._local[jti]
+                return False
+            return exp is not None
+
+        await self.maybe_sync()
+        if self.staleness <= self.max_staleness and jti not in self.filter:
+            self.stats.local_negative += 1
+            return False
+
+        # Filter hit (or replica too old): ask Redis
+        self.stats.remote_checks += 1
+        return bool(await self.redis.exists(f"{self.KEY_PREFIX}{jti}"))
+
+    async def maybe_sync(self) -> None:
+        # Also paces retries while Redis is failing
+        if self.redis is None or self._clock() - self._last_attempt < self.sync_interval:
+            return
+        if self._sync_lock.locked():
+            return  # Another request is already syncing
+        async with self._sync_lock:
+            if self._clock() - self._last_attempt >= self.sync_interval:
+                await self.sync()
+
+    async def sync(self) -> None:
+        """Apply revocations logged since the last sync (or rebuild)"""
+        now = self._clock()
+        self._last_attempt = now
+        try:
+            if (now - self._last_rebuild >= self.rebuild_interval
+                    or self.filter.is_saturated):
+                await self._rebuild(now)
+            else:
+                # Inclusive and overlapping: an entry scored at or just below
+                # the cursor may have committed after the previous read
+                entries = await self.redis.zrangebyscore(
+                    self.LOG_KEY, self._cursor - self.sync_overlap, "+inf",
+                    withscores=True)
+                self._apply_entries(entries, now)
+            self.stats.syncs += 1
+            self.stats.last_sync_at = now
+        except Exception as e:
+            self.stats.sync_failures += 1
+            logger.warning("Revocation sync failed", error=str(e))
+
+    async def _rebuild(self, now: float) -> None:
+        """Fresh filter from unexpired log entries (drops expired jtis)"""
+        entries = await self.redis.zrangebyscore(
+            self.LOG_KEY, now - self.retention_seconds, "+inf", withscores=True)
+        self.filter = BloomFilter(self.capacity, self.error_rate)
+        self._cursor = 0.0
+        self._recent = {}
+        self._last_rebuild = now
+        self.stats.rebuilds += 1
+        self._apply_entries(entries, now, skip_expired=True)
+
+    def _apply_entries(self, entries, now: float, skip_expired: bool = False) -> None:
+        for member, revoked_at in entries:
+            if isinstance(member, bytes):
+                member = member.decode("utf-8")
+            if member in self._recent:
+                continue  # Already applied in the overlap window
+            jti, _, exp = member.rpartition(":")
+            self._recent[member] = float(revoked_at)
+            self._cursor = max(self._cursor, float(revoked_at))
+            if skip_expired and float(exp) <= now:
+                continue
+            self.filter.add(jti)
+            lag = max(0.0, now - float(revoked_at))
+            self.stats.last_propagation_lag = lag
+            self.stats.max_propagation_lag = max(self.stats.max_propagation_lag, lag)
+
+        horizon = self._cursor - self.sync_overlap
+        self._recent = {m: score for m, score in self._recent.items() if score >= horizon}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.__dict__,
+            "staleness": self.staleness if self.redis is not None else 0.0,
+            "revocation_latency_bound": self.max_staleness,
+            "filter_entries": self.filter.count,
+            "filter_capacity": self.capacity,
+        }
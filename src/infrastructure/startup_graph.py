@@ -0,0 +1,382 @@
+"""
+🚦 Startup Graph
+Dependency-aware concurrent service startup with lazy activation,
+readiness tracking and a per-boot startup timeline.
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class StartupError(RuntimeError):
+    """Raised when a critical service fails to start"""
+
+
+class ServiceUnavailableError(StartupError):
+    """Raised when a service that failed or was skipped is requested"""
+
+
+@dataclass
+class ServiceSpec:
+    """Declaration of a service taking part in startup"""
+
+    name: str
+    factory: Callable[[], Any]
+    depends_on: List[str] = field(default_factory=list)
+    critical: bool = False
+    lazy: bool = False
+    timeout_seconds: Optional[float] = None
+    # Await the instance's initialize() after creating it
+    initialize: bool = True
+
+
+@dataclass
+class TimelineEntry:
+    """One service's startup span"""
+
+    service: str
+    status: str  # started | failed | lazy | skipped
+    start_offset_ms: float
+    duration_ms: float
+    critical: bool
+    depends_on: List[str]
+    error: Optional[str] = None
+
+
+class StartupTimeline:
+    """Collects startup spans and writes them out on every boot"""
+
+    def __init__(self):
+        self.boot_started_at = datetime.utcnow()
+        self._origin = time.perf_counter()
+        self.entries: List[TimelineEntry] = []
+        self.ready_offset_ms: Optional[float] = None
+
+    def offset_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    def record(self, entry: TimelineEntry) -> None:
+        self.entries.append(entry)
+
+    def mark_ready(self) -> None:
+        self.ready_offset_ms = self.offset_ms()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "boot_started_at": self.boot_started_at.isoformat(),
+            "ready_after_ms": self.ready_offset_ms,
+            "total_ms": max(
+                (e.start_offset_ms + e.duration_ms for e in self.entries),
+                default=0.0,
+            ),
+            "services": [
+                asdict(e)
+                for e in sorted(self.entries, key=lambda e: e.start_offset_ms)
+            ],
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+
+
+class LazyService:
+    """Service handle that is created and initialized on first use"""
+
+    def __init__(
+        self,
+        spec: ServiceSpec,
+        timeline: StartupTimeline,
+        on_started: Optional[Callable[[str, Any], None]] = None,
+    ):
+        self.spec = spec
+        self._timeline = timeline
+        self._on_started = on_started
+        self._instance: Any = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_active(self) -> bool:
+        return self._instance is not None
+
+    async def get(self) -> Any:
+        """Return the service, activating it on first call"""
+        if self._instance is not None:
+            return self._instance
+
+        async with self._lock:
+            if self._instance is None:
+                start = self._timeline.offset_ms()
+                self._instance = await _activate(self.spec)
+                if self._on_started:
+                    self._on_started(self.spec.name, self._instance)
+                logger.info(
+                    "Lazy service activated",
+                    service=self.spec.name,
+                    duration_ms=round(self._timeline.offset_ms() - start, 1),
+                )
+        return self._instance
+
+
+async def _activate(spec: ServiceSpec) -> Any:
+    """Create a service and, unless disabled, await its initialize()"""
+    instance = spec.factory()
+    if inspect.isawaitable(instance):
+        instance = await instance
+
+    initialize = getattr(instance, "initialize", None) if spec.initialize else None
+    if callable(initialize):
+        result = initialize()
+        if inspect.isawaitable(result):
+            if spec.timeout_seconds:
+                await asyncio.wait_for(result, spec.timeout_seconds)
+            else:
+                await result
+    return instance
+
+
+class StartupGraph:
+    """
+    Starts services as soon as their dependencies are up.
+
+    Independent services start concurrently; the readiness event is set
+    once every critical service (and its dependencies) has started.
+    ``on_started(name, instance)`` is called whenever a service comes up,
+    including lazy services on first use, so callers can bind the live
+    instance wherever consumers look it up. ``wait_for(name)`` lets request
+    paths await one service's node instead of the whole boot, and
+    ``status()`` reports per-service readiness.
+    """
+
+    def __init__(self, on_started: Optional[Callable[[str, Any], None]] = None):
+        self._on_started = on_started
+        self._specs: Dict[str, ServiceSpec] = {}
+        self.instances: Dict[str, Any] = {}
+        self.failures: Dict[str, str] = {}
+        self.timeline = StartupTimeline()
+        self.ready = asyncio.Event()
+        # Per-service completion (True = usable) and last recorded status
+        self._done: Dict[str, asyncio.Future] = {}
+        self._status: Dict[str, str] = {}
+
+    def register(self, spec: ServiceSpec) -> None:
+        if spec.name in self._specs:
+            raise ValueError(f"Service already registered: {spec.name}")
+        self._specs[spec.name] = spec
+
+    def add(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        depends_on: Optional[List[str]] = None,
+        critical: bool = False,
+        lazy: bool = False,
+        timeout_seconds: Optional[float] = None,
+        initialize: bool = True,
+    ) -> None:
+        self.register(
+            ServiceSpec(
+                name=name,
+                factory=factory,
+                depends_on=list(depends_on or []),
+                critical=critical,
+                lazy=lazy,
+                timeout_seconds=timeout_seconds,
+                initialize=initialize,
+            )
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def get(self, name: str) -> Any:
+        """Started instance or LazyService handle for a service"""
+        return self.instances.get(name)
+
+    async def resolve(self, name: str) -> Any:
+        """Started instance for a service, activating it if lazy"""
+        instance = self.instances.get(name)
+        if isinstance(instance, LazyService):
+            return await instance.get()
+        return instance
+
+    async def wait_for(self, name: str) -> Any:
+        """Wait until a service's startup node is done and return it.
+
+        Lazy services are activated; a service that failed, or was skipped
+        because a dependency failed, raises ServiceUnavailableError.
+        """
+        if name not in self._specs:
+            raise KeyError(f"Unknown service: {name}")
+        if not await asyncio.shield(self._node(name)):
+            raise ServiceUnavailableError(
+                f"{name} is unavailable: {self.failures.get(name, 'not started')}")
+        return await self.resolve(name)
+
+    def status(self) -> Dict[str, str]:
+        """Per-service state: starting, started, lazy, active, failed or skipped"""
+        result = {}
+        for name in self._specs:
+            state = self._status.get(name, "starting")
+            instance = self.instances.get(name)
+            if state == "lazy" and isinstance(instance, LazyService) and instance.is_active:
+                state = "active"
+            result[name] = state
+        return result
+
+    def _node(self, name: str) -> asyncio.Future:
+        node = self._done.get(name)
+        if node is None:
+            node = self._done[name] = asyncio.get_running_loop().create_future()
+        return node
+
+    async def start(self) -> Dict[str, Any]:
+        """Start all services, raising StartupError on critical failure"""
+        self._validate()
+
+        done = {name: self._node(name) for name in self._specs}
+        critical_path = self._critical_closure()
+
+        async def mark_ready_when_critical_done() -> None:
+            await asyncio.gather(
+                *(done[name] for name in critical_path), return_exceptions=True
+            )
+            if not any(name in self.failures for name in critical_path):
+                self.timeline.mark_ready()
+                self.ready.set()
+
+        readiness = asyncio.create_task(mark_ready_when_critical_done())
+        await asyncio.gather(
+            *(self._start_one(spec, done) for spec in self._specs.values())
+        )
+        await readiness
+
+        critical_failures = {
+            name: error
+            for name, error in self.failures.items()
+            if name in critical_path
+        }
+        if critical_failures:
+            raise StartupError(
+                f"Critical services failed to start: {critical_failures}")
+
+        return self.instances
+
+    async def _start_one(
+        self, spec: ServiceSpec, done: Dict[str, asyncio.Future]
+    ) -> None:
+        try:
+            dependency_ok = all(
+                await asyncio.gather(*(done[dep] for dep in spec.depends_on))
+            )
+            start = self.timeline.offset_ms()
+
+            if not dependency_ok:
+                failed = [dep for dep in spec.depends_on if dep in self.failures]
+                self._fail(spec, start, f"dependencies failed: {failed}", "skipped")
+                done[spec.name].set_result(False)
+                return
+
+            if spec.lazy:
+                self.instances[spec.name] = LazyService(
+                    spec, self.timeline, self._on_started)
+                self._record(spec, "lazy", start)
+                done[spec.name].set_result(True)
+                return
+
+            try:
+                self.instances[spec.name] = await _activate(spec)
+            except Exception as e:
+                self._fail(spec, start, str(e) or type(e).__name__, "failed")
+                done[spec.name].set_result(False)
+                return
+
+            self._record(spec, "started", start)
+            if self._on_started:
+                self._on_started(spec.name, self.instances[spec.name])
+            logger.info(f"✅ {spec.name} initialized")
+            done[spec.name].set_result(True)
+        finally:
+            if not done[spec.name].done():
+                done[spec.name].set_result(False)
+
+    def _record(
+        self,
+        spec: ServiceSpec,
+        status: str,
+        start: float,
+        error: Optional[str] = None,
+    ) -> None:
+        self._status[spec.name] = status
+        self.timeline.record(
+            TimelineEntry(
+                service=spec.name,
+                status=status,
+                start_offset_ms=round(start, 3),
+                duration_ms=round(self.timeline.offset_ms() - start, 3),
+                critical=spec.critical,
+                depends_on=list(spec.depends_on),
+                error=error,
+            )
+        )
+
+    def _fail(
+            self,
+            spec: ServiceSpec,
+            start: float,
+            error: str,
+            status: str) -> None:
+        self.failures[spec.name] = error
+        self._record(spec, status, start, error)
+        log = logger.error if spec.critical else logger.warning
+        log(f"⚠️ {spec.name} initialization failed: {error}")
+
+    def _critical_closure(self) -> Set[str]:
+        """Critical services plus everything they depend on"""
+        closure: Set[str] = set()
+        stack = [name for name, spec in self._specs.items() if spec.critical]
+        while stack:
+            name = stack.pop()
+            if name in closure:
+                continue
+            closure.add(name)
+            stack.extend(self._specs[name].depends_on)
+        return closure
+
+    def _validate(self) -> None:
+        """Reject unknown dependencies and cycles before starting anything"""
+        for spec in self._specs.values():
+            unknown = [d for d in spec.depends_on if d not in self._specs]
+            if unknown:
+                raise ValueError(
+                    f"{spec.name} depends on unknown services: {unknown}")
+
+        visiting: Set[str] = set()
+        visited: Set[str] = set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(
+                    f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self._specs[name].depends_on:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._specs:
+            visit(name, [])
+
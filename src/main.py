@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict, Optional
 
 """
 🚀 AI Teddy Bear - Unified Application Entry Point
@@ -26,6 +26,8 @@ from prometheus_client import Counter, Gauge, Histogram, start_http_server
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from infrastructure.startup_graph import StartupGraph  # noqa: E402
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -58,6 +60,7 @@ ACTIVE_CONNECTIONS = Gauge(
     "app_active_connections", "Active connections", ["server_type"]
 )
 SERVICE_STATUS = Gauge("app_service_status", "Service status", ["service"])
+APP_READY = Gauge("app_ready", "1 once the critical startup path is up")
 
 
 class Container(containers.DeclarativeContainer):
@@ -193,6 +196,13 @@ class Container(containers.DeclarativeContainer):
     metrics_collector = providers.Singleton(
         "infrastructure.metrics.MetricsCollector")
 
+    # ================== STARTUP ==================
+
+    # Bound by Application: ``await service_locator()(name)`` waits for a
+    # service's startup node; ``readiness()()`` is the health payload
+    service_locator = providers.Object(None)
+    readiness = providers.Object(None)
+
 
 class Application:
     """
@@ -204,6 +214,12 @@ class Application:
         self.container = Container()
         self.servers = []
         self.shutdown_event = asyncio.Event()
+        self.startup_graph: Optional[StartupGraph] = None
+        self._startup_task: Optional[asyncio.Task] = None
+
+        # Servers resolve services and readiness through the startup graph
+        self.container.service_locator.override(providers.Object(self.get_service))
+        self.container.readiness.override(providers.Object(self.readiness))
 
         # Load configuration from environment
         self._load_configuration()
@@ -234,6 +250,12 @@ class Application:
                 "graphql_port": 8080,
                 "metrics_port": 9090,
             },
+            "startup": {
+                # Services to activate on first get_service() instead of at
+                # boot, e.g. ["emotion_service"]; empty keeps boot eager
+                "lazy_services": [],
+                "timeline_path": "logs/startup_timeline.json",
+            },
         }
 
         self.container.config.from_dict(config)
@@ -253,32 +275,149 @@ class Application:
     async def startup(self):
         """
         🚀 Application startup sequence
-        1. Health checks
-        2. Database migrations
-        3. Metrics server
-        4. Service initialization
+        1. Metrics server (so readiness is observable from the start)
+        2. Health checks, migrations and services, started concurrently
+           as soon as their declared dependencies are up
         """
         logger.info("🚀 Starting AI Teddy Bear Application...")
 
-        try:
-            # Step 1: Run health checks
-            await self._run_health_checks()
-
-            # Step 2: Run database migrations
-            await self._run_migrations()
+        self._start_metrics_server()
+        self.startup_graph = StartupGraph(on_started=self._bind_service)
+        self._build_startup_graph(self.startup_graph)
 
-            # Step 3: Start metrics server
-            self._start_metrics_server()
+        # Return as soon as the critical path is up; non-critical services
+        # keep starting in the background. Request paths await them through
+        # get_service() and readiness() reports them until they are up
+        self._startup_task = asyncio.create_task(self.startup_graph.start())
+        self._startup_task.add_done_callback(
+            lambda _: self._write_startup_timeline())
+        ready_wait = asyncio.create_task(self.startup_graph.ready.wait())
 
-            # Step 4: Initialize services
-            await self._initialize_services()
+        try:
+            await asyncio.wait(
+                {self._startup_task, ready_wait},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if self._startup_task.done():
+                # Surfaces critical failures
+                self._startup_task.result()
 
+            APP_READY.set(1)
             logger.info("✅ Application startup completed successfully")
 
         except Exception as e:
             logger.error("❌ Application startup failed", error=str(e))
             raise
 
+        finally:
+            ready_wait.cancel()
+
+    def is_ready(self) -> bool:
+        """Readiness probe: True once the critical startup path is up"""
+        return bool(self.startup_graph and self.startup_graph.is_ready)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Health endpoint payload: overall readiness and per-service state"""
+        services = self.startup_graph.status() if self.startup_graph else {}
+        return {"ready": self.is_ready(), "services": services}
+
+    async def get_service(self, name: str) -> Any:
+        """Service by name for request paths.
+
+        Services in the startup graph are awaited until their node is done
+        (lazy ones are activated on first use), so callers never get an
+        uninitialized instance; ServiceUnavailableError if it failed.
+        """
+        if self.startup_graph and name in self.startup_graph.status():
+            return await self.startup_graph.wait_for(name)
+        return getattr(self.container, name)()
+
+    def _bind_service(self, name: str, instance: Any) -> None:
+        """Point the container at the instance the startup graph brought up.
+
+        ai/speech/emotion services are Factory providers; without this,
+        consumers resolving them from the container would get a fresh,
+        uninitialized instance.
+        """
+        provider = getattr(self.container, name, None)
+        if isinstance(provider, providers.Provider):
+            provider.override(providers.Object(instance))
+        SERVICE_STATUS.labels(service=name).set(1)
+
+    def _build_startup_graph(self, graph: StartupGraph) -> None:
+        """Declare services and their startup dependencies"""
+        lazy = set(self.container.config()["startup"]["lazy_services"])
+
+        graph.add("health_checks", self._run_health_checks, critical=True)
+        graph.add(
+            "migrations",
+            self._run_migrations,
+            depends_on=["health_checks"],
+            critical=True,
+        )
+
+        # Enhanced Components - 2025 Edition (constructed only, as before)
+        graph.add(
+            "enhanced_audio_processor",
+            self.container.enhanced_audio_processor,
+            lazy="enhanced_audio_processor" in lazy,
+            initialize=False,
+        )
+        graph.add(
+            "advanced_ai_orchestrator",
+            self.container.advanced_ai_orchestrator,
+            initialize=False,
+        )
+        graph.add(
+            "advanced_content_filter",
+            self.container.advanced_content_filter,
+            initialize=False,
+        )
+
+        # AI services
+        graph.add(
+            "ai_service",
+            self.container.ai_service,
+            depends_on=["health_checks"],
+            lazy="ai_service" in lazy,
+        )
+        graph.add(
+            "speech_service",
+            self.container.speech_service,
+            depends_on=["health_checks"],
+            lazy="speech_service" in lazy,
+        )
+        graph.add(
+            "emotion_service",
+            self.container.emotion_service,
+            depends_on=["health_checks"],
+            lazy="emotion_service" in lazy,
+        )
+
+        # Command/query buses
+        graph.add("command_bus", self.container.command_bus, depends_on=["migrations"])
+        graph.add("query_bus", self.container.query_bus, depends_on=["migrations"])
+
+        # Not ready until each service's node has started it
+        for name in graph.status():
+            SERVICE_STATUS.labels(service=name).set(0)
+
+    def _write_startup_timeline(self) -> None:
+        """Persist the startup timeline trace for this boot"""
+        if not self.startup_graph:
+            return
+
+        timeline_path = Path(self.container.config()["startup"]["timeline_path"])
+        try:
+            self.startup_graph.timeline.write(timeline_path)
+            logger.info(
+                "🕒 Startup timeline written",
+                path=str(timeline_path),
+                ready_after_ms=self.startup_graph.timeline.ready_offset_ms,
+            )
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write startup timeline: {e}")
+
     async def _run_health_checks(self):
         """Run comprehensive health checks"""
         logger.info("🏥 Running health checks...")
@@ -327,64 +466,6 @@ class Application:
         start_http_server(metrics_port)
         logger.info("✅ Metrics server started")
 
-    async def _initialize_services(self):
-        """Initialize all application services"""
-        logger.info("⚙️ Initializing services...")
-
-        # Initialize Enhanced Components - 2025 Edition
-        try:
-            self.container.enhanced_audio_processor()
-            logger.info("✅ Enhanced Audio Processor initialized")
-
-            self.container.advanced_ai_orchestrator()
-            logger.info("✅ Advanced AI Orchestrator initialized")
-
-            self.container.advanced_content_filter()
-            logger.info("✅ Advanced Content Filter initialized")
-
-        except Exception as e:
-            logger.warning(
-                f"⚠️ Enhanced components initialization failed: {e}")
-            logger.info("🔄 Falling back to basic components")
-
-        # Initialize AI services
-        try:
-            ai_service = self.container.ai_service()
-            await ai_service.initialize()
-            logger.info("✅ AI Service initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ AI service initialization failed: {e}")
-
-        # Initialize speech service
-        try:
-            speech_service = self.container.speech_service()
-            await speech_service.initialize()
-            logger.info("✅ Speech Service initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Speech service initialization failed: {e}")
-
-        # Initialize emotion service
-        try:
-            emotion_service = self.container.emotion_service()
-            await emotion_service.initialize()
-            logger.info("✅ Emotion Service initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Emotion service initialization failed: {e}")
-
-        # Initialize command/query buses
-        try:
-            command_bus = self.container.command_bus()
-            await command_bus.initialize()
-
-            query_bus = self.container.query_bus()
-            await query_bus.initialize()
-
-            logger.info("✅ Command/Query buses initialized")
-        except Exception as e:
-            logger.warning(f"⚠️ Buses initialization failed: {e}")
-
-        logger.info("✅ All services initialized with Enhanced 2025 Components")
-
     async def run(self):
         """
         🏃 Main application run loop
@@ -500,6 +581,10 @@ class Application:
         🛑 Graceful application shutdown
         """
         logger.info("🛑 Starting graceful shutdown...")
+        APP_READY.set(0)
+
+        if self._startup_task and not self._startup_task.done():
+            self._startup_task.cancel()
 
         try:
             # Cleanup Enhanced Components - 2025 Edition
@@ -5,22 +5,42 @@
 # Date: January 2025
 # ===================================================================
 
-from .child_interaction_pipeline import (
-    ChildSafetyChecker,
-    SafetyResult,
-    child_interaction_pipeline,
-    deploy_child_interaction_pipeline,
-    generate_safe_response,
-    preprocess_child_audio,
+from .audio_filters import (
+    age_band_profile,
+    bandpass,
+    enhance_batch,
+    estimate_snr_db,
+    spectral_gate,
 )
 
 __all__ = [
-    "child_interaction_pipeline",
-    "deploy_child_interaction_pipeline",
-    "preprocess_child_audio",
-    "generate_safe_response",
-    "ChildSafetyChecker",
-    "SafetyResult",
+    "age_band_profile",
+    "bandpass",
+    "enhance_batch",
+    "estimate_snr_db",
+    "spectral_gate",
 ]
 
+# The pipeline definitions need the Kubeflow SDK; audio filters do not
+try:
+    from .child_interaction_pipeline import (
+        ChildSafetyChecker,
+        SafetyResult,
+        child_interaction_pipeline,
+        deploy_child_interaction_pipeline,
+        generate_safe_response,
+        preprocess_child_audio,
+    )
+
+    __all__ += [
+        "child_interaction_pipeline",
+        "deploy_child_interaction_pipeline",
+        "preprocess_child_audio",
+        "generate_safe_response",
+        "ChildSafetyChecker",
+        "SafetyResult",
+    ]
+except ImportError:
+    pass
+
 __version__ = "1.0.0"
@@ -0,0 +1,253 @@
+# ===================================================================
+# 🎵 AI Teddy Bear - Age-Band Audio Filtering
+# Vectorized band-pass filter bank and spectral-gating noise reduction
+# ===================================================================
+"""
+فلاتر صوتية مخصصة حسب عمر الطفل
+
+Band-pass designs are second-order sections cached per
+(sample_rate, band, order) and applied zero-phase to a whole batch of clips
+at once with ``scipy.signal.sosfiltfilt``. Noise reduction is spectral
+gating on overlapping STFT frames: a per-clip noise profile is estimated per
+frequency bin from the quietest frames and bins that do not rise above it
+are attenuated, instead of clamping samples.
+
+All functions accept NumPy arrays or torch tensors shaped
+``(..., samples)`` and return the same type.
+"""
+
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import signal
+from scipy.ndimage import uniform_filter
+
+logger = logging.getLogger(__name__)
+
+# (low_hz, high_hz) voice band and noise reduction strength per age group
+AGE_BAND_PROFILES: Dict[str, Dict[str, Any]] = {
+    "toddler": {"band": (300.0, 3000.0), "noise_reduction": 0.8},  # ≤ 4
+    "child": {"band": (200.0, 4000.0), "noise_reduction": 0.6},  # 5-8
+    "general": {"band": (100.0, 8000.0), "noise_reduction": 0.4},  # 9+
+}
+
+
+def age_band_profile(child_age: int) -> Dict[str, Any]:
+    """إعدادات الفلترة المناسبة لعمر الطفل"""
+    if child_age <= 4:
+        return AGE_BAND_PROFILES["toddler"]
+    if child_age <= 8:
+        return AGE_BAND_PROFILES["child"]
+    return AGE_BAND_PROFILES["general"]
+
+
+# ---------------------------------------------------------------
+# NumPy / torch interop
+# ---------------------------------------------------------------
+
+def _to_numpy(
+    waveform: Any, dtype: Any = np.float64
+) -> Tuple[np.ndarray, Optional[Any]]:
+    """Float array view of the input and the tensor to restore type from."""
+    if hasattr(waveform, "detach") and hasattr(waveform, "cpu"):
+        return waveform.detach().cpu().numpy().astype(dtype), waveform
+    return np.asarray(waveform, dtype=dtype), None
+
+
+def _restore(result: np.ndarray, like: Optional[Any], dtype: Any) -> Any:
+    if like is not None:
+        import torch
+
+        return torch.from_numpy(np.ascontiguousarray(result)).to(
+            dtype=like.dtype, device=like.device)
+    return result.astype(dtype, copy=False)
+
+
+# ---------------------------------------------------------------
+# Band-pass filter bank
+# ---------------------------------------------------------------
+
+@lru_cache(maxsize=64)
+def design_bandpass(
+    sample_rate: int, low_freq: float, high_freq: float, order: int = 4
+) -> Optional[np.ndarray]:
+    """Cached Butterworth band-pass in SOS form (None if the band is empty)."""
+    nyquist = sample_rate / 2.0
+    high = min(high_freq, nyquist * 0.99)
+    if low_freq <= 0 or low_freq >= high:
+        return None
+    return signal.butter(
+        order, [low_freq, high], btype="bandpass", fs=sample_rate, output="sos")
+
+
+def bandpass(
+    waveform: Any, sample_rate: int, low_freq: float, high_freq: float,
+    order: int = 4,
+) -> Any:
+    """Zero-phase band-pass over the last axis of a clip or batch of clips."""
+    sos = design_bandpass(int(sample_rate), float(low_freq), float(high_freq), order)
+    if sos is None:
+        return waveform
+
+    data, like = _to_numpy(waveform)
+    samples = data.shape[-1]
+    if samples < 2:
+        return waveform
+
+    # Default pad length of sosfiltfilt, shortened for very short clips
+    padlen = min(3 * (2 * len(sos) + 1), samples - 1)
+    filtered = signal.sosfiltfilt(sos, data, axis=-1, padlen=padlen)
+    return _restore(filtered, like, getattr(waveform, "dtype", np.float32))
+
+
+# ---------------------------------------------------------------
+# Spectral gating
+# ---------------------------------------------------------------
+
+def spectral_gate(
+    waveform: Any,
+    sample_rate: int,
+    strength: float = 0.6,
+    n_fft: int = 512,
+    hop_length: int = 128,
+    noise_percentile: float = 20.0,
+    n_std: float = 1.5,
+) -> Any:
+    """تقليل الضوضاء بالبوابة الطيفية
+
+    The quietest ``noise_percentile`` % of each clip's frames give a noise
+    profile (mean and spread of every frequency bin in dB); bins that do not
+    rise ``n_std`` deviations above it are attenuated by ``strength``
+    (0 = off, 1 = fully removed). The gain mask is smoothed over time and
+    frequency to avoid musical noise.
+    """
+    strength = float(np.clip(strength, 0.0, 1.0))
+    # Single precision is plenty for a gain mask and halves memory traffic
+    data, like = _to_numpy(waveform, np.float32)
+    samples = data.shape[-1]
+    if strength == 0.0 or samples < n_fft:
+        return waveform
+
+    _, _, spectrum = signal.stft(
+        data, fs=sample_rate, nperseg=n_fft, noverlap=n_fft - hop_length,
+        axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    power_db = 10.0 * np.log10(power + np.float32(1e-12))  # (..., freqs, frames)
+
+    # Noise frames: lowest-energy frames of each clip
+    frame_energy = power_db.mean(axis=-2, keepdims=True)
+    cutoff = np.percentile(frame_energy, noise_percentile, axis=-1, keepdims=True)
+    noise_frames = (frame_energy <= cutoff).astype(np.float32)
+    noise_count = noise_frames.sum(axis=-1, keepdims=True)
+    noise_mean = (power_db * noise_frames).sum(axis=-1, keepdims=True) / noise_count
+    noise_std = np.sqrt(
+        (((power_db - noise_mean) ** 2) * noise_frames).sum(axis=-1, keepdims=True)
+        / noise_count)
+
+    mask = (power_db > noise_mean + n_std * noise_std).astype(np.float32)
+    size = [1] * (mask.ndim - 2) + [3, 3]
+    mask = uniform_filter(mask, size=size, mode="nearest")
+
+    gain = np.float32(1.0 - strength) + np.float32(strength) * mask
+    _, gated = signal.istft(
+        spectrum * gain, fs=sample_rate, nperseg=n_fft,
+        noverlap=n_fft - hop_length, time_axis=-1, freq_axis=-2)
+
+    gated = gated[..., :samples]
+    if gated.shape[-1] < samples:
+        pad = [(0, 0)] * (gated.ndim - 1) + [(0, samples - gated.shape[-1])]
+        gated = np.pad(gated, pad)
+    return _restore(gated, like, getattr(waveform, "dtype", np.float32))
+
+
+# ---------------------------------------------------------------
+# Quality check
+# ---------------------------------------------------------------
+
+def estimate_snr_db(
+    waveform: Any, sample_rate: int, frame_ms: float = 20.0
+) -> np.ndarray:
+    """Rough per-clip SNR: loud-frame energy (90th pct) vs. quiet (10th pct)."""
+    data, _ = _to_numpy(waveform)
+    frame = max(int(sample_rate * frame_ms / 1000), 1)
+    frames = data.shape[-1] // frame
+    if frames < 2:
+        return np.zeros(data.shape[:-1])
+
+    energy = np.mean(
+        data[..., :frames * frame].reshape(*data.shape[:-1], frames, frame) ** 2,
+        axis=-1) + 1e-12
+    loud = np.percentile(energy, 90, axis=-1)
+    quiet = np.percentile(energy, 10, axis=-1)
+    return 10.0 * np.log10(loud / quiet)
+
+
+# ---------------------------------------------------------------
+# Batch processing
+# ---------------------------------------------------------------
+
+def enhance_batch(
+    clips: Sequence[Any],
+    sample_rate: int,
+    child_age: int,
+    noise_reduction: Optional[float] = None,
+    max_batch: int = 8,
+) -> List[np.ndarray]:
+    """Band-pass, spectral gate and peak-normalize many mono clips at once.
+
+    Clips of equal length are processed together in matrices of up to
+    ``max_batch`` rows (larger matrices spill out of CPU cache). Clips of
+    different lengths are not padded together, since silent padding would
+    bias the per-clip noise profile.
+    """
+    profile = age_band_profile(child_age)
+    low_freq, high_freq = profile["band"]
+    strength = profile["noise_reduction"] if noise_reduction is None else noise_reduction
+
+    arrays = [_to_numpy(clip)[0].reshape(-1) for clip in clips]
+    by_length: Dict[int, List[int]] = {}
+    for index, array in enumerate(arrays):
+        by_length.setdefault(len(array), []).append(index)
+
+    enhanced: List[Optional[np.ndarray]] = [None] * len(arrays)
+    groups = [
+        indices[start:start + max_batch]
+        for indices in by_length.values()
+        for start in range(0, len(indices), max_batch)
+    ]
+    for indices in groups:
+        batch = np.stack([arrays[index] for index in indices])
+        batch = bandpass(batch, sample_rate, low_freq, high_freq)
+        batch = spectral_gate(batch, sample_rate, strength)
+
+        peaks = np.max(np.abs(batch), axis=-1, keepdims=True) if batch.size else 0
+        batch = np.divide(batch * 0.9, peaks, out=batch, where=peaks > 0)
+        for row, index in enumerate(indices):
+            enhanced[index] = batch[row]
+    return enhanced
+
+
+def measure_throughput(
+    clips: Sequence[Any], sample_rate: int, child_age: int = 6, repeats: int = 3
+) -> Dict[str, float]:
+    """Clips/sec (single process) and SNR change for a preprocessing job."""
+    best = float("inf")
+    enhanced: List[np.ndarray] = []
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        enhanced = enhance_batch(clips, sample_rate, child_age)
+        best = min(best, time.perf_counter() - start)
+
+    def mean_snr(batch):
+        return float(np.mean([estimate_snr_db(clip, sample_rate) for clip in batch]))
+
+    return {
+        "clips": len(clips),
+        "seconds": best,
+        "clips_per_second_per_core": len(clips) / best if best > 0 else 0.0,
+        "snr_before_db": mean_snr(clips),
+        "snr_after_db": mean_snr(enhanced),
+    }
@@ -7,6 +7,8 @@ import logging
 import json
 from typing import Any, Dict, List, Optional
 
+from .audio_filters import bandpass, estimate_snr_db, spectral_gate
+
 # ===================================================================
 # 🤖 AI Teddy Bear - Advanced Child Interaction Pipeline
 # Enterprise-Grade AI Pipeline with Child Safety Focus
@@ -68,7 +70,7 @@ def preprocess_child_audio(
             noise_reduction_factor = 0.4
 
         # تقليل الضوضاء وتطبيع الصوت
-        waveform = reduce_noise(waveform, noise_reduction_factor)
+        waveform = reduce_noise(waveform, noise_reduction_factor, sample_rate)
         waveform = normalize_audio(waveform)
 
         # حفظ النتيجة المعالجة
@@ -82,7 +84,8 @@ def preprocess_child_audio(
             "child_age": child_age,
             "enhancement_applied": enhancement_level,
             "processing_timestamp": datetime.now().isoformat(),
-            "quality_score": calculate_audio_quality(waveform, sample_rate)
+            "quality_score": calculate_audio_quality(waveform, sample_rate),
+            "estimated_snr_db": float(estimate_snr_db(waveform, sample_rate).mean())
         }
 
         with open(audio_metadata.path, 'w') as f:
@@ -649,18 +652,13 @@ def apply_general_enhancement(waveform, sr) -> Any:
 
 
 def apply_frequency_filter(waveform, sr, low_freq, high_freq) -> Any:
-    """تطبيق فلتر ترددي"""
-    import torch
+    """تطبيق فلتر ترددي (band-pass بدون إزاحة طور)"""
+    return bandpass(waveform, sr, low_freq, high_freq)
 
-    # تطبيق فلتر بسيط
-    return waveform
 
-
-def reduce_noise(waveform, factor) -> Any:
-    """تقليل الضوضاء"""
-    import torch
-    noise_profile = torch.std(waveform) * factor
-    return torch.clamp(waveform, -noise_profile, noise_profile)
+def reduce_noise(waveform, factor, sr=16000) -> Any:
+    """تقليل الضوضاء بالبوابة الطيفية"""
+    return spectral_gate(waveform, sr, strength=factor)
 
 
 def normalize_audio(waveform) -> Any:
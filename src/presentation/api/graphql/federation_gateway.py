@@ -34,6 +34,8 @@ from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from src.infrastructure.security.rate_limiter import RateLimiter
+
 # Caching and performance
 try:
     from core.infrastructure.caching import ContentType, MultiLayerCache
@@ -69,6 +71,7 @@ class FederationConfig:
     enable_rate_limiting: bool = True
     rate_limit_requests: int = 100
     rate_limit_window: int = 60
+    rate_limit_burst: Optional[int] = None
     cors_origins: List[str] = None
 
 
@@ -411,7 +414,7 @@ SAFETY_SERVICE_SCHEMA = """
 class GraphQLFederationGateway:
     """GraphQL Federation Gateway for microservices architecture."""
 
-    def __init__(self, config: FederationConfig):
+    def __init__(self, config: FederationConfig, rate_limiter: Optional[RateLimiter] = None):
         self.config = config
         self.services: Dict[str, ServiceConfig] = {
             service.name: service for service in config.services
@@ -423,6 +426,13 @@ class GraphQLFederationGateway:
         # Security
         self.security = HTTPBearer() if config.enable_authentication else None
 
+        # Shared token-bucket limiter (pass one built with a Redis client to
+        # enforce the limit across gateway workers)
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=config.rate_limit_requests * 60 / config.rate_limit_window,
+            burst_size=config.rate_limit_burst or max(1, config.rate_limit_requests // 10),
+        )
+
         # Performance metrics
         self.metrics = {
             "requests_total": 0,
@@ -493,30 +503,7 @@ class GraphQLFederationGateway:
         if self.config.enable_rate_limiting:
             @app.middleware("http")
             async def rate_limit_middleware(request: Request, call_next):
-                # Simple rate limiting implementation
-                client_ip = request.client.host
-
-                # Get current request count for IP
-                cache_key = f"rate_limit:{client_ip}"
-                if self.cache:
-                    current_requests = await self.cache.get_with_fallback(
-                        cache_key, ContentType.CONFIGURATION
-                    ) or 0
-
-                    if current_requests >= self.config.rate_limit_requests:
-                        raise HTTPException(
-                            status_code=429,
-                            detail="Rate limit exceeded"
-                        )
-
-                    # Increment counter
-                    await self.cache.set_multi_layer(
-                        cache_key,
-                        current_requests + 1,
-                        ContentType.CONFIGURATION
-                    )
-
-                return await call_next(request)
+                return await self.rate_limiter(request, call_next)
 
         # GraphQL endpoint
         @app.post("/graphql")
@@ -0,0 +1,81 @@
+"""
+Benchmark: audio clips through L2 Redis vs. the L4 blob store.
+
+The Redis path pickles (and possibly compresses) the whole clip; the blob
+store path writes the clip once to disk and keeps only a pointer in Redis.
+Redis is the in-process mock here, so network transfer of large values -
+the main cost the blob store removes - is not included.
+"""
+
+import logging
+import os
+import time
+
+import pytest
+
+try:
+    from src.infrastructure.caching.layers.l2_redis_cache import L2RedisCache
+    from src.infrastructure.caching.layers.l4_blob_store import (
+        ContentAddressedBlobStore,
+    )
+    from src.infrastructure.caching.mocks import MockRedisClient
+    from src.infrastructure.caching.models import CacheConfig
+
+    BLOB_STORE_AVAILABLE = True
+except ImportError:
+    BLOB_STORE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CLIP_SIZES_KB = [50, 100, 250, 500]
+ITERATIONS = 20
+
+
+async def _redis_path(cache, clips):
+    start = time.perf_counter()
+    for i, clip in enumerate(clips):
+        await cache.set(f"audio:{i}", clip, 3600)
+    for i in range(len(clips)):
+        assert await cache.get(f"audio:{i}") is not None
+    return time.perf_counter() - start
+
+
+async def _blob_path(cache, store, clips):
+    start = time.perf_counter()
+    for i, clip in enumerate(clips):
+        await cache.set(f"audio:{i}", await store.put(clip), 3600)
+    for i in range(len(clips)):
+        pointer = await cache.get(f"audio:{i}")
+        assert len(await store.get(pointer.digest)) == pointer.size
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.skipif(not BLOB_STORE_AVAILABLE, reason="Blob store not available")
+@pytest.mark.parametrize("size_kb", CLIP_SIZES_KB)
+async def test_blob_store_vs_redis_audio_path(tmp_path, size_kb):
+    clips = [os.urandom(size_kb * 1024) for _ in range(ITERATIONS)]
+
+    redis_cache = L2RedisCache(CacheConfig())
+    redis_cache.redis_client = MockRedisClient()
+    redis_seconds = await _redis_path(redis_cache, clips)
+
+    pointer_cache = L2RedisCache(CacheConfig())
+    pointer_cache.redis_client = MockRedisClient()
+    store = ContentAddressedBlobStore(str(tmp_path), max_bytes=1024 ** 3)
+    try:
+        blob_seconds = await _blob_path(pointer_cache, store, clips)
+    finally:
+        await store.close()
+
+    redis_bytes = sum(len(v) for v in redis_cache.redis_client.storage.values())
+    pointer_bytes = sum(len(v) for v in pointer_cache.redis_client.storage.values())
+
+    logger.info(
+        f"{size_kb} KB x {ITERATIONS}: redis {redis_seconds * 1000:.1f} ms "
+        f"({redis_bytes} bytes in Redis), blob store {blob_seconds * 1000:.1f} ms "
+        f"({pointer_bytes} bytes in Redis)")
+
+    # Redis keeps only pointers
+    assert pointer_bytes < redis_bytes / 100
@@ -0,0 +1,69 @@
+"""
+Benchmark: encrypted emotion scoring, one ciphertext per child vs. packed.
+
+The per-child path encrypts each feature vector as its own CKKS vector
+and runs ``dot`` + ``square`` on it, as ``EmotionProcessor`` does. The
+packed path scores up to ``slot_count / 16`` children per ciphertext with
+rotation-based diagonals. Set ``HE_BENCH_CHILDREN`` to change the batch
+size and ``HE_BENCH_WORKERS`` for the process pool size.
+"""
+
+import logging
+import os
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from src.infrastructure.security.he_batching import (
+        TENSEAL_AVAILABLE,
+        PackedEmotionBatcher,
+        ts,
+    )
+except ImportError:
+    TENSEAL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHILDREN = int(os.getenv("HE_BENCH_CHILDREN", "2048"))
+WORKERS = int(os.getenv("HE_BENCH_WORKERS", "2"))
+PER_CHILD_SAMPLE = 50
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not TENSEAL_AVAILABLE, reason="TenSEAL not available")
+def test_packed_vs_per_child_throughput():
+    context = ts.context(ts.SCHEME_TYPE.CKKS, poly_modulus_degree=8192,
+                         coeff_mod_bit_sizes=[60, 40, 40, 60])
+    context.global_scale = 2**40
+    context.generate_galois_keys()
+    context.generate_relin_keys()
+    rng = np.random.default_rng(0)
+    features, weights = rng.random((CHILDREN, 5)), rng.random((5, 5))
+
+    start = time.perf_counter()
+    for row in features[:PER_CHILD_SAMPLE]:
+        vector = ts.ckks_vector(context, row.tolist())
+        for emotion in weights:
+            vector.dot(ts.ckks_vector(context, emotion.tolist())).square()
+    per_child_rate = PER_CHILD_SAMPLE / (time.perf_counter() - start)
+
+    batcher = PackedEmotionBatcher(context, 5, 5, max_workers=WORKERS)
+    try:
+        batcher.process(features[:1], weights)  # warm up
+        batcher.process(features, weights)
+        stats = batcher.last_stats
+    finally:
+        batcher.close()
+
+    logger.info(
+        f"{CHILDREN} children: {per_child_rate:.0f} children/s per-child ciphertexts, "
+        f"{stats.children_per_second:.0f} children/s packed "
+        f"({stats.children_per_second / per_child_rate:.1f}x, "
+        f"{stats.ciphertexts_per_second:.1f} ciphertexts/s, "
+        f"{stats.slot_utilization:.1%} slot utilization vs "
+        f"{5 / 4096:.2%} per child, {WORKERS} workers)")
+
+    assert stats.children == CHILDREN
+    assert stats.children_per_second > per_child_rate
@@ -0,0 +1,54 @@
+"""
+Benchmark: top-k search over one child's index at its 100k-vector capacity.
+"""
+
+import logging
+import time
+
+import pytest
+
+try:
+    import numpy as np
+
+    from src.infrastructure.memory.memory_vector_index import (
+        DEFAULT_MAX_MEMORIES_PER_CHILD,
+        ChildVectorIndex,
+    )
+
+    INDEX_AVAILABLE = True
+except ImportError:
+    INDEX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+VECTORS = 100_000
+DIMENSION = 256
+QUERIES = 50
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not INDEX_AVAILABLE, reason="Memory vector index not available")
+def test_search_at_100k_vectors():
+    assert DEFAULT_MAX_MEMORIES_PER_CHILD >= VECTORS
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((VECTORS, DIMENSION)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = ChildVectorIndex(DIMENSION)
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        index.add(f"m{i}", vector)
+    add_seconds = time.perf_counter() - start
+    assert len(index) == VECTORS
+
+    start = time.perf_counter()
+    for q in range(QUERIES):
+        results = index.search(vectors[q * 1000], k=5)
+        assert results[0][0] == f"m{q * 1000}"
+    search_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+    logger.info(
+        "100k vectors: add %.2fs, search %.2fms/query", add_seconds, search_ms
+    )
+    assert search_ms < 100
@@ -0,0 +1,78 @@
+"""
+Benchmark: saving one child's update with 100k children on disk.
+
+The legacy path rewrote three whole JSON files (``indent=2``) per save; the
+SQLite store upserts only the changed child's rows in a group commit.
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict
+
+import pytest
+
+try:
+    from src.application.services.personalization.data_models import (
+        ChildPersonality,
+        InteractionPattern,
+    )
+    from src.application.services.personalization.personalization_data_manager import (
+        PersonalizationDataManager,
+    )
+
+    DATA_MANAGER_AVAILABLE = True
+except ImportError:
+    DATA_MANAGER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHILDREN = 100_000
+UPDATES = 200
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not DATA_MANAGER_AVAILABLE, reason="Data manager not available")
+def test_per_child_save_vs_full_json_rewrite(tmp_path):
+    personalities = {
+        f"child-{i}": ChildPersonality(child_id=f"child-{i}") for i in range(CHILDREN)
+    }
+    patterns = {
+        f"child-{i}": InteractionPattern(child_id=f"child-{i}") for i in range(CHILDREN)
+    }
+
+    # Legacy: one save = full rewrite of the JSON files
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    start = time.perf_counter()
+    for name, records in (("personalities", personalities),
+                          ("interaction_patterns", patterns)):
+        with open(legacy_dir / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump({k: asdict(v) for k, v in records.items()}, f,
+                      indent=2, ensure_ascii=False)
+    legacy_save_seconds = time.perf_counter() - start
+
+    manager = PersonalizationDataManager(str(tmp_path / "sqlite"))
+    start = time.perf_counter()
+    manager.save_all_data(personalities, patterns, {})
+    bulk_load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(UPDATES):
+        child_id = f"child-{i * 37 % CHILDREN}"
+        manager.mark_dirty(child_id, personalities[child_id], patterns[child_id])
+    manager.commit()
+    per_update_ms = (time.perf_counter() - start) * 1000 / UPDATES
+
+    start = time.perf_counter()
+    record = manager.load_child("child-4242")
+    lazy_load_ms = (time.perf_counter() - start) * 1000
+    manager.close()
+
+    logger.info(
+        f"{CHILDREN} children: legacy full save {legacy_save_seconds * 1000:.0f} ms, "
+        f"sqlite initial bulk write {bulk_load_seconds * 1000:.0f} ms, "
+        f"per-child update {per_update_ms:.3f} ms, lazy child load {lazy_load_ms:.3f} ms")
+
+    assert record["personality"]["child_id"] == "child-4242"
+    assert per_update_ms * 100 < legacy_save_seconds * 1000
@@ -0,0 +1,85 @@
+"""
+Benchmark: SQLite rows/sec, bulk loader vs. the per-row path.
+
+The per-row path executes one INSERT and one commit per row, as
+``BaseSQLiteRepository.create`` does; it is timed on at most
+``ROW_PATH_SAMPLE`` rows and reported as a rate. The bulk path loads the
+full row count with chunked ``executemany`` in one transaction. Set
+``SQLITE_BENCH_ROWS`` (comma separated) to change the load sizes.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+
+import pytest
+
+try:
+    from src.infrastructure.persistence.sqlite.sqlite_bulk_ingest import (
+        BulkLoadOptions,
+        SQLiteBulkLoader,
+    )
+
+    BULK_INGEST_AVAILABLE = True
+except ImportError:
+    BULK_INGEST_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ROW_COUNTS = [
+    int(n) for n in os.getenv("SQLITE_BENCH_ROWS", "10000,100000,1000000").split(",")
+]
+ROW_PATH_SAMPLE = 2000
+
+SCHEMA = (
+    "CREATE TABLE messages (id TEXT PRIMARY KEY, conversation_id TEXT, "
+    "role TEXT, content TEXT, sequence_number INTEGER, timestamp TEXT)"
+)
+INDEX = "CREATE INDEX idx_messages_conversation_seq ON messages(conversation_id, sequence_number)"
+
+
+def _connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute(SCHEMA)
+    connection.execute(INDEX)
+    connection.commit()
+    return connection
+
+
+def _rows(count):
+    for i in range(count):
+        yield (f"msg-{i:08d}", f"conv-{i % 5000}", "child" if i % 2 else "assistant",
+               "hello teddy, tell me a story", i, "2024-01-01T00:00:00")
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(not BULK_INGEST_AVAILABLE, reason="SQLite bulk ingestion not available")
+@pytest.mark.parametrize("row_count", ROW_COUNTS)
+def test_bulk_ingest_vs_row_path(tmp_path, row_count):
+    connection = _connect(tmp_path / "row.db")
+    sql = "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?)"
+    sample = min(row_count, ROW_PATH_SAMPLE)
+    start = time.perf_counter()
+    for row in _rows(sample):
+        connection.execute(sql, row)
+        connection.commit()
+    row_rate = sample / (time.perf_counter() - start)
+    connection.close()
+
+    connection = _connect(tmp_path / "bulk.db")
+    loader = SQLiteBulkLoader(connection, "messages")
+    columns = ["id", "conversation_id", "role", "content", "sequence_number", "timestamp"]
+    stats = loader.load(_rows(row_count), columns=columns,
+                        options=BulkLoadOptions(defer_indexes=row_count >= 100_000))
+    connection.close()
+
+    logger.info(
+        f"{row_count} rows: {row_rate:.0f} rows/s per-row commits, "
+        f"{stats.rows_per_second:.0f} rows/s bulk "
+        f"({stats.rows_per_second / row_rate:.1f}x, {stats.seconds:.2f}s, "
+        f"{stats.indexes_rebuilt} indexes rebuilt)")
+
+    assert stats.rows == row_count
+    assert stats.rows_per_second > row_rate
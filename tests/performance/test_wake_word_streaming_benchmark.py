@@ -0,0 +1,100 @@
+"""
+Benchmark: real-time factor of streaming wake word detection on CPU.
+
+Simulates 1, 10 and 100 devices each streaming ``AUDIO_SECONDS`` of audio
+in 100 ms hops, all fed concurrently. The model is a small dense layer
+over the log-mel window, scored in batches on the inference thread. The
+real-time factor is wall time divided by the audio duration of one
+stream, so RTF < 1 means all streams keep up with real time. For
+comparison, the old per-call path (log-mel over the full last second on
+every hop, one inference per call) is timed on a single stream.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from src.adapters.edge.streaming_wake_word import (
+        FEATURES,
+        LogMelFrontend,
+        StreamingWakeWordConfig,
+        StreamingWakeWordDetector,
+    )
+
+    STREAMING_WAKE_WORD_AVAILABLE = True
+except ImportError:
+    STREAMING_WAKE_WORD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STREAM_COUNTS = [int(n) for n in os.getenv("WAKE_WORD_BENCH_STREAMS", "1,10,100").split(",")]
+AUDIO_SECONDS = float(os.getenv("WAKE_WORD_BENCH_SECONDS", "5"))
+
+
+if STREAMING_WAKE_WORD_AVAILABLE:
+
+    class DenseScorer:
+        """Logistic layer over the flattened log-mel window"""
+
+        input_kind = FEATURES
+
+        def __init__(self, config):
+            rng = np.random.default_rng(0)
+            self.weights = rng.standard_normal(
+                (config.frames_per_window * config.n_mels, 64)).astype(np.float32) * 0.01
+            self.head = rng.standard_normal(64).astype(np.float32)
+
+        def score_batch(self, windows):
+            hidden = np.maximum(windows.reshape(len(windows), -1) @ self.weights, 0)
+            return 1 / (1 + np.exp(-(hidden @ self.head)))
+
+
+def _per_call_rtf(config, scorer, audio):
+    hop, window = config.hop_samples, config.window_samples
+    start = time.perf_counter()
+    for end in range(hop, len(audio) + 1, hop):
+        features = LogMelFrontend(config).frames_for(audio[max(0, end - window):end])
+        padded = np.full((config.frames_per_window, config.n_mels), np.log(1e-6), np.float32)
+        padded[-len(features):] = features
+        scorer.score_batch(padded[None])
+    return (time.perf_counter() - start) / (len(audio) / config.sample_rate)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+@pytest.mark.skipif(not STREAMING_WAKE_WORD_AVAILABLE,
+                    reason="Streaming wake word detection not available")
+@pytest.mark.parametrize("streams", STREAM_COUNTS)
+async def test_streaming_real_time_factor(streams):
+    config = StreamingWakeWordConfig()
+    scorer = DenseScorer(config)
+    samples = int(AUDIO_SECONDS * config.sample_rate)
+    audio = (np.random.default_rng(1).standard_normal(samples) * 0.05).astype(np.float32)
+    hops = [audio[i:i + config.hop_samples] for i in range(0, samples, config.hop_samples)]
+
+    detector = StreamingWakeWordDetector(scorer, config)
+    try:
+        start = time.perf_counter()
+        for hop in hops:
+            await asyncio.gather(*[detector.feed(f"teddy-{i}", hop) for i in range(streams)])
+        elapsed = time.perf_counter() - start
+    finally:
+        detector.close()
+
+    stats = detector.get_stats()
+    rtf = elapsed / AUDIO_SECONDS
+    per_call = _per_call_rtf(config, scorer, audio) if streams == 1 else None
+    logger.info(
+        f"{streams} streams x {AUDIO_SECONDS:.0f}s: RTF {rtf:.3f} "
+        f"({rtf / streams:.4f} per stream), avg batch {stats['average_batch_size']:.1f}, "
+        f"inference {stats['inference_seconds']:.2f}s"
+        + (f"; per-call path RTF {per_call:.3f}" if per_call is not None else ""))
+
+    assert stats["hops"] == streams * len(hops)
+    if streams > 1:
+        assert stats["average_batch_size"] > 1
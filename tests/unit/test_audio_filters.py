@@ -0,0 +1,90 @@
+"""
+Unit tests for age-band audio filtering and spectral gating.
+"""
+
+import numpy as np
+import pytest
+
+try:
+    from src.ml.pipelines.audio_filters import (
+        bandpass,
+        design_bandpass,
+        enhance_batch,
+        estimate_snr_db,
+        spectral_gate,
+    )
+
+    AUDIO_FILTERS_AVAILABLE = True
+except (ImportError, TypeError):
+    # TypeError: scipy fails to import once conftest has mocked out torch
+    AUDIO_FILTERS_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not AUDIO_FILTERS_AVAILABLE, reason="Audio filters not available"
+)
+
+SR = 16000
+
+
+def tone(freq, seconds=1.0, amplitude=0.5):
+    t = np.arange(int(SR * seconds)) / SR
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+def rms(x):
+    return float(np.sqrt(np.mean(np.square(x))))
+
+
+def test_bandpass_keeps_voice_band_and_removes_rumble_and_hiss():
+    clip = tone(1000) + tone(50) + tone(7000)
+
+    filtered = bandpass(clip, SR, 300, 3000)
+
+    voice = tone(1000)
+    residual = filtered - voice
+    assert rms(residual) < 0.1 * rms(voice)
+    assert filtered.dtype == clip.dtype
+
+
+def test_filter_designs_are_cached():
+    design_bandpass.cache_clear()
+    bandpass(tone(500), SR, 200, 4000)
+    bandpass(tone(700), SR, 200, 4000)
+
+    info = design_bandpass.cache_info()
+    assert info.misses == 1 and info.hits == 1
+    # Band edge above Nyquist is clamped rather than failing
+    assert design_bandpass(8000, 100, 8000) is not None
+
+
+def test_batch_matches_per_clip_filtering():
+    rng = np.random.default_rng(0)
+    batch = rng.normal(size=(6, SR // 2))
+
+    together = bandpass(batch, SR, 200, 4000)
+    separately = np.stack([bandpass(clip, SR, 200, 4000) for clip in batch])
+
+    np.testing.assert_allclose(together, separately, atol=1e-10)
+
+
+def test_spectral_gate_reduces_stationary_noise():
+    rng = np.random.default_rng(1)
+    speech = tone(440) * (np.arange(SR) % (SR // 4) < SR // 8)  # bursts
+    noisy = speech + rng.normal(scale=0.05, size=SR)
+
+    gated = spectral_gate(noisy, SR, strength=0.9)
+
+    assert estimate_snr_db(gated, SR) > estimate_snr_db(noisy, SR) + 6
+    # Speech bursts survive
+    assert np.corrcoef(gated, speech)[0, 1] > 0.9
+    assert gated.shape == noisy.shape
+
+
+def test_enhance_batch_handles_mixed_lengths():
+    rng = np.random.default_rng(2)
+    clips = [rng.normal(size=n) for n in (SR, SR // 2, SR, 100)]
+
+    enhanced = enhance_batch(clips, SR, child_age=3)
+
+    assert [len(c) for c in enhanced] == [len(c) for c in clips]
+    assert all(np.max(np.abs(c)) == pytest.approx(0.9) for c in enhanced)
@@ -0,0 +1,90 @@
+"""
+Unit tests for the streaming audio frame codec.
+"""
+
+import os
+
+import pytest
+
+try:
+    from src.infrastructure.security.audio_encryption import AudioEncryptionManager
+    from src.infrastructure.security.audio_frame_codec import (
+        FRAME_OVERHEAD,
+        AudioFrameDecoder,
+        AudioFrameEncoder,
+        FrameError,
+        ReplayError,
+    )
+
+    FRAME_CODEC_AVAILABLE = True
+except ImportError:
+    FRAME_CODEC_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not FRAME_CODEC_AVAILABLE, reason="Audio frame codec not available"
+)
+
+SESSION_ID = "audio_sess_" + "ab" * 16
+FRAME = bytes(range(256)) * 2 + bytes(128)  # 20 ms of 16 kHz PCM16
+
+
+def _pair(window=64):
+    key = os.urandom(32)
+    return (AudioFrameEncoder(SESSION_ID, key),
+            AudioFrameDecoder(SESSION_ID, key, replay_window=window))
+
+
+def test_round_trip_into_preallocated_buffers():
+    encoder, decoder = _pair()
+    out = bytearray(encoder.frame_size(len(FRAME)) * 2)
+
+    written = encoder.encrypt_frame_into(FRAME, out)
+    second = encoder.encrypt_frame_into(FRAME, out, offset=written)
+    assert written == second == len(FRAME) + FRAME_OVERHEAD
+
+    audio = bytearray(len(FRAME))
+    assert decoder.decrypt_frame_into(out[:written], audio) == (0, len(FRAME))
+    assert bytes(audio) == FRAME
+    assert decoder.decrypt_frame(bytes(out[written:])) == (1, FRAME)
+
+
+def test_out_of_order_accepted_but_replays_rejected():
+    encoder, decoder = _pair(window=4)
+    frames = [encoder.encrypt_frame(FRAME) for _ in range(8)]
+
+    for index in (2, 0, 1, 7):
+        assert decoder.decrypt_frame(frames[index])[0] == index
+    with pytest.raises(ReplayError):
+        decoder.decrypt_frame(frames[7])
+    with pytest.raises(ReplayError):
+        decoder.decrypt_frame(frames[3])  # behind the 4-frame window
+    assert decoder.decrypt_frame(frames[5])[0] == 5
+
+
+def test_tampered_header_or_payload_fails_authentication():
+    encoder, decoder = _pair()
+    frame = bytearray(encoder.encrypt_frame(FRAME))
+
+    for position in (20, len(frame) - 1):  # epoch field, tag
+        tampered = bytearray(frame)
+        tampered[position] ^= 1
+        with pytest.raises(FrameError):
+            decoder.decrypt_frame(bytes(tampered))
+    # A failed frame must not burn its sequence number
+    assert decoder.decrypt_frame(bytes(frame)) == (0, FRAME)
+
+
+@pytest.mark.asyncio
+async def test_manager_streams_across_key_rotation(tmp_path, monkeypatch):
+    monkeypatch.setenv("AUDIO_MASTER_KEY_PATH", str(tmp_path / "master.key"))
+    server = AudioEncryptionManager()
+    session_id = await server.create_encryption_session("device-1", "user-1")
+
+    before = await server.encrypt_audio_frames(session_id, [b"a" * 640, b"b" * 640], "upstream")
+    await server.rotate_session_key(session_id)
+    after = await server.encrypt_audio_frames(session_id, [b"c" * 640], "upstream")
+
+    # In-flight frames from the previous epoch still decrypt, in order
+    stream = await server.decrypt_audio_frames(after + before[::-1])
+    assert stream == b"a" * 640 + b"b" * 640 + b"c" * 640
+    assert (await server.get_session_info(session_id))["key_epoch"] == 1
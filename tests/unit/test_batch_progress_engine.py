@@ -0,0 +1,127 @@
+"""
+Unit tests for the vectorized batch progress engine.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.domain.reporting.models.report_models import (
+        InteractionAnalysis,
+        ReportPeriod,
+    )
+    from src.domain.reporting.services.batch_progress_engine import (
+        BatchProgressEngine,
+    )
+    from src.domain.reporting.services.progress_analyzer import ProgressAnalyzer
+    from src.domain.reporting.services.skill_analyzer import SkillAnalyzer
+
+    REPORTING_AVAILABLE = True
+except ImportError:
+    REPORTING_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not REPORTING_AVAILABLE, reason="Reporting services not available"
+)
+
+EMOTIONS = ["happy", "sad", "curious", "calm"]
+TOPICS = ["space", "dinosaurs", "math", "art", "music", "animals"]
+SKILLS = ["counting", "reading", "sharing", "drawing"]
+
+
+@pytest.fixture
+def period():
+    end = datetime(2026, 10, 18, 20, 0)
+    return ReportPeriod(start_date=end - timedelta(days=7), end_date=end)
+
+
+def make_interactions(rng, period, count):
+    return [
+        InteractionAnalysis(
+            timestamp=period.start_date + timedelta(hours=rng.uniform(0, 24 * 7)),
+            duration=rng.randint(10, 1800),
+            primary_emotion=rng.choice(EMOTIONS),
+            emotions={e: rng.random() for e in rng.sample(EMOTIONS, rng.randint(0, 3))},
+            topics_discussed=rng.sample(TOPICS, rng.randint(0, 3)),
+            skills_used=rng.sample(SKILLS, rng.randint(0, 3)),
+            behavioral_indicators=[],
+            quality_score=rng.random(),
+        )
+        for _ in range(count)
+    ]
+
+
+def assert_close(actual, expected):
+    assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_batch_matches_per_child_analyzers(period):
+    rng = random.Random(7)
+    data = {
+        f"child-{i}": make_interactions(rng, period, rng.choice([0, 1, 2, 6, 25]))
+        for i in range(30)
+    }
+    results = BatchProgressEngine(chunk_size=8).compute_metrics(data, period)
+
+    progress, skills = ProgressAnalyzer(), SkillAnalyzer()
+    for child_id, interactions in data.items():
+        metrics = results[child_id]
+        assert metrics["total_interactions"] == len(interactions)
+        assert metrics["longest_conversation"] == progress.calculate_longest_conversation(interactions)
+        assert metrics["favorite_topics"] == progress.extract_favorite_topics(interactions)
+        assert metrics["vocabulary_growth"] == progress.estimate_vocabulary_growth(interactions)
+        assert_close(metrics["attention_span"], progress.calculate_attention_span(interactions))
+        assert_close(metrics["response_time"], progress.calculate_response_time(interactions))
+        assert_close(metrics["question_frequency"], progress.calculate_question_frequency(interactions))
+
+        expected = progress.analyze_emotion_distribution(interactions)
+        actual = metrics["emotion_analysis"]
+        assert actual.dominant_emotion == expected.dominant_emotion
+        assert_close(actual.stability_score, expected.stability_score)
+        assert actual.emotions.keys() == expected.emotions.keys()
+        for emotion, share in expected.emotions.items():
+            assert_close(actual.emotions[emotion], share)
+
+        expected_trends = progress.analyze_mood_trends(
+            interactions, period.start_date, period.end_date)
+        assert metrics["mood_trends"].keys() == expected_trends.keys()
+        for emotion, scores in expected_trends.items():
+            assert metrics["mood_trends"][emotion] == pytest.approx(scores)
+
+        assert metrics["skill_analysis"] == skills.analyze_skills_practiced(interactions)
+
+
+def test_single_child_uses_same_engine(period):
+    rng = random.Random(3)
+    interactions = make_interactions(rng, period, 10)
+    engine = BatchProgressEngine()
+
+    single = engine.compute_child_metrics("child-a", interactions, period)
+    batch = engine.compute_metrics(
+        {"child-a": interactions, "child-b": make_interactions(rng, period, 4)},
+        period,
+    )["child-a"]
+
+    assert single["favorite_topics"] == batch["favorite_topics"]
+    assert single["skill_analysis"] == batch["skill_analysis"]
+    assert_close(single["attention_span"], batch["attention_span"])
+
+
+def test_build_child_progress_with_empty_child(period):
+    engine = BatchProgressEngine()
+    metrics = engine.compute_child_metrics("child-a", [], period)
+
+    report = engine.build_child_progress(
+        "child-a", {"name": "Sara", "age": 6}, period, metrics,
+        empathy_indicators=2,
+    )
+
+    assert report.child_name == "Sara"
+    assert report.total_interactions == 0
+    assert report.emotion_analysis.dominant_emotion == "neutral"
+    assert report.mood_trends == {}
+    assert report.empathy_indicators == 2
+    assert report.concerning_patterns == []
@@ -0,0 +1,118 @@
+"""
+Unit tests for the L4 content-addressed blob store.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+try:
+    from src.infrastructure.caching.layers.l4_blob_store import (
+        BlobPointer,
+        ContentAddressedBlobStore,
+    )
+
+    BLOB_STORE_AVAILABLE = True
+except ImportError:
+    BLOB_STORE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not BLOB_STORE_AVAILABLE, reason="Blob store not available"
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    blob_store = ContentAddressedBlobStore(str(tmp_path), max_bytes=1000)
+    yield blob_store
+    blob_store._db.close()
+
+
+def test_put_is_content_addressed_and_deduplicated(store):
+    first = store.put_bytes(b"audio" * 10)
+    second = store.put_bytes(b"audio" * 10)
+
+    assert first == second
+    assert first == BlobPointer(first.digest, 50)
+    assert store.total_bytes == 50
+    assert store.stats["dedup_hits"] == 1
+    assert store._path_for(first.digest).parent.parent.name == first.digest[:2]
+
+
+def test_get_bytes_reads_back_and_counts_misses(store):
+    data = os.urandom(300)
+    pointer = store.put_bytes(data)
+
+    assert store.get_bytes(pointer.digest) == data
+    assert store.get_bytes("0" * 64) is None
+    assert store.stats["reads"] == 1 and store.stats["misses"] == 1
+
+
+def test_open_view_is_a_zero_copy_mapping(store):
+    data = os.urandom(300)
+    pointer = store.put_bytes(data)
+
+    with store.open_view(pointer.digest) as view:
+        assert isinstance(view, memoryview) and view.readonly
+        assert view.obj is not None and not isinstance(view.obj, bytes)
+        assert view[:10] == data[:10] and view.tobytes() == data
+        store.delete(pointer.digest)  # eviction while a reader holds the view
+        assert view.nbytes == 300
+    with pytest.raises(ValueError):
+        view.tobytes()  # released on exit
+
+    with store.open_view("0" * 64) as missing:
+        assert missing is None
+    assert store.stats["reads"] == 1 and store.stats["misses"] == 1
+
+
+def test_concurrent_puts_of_one_digest_are_counted_once(tmp_path):
+    store = ContentAddressedBlobStore(str(tmp_path), max_bytes=10_000_000)
+    data = os.urandom(256 * 1024)
+    barrier = threading.Barrier(8)
+
+    def put():
+        barrier.wait()
+        return store.put_bytes(data)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pointers = set(pool.map(lambda _: put(), range(8)))
+
+    assert len(pointers) == 1
+    assert store.total_bytes == len(data)
+    assert store.stats["puts"] + store.stats["dedup_hits"] == 8
+    assert store.stats["puts"] == 1
+    assert not list(tmp_path.rglob("*.tmp"))
+    store._db.close()
+
+
+def test_eviction_drops_least_recently_used_to_low_watermark(store):
+    pointers = []
+    for i in range(4):
+        pointers.append(store.put_bytes(bytes([i]) * 200))
+        time.sleep(0.002)
+    store.get_bytes(pointers[0].digest)
+    store.flush_access_times()
+
+    # 1000 bytes is above the 95% high watermark
+    store.put_bytes(b"\xff" * 200)
+    evicted = store.evict_if_needed()
+
+    assert evicted == 1
+    assert store.total_bytes <= 800
+    assert store.contains(pointers[0].digest)
+    assert not store.contains(pointers[1].digest)
+
+
+def test_index_survives_reopen(tmp_path):
+    store = ContentAddressedBlobStore(str(tmp_path), max_bytes=10_000)
+    pointer = store.put_bytes(b"x" * 123)
+    store._db.close()
+
+    reopened = ContentAddressedBlobStore(str(tmp_path), max_bytes=10_000)
+    assert reopened.total_bytes == 123
+    assert reopened.get_bytes(pointer.digest) == b"x" * 123
+    reopened._db.close()
@@ -0,0 +1,137 @@
+"""
+Unit tests for spec-based, cached chart rendering.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.domain.reporting.models import (
+        ChildProgress,
+        EmotionDistribution,
+        ReportPeriod,
+        SkillAnalysis,
+    )
+    from src.infrastructure.reporting.chart_generator import (
+        PLOTTING_AVAILABLE,
+        ChartCache,
+        ChartGenerator,
+    )
+    from src.infrastructure.reporting.pdf_generator import PDF_AVAILABLE, PDFGenerator
+
+    REPORTING_AVAILABLE = PLOTTING_AVAILABLE
+except ImportError:
+    REPORTING_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not REPORTING_AVAILABLE, reason="Chart generation not available"
+)
+
+
+def make_progress(child_id="child-1", happy=0.6):
+    end = datetime(2026, 10, 18)
+    return ChildProgress(
+        child_id=child_id,
+        child_name="Sara",
+        age=6,
+        period=ReportPeriod(start_date=end - timedelta(days=7), end_date=end),
+        total_interactions=12,
+        avg_daily_interactions=1.7,
+        longest_conversation=9,
+        favorite_topics=["space"],
+        emotion_analysis=EmotionDistribution(
+            emotions={"happy": happy, "curious": 1 - happy},
+            dominant_emotion="happy",
+            stability_score=0.8,
+        ),
+        mood_trends={"happy": [0.5, 0.7, 0.6], "curious": [0.2, 0.3, 0.4]},
+        attention_span=6.5,
+        response_time=3.0,
+        vocabulary_growth=9,
+        question_frequency=2.5,
+        skill_analysis=SkillAnalysis(
+            skills_practiced={"counting": 4, "reading": 2},
+            new_skills_learned=["reading"],
+            improvement_areas=[],
+            mastery_level={"counting": 1.0, "reading": 0.5},
+        ),
+        learning_achievements=[],
+        recommended_activities=[],
+        empathy_indicators=3,
+        sharing_behavior=2,
+        cooperation_level=0.7,
+        sleep_pattern_quality=None,
+        bedtime_conversations=0,
+        concerning_patterns=[],
+        urgent_recommendations=[],
+    )
+
+
+def test_renders_all_charts_as_png():
+    charts = ChartGenerator().render_charts(make_progress())
+
+    assert set(charts) == {"emotions", "mood_trends", "skills", "development"}
+    for chart in charts.values():
+        assert chart.format == "png"
+        assert chart.data.startswith(b"\x89PNG")
+
+
+def test_identical_charts_are_served_from_cache():
+    generator = ChartGenerator()
+    first = generator.render_charts(make_progress("child-1"))
+    second = generator.render_charts(make_progress("child-2"))
+
+    assert first["emotions"].digest == second["emotions"].digest
+    assert generator.cache.get_stats()["hits"] == 4
+
+    changed = generator.render_charts(make_progress("child-3", happy=0.3))
+    assert changed["emotions"].digest != first["emotions"].digest
+    assert changed["skills"].data == first["skills"].data
+
+
+def test_batch_deduplicates_and_supports_svg(tmp_path):
+    generator = ChartGenerator(
+        output_format="svg", cache=ChartCache(directory=str(tmp_path)))
+    batch = generator.render_batch([make_progress("a"), make_progress("b")])
+
+    assert batch[0]["development"].digest == batch[1]["development"].digest
+    assert b"<svg" in batch[0]["emotions"].data
+    # One file per distinct chart, reusable by another generator/process
+    assert len(list(tmp_path.iterdir())) == 4
+    other = ChartGenerator(
+        output_format="svg", cache=ChartCache(directory=str(tmp_path)))
+    other.render_charts(make_progress("c"))
+    assert other.cache.get_stats()["misses"] == 0
+
+
+def test_low_dpi_changes_output():
+    generator = ChartGenerator()
+    full = generator.render_charts(make_progress())["skills"]
+    preview = generator.render_charts(make_progress(), dpi=50)["skills"]
+
+    assert full.digest != preview.digest
+    assert len(preview.data) < len(full.data)
+
+
+def test_render_is_thread_safe():
+    generator = ChartGenerator()
+    progresses = [make_progress(f"c{i}", happy=i / 20) for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(generator.render_charts, progresses))
+
+    assert all(len(charts) == 4 for charts in results)
+
+
+@pytest.mark.skipif(not REPORTING_AVAILABLE or not PDF_AVAILABLE,
+                    reason="ReportLab not available")
+def test_pdf_embeds_rendered_charts(tmp_path):
+    progress = make_progress()
+    charts = ChartGenerator().render_charts(progress)
+
+    path = PDFGenerator(str(tmp_path)).create_pdf_report(progress, charts)
+
+    assert path.endswith(".pdf")
+    assert b"/Subtype /Image" in open(path, "rb").read()
@@ -0,0 +1,133 @@
+"""
+Unit tests for the ring-buffer backed emotion history service.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.application.services.ai.emotion_history_buffer import EmotionRingBuffer
+    from src.application.services.ai.emotion_history_service import (
+        EmotionHistoryService,
+    )
+    from src.domain.emotion.models import EmotionResult
+
+    EMOTION_HISTORY_AVAILABLE = True
+except ImportError:
+    EMOTION_HISTORY_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not EMOTION_HISTORY_AVAILABLE, reason="Emotion history service not available"
+)
+
+
+def make_result(timestamp, emotion="happy", confidence=0.8):
+    return EmotionResult(
+        primary_emotion=emotion,
+        confidence=confidence,
+        all_emotions={},
+        source="text",
+        timestamp=timestamp.isoformat(),
+        behavioral_indicators=[],
+        recommendations=[],
+    )
+
+
+def test_ring_buffer_window_across_wraparound():
+    buffer = EmotionRingBuffer(capacity=5)
+    for second in range(8):
+        buffer.append(float(second), 0, 0.5, make_result(datetime.now()))
+
+    assert len(buffer) == 5
+    assert buffer.timestamps[buffer.window(-1.0)].tolist() == [3, 4, 5, 6, 7]
+    assert buffer.timestamps[buffer.window(4.0)].tolist() == [5, 6, 7]
+    assert buffer.timestamps[buffer.window(4.0, limit=2)].tolist() == [6, 7]
+
+
+def test_ring_buffer_keeps_late_arrivals_sorted():
+    buffer = EmotionRingBuffer(capacity=4)
+    for ts in (1.0, 2.0, 4.0, 5.0, 3.0, 0.5):
+        buffer.append(ts, 0, 0.5, make_result(datetime.now()))
+
+    assert buffer.timestamps[buffer.physical(0)].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_ring_buffer_grows_on_demand_up_to_capacity():
+    buffer = EmotionRingBuffer(capacity=100)
+    assert buffer.allocated == 8
+
+    for second in range(20):
+        buffer.append(float(second), 0, 0.5, make_result(datetime.now()))
+    buffer.append(9.5, 0, 0.5, make_result(datetime.now()))  # late arrival
+    assert buffer.allocated == 32
+    assert buffer.timestamps[buffer.window(17.0)].tolist() == [18.0, 19.0]
+
+    for second in range(20, 150):
+        buffer.append(float(second), 0, 0.5, make_result(datetime.now()))
+    assert buffer.allocated == 100 and len(buffer) == 100
+    assert buffer.timestamps[buffer.physical(0)].tolist() == list(range(50, 150))
+
+
+@pytest.mark.asyncio
+async def test_history_is_newest_first_and_windowed():
+    service = EmotionHistoryService()
+    now = datetime.now()
+    for hours_ago in (30, 5, 3, 1):
+        await service.add_emotion_to_history(
+            "child", make_result(now - timedelta(hours=hours_ago)))
+
+    history = await service.get_emotion_history("child", hours=24, limit=2)
+
+    assert [r.timestamp for r in history] == [
+        (now - timedelta(hours=1)).isoformat(),
+        (now - timedelta(hours=3)).isoformat(),
+    ]
+    assert await service.get_emotion_history("unknown") == []
+
+
+@pytest.mark.asyncio
+async def test_daily_trends_and_stability():
+    service = EmotionHistoryService()
+    today = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    if today > datetime.now():
+        today -= timedelta(days=1)
+    for days_ago, emotions in ((2, ["sad", "sad"]), (1, ["happy", "sad"]), (0, ["happy", "happy"])):
+        for minute, emotion in enumerate(emotions):
+            await service.add_emotion_to_history(
+                "child",
+                make_result(today - timedelta(days=days_ago, minutes=minute), emotion))
+
+    trends = {t.emotion: t for t in await service.get_emotion_trends("child", days=7)}
+
+    assert trends["happy"].values == [0.0, 0.5, 1.0]
+    assert trends["sad"].values == [1.0, 0.5, 0.0]
+    assert trends["happy"].dates[-1] == today.date()
+    assert 0.0 <= await service.get_emotional_stability_score("child") <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_cold_children_spill_and_reload(tmp_path):
+    service = EmotionHistoryService(
+        max_hot_children=2, spill_path=str(tmp_path / "history.db"))
+    now = datetime.now()
+    for child in ("a", "b", "c"):
+        await service.add_emotion_to_history(child, make_result(now, "curious"))
+
+    assert list(service.emotion_cache) == ["b", "c"]
+    assert service.spill_store.contains("a")
+
+    history = await service.get_emotion_history("a")
+    assert [r.primary_emotion for r in history] == ["curious"]
+    assert "a" in service.emotion_cache and len(service.emotion_cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_hot_children_are_capped_without_spill_store():
+    service = EmotionHistoryService(max_hot_children=2)
+    now = datetime.now()
+    for child in ("a", "b", "c"):
+        await service.add_emotion_to_history(child, make_result(now))
+
+    assert list(service.emotion_cache) == ["b", "c"]
+    assert await service.get_emotion_history("a") == []
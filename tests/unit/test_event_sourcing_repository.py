@@ -0,0 +1,169 @@
+"""
+Unit tests for hydrated-aggregate caching and adaptive snapshots in the
+event sourcing repository.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    from src.infrastructure.persistence.repositories.event_sourcing_repository import (
+        EventSourcingRepositoryImpl,
+    )
+
+    EVENT_SOURCING_AVAILABLE = True
+except ImportError:
+    EVENT_SOURCING_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not EVENT_SOURCING_AVAILABLE, reason="Event sourcing repository not available"
+)
+
+
+class Counter:
+    """Minimal aggregate: sums the values of applied events"""
+
+    def __init__(self, id, total=0, version=0):
+        self.id = id
+        self.total = total
+        self.version = version
+        self._events = []
+
+    def add(self, value):
+        event = {"value": value}
+        self.apply_event(event)
+        self._events.append(event)
+
+    def apply_event(self, event):
+        self.total += event["value"]
+
+    def increment_version(self):
+        self.version += 1
+
+    def has_uncommitted_events(self):
+        return bool(self._events)
+
+    def get_domain_events(self):
+        return list(self._events)
+
+    def clear_domain_events(self):
+        self._events = []
+
+
+class InMemoryEventStore:
+    """Versioned streams; version N is the Nth stored event (1-based)"""
+
+    def __init__(self):
+        self.streams = {}
+        self.loads = []
+
+    async def append_events(self, stream_id, events, expected_version):
+        stream = self.streams.setdefault(stream_id, [])
+        assert len(stream) == expected_version
+        stream.extend(SimpleNamespace(data=event) for event in events)
+
+    async def load_events(self, stream_id, from_version=1):
+        self.loads.append((stream_id, from_version))
+        return self.streams.get(stream_id, [])[from_version - 1:]
+
+
+class InMemorySnapshotStore:
+    def __init__(self):
+        self.snapshots = {}
+
+    async def should_create_snapshot(self, stream_id, version):
+        return False
+
+    async def save_snapshot(self, stream_id, aggregate, version):
+        self.snapshots[stream_id] = SimpleNamespace(
+            data={"id": aggregate.id, "total": aggregate.total, "version": version},
+            metadata=SimpleNamespace(version=version),
+        )
+
+    async def load_snapshot(self, stream_id):
+        return self.snapshots.get(stream_id)
+
+
+def make_repository(**kwargs):
+    events, snapshots = InMemoryEventStore(), InMemorySnapshotStore()
+    repository = EventSourcingRepositoryImpl(
+        Counter, event_store=events, snapshot_store=snapshots, **kwargs)
+    return repository, events, snapshots
+
+
+async def append(repository, aggregate_id, *values):
+    aggregate = await repository.load(aggregate_id) or Counter(aggregate_id)
+    for value in values:
+        aggregate.add(value)
+    await repository.save(aggregate)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_only_fetches_the_event_tail():
+    repository, events, _ = make_repository()
+    await append(repository, "a", 1, 2, 3)
+
+    first = await repository.load("a")
+    assert (first.total, first.version) == (6, 3)
+    assert repository.cache.misses >= 1
+
+    events.loads.clear()
+    second = await repository.load("a")
+    assert (second.total, second.version) == (6, 3)
+    assert repository.cache.hits == 1
+    assert events.loads == [("counter.a", 4)]
+    # Callers get copies; mutating one does not touch the cache
+    second.total = 100
+    assert (await repository.load("a")).total == 6
+
+
+@pytest.mark.asyncio
+async def test_incremental_catch_up_advances_per_stored_event():
+    repository, events, _ = make_repository()
+    await append(repository, "a", 1, 2)
+    await repository.load("a")
+
+    # Written by another process: the cache is not invalidated. The empty
+    # event deserializes to a falsy value but still occupies a version.
+    stream = events.streams["counter.a"]
+    stream.append(SimpleNamespace(data={}))
+    stream.append(SimpleNamespace(data={"value": 10}))
+
+    caught_up = await repository.load("a")
+    assert (caught_up.total, caught_up.version) == (13, 4)
+    assert events.loads[-1] == ("counter.a", 3)
+
+    again = await repository.load("a")
+    assert (again.total, again.version) == (13, 4)
+    assert events.loads[-1] == ("counter.a", 5)
+
+    loaded = await repository.load_many(["a", "missing", "a"])
+    assert list(loaded) == ["a"] and loaded["a"].total == 13
+
+
+@pytest.mark.asyncio
+async def test_costly_replay_triggers_snapshot():
+    repository, events, snapshots = make_repository(
+        cache_size=0, snapshot_event_threshold=5, snapshot_replay_budget_ms=1e9)
+    await append(repository, "a", *range(4))
+    await append(repository, "a", 1)
+    # Replayed 4 events before the second save: under the threshold
+    assert "counter.a" not in snapshots.snapshots
+
+    await append(repository, "a", 1)
+    # Replayed 5 events: snapshot taken, replay cost reset
+    assert snapshots.snapshots["counter.a"].metadata.version == 6
+    assert repository.get_replay_cost("counter.a").events_replayed == 0
+
+    loaded = await repository.load("a")
+    assert (loaded.total, loaded.version) == (8, 6)
+    assert events.loads[-1] == ("counter.a", 7)
+    assert repository.get_replay_cost("counter.a").events_replayed == 0
+
+
+def test_replay_costs_are_bounded():
+    repository, _, _ = make_repository(cache_size=2)
+    for i in range(5):
+        repository._replay_events(f"counter.{i}", Counter(str(i)), [])
+    assert list(repository._replay_costs) == ["counter.3", "counter.4"]
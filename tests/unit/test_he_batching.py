@@ -0,0 +1,82 @@
+"""
+Unit tests for SIMD-packed CKKS batch inference.
+"""
+
+import numpy as np
+import pytest
+
+try:
+    from src.infrastructure.security.he_batching import (
+        TENSEAL_AVAILABLE,
+        PackedEmotionBatcher,
+        SlotLayout,
+        ts,
+    )
+
+    HE_BATCHING_AVAILABLE = True
+except ImportError:
+    HE_BATCHING_AVAILABLE = False
+    TENSEAL_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not HE_BATCHING_AVAILABLE, reason="HE batching not available"
+)
+
+requires_tenseal = pytest.mark.skipif(not TENSEAL_AVAILABLE, reason="TenSEAL not available")
+
+
+def _rotate(slots, step):
+    """CKKS left rotation on a plaintext slot vector"""
+    return np.roll(slots, -step)
+
+
+def test_diagonal_method_matches_matrix_product_per_block():
+    layout = SlotLayout(slot_count=4096, feature_dim=5, output_dim=3)
+    rng = np.random.default_rng(7)
+    features, weights = rng.random((100, 5)), rng.random((3, 5))
+
+    slots = layout.pack(features)
+    result = sum(diagonal * _rotate(slots, step)
+                 for step, diagonal in layout.diagonals(weights))
+
+    assert layout.stride == 8 and layout.capacity == 256
+    np.testing.assert_allclose(layout.unpack(result, 100), features @ weights.T)
+
+
+def test_layout_validation_and_utilization():
+    layout = SlotLayout(slot_count=64, feature_dim=3, output_dim=3)
+    assert layout.capacity == 8
+    assert layout.utilization(8) == pytest.approx(24 / 64)
+    with pytest.raises(ValueError):
+        layout.pack(np.ones((9, 3)))
+    with pytest.raises(ValueError):
+        layout.diagonals(np.ones((3, 4)))
+
+
+def _context():
+    context = ts.context(ts.SCHEME_TYPE.CKKS, poly_modulus_degree=8192,
+                         coeff_mod_bit_sizes=[60, 40, 40, 60])
+    context.global_scale = 2**40
+    context.generate_galois_keys()
+    context.generate_relin_keys()
+    return context
+
+
+@requires_tenseal
+@pytest.mark.parametrize("workers", [0, 2])
+def test_packed_batches_decrypt_to_squared_linear_scores(workers):
+    rng = np.random.default_rng(3)
+    features, weights = rng.random((300, 5)), rng.random((5, 5))
+    batcher = PackedEmotionBatcher(_context(), 5, 5, max_workers=workers)
+    try:
+        batches = batcher.process(features, weights)
+        scores = np.vstack([batcher.decrypt(batch) for batch in batches])
+    finally:
+        batcher.close()
+
+    assert [batch.size for batch in batches] == [256, 44]
+    np.testing.assert_allclose(scores, (features @ weights.T) ** 2, atol=1e-4)
+    stats = batcher.get_stats()["last_batch"]
+    assert stats["ciphertexts"] == 2
+    assert stats["rotations"] == 2 * 7
+    assert stats["slot_utilization"] == pytest.approx(300 * 5 / (2 * 4096))
@@ -0,0 +1,97 @@
+"""
+Unit tests for the tiered memory profiler in HealthService.
+"""
+
+import tracemalloc
+
+import pytest
+
+try:
+    from src.application.services.core.health_service import HealthService
+
+    HEALTH_SERVICE_AVAILABLE = True
+# health_service references ServiceBase without importing it
+except (ImportError, NameError):
+    HEALTH_SERVICE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not HEALTH_SERVICE_AVAILABLE, reason="Health service not available"
+)
+
+
+@pytest.fixture
+def service():
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(1)
+    yield HealthService(None, {"memory_sample_every_ticks": 3})
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+async def test_cheap_tier_does_not_report_sampled_values_as_current(service):
+    cheap = await service._take_memory_snapshot()
+    assert cheap.tier == "cheap"
+    assert cheap.objects_count is None and cheap.top_types == []
+    assert set(service.tier_overhead) == {"cheap"}
+
+    sampled = await service._take_memory_snapshot(sampled=True)
+    assert sampled.tier == "sampled"
+    # The sampled tier never walks the heap to count objects
+    assert sampled.objects_count is None and sampled.top_types
+
+    later = await service._take_memory_snapshot()
+    service._add_snapshot(sampled)
+    service._add_snapshot(later)
+    assert later.objects_count is None and later.top_types == []
+
+    health = await service._check_memory_health()
+    assert health["objects_count"] is None
+    assert health["top_consumers_stale"] is True
+    assert health["top_consumers_sampled_at"] == sampled.timestamp.isoformat()
+    assert len(health["top_consumers"]) == min(5, len(sampled.top_types))
+
+    service._add_snapshot(await service._take_memory_snapshot(sampled=True))
+    assert (await service._check_memory_health())["top_consumers_stale"] is False
+
+
+@pytest.mark.asyncio
+async def test_heavy_tier_counts_objects_and_has_a_cooldown(service, monkeypatch):
+    runs = []
+
+    async def no_websockets():
+        runs.append(True)
+
+    monkeypatch.setattr(service, "_check_websocket_memory_leaks", no_websockets)
+    service._add_snapshot(await service._take_memory_snapshot())
+
+    assert service._heavy_tier_due()
+    await service._handle_memory_leak()
+    health = await service._check_memory_health()
+    assert health["objects_count"] > 0 and health["objects_counted_at"]
+    assert len(runs) == 1
+
+    # A leak detected on the next tick does not trigger another heap walk
+    assert not service._heavy_tier_due()
+    service._last_heavy_at -= service.memory_heavy_min_interval
+    assert service._heavy_tier_due()
+
+
+@pytest.mark.asyncio
+async def test_heap_size_is_traced_heap_not_rss(service):
+    snapshot = await service._take_memory_snapshot()
+    assert snapshot.heap_size == snapshot.heap_used
+    assert 0 < snapshot.heap_size < snapshot.rss
+
+    tracemalloc.stop()
+    try:
+        untraced = await service._take_memory_snapshot()
+    finally:
+        tracemalloc.start(1)
+    assert untraced.heap_size is None and untraced.heap_used is None
+
+    service._add_snapshot(untraced)
+    health = await service._check_memory_health()
+    assert health["heap_size_mb"] is None
+    assert health["objects_count"] is None
@@ -19,12 +19,18 @@ try:
         HEConfig,
         HEScheme,
         HomomorphicEncryption,
+        EmotionProcessor,
+        PackedEmotionBatcher,
         ProcessingMode,
+        SecureContextManager,
+        VoiceFeatureEncryptor,
+        ts,
     )
 
     HE_IMPORTS_AVAILABLE = True
 except ImportError as e:
     HE_IMPORTS_AVAILABLE = False
+    TENSEAL_AVAILABLE = False
     import_error = str(e)
 
 
@@ -128,5 +134,39 @@ class TestSecurityAndPrivacy:
         assert hash1 != hash2
 
 
+
+class TestEmotionTransformParity:
+    """Packed and per-item paths must compute the same emotion scores."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not TENSEAL_AVAILABLE, reason="TenSEAL not available")
+    async def test_packed_scores_match_per_item_scores(self):
+        """Test packed batch scores equal the per-child scores."""
+        if not HE_IMPORTS_AVAILABLE:
+            pytest.skip(f"HE imports not available: {import_error}")
+
+        contexts = SecureContextManager(HEConfig())
+        context = contexts.create_context("parity")
+        encryptor = VoiceFeatureEncryptor(contexts)
+        processor = EmotionProcessor(contexts)
+        mode = ProcessingMode.BEHAVIORAL_PATTERNS
+        features = np.random.default_rng(5).random((3, 5))
+
+        per_item = []
+        for index, row in enumerate(features):
+            encrypted = encryptor.encrypt_voice_features(row, f"child-{index}", "parity")
+            result = await processor.process_encrypted_emotion(encrypted, mode)
+            per_item.append(ts.ckks_vector_from(
+                context, result.encrypted_result.data).decrypt())
+
+        batcher = PackedEmotionBatcher(context, 5, 5, max_workers=0)
+        normalized = [encryptor._normalize_features(row) for row in features]
+        batches = batcher.process(normalized, processor.emotion_transform_matrix(mode))
+        packed = batcher.decrypt(batches[0])
+
+        assert np.asarray(per_item).shape == (3, len(processor.model_weights))
+        np.testing.assert_allclose(packed, per_item, atol=1e-4)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+"""
+Unit tests for the inverted-index memory graph.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+try:
+    from src.domain.memory.models import Memory, MemoryImportance, MemoryType
+    from src.infrastructure.memory.memory_graph import MemoryGraph, build_memory_graph
+
+    GRAPH_AVAILABLE = True
+except ImportError:
+    GRAPH_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not GRAPH_AVAILABLE, reason="Memory graph not available"
+)
+
+TOPICS = ["story", "math", "science", "family", "animals", "colors"]
+EMOTIONS = ["happy", "sad", "curious", "scared"]
+
+
+def make_memories(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        Memory(
+            id=f"m{i}",
+            child_id="child-1",
+            content="",
+            memory_type=MemoryType.EPISODIC,
+            importance=MemoryImportance.LOW,
+            timestamp=datetime.now(),
+            topics=rng.sample(TOPICS, rng.randint(0, 2)),
+            emotions=rng.sample(EMOTIONS, rng.randint(0, 2)),
+        )
+        for i in range(count)
+    ]
+
+
+def pairwise_graph(memories, threshold):
+    """Reference O(n^2) implementation of the original scan"""
+
+    def similarity(a, b):
+        topic_sim = len(set(a.topics) & set(b.topics)) / max(
+            len(a.topics) + len(b.topics), 1
+        )
+        emotion_sim = len(set(a.emotions) & set(b.emotions)) / max(
+            len(a.emotions) + len(b.emotions), 1
+        )
+        return (topic_sim + emotion_sim) / 2
+
+    return {
+        a.id: sorted(
+            b.id for b in memories if a.id != b.id and similarity(a, b) >= threshold
+        )
+        for a in memories
+    }
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.25, 0.3, 0.5])
+def test_sparse_build_matches_pairwise_scan(threshold):
+    memories = make_memories(120)
+    expected = pairwise_graph(memories, threshold)
+    actual = build_memory_graph(memories, threshold)
+
+    assert {k: sorted(v) for k, v in actual.items()} == expected
+
+
+def test_incremental_graph_matches_batch_build():
+    memories = make_memories(80, seed=3)
+    graph = MemoryGraph(threshold=0.25)
+    for memory in memories:
+        graph.add(memory)
+
+    expected = pairwise_graph(memories, 0.25)
+    assert {k: sorted(v) for k, v in graph.to_dict().items()} == expected
+
+
+def test_remove_drops_edges_both_ways():
+    memories = make_memories(30, seed=11)
+    graph = MemoryGraph(threshold=0.1)
+    for memory in memories:
+        graph.add(memory)
+
+    assert graph.remove("m0")
+    assert not graph.remove("m0")
+    assert "m0" not in graph
+    assert all("m0" not in related for related in graph.to_dict().values())
@@ -0,0 +1,108 @@
+"""
+Unit tests for the per-child memory graphs kept by MemoryStorageService.
+"""
+
+from datetime import datetime
+
+import pytest
+
+try:
+    from src.application.services.core.memory_storage_service import (
+        MemoryStorageService,
+    )
+    from src.domain.memory.models import Memory, MemoryImportance, MemoryType
+
+    STORAGE_SERVICE_AVAILABLE = True
+# memory_repository.py and vector_memory_store.py are UTF-16 placeholders
+except (ImportError, SyntaxError):
+    STORAGE_SERVICE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not STORAGE_SERVICE_AVAILABLE, reason="Memory storage service not available"
+)
+
+
+def make_memory(memory_id, child_id="child-1", topics=("animals",),
+                emotions=("happy",)):
+    return Memory(
+        id=memory_id,
+        child_id=child_id,
+        content=f"memory {memory_id}",
+        memory_type=MemoryType.EPISODIC,
+        importance=MemoryImportance.MEDIUM,
+        timestamp=datetime.now(),
+        topics=list(topics),
+        emotions=list(emotions),
+    )
+
+
+class FakeRepository:
+    def __init__(self, memories=()):
+        self.memories = list(memories)
+        self.loads = []
+
+    async def get_memories_by_child(self, child_id):
+        self.loads.append(child_id)
+        return [m for m in self.memories if m.child_id == child_id]
+
+    async def get_recent_memories(self, days=1):
+        return list(self.memories)
+
+    async def save_memory(self, memory):
+        self.memories.append(memory)
+
+
+class FakeVectorStore:
+    def add_memory(self, memory):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_graph_is_seeded_from_stored_memories_on_first_access():
+    repository = FakeRepository([make_memory("old-1"), make_memory("old-2")])
+    service = MemoryStorageService(repository, FakeVectorStore())
+
+    await service.store_interaction(
+        "s1", "I saw a dog", "Dogs are great!",
+        {"child_id": "child-1", "emotions": ["happy"]},
+    )
+
+    stored = repository.memories[-1]
+    assert set(stored.related_memories) >= {"old-1", "old-2"}
+    assert set(await service.get_related_memory_ids("child-1", "old-1")) >= {
+        "old-2", stored.id}
+    assert repository.loads == ["child-1"]
+
+
+@pytest.mark.asyncio
+async def test_graphs_are_bounded_and_rebuilt_after_eviction():
+    repository = FakeRepository(
+        [make_memory(f"{child}-{i}", child_id=child)
+         for child in ("a", "b", "c") for i in range(2)])
+    service = MemoryStorageService(repository, FakeVectorStore())
+    service.max_graph_children = 2
+
+    for child in ("a", "b", "c"):
+        await service.get_related_memory_ids(child, f"{child}-0")
+    assert list(service.memory_graphs) == ["b", "c"]
+
+    assert await service.get_related_memory_ids("a", "a-0") == ["a-1"]
+    assert repository.loads == ["a", "b", "c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_consolidation_groups_related_memories_per_child():
+    memories = [make_memory(f"a-{i}", child_id="a") for i in range(4)]
+    memories += [make_memory(f"b-{i}", child_id="b") for i in range(3)]
+    memories += [make_memory(f"c-{i}", child_id="c", topics=(f"t{i}",),
+                             emotions=()) for i in range(3)]
+    repository = FakeRepository(memories)
+    service = MemoryStorageService(repository, FakeVectorStore())
+
+    await service._consolidate_memories()
+
+    consolidated = repository.memories[len(memories):]
+    assert {m.child_id for m in consolidated} == {"a", "b"}
+    by_child = {m.child_id: set(m.related_memories) for m in consolidated}
+    assert by_child["a"] == {f"a-{i}" for i in range(4)}
+    assert consolidated[0].topics == ["animals"]
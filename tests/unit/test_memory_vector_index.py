@@ -0,0 +1,156 @@
+"""
+Unit tests for the local memory vector index.
+"""
+
+from datetime import datetime
+
+import pytest
+
+try:
+    import numpy as np
+
+    from src.domain.memory.models import Memory, MemoryImportance, MemoryType
+    from src.infrastructure.memory.memory_vector_index import (
+        ChildVectorIndex,
+        HashingTextVectorizer,
+        MemoryVectorIndex,
+    )
+
+    INDEX_AVAILABLE = True
+except ImportError:
+    INDEX_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not INDEX_AVAILABLE, reason="Memory vector index not available"
+)
+
+
+def make_memory(memory_id, content, child_id="child-1", topics=None):
+    return Memory(
+        id=memory_id,
+        child_id=child_id,
+        content=content,
+        memory_type=MemoryType.EPISODIC,
+        importance=MemoryImportance.MEDIUM,
+        timestamp=datetime.now(),
+        topics=topics or [],
+    )
+
+
+class TestHashingTextVectorizer:
+    def test_embedding_is_unit_length_and_stable(self):
+        vectorizer = HashingTextVectorizer(dimension=128)
+        first = vectorizer.embed("Why is the sky blue?")
+        second = vectorizer.embed("why is the sky blue")
+
+        assert first.shape == (128,)
+        assert np.isclose(np.linalg.norm(first), 1.0)
+        assert np.allclose(first, second)
+
+    def test_empty_text_gives_zero_vector(self):
+        vectorizer = HashingTextVectorizer(dimension=64)
+        assert not vectorizer.embed("").any()
+
+
+class TestChildVectorIndex:
+    def test_remove_keeps_remaining_rows_searchable(self):
+        vectorizer = HashingTextVectorizer(dimension=64)
+        index = ChildVectorIndex(64, initial_capacity=2)
+        for i, text in enumerate(["dogs bark", "cats meow", "birds sing"]):
+            index.add(f"m{i}", vectorizer.embed(text))
+
+        assert index.remove("m0")
+        assert not index.remove("m0")
+        assert len(index) == 2
+
+        top_id, score = index.search(vectorizer.embed("birds sing"), k=1)[0]
+        assert top_id == "m2"
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        vectorizer = HashingTextVectorizer(dimension=32)
+        index = ChildVectorIndex(32)
+        index.add("a", vectorizer.embed("red ball"))
+        index.add("b", vectorizer.embed("blue train"))
+
+        path = tmp_path / "child.npz"
+        index.save(path)
+        loaded = ChildVectorIndex.load(path, 32)
+
+        assert len(loaded) == 2
+        assert loaded.search(vectorizer.embed("blue train"), k=1)[0][0] == "b"
+
+
+class TestMemoryVectorIndex:
+    def test_search_is_partitioned_per_child(self):
+        index = MemoryVectorIndex()
+        index.add_memory(make_memory("m1", "We read a story about dragons"))
+        index.add_memory(
+            make_memory("m2", "We read a story about dragons", child_id="child-2")
+        )
+
+        results = index.search("child-1", "dragon story", k=5)
+        assert [memory.id for memory, _ in results] == ["m1"]
+
+    def test_forget_and_persist(self, tmp_path):
+        index = MemoryVectorIndex(storage_path=tmp_path)
+        index.add_memory(make_memory("m1", "counting to ten", topics=["math"]))
+        index.add_memory(make_memory("m2", "my dog is called Max"))
+        assert index.forget("child-1", "m1")
+        assert index.persist() == 1
+
+        reloaded = MemoryVectorIndex(storage_path=tmp_path)
+        assert reloaded.count("child-1") == 1
+
+    def test_search_works_after_restart(self, tmp_path):
+        index = MemoryVectorIndex(storage_path=tmp_path)
+        index.add_memory(make_memory("m1", "we built a sandcastle", topics=["beach"]))
+        index.add_memory(make_memory("m2", "my dog is called Max"))
+        index.persist()
+
+        # Saved without pickled objects
+        with np.load(next(tmp_path.glob("*.npz")), allow_pickle=False) as data:
+            assert data["ids"].dtype.kind == "U"
+
+        reloaded = MemoryVectorIndex(storage_path=tmp_path)
+        results = reloaded.search("child-1", "we built a sandcastle", k=1)
+        memory, _ = results[0]
+        assert memory.id == "m1"
+        assert memory.topics == ["beach"]
+        assert memory.memory_type == MemoryType.EPISODIC
+
+    def test_re_adding_a_memory_re_embeds_it(self):
+        index = MemoryVectorIndex()
+        index.add_memory(make_memory("m1", "my favourite colour is red"))
+        index.add_memory(make_memory("m1", "my favourite animal is a giraffe"))
+
+        assert index.count("child-1") == 1
+        memory, score = index.search("child-1", "my favourite animal is a giraffe", k=1)[0]
+        assert memory.content == "my favourite animal is a giraffe"
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+    def test_child_index_is_bounded(self):
+        index = MemoryVectorIndex(max_memories_per_child=3)
+        for i in range(5):
+            index.add_memory(make_memory(f"m{i}", f"memory number {i}"))
+        # Re-indexing refreshes recency
+        index.add_memory(make_memory("m2", "memory number 2"))
+        index.add_memory(make_memory("m5", "memory number 5"))
+
+        child_index = index._get_index("child-1")
+        assert len(child_index) == 3
+        assert set(child_index._memories) == {"m4", "m2", "m5"}
+
+    def test_least_recently_used_child_index_is_unloaded(self, tmp_path):
+        index = MemoryVectorIndex(storage_path=tmp_path, max_loaded_children=2)
+        for child in ("a", "b"):
+            index.add_memory(make_memory(f"{child}1", "red ball", child_id=child))
+        index.search("a", "red ball")
+        index.add_memory(make_memory("c1", "blue train", child_id="c"))
+
+        assert index.loaded_children() == 2
+        assert set(index._indexes) == {"a", "c"}
+        # The unloaded child was saved on the way out and reloads from disk
+        memory, _score = index.search("b", "red ball", k=1)[0]
+        assert memory.id == "b1"
+        assert index.loaded_children() == 2
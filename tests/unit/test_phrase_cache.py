@@ -0,0 +1,143 @@
+"""
+Unit tests for the phrase-level synthesis cache.
+"""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+try:
+    from src.application.services.synthesis.phrase_cache import (
+        PhraseAudioLibrary,
+        PhraseCacheConfig,
+        PhraseSynthesisLayer,
+        detect_audio_format,
+        split_into_phrases,
+        stitch_segments,
+    )
+
+    PHRASE_CACHE_AVAILABLE = True
+except ImportError:
+    PHRASE_CACHE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not PHRASE_CACHE_AVAILABLE, reason="Phrase cache not available"
+)
+
+
+def make_wav(value, frames=100, rate=1000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes(np.full(frames, value, dtype=np.int16).tobytes())
+    return buffer.getvalue()
+
+
+class FakeSynthesisService:
+    """Returns 100 frames of constant WAV audio per phrase and records calls"""
+
+    def __init__(self, encode=make_wav):
+        self.calls = []
+        self.encode = encode
+
+    async def synthesize_audio(self, text, emotion, character_id=None, language=None):
+        self.calls.append(text)
+        return self.encode(len(self.calls))
+
+
+def test_split_merges_short_fragments_and_handles_arabic():
+    phrases = split_into_phrases("Hi! Great job today. عذراً، هل يمكنك طرح سؤال آخر؟")
+
+    assert phrases[0] == "Hi! Great job today."
+    assert phrases[-1].endswith("؟")
+
+
+def test_stitch_pcm_crossfades_segments():
+    a = np.full(100, 1000, dtype=np.int16).tobytes()
+    b = np.full(100, -1000, dtype=np.int16).tobytes()
+
+    stitched = np.frombuffer(
+        stitch_segments([a, b], "pcm16", sample_rate=1000, crossfade_ms=10),
+        dtype=np.int16,
+    )
+    assert len(stitched) == 190
+    assert stitched[0] == 1000 and stitched[-1] == -1000
+
+
+def test_stitch_encoded_formats_concatenates():
+    assert stitch_segments([b"ab", b"cd"], "mp3") == b"abcd"
+    tagged = b"ID3\x04\x00\x00\x00\x00\x00\x02TT\xff\xfbcd"
+    assert stitch_segments([b"\xff\xfbab", tagged]) == b"\xff\xfbab\xff\xfbcd"
+
+
+def test_stitch_detects_wav_and_rejects_what_it_cannot_join():
+    stitched = stitch_segments([make_wav(1000), make_wav(-1000)], crossfade_ms=10)
+    assert detect_audio_format(stitched) == "wav"
+    with wave.open(io.BytesIO(stitched), "rb") as reader:
+        assert reader.getnframes() == 190
+
+    with pytest.raises(ValueError):
+        stitch_segments([make_wav(1), b"OggS-page"])
+    with pytest.raises(ValueError):
+        stitch_segments([b"\x01\x02\x03", b"\x04\x05"], "pcm16")
+    with pytest.raises(ValueError):
+        stitch_segments([b"raw", b"bytes"])
+
+
+def test_library_persists_across_instances(tmp_path):
+    library = PhraseAudioLibrary(tmp_path, index_flush_every=2)
+    library.put("teddy", "friendly", "Great  job!", b"\x01\x02", 0.8)
+    # Index not rewritten yet, audio still found after a restart
+    assert not list(tmp_path.rglob("index.json"))
+    assert PhraseAudioLibrary(tmp_path).get("teddy", "friendly", "great job!")
+
+    library.put("teddy", "friendly", "Well done!", b"\x03", 0.5)
+    assert len(list(tmp_path.rglob("index.json"))) == 1
+
+    reloaded = PhraseAudioLibrary(tmp_path)
+    assert reloaded.get("teddy", "friendly", "great job!") == (b"\x01\x02", 0.8)
+
+
+def test_library_keeps_character_ids_inside_its_directory(tmp_path):
+    library = PhraseAudioLibrary(tmp_path / "lib")
+    library.put("../../escape", "friendly", "Hello there!", b"\x01", 0.1)
+    library.flush()
+
+    written = list(tmp_path.rglob("*.bin"))
+    assert len(written) == 1
+    assert (tmp_path / "lib") in written[0].parents
+    assert PhraseAudioLibrary(tmp_path / "lib").get("../../escape", "friendly", "hello there!")
+
+
+@pytest.mark.asyncio
+async def test_layer_only_synthesizes_missing_phrases(tmp_path):
+    service = FakeSynthesisService()
+    layer = PhraseSynthesisLayer(
+        service, PhraseCacheConfig(library_path=tmp_path, crossfade_ms=0)
+    )
+
+    await layer.synthesize("Hello my friend! Let's count to three.")
+    await layer.synthesize("Hello my friend! Let's read a story.")
+
+    assert service.calls == [
+        "Hello my friend!",
+        "Let's count to three.",
+        "Let's read a story.",
+    ]
+    stats = layer.get_stats()
+    assert stats["phrase_hits"] == 1
+    assert stats["hit_ratio"] == pytest.approx(0.25)
+
+
+@pytest.mark.asyncio
+async def test_layer_falls_back_to_full_reply_when_segments_cannot_be_stitched(tmp_path):
+    service = FakeSynthesisService(encode=lambda n: bytes([n, n, n]))
+    layer = PhraseSynthesisLayer(service, PhraseCacheConfig(library_path=tmp_path))
+
+    audio = await layer.synthesize("Hello my friend! Let's count to three.")
+    assert service.calls[-1] == "Hello my friend! Let's count to three."
+    assert audio == bytes([3, 3, 3])
@@ -0,0 +1,167 @@
+"""
+Unit tests for the query result cache and the optimizer's read routing.
+"""
+
+import pytest
+
+try:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.infrastructure.database.async_database_optimizer import (
+        AsyncDatabaseOptimizer,
+        ReadReplica,
+    )
+    from src.infrastructure.database.query_result_cache import (
+        QueryResultCache,
+        fingerprint_statement,
+        hash_params,
+    )
+
+    QUERY_CACHE_AVAILABLE = True
+except ImportError:
+    QUERY_CACHE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not QUERY_CACHE_AVAILABLE, reason="Query result cache not available"
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint_ignores_whitespace_case_and_comments():
+    a = fingerprint_statement("SELECT *  FROM children\n WHERE id = :id -- by id")
+    b = fingerprint_statement("select * from children where id = :id")
+    assert a.fingerprint == b.fingerprint
+    assert a.tables == {"children"}
+    assert not a.is_write
+
+    joined = fingerprint_statement(
+        "SELECT * FROM children c, conversations v JOIN messages m ON m.id = v.id")
+    assert joined.tables == {"children", "conversations", "messages"}
+    assert fingerprint_statement("UPDATE children SET age = :age").is_write
+    assert fingerprint_statement(
+        "WITH gone AS (DELETE FROM messages RETURNING id) SELECT * FROM gone").is_write
+
+
+def test_truncate_is_a_write_to_the_truncated_tables():
+    for sql in ("TRUNCATE children", "truncate table children",
+                "TRUNCATE TABLE ONLY public.children RESTART IDENTITY CASCADE"):
+        statement = fingerprint_statement(sql)
+        assert statement.is_write
+        assert statement.tables == {"children"}
+
+    both = fingerprint_statement("TRUNCATE children, messages CASCADE")
+    assert both.tables == {"children", "messages"}
+
+
+def test_param_hash_is_stable_and_type_aware():
+    assert hash_params({"a": 1, "b": [1, 2]}) == hash_params({"b": [1, 2], "a": 1})
+    assert hash_params({"a": 1}) != hash_params({"a": "1"})
+    assert hash_params({"a": 1}) != hash_params({"a": 1.0})
+    assert hash_params({"a": True}) != hash_params({"a": 1})
+
+
+def test_entries_expire_and_are_bounded_by_bytes():
+    clock = FakeClock()
+    cache = QueryResultCache(max_bytes=20_000, default_ttl=10, max_entry_fraction=0.5, clock=clock)
+    statement = fingerprint_statement("SELECT * FROM children WHERE id = :id")
+    rows = [{"id": i, "name": "x" * 50} for i in range(10)]
+
+    for i in range(50):
+        cache.put(statement, {"id": i}, rows)
+    assert cache.current_bytes <= cache.max_bytes
+    assert cache.stats.evictions > 0
+    assert cache.get(statement, {"id": 0}) is None
+    assert cache.get(statement, {"id": 49}) == rows
+
+    clock.now += 11
+    assert cache.get(statement, {"id": 49}) is None
+    assert cache.stats.expired == 1
+
+    huge = [{"blob": "x" * 20_000}]
+    assert not cache.put(statement, {"id": 1}, huge)
+
+
+def test_writes_invalidate_dependent_entries_only():
+    cache = QueryResultCache(clock=FakeClock())
+    children = fingerprint_statement("SELECT * FROM children")
+    messages = fingerprint_statement("SELECT * FROM messages")
+    cache.put(children, None, [{"id": 1}])
+    cache.put(messages, None, [{"id": 2}])
+
+    write = fingerprint_statement("UPDATE children SET age = :age")
+    cache.invalidate_tables(write.tables)
+
+    assert cache.get(children) is None
+    assert cache.get(messages) == [{"id": 2}]
+    assert cache.stats.invalidated == 1
+
+    # A result read before a concurrent write must not be served after it
+    versions = cache.snapshot_versions(children)
+    cache.invalidate_tables({"children"})
+    cache.put(children, None, [{"id": 1}], table_versions=versions)
+    assert cache.get(children) is None
+
+
+async def make_optimizer(tmp_path):
+    primary_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    optimizer = AsyncDatabaseOptimizer({"routing": {"consistency_margin_seconds": 0.0}})
+    optimizer.primary_engine = create_async_engine(primary_url)
+    replica = ReadReplica("replica-1", replica_url, lag_threshold=30)
+    replica.engine = create_async_engine(replica_url)
+    optimizer.read_replicas.append(replica)
+
+    for engine, name in ((optimizer.primary_engine, "primary"), (replica.engine, "replica")):
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("CREATE TABLE children (id INTEGER, source TEXT)")
+            await conn.exec_driver_sql(f"INSERT INTO children VALUES (1, '{name}')")
+
+    return optimizer
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_and_cache(tmp_path):
+    optimizer = await make_optimizer(tmp_path)
+    query = "SELECT source FROM children WHERE id = :id"
+    first = await optimizer.execute_optimized_query(query, {"id": 1})
+    second = await optimizer.execute_optimized_query(query, {"id": 1})
+
+    assert first == second == [{"source": "replica"}]
+    assert optimizer.routing_stats["replica_reads"] == 1
+    assert optimizer._calculate_cache_hit_ratio() == 0.5
+    await optimizer.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_session_reads_its_writes_from_primary(tmp_path):
+    optimizer = await make_optimizer(tmp_path)
+    optimizer.read_replicas[0].replication_lag = 5
+    query = "SELECT source FROM children WHERE id = :id"
+    await optimizer.execute_optimized_query(query, {"id": 1})
+
+    await optimizer.execute_optimized_query(
+        "UPDATE children SET source = :source WHERE id = :id",
+        {"source": "written", "id": 1},
+        session_id="sess-1",
+    )
+
+    own = await optimizer.execute_optimized_query(query, {"id": 1}, session_id="sess-1")
+    assert own == [{"source": "written"}]
+    assert optimizer.routing_stats["consistency_reroutes"] == 1
+
+    # Other sessions may read the lagging replica, but its result is not
+    # cached under the post-write table version
+    other = await optimizer.execute_optimized_query(query, {"id": 2}, session_id="sess-2")
+    assert other == []
+    assert optimizer.routing_stats["replica_results_not_cached"] == 1
+
+    metrics = await optimizer.get_performance_metrics()
+    assert metrics["database_optimizer"]["cache_stats"]["writes_seen"] == 1
+    await optimizer.cleanup()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the semantic response cache.
+"""
+
+import pytest
+
+try:
+    from src.infrastructure.caching.models import ContentType
+    from src.infrastructure.caching.semantic_response_cache import (
+        SemanticCacheConfig,
+        SemanticResponseCache,
+        normalize_question,
+    )
+
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not SEMANTIC_CACHE_AVAILABLE, reason="Semantic cache not available"
+)
+
+
+@pytest.fixture
+def cache():
+    return SemanticResponseCache(SemanticCacheConfig(enabled=True))
+
+
+def test_disabled_by_default():
+    cache = SemanticResponseCache()
+    assert not cache.store("why is the sky blue", "answer", 6, "en")
+    assert cache.lookup("why is the sky blue", 6, "en") is None
+
+
+def test_paraphrase_hits(cache):
+    cache.store("why is the sky blue", "Because of sunlight scattering!", 6, "en")
+
+    assert cache.lookup("Why the sky is blue?", 7, "en") == (
+        "Because of sunlight scattering!")
+    stats = cache.get_stats()["by_content_type"][ContentType.AI_RESPONSE.value]
+    assert stats["hits"] == 1
+    assert stats["llm_calls_avoided"] == 1
+
+
+def test_partitioned_by_age_band_and_language(cache):
+    cache.store("why is the sky blue", "answer", 6, "en")
+
+    assert cache.lookup("why is the sky blue", 11, "en") is None
+    assert cache.lookup("why is the sky blue", 6, "ar") is None
+    assert cache.lookup("why is grass green", 6, "en") is None
+
+
+def test_arabic_normalization():
+    assert normalize_question("لِماذا السَّماءُ زرقاء؟") == normalize_question(
+        "لماذا السماء زرقاء")
+
+
+def test_hits_are_remoderated_against_current_rules():
+    blocked = set()
+    cache = SemanticResponseCache(
+        SemanticCacheConfig(enabled=True),
+        moderator=lambda text: not any(word in text for word in blocked),
+    )
+    cache.store("tell me about dragons", {"content": "Dragons breathe fire"}, 5, "en")
+    assert cache.lookup("tell me about dragons", 5, "en") is not None
+
+    blocked.add("fire")
+    assert cache.lookup("tell me about dragons", 5, "en") is None
+    stats = cache.get_stats()["by_content_type"][ContentType.AI_RESPONSE.value]
+    assert stats["moderation_rejections"] == 1
+    # The rejected entry is dropped
+    blocked.clear()
+    assert cache.lookup("tell me about dragons", 5, "en") is None
+
+
+def test_partition_capacity_replaces_least_recently_used():
+    cache = SemanticResponseCache(
+        SemanticCacheConfig(enabled=True, max_entries_per_partition=2))
+    cache.store("why is the sky blue", "sky", 6, "en")
+    cache.store("why is grass green", "grass", 6, "en")
+    cache.lookup("why is the sky blue", 6, "en")
+    cache.store("why is snow cold", "snow", 6, "en")
+
+    assert cache.lookup("why is the sky blue", 6, "en") == "sky"
+    assert cache.lookup("why is snow cold", 6, "en") == "snow"
+    assert cache.lookup("why is grass green", 6, "en") is None
+
+
+def test_negation_is_not_served_the_positive_answer(cache):
+    cache.store("can I touch the stove when it is hot", "No, it burns!", 6, "en")
+
+    assert cache.lookup("can I touch the stove when it is not hot", 6, "en") is None
+    assert cache.lookup("can I touch the stove when it isn't hot", 6, "en") is None
+    assert cache.lookup("Can I touch the stove, when it is hot?", 6, "en") == (
+        "No, it burns!")
+
+
+def test_word_order_that_changes_meaning_misses(cache):
+    cache.store("is a dog bigger than a cat", "Usually, yes!", 6, "en")
+
+    assert cache.lookup("is a cat bigger than a dog", 6, "en") is None
+    assert cache.lookup("is the dog bigger than the cat", 6, "en") == "Usually, yes!"
@@ -0,0 +1,179 @@
+"""
+Unit tests for the bounded, tiered session history.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.application.services.core.session_history_store import (
+        ChildSessionAggregates,
+        SessionHistoryColdStore,
+    )
+    from src.application.services.core.session_management_service import (
+        SessionManagementService,
+    )
+
+    SESSION_SERVICE_AVAILABLE = True
+except ImportError:
+    SESSION_SERVICE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not SESSION_SERVICE_AVAILABLE, reason="Session management service not available"
+)
+
+
+def test_hot_window_is_bounded_and_older_messages_come_from_cold_store(tmp_path):
+    service = SessionManagementService(
+        hot_window=10, cold_store_path=str(tmp_path / "sessions.db"), cold_flush_size=7)
+    service.create_session("s1", user_id="child-1")
+    for i in range(100):
+        service.add_message("s1", "child", f"message {i}")
+
+    assert len(service.session_history["s1"]) == 10
+    recent = service.get_recent_messages("s1", limit=25)
+    assert [m["content"] for m in recent] == [f"message {i}" for i in range(75, 100)]
+    assert service.cold_store.count_messages() == 90
+
+    stats = service.get_session_stats()
+    assert stats["total_messages"] == 100
+    assert stats["hot_messages"] == 10
+    assert stats["spilled_messages"] == 90
+
+
+def test_without_cold_store_old_messages_are_dropped():
+    service = SessionManagementService(hot_window=3)
+    service.create_session("s1")
+    for i in range(5):
+        service.add_message("s1", "child", f"m{i}")
+
+    assert [m["content"] for m in service.get_recent_messages("s1", limit=10)] == [
+        "m2", "m3", "m4"]
+    assert service.get_session_stats()["dropped_messages"] == 2
+
+
+def test_child_aggregates_update_on_session_end_and_persist(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SessionManagementService(cold_store_path=path)
+    for index in range(3):
+        session = service.create_session(f"s{index}", user_id="child-1")
+        session["created_at"] = datetime.now() - timedelta(minutes=10)
+        service.add_message(f"s{index}", "child", "hello")
+        service.add_message(f"s{index}", "assistant", "hi there")
+        service.end_session(f"s{index}")
+    service.end_session("s0")  # Ending twice must not double count
+
+    stats = service.get_child_stats("child-1")
+    assert stats["session_count"] == 3
+    assert stats["message_count"] == 6
+    assert stats["average_duration_seconds"] == pytest.approx(600, abs=5)
+    assert stats["today"]["sessions"] == 3
+
+    # A fresh process picks the totals up from the cold tier
+    restarted = SessionManagementService(cold_store=SessionHistoryColdStore(path))
+    assert restarted.get_child_stats("child-1")["session_count"] == 3
+    assert restarted.get_session("s1")["status"] == "ended"
+
+
+def test_daily_buckets_are_bounded_and_ordered():
+    aggregates = ChildSessionAggregates(max_days=3)
+    start = datetime(2024, 1, 10, 9, 0)
+    for offset in (0, 1, 2, 3, -5, 1):
+        day = start + timedelta(days=offset)
+        aggregates.record(day, day + timedelta(minutes=5), 2)
+
+    assert list(aggregates.daily) == ["2024-01-11", "2024-01-12", "2024-01-13"]
+    assert aggregates.daily["2024-01-11"][0] == 2
+    assert aggregates.session_count == 6
+    assert aggregates.total_duration_seconds == 6 * 300
+
+
+def test_eviction_keeps_hot_tier_under_memory_budget(tmp_path):
+    service = SessionManagementService(
+        hot_window=100, memory_budget_bytes=200_000,
+        cold_store_path=str(tmp_path / "sessions.db"))
+    for index in range(50):
+        service.create_session(f"s{index}", user_id=f"child-{index % 5}")
+        for i in range(40):
+            service.add_message(f"s{index}", "child", "x" * 200)
+        if index % 2:
+            service.end_session(f"s{index}")
+
+    service.evict_to_budget()
+    stats = service.get_session_stats()
+    assert stats["hot_bytes"] <= 200_000
+    assert stats["evicted_sessions"] > 0
+    # Active sessions keep their newest messages hot
+    assert all(len(service.session_history[f"s{i}"]) >= 5 for i in range(48, 50, 2))
+    assert len(service.get_recent_messages("s0", limit=40)) == 40
+
+
+def test_child_aggregates_leave_memory_with_the_childs_sessions(tmp_path):
+    service = SessionManagementService(cold_store_path=str(tmp_path / "sessions.db"))
+    for index in range(100):
+        service.create_session(f"s{index}", user_id=f"child-{index}")
+        service.add_message(f"s{index}", "child", "hello")
+    service.create_session("extra", user_id="child-0")
+    for index in range(100):
+        service.end_session(f"s{index}")
+    assert len(service.child_aggregates) == 100
+
+    service.cleanup_old_sessions(max_age_hours=-1)
+    assert service.child_aggregates == {}
+    assert service.get_session_stats()["aggregate_bytes"] == 0
+    assert service.get_session_stats()["hot_bytes"] == 0
+
+    # Still served from the cold store, without being cached again
+    assert service.get_child_stats("child-7")["session_count"] == 1
+    assert service.get_child_stats("child-0")["session_count"] == 2
+    assert service.child_aggregates == {}
+
+
+def test_child_aggregates_count_towards_budget_without_cold_store():
+    service = SessionManagementService()
+    service.create_session("s1", user_id="child-1")
+    service.end_session("s1")
+    service.cleanup_old_sessions(max_age_hours=-1)
+
+    # The aggregates are the only copy, so they stay and are accounted for
+    assert service.get_child_stats("child-1")["session_count"] == 1
+    stats = service.get_session_stats()
+    assert stats["aggregate_bytes"] > 0
+    assert stats["hot_bytes"] == stats["aggregate_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_background_eviction_task(tmp_path):
+    service = SessionManagementService(
+        memory_budget_bytes=10_000, cold_store_path=str(tmp_path / "sessions.db"))
+    service.create_session("s1", user_id="child-1")
+    for i in range(20):
+        service.add_message("s1", "child", "y" * 100)
+    assert service.get_session_stats()["hot_bytes"] > 10_000
+
+    service.start_background_eviction(interval_seconds=0.01)
+    await asyncio.sleep(0.05)
+    await service.stop_background_eviction()
+    assert service.get_session_stats()["hot_bytes"] <= 10_000
+
+
+def test_reused_session_id_does_not_overwrite_cold_rows(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SessionManagementService(hot_window=2, cold_store_path=path)
+    for round_name in ("first", "second"):
+        service.create_session("s1")
+        for i in range(3):
+            service.add_message("s1", "child", f"{round_name} {i}")
+        assert service.cleanup_old_sessions(max_age_hours=-1) == 1
+
+    # A fresh process continues after the stored rows as well
+    restarted = SessionManagementService(cold_store=SessionHistoryColdStore(path))
+    restarted.create_session("s1")
+    restarted.add_message("s1", "child", "third")
+    restarted.cleanup_old_sessions(max_age_hours=-1)
+
+    contents = [m["content"] for m in restarted.cold_store.recent_messages("s1", 10)]
+    assert contents == [f"first {i}" for i in range(3)] + [
+        f"second {i}" for i in range(3)] + ["third"]
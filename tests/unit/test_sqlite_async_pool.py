@@ -0,0 +1,164 @@
+"""
+Unit tests for the async SQLite pool and repositories running on it.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+try:
+    from src.infrastructure.persistence.sqlite import (
+        AsyncSQLitePool,
+        BaseSQLiteRepository,
+        SQLitePoolConfig,
+    )
+
+    SQLITE_POOL_AVAILABLE = True
+except ImportError:
+    SQLITE_POOL_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not SQLITE_POOL_AVAILABLE, reason="SQLite pool not available"
+)
+
+
+@dataclass
+class Note:
+    id: Optional[str]
+    text: str
+
+    def to_dict(self):
+        return {"id": self.id, "text": self.text}
+
+
+if SQLITE_POOL_AVAILABLE:
+
+    class NoteRepository(BaseSQLiteRepository[Note, str]):
+        def _get_table_schema(self) -> str:
+            return "CREATE TABLE IF NOT EXISTS notes (id TEXT PRIMARY KEY, text TEXT)"
+
+        async def add(self, entity):
+            return await self.create(entity)
+
+        async def search(self, criteria, options=None):
+            raise NotImplementedError
+
+        async def count(self, criteria=None):
+            raise NotImplementedError
+
+
+async def _open_pool(tmp_path, **overrides):
+    pool = AsyncSQLitePool(SQLitePoolConfig(str(tmp_path / "pool.db"), readers=2, **overrides))
+    await pool.initialize()
+    await pool.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_writes_and_reads_run_on_their_own_threads(tmp_path):
+    pool = await _open_pool(tmp_path)
+    try:
+        thread = await pool.run_write(lambda conn: threading.current_thread().name)
+        assert thread == "sqlite-writer"
+        assert (await pool.run_read(lambda conn: threading.current_thread().name)).startswith(
+            "sqlite-reader-")
+
+        rowcount, lastrowid = await pool.execute(
+            "INSERT INTO items (name) VALUES (?)", ("teddy",))
+        assert (rowcount, lastrowid) == (1, 1)
+        # Committed before the write resolved, so any reader sees it
+        rows = await asyncio.gather(*[
+            pool.fetchone("SELECT name FROM items WHERE id = ?", (1,)) for _ in range(4)])
+        assert [row["name"] for row in rows] == ["teddy"] * 4
+
+        journal_mode = await pool.run_read(
+            lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0])
+        assert journal_mode == "wal"
+        with pytest.raises(sqlite3.OperationalError):
+            await pool.run_read(lambda conn: conn.execute("DELETE FROM items"))
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_write_rolls_back(tmp_path):
+    pool = await _open_pool(tmp_path)
+    try:
+        def job(conn):
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await pool.run_write(job)
+        assert (await pool.fetchone("SELECT COUNT(*) FROM items"))[0] == 0
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_do_not_stall_the_loop(tmp_path):
+    pool = await _open_pool(tmp_path, stall_check_interval=0.01)
+    try:
+        def slow(conn):
+            time.sleep(0.2)
+            return conn.execute("SELECT 1").fetchone()[0]
+
+        results = await asyncio.gather(pool.run_read(slow), pool.run_read(slow),
+                                       pool.run_write(slow))
+        assert results == [1, 1, 1]
+
+        metrics = pool.get_metrics()
+        assert metrics["loop_stall"]["count"] > 5
+        assert metrics["loop_stall"]["max_ms"] < 150
+        assert metrics["reader_statement"]["max_ms"] >= 200
+        assert metrics["writer_queue_wait"]["count"] >= 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_repository_adopts_pool_without_interface_change(tmp_path):
+    pool = await _open_pool(tmp_path)
+    try:
+        repository = NoteRepository(None, "notes", Note, pool=pool)
+        await repository.create(Note("n1", "hello"))
+        result = await repository.bulk_create([Note(f"n{i}", "bulk") for i in range(2, 6)])
+
+        assert result.success_count == 4
+        assert (await repository.get_by_id("n1")).text == "hello"
+        assert (await repository.get_by_id("n5")).text == "bulk"
+        assert (await pool.fetchone("SELECT COUNT(*) FROM notes"))[0] == 5
+        assert await repository.delete("n1")
+        assert await repository.get_by_id("n1") is None
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_repository_never_needs_a_direct_connection(tmp_path):
+    pool = await _open_pool(tmp_path)
+    try:
+        repository = NoteRepository(None, "notes", Note, pool=pool)
+        await repository.run_in_transaction(lambda conn: conn.executemany(
+            "INSERT INTO notes (id, text) VALUES (?, ?)", [("a", "x"), ("b", "y")]))
+
+        assert await repository.exists("a")
+        assert not await repository.exists("z")
+        assert await repository.aggregate("id", "count") == 2
+        rows = await repository.execute_safe_query("SELECT text FROM notes ORDER BY id")
+        assert [row["text"] for row in rows] == ["x", "y"]
+        info = await asyncio.to_thread(repository.get_table_info)
+        assert [column["name"] for column in info["columns"]] == ["id", "text"]
+        await asyncio.to_thread(repository.analyze)
+        await asyncio.to_thread(repository.vacuum)
+
+        with pytest.raises(Exception, match="run_in_transaction"):
+            with repository.transaction():
+                pass
+    finally:
+        await pool.close()
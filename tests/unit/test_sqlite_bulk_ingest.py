@@ -0,0 +1,104 @@
+"""
+Unit tests for the SQLite bulk ingestion path.
+"""
+
+import sqlite3
+
+import pytest
+
+try:
+    from src.infrastructure.persistence.sqlite.sqlite_bulk_ingest import (
+        BulkLoadOptions,
+        SQLiteBulkLoader,
+    )
+
+    BULK_INGEST_AVAILABLE = True
+except ImportError:
+    BULK_INGEST_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not BULK_INGEST_AVAILABLE, reason="SQLite bulk ingestion not available"
+)
+
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = sqlite3.connect(tmp_path / "bulk.db")
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute(
+        "CREATE TABLE messages (id TEXT PRIMARY KEY, conversation_id TEXT, "
+        "content TEXT, sequence_number INTEGER)")
+    connection.execute(
+        "CREATE INDEX idx_messages_conversation ON messages(conversation_id, sequence_number)")
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def _rows(count, content="hello"):
+    return ({"id": f"m{i}", "conversation_id": f"c{i % 10}", "content": content,
+             "sequence_number": i} for i in range(count))
+
+
+def test_load_is_chunked_and_commits_once(connection):
+    loader = SQLiteBulkLoader(connection, "messages")
+    stats = loader.load(_rows(2500), options=BulkLoadOptions(chunk_size=1000))
+
+    assert stats.rows == 2500
+    assert stats.chunks == 3
+    assert stats.changes == 2500
+    assert not connection.in_transaction
+    assert connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 2500
+
+
+def test_failed_load_rolls_back_everything(connection):
+    loader = SQLiteBulkLoader(connection, "messages")
+    rows = list(_rows(10)) + [{"id": "m0", "conversation_id": "c0",
+                               "content": "dup", "sequence_number": 0}]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        loader.load(rows, options=BulkLoadOptions(chunk_size=4))
+    assert connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+
+
+def test_upsert_updates_or_keeps_existing_rows(connection):
+    loader = SQLiteBulkLoader(connection, "messages")
+    loader.load(_rows(5))
+
+    loader.load(_rows(8, content="edited"), options=BulkLoadOptions(conflict_columns=["id"]))
+    contents = connection.execute(
+        "SELECT content, COUNT(*) FROM messages GROUP BY content").fetchall()
+    assert contents == [("edited", 8)]
+
+    loader.load(_rows(10, content="ignored"), options=BulkLoadOptions(
+        conflict_columns=["id"], update_columns=[]))
+    assert connection.execute(
+        "SELECT COUNT(*) FROM messages WHERE content = 'ignored'").fetchone()[0] == 2
+
+
+def test_deferred_indexes_are_rebuilt_and_pragmas_restored(connection):
+    synchronous = connection.execute("PRAGMA synchronous").fetchone()[0]
+    loader = SQLiteBulkLoader(connection, "messages")
+
+    stats = loader.load(_rows(100), options=BulkLoadOptions(defer_indexes=True))
+
+    assert stats.indexes_rebuilt == 1
+    indexes = [row[1] for row in connection.execute("PRAGMA index_list(messages)")]
+    assert "idx_messages_conversation" in indexes
+    assert connection.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+
+
+def test_sequence_rows_and_savepoint_inside_open_transaction(connection):
+    loader = SQLiteBulkLoader(connection, "messages", serialize=str)
+    connection.execute("INSERT INTO messages VALUES ('x', 'c', 'outer', 0)")
+    assert connection.in_transaction
+
+    loader.load([("a", "c1", "hi", 1), ("b", "c1", "there", 2)],
+                columns=["id", "conversation_id", "content", "sequence_number"])
+    # The caller's transaction stays open and owns the commit
+    assert connection.in_transaction
+    connection.rollback()
+    assert connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+
+    with pytest.raises(ValueError):
+        loader.load([("a", "c1")], columns=["id", "conversation_id", "content"])
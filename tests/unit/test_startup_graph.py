@@ -0,0 +1,169 @@
+"""
+Unit tests for dependency-aware concurrent startup.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+try:
+    from src.infrastructure.startup_graph import (
+        LazyService,
+        ServiceUnavailableError,
+        StartupError,
+        StartupGraph,
+    )
+
+    STARTUP_GRAPH_AVAILABLE = True
+except ImportError:
+    STARTUP_GRAPH_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not STARTUP_GRAPH_AVAILABLE, reason="Startup graph not available"
+)
+
+
+class SlowService:
+    def __init__(self, name, log, delay=0.05, fail=False):
+        self.name = name
+        self.log = log
+        self.delay = delay
+        self.fail = fail
+
+    async def initialize(self):
+        self.log.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} broke")
+        self.log.append(("end", self.name))
+
+
+@pytest.mark.asyncio
+async def test_independent_services_start_concurrently():
+    log = []
+    graph = StartupGraph()
+    for name in ("a", "b", "c"):
+        graph.add(name, lambda name=name: SlowService(name, log, delay=0.1))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await graph.start()
+
+    assert loop.time() - started < 0.25
+    assert graph.is_ready
+
+
+@pytest.mark.asyncio
+async def test_dependencies_start_first():
+    log = []
+    graph = StartupGraph()
+    graph.add("db", lambda: SlowService("db", log))
+    graph.add("bus", lambda: SlowService("bus", log), depends_on=["db"])
+    await graph.start()
+
+    assert log.index(("end", "db")) < log.index(("start", "bus"))
+
+
+@pytest.mark.asyncio
+async def test_lazy_service_activates_on_first_use():
+    log = []
+    graph = StartupGraph()
+    graph.add("whisper", lambda: SlowService("whisper", log), lazy=True)
+    await graph.start()
+
+    handle = graph.get("whisper")
+    assert isinstance(handle, LazyService)
+    assert not log
+
+    service = await handle.get()
+    assert service is await handle.get()
+    assert log == [("start", "whisper"), ("end", "whisper")]
+
+
+@pytest.mark.asyncio
+async def test_critical_failure_blocks_readiness_and_skips_dependents():
+    log = []
+    graph = StartupGraph()
+    graph.add("health", lambda: SlowService("health", log, fail=True), critical=True)
+    graph.add("api", lambda: SlowService("api", log), depends_on=["health"])
+    graph.add("extra", lambda: SlowService("extra", log))
+
+    with pytest.raises(StartupError):
+        await graph.start()
+
+    assert not graph.is_ready
+    assert "api" in graph.failures
+    assert ("end", "extra") in log
+
+
+@pytest.mark.asyncio
+async def test_cycles_are_rejected():
+    graph = StartupGraph()
+    graph.add("a", object, depends_on=["b"])
+    graph.add("b", object, depends_on=["a"])
+
+    with pytest.raises(ValueError):
+        await graph.start()
+
+
+@pytest.mark.asyncio
+async def test_timeline_written(tmp_path):
+    graph = StartupGraph()
+    graph.add("a", object, critical=True)
+    await graph.start()
+
+    path = tmp_path / "timeline.json"
+    graph.timeline.write(path)
+    data = json.loads(path.read_text())
+
+    assert data["ready_after_ms"] is not None
+    assert data["services"][0]["service"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_started_services_are_reported_and_resolvable():
+    log, bound = [], {}
+    graph = StartupGraph(on_started=bound.__setitem__)
+    graph.add("eager", lambda: SlowService("eager", log, delay=0))
+    graph.add("lazy", lambda: SlowService("lazy", log, delay=0), lazy=True)
+    graph.add(
+        "construct_only", lambda: SlowService("construct_only", log), initialize=False)
+    await graph.start()
+
+    # Constructed without initialize(); lazy one not created yet
+    assert set(bound) == {"eager", "construct_only"}
+    assert log == [("start", "eager"), ("end", "eager")]
+
+    lazy = await graph.resolve("lazy")
+    assert isinstance(lazy, SlowService)
+    assert bound["lazy"] is lazy
+    assert await graph.resolve("lazy") is lazy
+    assert await graph.resolve("eager") is bound["eager"]
+
+
+@pytest.mark.asyncio
+async def test_requests_wait_for_services_still_starting_after_ready():
+    log = []
+    graph = StartupGraph()
+    graph.add("health", lambda: SlowService("health", log, delay=0.01), critical=True)
+    graph.add("ai", lambda: SlowService("ai", log, delay=0.1), depends_on=["health"])
+    graph.add("broken", lambda: SlowService("broken", log, fail=True))
+    graph.add("speech", lambda: SlowService("speech", log), lazy=True)
+
+    startup = asyncio.create_task(graph.start())
+    await graph.ready.wait()
+    assert graph.status()["ai"] == "starting"
+
+    ai = await graph.wait_for("ai")
+    assert ("end", "ai") in log and ai is graph.get("ai")
+    assert graph.status()["ai"] == "started"
+
+    with pytest.raises(ServiceUnavailableError):
+        await graph.wait_for("broken")
+    assert graph.status()["broken"] == "failed"
+
+    await startup
+    assert graph.status()["speech"] == "lazy"
+    await graph.wait_for("speech")
+    assert graph.status()["speech"] == "active"
@@ -0,0 +1,113 @@
+"""
+Unit tests for the per-child story choice log.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+try:
+    from src.domain.stories.choice_log_store import ChoiceLogStore
+    from src.domain.stories.interactive_story_engine import (
+        ChoiceType,
+        StoryChoiceLog,
+    )
+
+    STORY_ENGINE_AVAILABLE = True
+except ImportError:
+    STORY_ENGINE_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not STORY_ENGINE_AVAILABLE, reason="Story engine not available"
+)
+
+
+def make_log(child, device, timestamp, scores, choice_type=None, index=0):
+    return StoryChoiceLog(
+        id=f"log-{index}",
+        device_id=device,
+        child_name=child,
+        story_id="story-1",
+        scene_id=f"scene-{index}",
+        choice_id=f"choice-{index}",
+        choice_type=choice_type or ChoiceType.COURAGE_VS_CAUTION,
+        behavioral_scores=scores,
+        timestamp=timestamp,
+    )
+
+
+def reference_analysis(logs, child, device, cutoff):
+    """The original full-scan aggregation"""
+    scores, distribution = {}, {}
+    for log in logs:
+        if log.child_name != child or log.device_id != device or log.timestamp < cutoff:
+            continue
+        for trait, score in log.behavioral_scores.items():
+            scores.setdefault(trait, []).append(score)
+        key = log.choice_type.value
+        distribution[key] = distribution.get(key, 0) + 1
+    averages = {trait: sum(v) / len(v) for trait, v in scores.items()}
+    return averages, distribution
+
+
+def test_windowed_aggregates_match_full_scan():
+    now = datetime.now()
+    logs = []
+    for i in range(200):
+        logs.append(make_log(
+            "sara" if i % 3 else "omar",
+            "dev-1",
+            now - timedelta(hours=i * 7),
+            {"bravery": (i % 10) / 10, "empathy": (i % 7) / 7} if i % 2
+            else {"caution": (i % 5) / 5},
+            ChoiceType.HELPING_VS_SELF_FOCUS if i % 4 == 0 else None,
+            i,
+        ))
+
+    store = ChoiceLogStore()
+    for log in logs:
+        store.append(log)
+
+    for days_back in (1, 7, 30):
+        cutoff = now - timedelta(days=days_back)
+        sums, counts, distribution, total = store.window_aggregates(
+            "sara", "dev-1", cutoff)
+        averages = {trait: sums[trait] / count for trait, count in counts.items()}
+        expected_averages, expected_distribution = reference_analysis(
+            logs, "sara", "dev-1", cutoff)
+
+        assert distribution == expected_distribution
+        assert total == sum(expected_distribution.values())
+        assert averages.keys() == expected_averages.keys()
+        for trait, value in expected_averages.items():
+            assert averages[trait] == pytest.approx(value)
+
+
+def test_rows_are_newest_first_and_per_child():
+    store = ChoiceLogStore()
+    now = datetime.now()
+    store.append(make_log("sara", "dev-1", now - timedelta(days=2), {}, index=1))
+    store.append(make_log("sara", "dev-1", now, {}, index=2))
+    store.append(make_log("sara", "dev-1", now - timedelta(seconds=1), {}, index=3))
+    store.append(make_log("sara", "dev-2", now, {}, index=4))
+
+    rows = store.iter_rows("sara", "dev-1", newest_first=True)
+    assert [row[3] for row in rows] == ["scene-2", "scene-3", "scene-1"]
+
+
+def test_flush_and_reload(tmp_path):
+    now = datetime.now()
+    store = ChoiceLogStore(tmp_path)
+    store.append(make_log("sara", "dev-1", now, {"bravery": 0.9}, index=1))
+    store.append(make_log("sara", "dev-1", now - timedelta(days=40), {"bravery": 0.1}, index=2))
+
+    assert store.flush() == 2
+    assert store.flush() == 0
+    assert "sara" not in " ".join(p.name for p in tmp_path.rglob("*"))
+
+    reloaded = ChoiceLogStore(tmp_path)
+    sums, counts, distribution, total = reloaded.window_aggregates(
+        "sara", "dev-1", now - timedelta(days=60))
+    assert total == 2
+    assert sums["bravery"] == pytest.approx(1.0)
+    assert len(list(reloaded.iter_rows("sara", "dev-1"))) == 2
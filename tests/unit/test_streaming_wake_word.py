@@ -0,0 +1,172 @@
+"""
+Unit tests for streaming wake word detection.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+try:
+    from src.adapters.edge.edge_wake_word_detector import EdgeWakeWordDetector
+    from src.adapters.edge.streaming_wake_word import (
+        FEATURES,
+        EnergyWakeWordScorer,
+        LogMelFrontend,
+        RingWindow,
+        StreamingWakeWordConfig,
+        StreamingWakeWordDetector,
+    )
+
+    STREAMING_WAKE_WORD_AVAILABLE = True
+except ImportError:
+    STREAMING_WAKE_WORD_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not STREAMING_WAKE_WORD_AVAILABLE, reason="Streaming wake word detection not available"
+)
+
+
+if STREAMING_WAKE_WORD_AVAILABLE:
+
+    class RecordingScorer:
+        """Feature-input scorer that records batch sizes and scoring threads"""
+
+        input_kind = FEATURES
+
+        def __init__(self, delay=0.0):
+            self.delay = delay
+            self.batch_sizes = []
+            self.threads = set()
+
+        def score_batch(self, windows):
+            self.batch_sizes.append(len(windows))
+            self.threads.add(threading.current_thread().name)
+            time.sleep(self.delay)
+            return np.full(len(windows), 0.1)
+
+    class FakeInterpreter:
+        """TFLite interpreter surface with a resizable (batch, 16000) input"""
+
+        def __init__(self):
+            self.shape = [1, 16000]
+
+        def get_input_details(self):
+            return [{"index": 0, "shape": np.array(self.shape), "dtype": np.float32}]
+
+        def get_output_details(self):
+            return [{"index": 1, "shape": np.array([self.shape[0], 2])}]
+
+        def resize_tensor_input(self, index, shape):
+            self.shape = list(shape)
+
+        def allocate_tensors(self):
+            pass
+
+        def set_tensor(self, index, value):
+            if list(value.shape) != self.shape:
+                raise ValueError(f"Cannot set tensor: got {value.shape}, expected {self.shape}")
+            self.batch = len(value)
+
+        def invoke(self):
+            pass
+
+        def get_tensor(self, index):
+            return np.tile([0.1, 0.9], (self.batch, 1))
+
+
+
+def test_incremental_frames_match_whole_signal():
+    config = StreamingWakeWordConfig()
+    audio = np.random.default_rng(1).standard_normal(16000).astype(np.float32)
+
+    whole = LogMelFrontend(config).frames_for(audio)
+    frontend = LogMelFrontend(config)
+    chunks = [frontend.frames_for(chunk) for chunk in np.array_split(audio, 37)]
+
+    assert whole.shape == (config.frames_per_window, config.n_mels)
+    np.testing.assert_allclose(np.concatenate(chunks), whole, rtol=1e-5, atol=1e-4)
+
+
+def test_ring_window_is_contiguous_and_ordered():
+    ring = RingWindow(5)
+    ring.extend(np.arange(3))
+    np.testing.assert_array_equal(ring.window(), [0, 0, 0, 1, 2])
+    ring.extend(np.arange(3, 7))
+    np.testing.assert_array_equal(ring.window(), [2, 3, 4, 5, 6])
+    ring.extend(np.arange(10, 22))
+    np.testing.assert_array_equal(ring.window(), [17, 18, 19, 20, 21])
+
+
+@pytest.mark.asyncio
+async def test_sustained_speech_fires_once_per_refractory_period():
+    config = StreamingWakeWordConfig(refractory_seconds=1.0, smoothing_hops=3)
+    detector = StreamingWakeWordDetector(EnergyWakeWordScorer(), config)
+    loud = np.full(1600, 0.2, dtype=np.float32)
+    try:
+        events = []
+        # 0.5 s silence, then 3 s of loud audio, fed hop by hop
+        for _ in range(5):
+            events += await detector.feed("teddy-1", np.zeros(1600, dtype=np.float32))
+        for _ in range(30):
+            events += await detector.feed("teddy-1", loud)
+    finally:
+        detector.close()
+
+    # Still loud after the refractory period: needs to drop below threshold_off first
+    assert len(events) == 1
+    assert events[0].device_id == "teddy-1"
+    assert events[0].confidence >= config.threshold_on
+    # A single loud hop is smoothed away and never fires
+    detector = StreamingWakeWordDetector(EnergyWakeWordScorer(), config)
+    try:
+        assert await detector.feed("teddy-2", np.zeros(16000, dtype=np.float32)) == []
+        assert await detector.feed("teddy-2", loud) == []
+        assert await detector.feed("teddy-2", np.zeros(3200, dtype=np.float32)) == []
+    finally:
+        detector.close()
+
+
+@pytest.mark.asyncio
+async def test_windows_from_many_streams_are_batched_off_the_loop():
+    scorer = RecordingScorer(delay=0.02)
+    detector = StreamingWakeWordDetector(scorer, StreamingWakeWordConfig(max_batch=64))
+    hop = np.random.default_rng(2).standard_normal(1600).astype(np.float32) * 0.01
+    try:
+        for _ in range(3):
+            await asyncio.gather(*[detector.feed(f"teddy-{i}", hop) for i in range(20)])
+        # Odd chunk sizes: only whole hops produce windows
+        await detector.feed("teddy-0", hop[:1000])
+        await detector.feed("teddy-0", hop[:600])
+    finally:
+        detector.close()
+
+    stats = detector.get_stats()
+    assert stats["hops"] == 61
+    assert stats["max_batch_size"] == 20
+    assert sum(scorer.batch_sizes) == 61
+    assert all(name.startswith("wake-word") for name in scorer.threads)
+
+
+@pytest.mark.asyncio
+async def test_streaming_and_per_call_detection_share_one_interpreter():
+    edge = EdgeWakeWordDetector(model_manager=None)
+    edge.model = FakeInterpreter()
+    hop = np.full(1600, 0.05, dtype=np.float32)
+
+    assert await edge.detect_wake_word(hop) == (True, pytest.approx(0.9))
+    streaming = edge.create_streaming_detector(StreamingWakeWordConfig(max_batch=8))
+    try:
+        for _ in range(2):
+            await asyncio.gather(*[streaming.feed(f"teddy-{i}", hop) for i in range(5)])
+        assert streaming.get_stats()["max_batch_size"] == 5
+
+        # The per-call path resizes back to batch 1, and streaming resizes again
+        assert await edge.detect_wake_word(hop) == (True, pytest.approx(0.9))
+        await asyncio.gather(*[streaming.feed(f"teddy-{i}", hop) for i in range(5)])
+    finally:
+        streaming.close()
+    assert streaming.get_stats()["hops"] == 15
+    assert edge.model.shape == [5, 16000]
@@ -0,0 +1,195 @@
+"""
+Unit tests for the verified-claims cache and jti revocation replica.
+"""
+
+import pytest
+from redis.exceptions import NoScriptError
+
+try:
+    from src.infrastructure.security.jwt_enhanced import EnhancedJWTManager, TokenClaims
+    from src.infrastructure.security.token_revocation import BloomFilter, RevocationList
+
+    TOKEN_REVOCATION_AVAILABLE = True
+except ImportError:
+    TOKEN_REVOCATION_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not TOKEN_REVOCATION_AVAILABLE, reason="Token revocation not available"
+)
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The handful of Redis commands the revocation list uses"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values = {}
+        self.zsets = {}
+        self.scripts = set()
+        self.calls = 0
+
+    async def script_load(self, script):
+        self.scripts.add("revoke-sha")
+        return "revoke-sha"
+
+    async def evalsha(self, sha, numkeys, *args):
+        if sha not in self.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        return await self.eval(None, numkeys, *args)
+
+    async def eval(self, script, numkeys, jti_key, log_key, member, exp, ttl, retention):
+        """Python twin of REVOKE_LUA, scored with the server clock"""
+        self.calls += 1
+        now = self.clock()
+        self.values[jti_key] = (exp, now + ttl)
+        zset = self.zsets.setdefault(log_key, {})
+        zset[member] = now
+        for stale in [m for m, score in zset.items() if score <= now - retention]:
+            del zset[stale]
+        return str(now)
+
+    async def exists(self, key):
+        self.calls += 1
+        value = self.values.get(key)
+        return int(value is not None and value[1] > self.clock())
+
+    async def zrangebyscore(self, key, low, high, withscores=False):
+        self.calls += 1
+        exclusive = isinstance(low, str) and low.startswith("(")
+        low = float(str(low).lstrip("("))
+        high = float("inf") if high == "+inf" else float(high)
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [
+            (member.encode(), score) for member, score in items
+            if (score > low if exclusive else score >= low) and score <= high
+        ]
+
+
+def _claims():
+    return TokenClaims(user_id="p-1", username="parent", email="p@example.com",
+                       role="parent", permissions=["reports:view"], is_parent=True)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"jti-{index}")
+    assert all(f"jti-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_cached_verification_and_local_revocation():
+    manager = EnhancedJWTManager(secret_key="secret")
+    tokens = await manager.create_token_pair(_claims())
+
+    first = await manager.verify_access_token(tokens.access_token)
+    first.permissions.append("tampered")  # callers get their own copy
+    second = await manager.verify_access_token(tokens.access_token)
+    assert second.permissions == ["reports:view"]
+    assert manager.claims_cache.hits == 1
+
+    assert await manager.revoke_token(tokens.access_token)
+    assert await manager.verify_access_token(tokens.access_token) is None
+
+
+@pytest.mark.asyncio
+async def test_revocation_reaches_other_workers_within_bound():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    revoker = RevocationList(redis, sync_interval=1.0, max_staleness=5.0, clock=clock)
+    worker = RevocationList(redis, sync_interval=1.0, max_staleness=5.0, clock=clock)
+
+    await worker.sync()
+    calls = redis.calls
+    for index in range(100):
+        assert not await worker.is_revoked(f"jti-{index}")
+    assert redis.calls == calls  # all answered by the local filter
+
+    await revoker.revoke("jti-7", exp=clock.now + 900)
+    clock.now += 1.5  # next sync interval
+    assert await worker.is_revoked("jti-7")
+    stats = worker.get_stats()
+    assert stats["max_propagation_lag"] <= 1.5
+    assert stats["remote_checks"] == 1
+
+    # Per-entry expiry: gone once the token itself would have expired
+    clock.now += 1000
+    assert not await worker.is_revoked("jti-7")
+
+
+@pytest.mark.asyncio
+async def test_stale_replica_falls_back_to_redis():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    worker = RevocationList(redis, sync_interval=1.0, max_staleness=5.0, clock=clock)
+    await worker.sync()
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("sync path down")
+
+    worker.redis.zrangebyscore = broken
+    await RevocationList(redis, clock=clock).revoke("jti-1", exp=clock.now + 900)
+
+    clock.now += 6.0  # past max_staleness and no successful sync
+    assert await worker.is_revoked("jti-1")
+    assert worker.stats.sync_failures >= 1
+
+
+@pytest.mark.asyncio
+async def test_writer_clock_skew_does_not_hide_revocations():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    worker = RevocationList(redis, sync_interval=1.0, max_staleness=5.0, clock=clock)
+    await RevocationList(redis, clock=clock).revoke("jti-1", exp=clock.now + 900)
+    clock.now += 1.5
+    assert await worker.is_revoked("jti-1")
+
+    # A writer whose own clock is minutes behind still lands after the cursor
+    skewed = FakeClock(clock.now - 300)
+    await RevocationList(redis, clock=skewed).revoke("jti-2", exp=clock.now + 900)
+    clock.now += 1.5
+    assert await worker.is_revoked("jti-2")
+
+
+@pytest.mark.asyncio
+async def test_entry_with_the_cursor_score_is_not_skipped():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    worker = RevocationList(redis, sync_interval=1.0, max_staleness=5.0, clock=clock)
+    revoker = RevocationList(redis, clock=clock)
+
+    await revoker.revoke("jti-1", exp=clock.now + 900)
+    await worker.sync()
+    # Committed after the sync with the same server timestamp
+    await revoker.revoke("jti-2", exp=clock.now + 900)
+    await worker.sync()
+
+    assert "jti-2" in worker.filter
+    # Re-read overlap entries are not added to the filter twice
+    assert worker.filter.count == 2
+
+
+@pytest.mark.asyncio
+async def test_revoke_reloads_a_flushed_script():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    revoker = RevocationList(redis, clock=clock)
+    await revoker.revoke("jti-1", exp=clock.now + 900)
+
+    redis.scripts.clear()  # SCRIPT FLUSH, restart or failover
+    await revoker.revoke("jti-2", exp=clock.now + 900)
+    await revoker.revoke("jti-3", exp=clock.now + 900)
+
+    worker = RevocationList(redis, clock=clock)
+    assert await worker.is_revoked("jti-2")
+    assert await worker.is_revoked("jti-3")
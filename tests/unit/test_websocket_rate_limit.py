@@ -0,0 +1,57 @@
+"""
+Unit tests for per-session message limiting in the WebSocket manager.
+"""
+
+import pytest
+
+try:
+    from src.application.services.core.websocket_manager import (
+        ConnectionInfo,
+        ModernWebSocketManager,
+        WebSocketConfig,
+    )
+    from src.infrastructure.security.rate_limiter import LocalTokenBucketLimiter
+
+    WEBSOCKET_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_MANAGER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not WEBSOCKET_MANAGER_AVAILABLE, reason="WebSocket manager not available"
+)
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def receive_json(self):
+        return {"type": "audio_chunk"}
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+def connect(manager, session_id="s1"):
+    websocket = FakeWebSocket()
+    manager.connections[session_id] = ConnectionInfo(websocket, session_id)
+    return websocket
+
+
+def test_limiting_is_off_by_default():
+    manager = ModernWebSocketManager()
+    assert manager.rate_limiter is None
+
+
+@pytest.mark.asyncio
+async def test_injected_limiter_rejects_messages_over_burst():
+    manager = ModernWebSocketManager(
+        WebSocketConfig(), LocalTokenBucketLimiter(1.0, 2))
+    websocket = connect(manager)
+
+    received = [await manager.receive_message("s1") for _ in range(3)]
+
+    assert received[:2] == [{"type": "audio_chunk"}] * 2
+    assert received[2] is None
+    assert manager.stats["messages_rate_limited"] == 1
+    assert websocket.sent[-1]["type"] == "rate_limited"